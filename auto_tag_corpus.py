@@ -3,6 +3,12 @@
 TF-IDF Auto-Tagging for Knowledge Base
 Discovers emergent concepts and tags articles with [[wiki-links]]
 Run every 2 weeks to keep knowledge graph fresh
+
+Usage:
+    python3 auto_tag_corpus.py                  # Map-reduce over all CPU cores
+    python3 auto_tag_corpus.py --workers 1      # Serial, in-memory pipeline
+    python3 auto_tag_corpus.py --sparse         # Persisted sparse matrix (numpy/scipy)
+    python3 auto_tag_corpus.py --auto-confirm   # Skip the confirmation prompt
 """
 
 import os
@@ -10,58 +16,79 @@ import sys
 import re
 from pathlib import Path
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import math
 
+sys.path.insert(0, str(Path(__file__).parent))
+from concept_tagger import get_tagger
+from tfidf_matrix import HAS_SPARSE, TFIDFMatrix
+
+SHARD_SIZE = 64  # Files per worker task
+
+
+def corpus_files(corpus_dir):
+    """Yield the markdown files of one corpus directory."""
+    corpus_dir = Path(corpus_dir)
+    # Pattern 1: articles/*.md (most sources)
+    # Pattern 2: episodes/*/transcript.md (Lenny's Podcast)
+    # Pattern 3: how-i-ai/*.md (ChatPRD deep dives)
+    for subdir, pattern in (
+        ("articles", "*.md"),
+        ("episodes", "*/transcript.md"),
+        ("how-i-ai", "*.md"),
+    ):
+        if (corpus_dir / subdir).exists():
+            yield from (corpus_dir / subdir).glob(pattern)
+
 
 class TFIDFTagger:
-    def __init__(self, corpus_dirs):
+    def __init__(self, corpus_dirs, workers=1, backend="dict"):
         """
         Args:
             corpus_dirs: List of directories containing markdown articles
+            workers: Worker processes; > 1 streams file paths through a
+                map-reduce pipeline instead of holding every document in memory
+            backend: "dict" (nested per-document dicts) or "sparse"
+                (persisted CSR matrix via tfidf_matrix.py, incremental)
         """
         self.corpus_dirs = [Path(d) for d in corpus_dirs]
+        self.workers = workers
+        self.backend = backend
+        # Streaming: work from file paths, never all texts in memory
+        self.streaming = workers > 1 or backend == "sparse"
         self.documents = []
+        self.paths = []  # Streaming: file paths only
         self.term_freq = defaultdict(Counter)  # {doc_id: {term: count}}
         self.doc_freq = Counter()  # {term: num_docs_containing}
         self.num_docs = 0
 
     def load_corpus(self):
-        """Load all markdown files from corpus directories"""
+        """Load all markdown files from corpus directories.
+
+        When streaming (workers > 1 or the sparse backend) only the file
+        paths are collected; each file is read where it's processed, so
+        the texts are never all in memory.
+        """
         print("📚 Loading corpus...")
 
         for corpus_dir in self.corpus_dirs:
             loaded = 0
 
-            # Pattern 1: articles/*.md (most sources)
-            articles_dir = corpus_dir / "articles"
-            if articles_dir.exists():
-                for md_file in articles_dir.glob("*.md"):
-                    content = md_file.read_text(encoding="utf-8")
-                    self.documents.append({"path": md_file, "content": content})
-                    loaded += 1
-
-            # Pattern 2: episodes/*/transcript.md (Lenny's Podcast)
-            episodes_dir = corpus_dir / "episodes"
-            if episodes_dir.exists():
-                for md_file in episodes_dir.glob("*/transcript.md"):
+            for md_file in corpus_files(corpus_dir):
+                if self.streaming:
+                    self.paths.append(md_file)
+                else:
                     content = md_file.read_text(encoding="utf-8")
                     self.documents.append({"path": md_file, "content": content})
-                    loaded += 1
-
-            # Pattern 3: how-i-ai/*.md (ChatPRD deep dives)
-            howiai_dir = corpus_dir / "how-i-ai"
-            if howiai_dir.exists():
-                for md_file in howiai_dir.glob("*.md"):
-                    content = md_file.read_text(encoding="utf-8")
-                    self.documents.append({"path": md_file, "content": content})
-                    loaded += 1
+                loaded += 1
 
             if loaded == 0:
                 print(f"   ⚠️  No content found in {corpus_dir}")
             else:
                 print(f"   ✅ {corpus_dir.name}: {loaded} documents")
 
-        self.num_docs = len(self.documents)
+        self.num_docs = len(self.paths) if self.streaming else len(self.documents)
         print(f"   Total: {self.num_docs} documents")
 
     # Comprehensive stop words + web/markdown noise
@@ -350,10 +377,11 @@ class TFIDFTagger:
 
         for doc_id in range(self.num_docs):
             tf = self.term_freq[doc_id]
+            total = sum(tf.values())
 
             for term, count in tf.items():
                 # TF: normalized frequency
-                tf_normalized = count / sum(tf.values())
+                tf_normalized = count / total
 
                 # IDF: inverse document frequency
                 idf = math.log(self.num_docs / (1 + self.doc_freq[term]))
@@ -364,6 +392,57 @@ class TFIDFTagger:
         print(f"   Computed scores for {len(self.doc_freq)} unique terms")
         return tfidf_scores
 
+    def compute_tfidf_parallel(self):
+        """Map-reduce TF-IDF totals over self.paths.
+
+        Each worker tokenizes a shard of files and returns its document
+        frequencies and per-term sums of normalized TF; the reducer merges
+        the shard tables. Since IDF is per term, a term's corpus-wide score
+        is idf * sum(tf_normalized), so no per-document tables are kept.
+
+        Returns {term: aggregated TF-IDF} (band-pass filtering not applied).
+        """
+        print(f"🔢 Computing TF-IDF scores ({self.workers} workers)...")
+
+        tf_sums = Counter()
+        for shard_df, shard_tf in _map_shards(_tokenize_shard, self.paths, self.workers):
+            self.doc_freq.update(shard_df)
+            tf_sums.update(shard_tf)
+
+        scores = {
+            term: tf_sum * math.log(self.num_docs / (1 + self.doc_freq[term]))
+            for term, tf_sum in tf_sums.items()
+        }
+        print(f"   Computed scores for {len(self.doc_freq)} unique terms")
+        return scores
+
+    def compute_tfidf_sparse(self):
+        """Bring the persisted TF-IDF matrix up to date with self.paths.
+
+        Only new or changed files are tokenized (by the worker pool when
+        workers > 1); the matrix is saved for the next run.
+        """
+        print("🔢 Updating sparse TF-IDF matrix...")
+
+        matrix = TFIDFMatrix()
+        changed = matrix.update(self.paths, self._count_terms)
+        matrix.save()
+        self.doc_freq = Counter(matrix.doc_freq_counter())
+
+        print(
+            f"   Tokenized {changed}/{matrix.num_docs} changed documents, "
+            f"{len(self.doc_freq)} unique terms"
+        )
+        return matrix
+
+    def _count_terms(self, paths):
+        """One term Counter per path, in order."""
+        return [
+            tf
+            for shard in _map_shards(_count_terms_shard, paths, self.workers)
+            for tf in shard
+        ]
+
     def extract_top_concepts(
         self, min_tfidf=0.01, min_doc_freq=10, max_doc_ratio=0.4, max_concepts=200
     ):
@@ -377,18 +456,27 @@ class TFIDFTagger:
         """
         print("🎯 Extracting top concepts...")
 
-        tfidf_scores = self.compute_tfidf()
         max_doc_count = int(self.num_docs * max_doc_ratio)
 
         # Aggregate TF-IDF scores across all documents
         concept_scores = Counter()
 
-        for doc_id, scores in tfidf_scores.items():
-            for term, score in scores.items():
-                df = self.doc_freq[term]
+        if self.backend == "sparse":
+            matrix = self.compute_tfidf_sparse()
+            concept_scores.update(matrix.concept_scores(min_doc_freq, max_doc_count))
+        elif self.workers > 1:
+            for term, score in self.compute_tfidf_parallel().items():
                 # Band-pass filter: not too rare, not too common
-                if min_doc_freq <= df <= max_doc_count:
-                    concept_scores[term] += score
+                if min_doc_freq <= self.doc_freq[term] <= max_doc_count:
+                    concept_scores[term] = score
+        else:
+            tfidf_scores = self.compute_tfidf()
+            for doc_id, scores in tfidf_scores.items():
+                for term, score in scores.items():
+                    df = self.doc_freq[term]
+                    # Band-pass filter: not too rare, not too common
+                    if min_doc_freq <= df <= max_doc_count:
+                        concept_scores[term] += score
 
         # Get top concepts
         top_concepts = [
@@ -407,27 +495,8 @@ class TFIDFTagger:
     def tag_document(self, content, concepts):
         """Add [[wiki-links]] to content for discovered concepts.
         Only tags first occurrence per concept to avoid over-linking."""
-        # Sort concepts by length (longest first) to avoid partial matches
-        concepts = sorted(concepts, key=len, reverse=True)
-
-        for concept in concepts:
-            pattern = re.compile(r"\b(" + re.escape(concept) + r")\b", re.IGNORECASE)
-
-            # Tag only first occurrence (count=1) to keep articles readable
-            def make_replacer(full_content):
-                def replace_if_not_tagged(match):
-                    start = max(0, match.start() - 3)
-                    end = min(len(full_content), match.end() + 3)
-                    context = full_content[start:end]
-                    if "[[" in context or "]]" in context:
-                        return match.group(0)
-                    return f"[[{match.group(0)}]]"
-
-                return replace_if_not_tagged
-
-            content = pattern.sub(make_replacer(content), content, count=1)
-
-        return content
+        # Compiled once per concept list; one pass over the content for all concepts
+        return get_tagger(tuple(concepts)).tag(content, first_only=True)
 
     def tag_corpus(self, concepts, dry_run=False):
         """Tag all documents with discovered concepts"""
@@ -435,6 +504,13 @@ class TFIDFTagger:
 
         tagged_count = 0
 
+        if self.streaming:
+            # Each worker reads, tags and writes its own shard of files
+            tag = partial(_tag_shard, concepts=tuple(concepts), dry_run=dry_run)
+            tagged_count = sum(_map_shards(tag, self.paths, self.workers))
+            print(f"   Tagged {tagged_count}/{self.num_docs} documents")
+            return tagged_count
+
         for doc in self.documents:
             tagged_content = self.tag_document(doc["content"], concepts)
 
@@ -454,6 +530,11 @@ class TFIDFTagger:
         # Count occurrences of each concept
         concept_counts = Counter()
 
+        if self.streaming:
+            count = partial(_count_shard, concepts=tuple(concepts))
+            for shard_counts in _map_shards(count, self.paths, self.workers):
+                concept_counts.update(shard_counts)
+
         for doc in self.documents:
             content = doc["content"].lower()
             for concept in concepts:
@@ -479,6 +560,60 @@ class TFIDFTagger:
         print(f"   Saved to {output_path}")
 
 
+# ── Map-reduce workers (module level so they pickle into worker processes) ──
+
+
+def _map_shards(fn, paths, workers):
+    """Run fn over SHARD_SIZE slices of paths in a process pool, in order."""
+    shards = (paths[i : i + SHARD_SIZE] for i in range(0, len(paths), SHARD_SIZE))
+    if workers <= 1:
+        yield from map(fn, shards)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(fn, shards)
+
+
+def _count_terms_shard(paths):
+    """Term Counter for each file in one shard."""
+    tokenizer = TFIDFTagger([])
+    return [Counter(tokenizer.tokenize(Path(p).read_text(encoding="utf-8"))) for p in paths]
+
+
+def _tokenize_shard(paths):
+    """Map: (doc_freq, summed normalized TF) for one shard of files."""
+    doc_freq = Counter()
+    tf_sums = Counter()
+    for tf in _count_terms_shard(paths):
+        total = sum(tf.values())
+        doc_freq.update(tf.keys())
+        for term, count in tf.items():
+            tf_sums[term] += count / total
+    return doc_freq, tf_sums
+
+
+def _tag_shard(paths, concepts, dry_run):
+    """Tag (and unless dry_run, rewrite) one shard; returns files changed."""
+    tagger = get_tagger(concepts)
+    tagged = 0
+    for path in paths:
+        content = Path(path).read_text(encoding="utf-8")
+        tagged_content = tagger.tag(content, first_only=True)
+        if tagged_content != content:
+            tagged += 1
+            if not dry_run:
+                Path(path).write_text(tagged_content, encoding="utf-8")
+    return tagged
+
+
+def _count_shard(paths, concepts):
+    """Articles per concept in one shard (for the concept index)."""
+    counts = Counter()
+    for path in paths:
+        content = Path(path).read_text(encoding="utf-8").lower()
+        counts.update(c for c in concepts if c in content)
+    return counts
+
+
 def main():
     """Run TF-IDF tagging on all advisor knowledge bases"""
     # Corpus directories
@@ -497,8 +632,21 @@ def main():
 
     print("🚀 TF-IDF Auto-Tagging System\n")
 
+    # Worker processes (--workers 1 keeps the serial in-memory pipeline)
+    workers = os.cpu_count() or 1
+    if "--workers" in sys.argv:
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
+
+    # Sparse backend: persisted matrix, only changed files re-tokenized
+    backend = "dict"
+    if "--sparse" in sys.argv:
+        if HAS_SPARSE:
+            backend = "sparse"
+        else:
+            print("⚠️  numpy/scipy not installed, using the dict backend\n")
+
     # Initialize tagger
-    tagger = TFIDFTagger(corpora)
+    tagger = TFIDFTagger(corpora, workers=workers, backend=backend)
 
     # Load corpus
     tagger.load_corpus()
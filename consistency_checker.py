@@ -37,6 +37,8 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from kb_counter import get_counter
+
 # ──────────────────────────────────────────────
 # Configuration
 # ──────────────────────────────────────────────
@@ -343,11 +345,9 @@ def count_articles(base_path, subdir, content_type):
     if not target.exists():
         return 0
     if content_type == "episodes":
-        return len(
-            [d for d in target.iterdir() if d.is_dir() and not d.name.startswith(".")]
-        )
+        return get_counter().count_dirs(target)
     else:
-        return len(list(target.glob("*.md")))
+        return get_counter().count(target, max_depth=1)
 
 
 def get_actual_counts():
@@ -355,6 +355,7 @@ def get_actual_counts():
     actual = {}
     for key, info in KNOWLEDGE_BASES.items():
         actual[key] = count_articles(info["path"], info["count_dir"], info["type"])
+    get_counter().save()
     actual["total"] = sum(actual.values())
     actual["indie_total"] = (
         actual.get("pieter", 0) + actual.get("justin", 0) + actual.get("daniel", 0)
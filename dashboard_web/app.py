@@ -6,21 +6,30 @@ Reads ALL KB sources dynamically from data-sources.json.
 
 Usage: python3 app.py
 Opens: http://localhost:5050
+
+The page subscribes to /api/stream (Server-Sent Events): one background
+refresher stats each panel's input files once a second, recomputes only
+panels whose inputs changed (or whose max age passed) and pushes the
+top-level keys that differ. Every tab shares that one refresher; with no
+tab open it sleeps. /api/data stays for polling clients.
 """
 
 import json
 import os
+import queue
 import sys
 import time
 import webbrowser
+from datetime import datetime
 from pathlib import Path
-from threading import Timer, Thread
+from threading import Condition, Lock, Timer, Thread
 
-from flask import Flask, jsonify, render_template
+from flask import Flask, Response, jsonify, render_template
 
 # Add parent dir so we can import data_loader
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data_loader import (
+    PanelWatcher,
     get_all_dashboard_data,
     get_knowledge_base_stats,
     get_delegation_stats,
@@ -56,6 +65,107 @@ def _cached_response(key, loader, ttl=None):
     return result
 
 
+# === PUSH UPDATES ===
+
+STREAM_POLL_SECONDS = 1.0  # How often input files are stat'ed
+STREAM_HEARTBEAT_SECONDS = 15  # SSE comment so dead connections surface
+STREAM_QUEUE_SIZE = 64  # Events a slow tab may lag before it is dropped
+
+
+class DashboardBroadcaster:
+    """One refresher thread feeding every /api/stream subscriber.
+
+    Events are (name, payload) tuples: "snapshot" with every key on
+    subscribe, then "delta" with only the keys that changed.
+    """
+
+    def __init__(self, watcher=None, interval=STREAM_POLL_SECONDS):
+        self.watcher = watcher or PanelWatcher()
+        self.interval = interval
+        self.version = 0
+        self._subscribers = set()
+        self._lock = Lock()
+        self._wake = Condition(self._lock)
+        self._thread = None
+
+    def subscribe(self):
+        """Register a subscriber → its queue, primed with a snapshot."""
+        q = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+            if self.watcher.snapshot:
+                q.put(("snapshot", self._payload(dict(self.watcher.snapshot))))
+            self._subscribers.add(q)
+            self._wake.notify()
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def _payload(self, values):
+        return {
+            "version": self.version,
+            "timestamp": datetime.now().isoformat(),
+            "data": values,
+        }
+
+    def poll(self):
+        """Recompute stale panels and fan the changed keys out."""
+        first = not self.watcher.snapshot
+        changes = self.watcher.poll()
+        if not changes:
+            return
+        with self._lock:
+            self.version += 1
+            event = ("snapshot", self._payload(dict(self.watcher.snapshot))) if first \
+                else ("delta", self._payload(changes))
+            dropped = []
+            for q in list(self._subscribers):
+                try:
+                    q.put_nowait(event)
+                except queue.Full:
+                    # Too far behind: drop it; EventSource reconnects and
+                    # starts over from a snapshot
+                    self._subscribers.discard(q)
+                    dropped.append(q)
+        for q in dropped:
+            self._close(q)
+
+    @staticmethod
+    def _close(q):
+        """Replace a stalled queue's backlog with a close marker, never blocking."""
+        while True:
+            try:
+                q.put_nowait(("close", None))
+                return
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._subscribers:
+                    self._wake.wait()  # Nobody watching: no work at all
+            try:
+                self.poll()
+            except Exception:
+                pass
+            time.sleep(self.interval)
+
+
+broadcaster = DashboardBroadcaster()
+
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
 # === ROUTES ===
 
 @app.route("/")
@@ -71,6 +181,32 @@ def api_data():
     return jsonify(data)
 
 
+@app.route("/api/stream")
+def api_stream():
+    """Server-Sent Events: a snapshot, then deltas of changed top-level keys."""
+    q = broadcaster.subscribe()
+
+    def events():
+        try:
+            while True:
+                try:
+                    event, payload = q.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if event == "close":
+                    return
+                yield _sse(event, payload)
+        finally:
+            broadcaster.unsubscribe(q)
+
+    return Response(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.route("/api/kb")
 def api_kb():
     """Return KB stats only (cached 60s)."""
@@ -197,7 +333,7 @@ if __name__ == "__main__":
         Timer(1.5, open_browser).start()
 
         print(f"Dashboard starting at http://localhost:{PORT}")
-        app.run(host="127.0.0.1", port=PORT, debug=False)
+        app.run(host="127.0.0.1", port=PORT, debug=False, threaded=True)
     except KeyboardInterrupt:
         print("\nDashboard stopped.")
     finally:
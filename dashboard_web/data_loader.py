@@ -14,10 +14,38 @@ import re
 import subprocess
 import sys
 import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# Shared session JSONL store lives with the other tools, one level up
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+try:
+    from session_usage import SessionUsageStore
+
+    HAS_SESSION_USAGE = True
+except ImportError:
+    HAS_SESSION_USAGE = False
+try:
+    from kb_counter import get_counter, kb_counts
+
+    HAS_KB_COUNTER = True
+except ImportError:
+    HAS_KB_COUNTER = False
+try:
+    from log_aggregates import (
+        AuditLogAggregator,
+        EvalLogAggregator,
+        tokens_saved_since,
+        value_counts,
+    )
+
+    HAS_LOG_AGGREGATES = True
+except ImportError:
+    HAS_LOG_AGGREGATES = False
+
 # === CONFIGURATION ===
 
 HOME = Path.home()
@@ -38,34 +66,122 @@ SUBSCRIPTION_COST = 200.00
 FIVE_HOUR_TOKEN_BUDGET = 500_000
 
 # === CACHING ===
+#
+# Each data source is a loader registered with @cache_source: the files it
+# reads (fingerprinted by mtime/size), a max age for what isn't a file (ps
+# output, time-relative fields), a timeout and a value to show until the
+# first load lands. A value stays fresh until an input's fingerprint
+# changes or max age passes. A stale value is served while one refresh
+# runs on the shared pool (stale-while-revalidate); only a cold cache
+# waits, and never longer than the source's timeout, so one slow scan
+# can't stall the rest of the dashboard.
+
+CACHE_WORKERS = 8
+CACHE_TIMEOUT_SECONDS = 5
+
+CACHE_SOURCES = {}  # key → (loader, inputs, max_age, timeout, default)
+_cache = {}  # key → (value, fingerprint, computed_at)
+_generation = {}  # key → number of values that have landed
+_inflight = {}  # key → Future of the running refresh
+_cache_lock = threading.Lock()
+_cache_pool = ThreadPoolExecutor(max_workers=CACHE_WORKERS, thread_name_prefix="dashboard-cache")
+
+
+def input_fingerprint(paths):
+    """(path, mtime_ns, size) per input; a missing file is (path, None, None)."""
+    prints = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            prints.append((str(path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            prints.append((str(path), None, None))
+    return tuple(prints)
+
+
+def cache_source(key, inputs=(), max_age=None, timeout=CACHE_TIMEOUT_SECONDS, default=None):
+    """Register the decorated loader as cache source `key` (see cached())."""
+    def register(loader):
+        CACHE_SOURCES[key] = (loader, tuple(inputs), max_age, timeout, default)
+        return loader
+    return register
+
+
+def _is_fresh(key, now):
+    entry = _cache.get(key)
+    if entry is None:
+        return False
+    _, inputs, max_age, _, _ = CACHE_SOURCES[key]
+    _, fingerprint, computed_at = entry
+    if max_age is not None and now - computed_at >= max_age:
+        return False
+    return fingerprint == input_fingerprint(inputs)
 
-_cache = {}
-_cache_ttl = {}
-CACHE_TTL_SECONDS = {
-    "kb_stats": 60,
-    "services": 30,
-    "system_memory": 15,
-    "scraping_jobs": 10,
-    "tracker_data": 10,
-    "active_tasks": 15,
-    "error_summary": 30,
-    "delegation_stats": 10,
-    "all_data": 0.5,  # 500ms for the combined API endpoint
-    "kb_data": 60,  # 60s for KB-only endpoint
-}
 
+def _refresh(key):
+    """Start (or join) the single in-flight recompute of key → Future."""
+    with _cache_lock:
+        future = _inflight.get(key)
+        if future is not None:
+            return future
+        future = _cache_pool.submit(_recompute, key)
+        _inflight[key] = future
+        return future
 
-def cached(key, loader, ttl=None):
-    """Return cached value if fresh, otherwise call loader and cache result."""
-    if ttl is None:
-        ttl = CACHE_TTL_SECONDS.get(key, 10)
+
+def _recompute(key):
+    loader, inputs, _, _, _ = CACHE_SOURCES[key]
+    # Fingerprint before reading, so a write during the load marks it stale
+    fingerprint = input_fingerprint(inputs)
+    started = time.time()
+    try:
+        value = loader()
+    except Exception as e:
+        log_error(key, "cached value", "exception", str(e)[:200])
+        with _cache_lock:
+            if key in _cache:
+                # Keep serving the last good value; retry on the next change
+                # or max age instead of on every call
+                _cache[key] = (_cache[key][0], fingerprint, started)
+            _inflight.pop(key, None)
+        raise
+    with _cache_lock:
+        _cache[key] = (value, fingerprint, started)
+        _generation[key] = _generation.get(key, 0) + 1
+        _inflight.pop(key, None)
+    return value
+
+
+def cached(key):
+    """Value of cache source key: fresh, last-good while refreshing, or
+    (cold) the loaded value — or the source's default after its timeout."""
+    if _is_fresh(key, time.time()):
+        return _cache[key][0]
+    future = _refresh(key)
+    entry = _cache.get(key)
+    if entry is not None:
+        return entry[0]  # Stale-while-revalidate
+    _, _, _, timeout, default = CACHE_SOURCES[key]
+    try:
+        return future.result(timeout=timeout)
+    except FuturesTimeout:
+        log_error(key, "value", "timeout", f"first load still running after {timeout}s")
+    except Exception:
+        pass  # Logged by _recompute
+    return default
+
+
+def refresh_stale(keys=None):
+    """Start refreshing every stale source in keys (default: all) at once."""
     now = time.time()
-    if key in _cache and (now - _cache_ttl.get(key, 0)) < ttl:
-        return _cache[key]
-    result = loader()
-    _cache[key] = result
-    _cache_ttl[key] = now
-    return result
+    for key in CACHE_SOURCES if keys is None else keys:
+        if not _is_fresh(key, now):
+            _refresh(key)
+
+
+def cache_generation(keys):
+    """Per-key count of landed values: changes whenever any of keys reloads."""
+    return tuple(_generation.get(key, 0) for key in keys)
 
 
 # === SAFE GLOB WITH TIMEOUT ===
@@ -81,8 +197,6 @@ def safe_glob(path, pattern, timeout_sec=5):
     Uses a worker thread instead of signal.alarm so it works inside
     Flask's threaded request handler.
     """
-    from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
-
     def _do_glob():
         return list(path.glob(pattern))
 
@@ -138,6 +252,8 @@ def log_error(panel, expected, actual, reason):
             pass
 
 
+@cache_source("error_summary", inputs=(ERROR_LOG,), max_age=300,
+              default={"count": 0, "recent": []})
 def _get_error_summary():
     """Get summary of recent errors for confidence display."""
     if not ERROR_LOG.exists():
@@ -152,7 +268,7 @@ def _get_error_summary():
 
 
 def get_error_summary():
-    return cached("error_summary", _get_error_summary, ttl=30)
+    return cached("error_summary")
 
 
 # === KB SOURCE LOADING — FILESYSTEM SCAN (GROUND TRUTH) ===
@@ -262,7 +378,9 @@ SKIP_DIRS = {
 
 
 def _fast_count_md(path):
-    """Count .md files using subprocess (handles 30K+ files without timeout)."""
+    """Count .md files under path (incremental snapshot, else `find`)."""
+    if HAS_KB_COUNTER:
+        return get_counter().count(path)
     try:
         result = subprocess.run(
             ["find", str(path), "-name", "*.md", "-type", "f"],
@@ -285,6 +403,17 @@ def _scan_kb_directories():
     not what data-sources.json claims. data-sources.json is scraper
     config; the dashboard shows reality.
     """
+    if HAS_KB_COUNTER:
+        # Same census flywheel_tracker and registry_sync report
+        return {
+            source["name"]: {
+                "path": Path(source["path"]),
+                "skill": DIR_TO_SKILL.get(source["parent"] or source["dir"]) or "unclassified",
+                "count": source["count"],
+            }
+            for source in kb_counts()["sources"]
+        }
+
     dev_dir = HOME / "Development"
     if not dev_dir.exists():
         return {}
@@ -328,6 +457,7 @@ def _scan_kb_directories():
     return sources
 
 
+@cache_source("kb_stats", max_age=60, timeout=20, default=({}, 0, {}))
 def _load_knowledge_base_stats():
     """Count articles across ALL knowledge bases by scanning the filesystem.
 
@@ -368,12 +498,13 @@ def _load_knowledge_base_stats():
 
 
 def get_knowledge_base_stats():
-    return cached("kb_stats", _load_knowledge_base_stats, ttl=60)
+    return cached("kb_stats")
 
 
 # === BUDGET / USAGE ===
 
 
+@cache_source("tracker_data", inputs=(BUDGET_STATE,))
 def _load_tracker_data():
     """Load budget state from .budget-state.json."""
     if not BUDGET_STATE.exists():
@@ -385,7 +516,7 @@ def _load_tracker_data():
 
 
 def load_tracker_data():
-    return cached("tracker_data", _load_tracker_data, ttl=10)
+    return cached("tracker_data")
 
 
 def get_usage_stats(data):
@@ -518,6 +649,7 @@ def get_environmental_impact(data):
 # === TASKS ===
 
 
+@cache_source("active_tasks", inputs=(ACTIVE_TASKS,), default=[])
 def _parse_active_tasks():
     """Parse top tasks from ACTIVE-TASKS.md."""
     tasks = []
@@ -594,7 +726,7 @@ def _parse_active_tasks():
 
 
 def parse_active_tasks():
-    return cached("active_tasks", _parse_active_tasks, ttl=15)
+    return cached("active_tasks")
 
 
 def get_next_action(tasks):
@@ -625,6 +757,7 @@ def get_next_action(tasks):
 # === BACKGROUND SERVICES & JOBS ===
 
 
+@cache_source("services", max_age=30, default=[])
 def _load_background_services():
     """Check PopChaos launchd services."""
     try:
@@ -662,9 +795,11 @@ def _load_background_services():
 
 
 def check_background_services():
-    return cached("services", _load_background_services, ttl=30)
+    return cached("services")
 
 
+@cache_source("scraping_jobs", inputs=(SCRAPING_QUEUE,), max_age=10,
+              default={"active": [], "completed": [], "failed": []})
 def _load_active_scraping_jobs():
     """Check for running scraping processes."""
     jobs = {"active": [], "completed": [], "failed": []}
@@ -711,12 +846,13 @@ def _load_active_scraping_jobs():
 
 
 def check_active_scraping_jobs():
-    return cached("scraping_jobs", _load_active_scraping_jobs, ttl=10)
+    return cached("scraping_jobs")
 
 
 # === SYSTEM ===
 
 
+@cache_source("system_memory", max_age=15, default={})
 def _load_system_memory():
     """Get system disk stats."""
     stats = {}
@@ -753,7 +889,7 @@ def _load_system_memory():
 
 
 def get_system_memory():
-    return cached("system_memory", _load_system_memory, ttl=15)
+    return cached("system_memory")
 
 
 # === VALIDATION ===
@@ -779,12 +915,31 @@ def validate_data(usage, kb_stats):
 # === CURRENT SESSION ===
 
 
+@cache_source("current_session", max_age=5)
 def _find_current_session():
     """Find the most recently active JSONL session file.
 
     Returns stats for the session actively being written to (mtime within
     last 5 minutes). This represents 'this session' for the dashboard.
+    Served from the shared session store (only appended bytes are parsed);
+    falls back to scanning the file when session_usage isn't importable.
     """
+    if HAS_SESSION_USAGE:
+        store = SessionUsageStore()
+        try:
+            store.refresh()
+            current = store.current_session(max_age_s=300)
+        finally:
+            store.close()
+        if not current:
+            return None
+        return {
+            "session_id": current["session_id"][:8],
+            "tokens": current["tokens"],
+            "messages": current["messages"],
+            "file": current["path"],
+        }
+
     projects_dir = HOME / ".claude" / "projects"
     if not projects_dir.exists():
         return None
@@ -840,7 +995,7 @@ def _find_current_session():
 
 
 def get_current_session_stats():
-    return cached("current_session", _find_current_session, ttl=5)
+    return cached("current_session")
 
 
 # === REFRESH ===
@@ -863,7 +1018,53 @@ def refresh_budget_data():
 
 # === DELEGATION STATS ===
 
+# Tail-following aggregates: a refresh parses only lines appended since the last one
+_delegation_audit = AuditLogAggregator(DELEGATION_AUDIT_LOG) if HAS_LOG_AGGREGATES else None
+_delegation_eval = EvalLogAggregator(DELEGATION_EVAL_LOG) if HAS_LOG_AGGREGATES else None
 
+
+def _apply_delegation_log_aggregates(data, session_start):
+    """Fill hook and route stats from the running log aggregates."""
+    try:
+        audit = _delegation_audit.refresh()
+        latency = audit["latency"]
+        data["hook_fires"] = audit["lines"]
+        data["prefetched"] = audit["prefetched"]
+        data["avg_latency_ms"] = latency["sum"] // max(latency["count"], 1)
+        data["latency_hist"] = latency["hist"]
+        data["by_action"] = value_counts(audit, "action", missing="unknown")
+        data["by_model"] = value_counts(audit, "model")
+        data["by_exec"] = value_counts(audit, "exec")
+    except (OSError, ValueError):
+        pass
+
+    try:
+        routes = _delegation_eval.refresh()
+        data["route_calls"] = routes["calls"]
+        data["route_success"] = routes["success"]
+        data["route_success_pct"] = round(routes["success"] * 100 / max(routes["calls"], 1))
+        data["est_tokens_saved"] = routes["tokens_saved"]
+        data["by_category"] = routes["by_category"]
+        if session_start:
+            saved, calls = tokens_saved_since(routes, session_start)
+            data["session_tokens_saved"] = saved
+            data["session_route_calls"] = calls
+        sorted_dates = sorted(routes["by_date"].items(), reverse=True)[:7]
+        data["by_date"] = [{"date": d, **stats} for d, stats in sorted_dates]
+        today = routes["by_date"].get(datetime.now().strftime("%Y-%m-%d"), {})
+        data["today_tokens_saved"] = today.get("tokens_saved", 0)
+        data["today_route_calls"] = today.get("calls", 0)
+    except (OSError, ValueError):
+        pass
+
+
+@cache_source(
+    "delegation_stats",
+    inputs=(DELEGATION_AUDIT_LOG, DELEGATION_EVAL_LOG, DELEGATION_COUNTER,
+            DELEGATION_COMPLIANCE, DELEGATION_DISABLED, DELEGATION_ACCEPTANCE, BUDGET_STATE),
+    max_age=60,  # Today/session splits move with the clock
+    default={},
+)
 def _load_delegation_stats():
     """Load Gemini template routing and delegation hook stats."""
     data = {
@@ -898,8 +1099,33 @@ def _load_delegation_stats():
         "by_date": [],
     }
 
-    # Hook audit log
-    if DELEGATION_AUDIT_LOG.exists():
+    # Session boundary: find when the current burst started
+    # Use budget state's since_last_gap.gap_started if available
+    # Normalize to naive local time for comparison with eval log timestamps
+    session_start = None
+    if BUDGET_STATE.exists():
+        try:
+            bs = json.loads(BUDGET_STATE.read_text())
+            gap_started = bs.get("since_last_gap", {}).get("gap_started")
+            if gap_started:
+                # Convert TZ-aware UTC to naive local time
+                from datetime import timezone
+
+                try:
+                    dt = datetime.fromisoformat(gap_started)
+                    if dt.tzinfo is not None:
+                        dt = dt.astimezone().replace(tzinfo=None)
+                    session_start = dt.strftime("%Y-%m-%dT%H:%M:%S")
+                except (ValueError, TypeError):
+                    session_start = gap_started[:19]
+        except (json.JSONDecodeError, OSError):
+            pass
+
+    if HAS_LOG_AGGREGATES:
+        _apply_delegation_log_aggregates(data, session_start)
+
+    # Hook audit log (full re-read without log_aggregates)
+    if not HAS_LOG_AGGREGATES and DELEGATION_AUDIT_LOG.exists():
         try:
             lines = [
                 l.strip()
@@ -947,7 +1173,7 @@ def _load_delegation_stats():
             pass
 
     # Gemini route eval log — with session/daily/all-time breakdowns
-    if DELEGATION_EVAL_LOG.exists():
+    if not HAS_LOG_AGGREGATES and DELEGATION_EVAL_LOG.exists():
         try:
             route_lines = [
                 l.strip()
@@ -960,28 +1186,6 @@ def _load_delegation_stats():
             by_date = {}  # date_str -> {calls, success, tokens_saved}
             today_str = datetime.now().strftime("%Y-%m-%d")
 
-            # Session boundary: find when the current burst started
-            # Use budget state's since_last_gap.gap_started if available
-            # Normalize to naive local time for comparison with eval log timestamps
-            session_start = None
-            if BUDGET_STATE.exists():
-                try:
-                    bs = json.loads(BUDGET_STATE.read_text())
-                    gap_started = bs.get("since_last_gap", {}).get("gap_started")
-                    if gap_started:
-                        # Convert TZ-aware UTC to naive local time
-                        from datetime import timezone
-
-                        try:
-                            dt = datetime.fromisoformat(gap_started)
-                            if dt.tzinfo is not None:
-                                dt = dt.astimezone().replace(tzinfo=None)
-                            session_start = dt.strftime("%Y-%m-%dT%H:%M:%S")
-                        except (ValueError, TypeError):
-                            session_start = gap_started[:19]
-                except (json.JSONDecodeError, OSError):
-                    pass
-
             session_saved = 0
             session_calls = 0
 
@@ -1112,7 +1316,7 @@ def _load_delegation_stats():
 
 
 def get_delegation_stats():
-    return cached("delegation_stats", _load_delegation_stats, ttl=10)
+    return cached("delegation_stats")
 
 
 # === AGGREGATE (for /api/data) ===
@@ -1153,50 +1357,122 @@ def _smart_model_recommendation(usage):
     return "opus", "ok"
 
 
-def get_all_dashboard_data():
-    """Load all dashboard data into a single JSON-serializable dict."""
+# === PANELS ===
+
+
+def _budget_panel():
     data = load_tracker_data()
     usage = get_usage_stats(data)
-    env_impact = get_environmental_impact(data)
-    kb_stats, kb_total, kb_by_skill = get_knowledge_base_stats()
-    tasks = parse_active_tasks()
-    next_action = get_next_action(tasks)
-    services = check_background_services()
-    jobs = check_active_scraping_jobs()
-    memory = get_system_memory()
-    error_summary = get_error_summary()
-    warnings = validate_data(usage, kb_stats)
-    budget_age = get_budget_age_minutes()
-    session = get_current_session_stats()
-    delegation = get_delegation_stats()
-
     # Override model recommendation with smart logic
     smart_rec, smart_alert = _smart_model_recommendation(usage)
     usage["model_recommendation"] = smart_rec
     usage["alert_level"] = smart_alert
-
+    budget_age = get_budget_age_minutes()
     return {
-        "timestamp": datetime.now().isoformat(),
-        "next_action": next_action,
         "usage": usage,
-        "environmental": env_impact,
-        "kb": {
-            "stats": kb_stats,
-            "total": kb_total,
-            "by_skill": kb_by_skill,
-            "source_count": len(kb_stats),
-        },
-        "tasks": tasks,
-        "services": services,
-        "jobs": jobs,
-        "system": memory,
-        "errors": error_summary,
-        "warnings": warnings,
+        "environmental": get_environmental_impact(data),
         "budget_age_minutes": round(budget_age, 1) if budget_age else None,
         "budget_state": {
             "generated": data.get("generated", "") if data else "",
             "alert_level": smart_alert,
         },
-        "current_session": session,
-        "delegation": delegation,
     }
+
+
+def _kb_panel():
+    kb_stats, kb_total, kb_by_skill = get_knowledge_base_stats()
+    return {
+        "kb": {
+            "stats": kb_stats,
+            "total": kb_total,
+            "by_skill": kb_by_skill,
+            "source_count": len(kb_stats),
+        }
+    }
+
+
+def _tasks_panel():
+    tasks = parse_active_tasks()
+    return {"tasks": tasks, "next_action": get_next_action(tasks)}
+
+
+def _warnings_panel():
+    usage = get_usage_stats(load_tracker_data())
+    kb_stats, _, _ = get_knowledge_base_stats()
+    return {"warnings": validate_data(usage, kb_stats)}
+
+
+# name → (loader, cache sources it reads, max age in seconds). A panel is
+# recomputed when one of its sources reloads, or after max age for fields
+# computed on the spot (budget age). get_all_dashboard_data() is every
+# panel's output merged.
+PANELS = {
+    "budget": (_budget_panel, ("tracker_data",), 60),
+    "kb": (_kb_panel, ("kb_stats",), None),
+    "tasks": (_tasks_panel, ("active_tasks",), None),
+    "services": (lambda: {"services": check_background_services()}, ("services",), None),
+    "jobs": (lambda: {"jobs": check_active_scraping_jobs()}, ("scraping_jobs",), None),
+    "system": (lambda: {"system": get_system_memory()}, ("system_memory",), None),
+    "errors": (lambda: {"errors": get_error_summary()}, ("error_summary",), None),
+    "warnings": (_warnings_panel, ("tracker_data", "kb_stats"), 60),
+    "current_session": (lambda: {"current_session": get_current_session_stats()},
+                        ("current_session",), None),
+    "delegation": (lambda: {"delegation": get_delegation_stats()}, ("delegation_stats",), None),
+}
+
+
+class PanelWatcher:
+    """Tracks which panels' sources reloaded and what they now produce.
+
+    poll() starts refreshes of stale sources, recomputes only panels whose
+    sources have landed a new value (or whose max age passed), and returns
+    the top-level keys whose JSON actually differs from the last poll. A
+    refresh still running shows up on a later poll. Not thread-safe: one
+    refresher owns it.
+    """
+
+    def __init__(self, panels=None):
+        self.panels = panels if panels is not None else PANELS
+        self.snapshot = {}  # Top-level key → value, as last computed
+        self._encoded = {}  # Top-level key → JSON text, for comparison
+        self._state = {}  # Panel → (source generations, computed_at)
+
+    def poll(self, now=None):
+        """Recompute changed panels → {key: value} of keys that changed."""
+        now = time.time() if now is None else now
+        refresh_stale({key for _, keys, _ in self.panels.values() for key in keys})
+        changes = {}
+        for name, (loader, keys, max_age) in self.panels.items():
+            generation = cache_generation(keys)
+            prior = self._state.get(name)
+            if prior is not None:
+                old_generation, computed_at = prior
+                expired = max_age is not None and now - computed_at >= max_age
+                if old_generation == generation and not expired:
+                    continue
+            try:
+                values = loader()
+            except Exception as e:
+                log_error(name, "panel data", "exception", str(e)[:200])
+                continue
+            self._state[name] = (generation, now)
+            for key, value in values.items():
+                encoded = json.dumps(value, sort_keys=True, default=str)
+                if self._encoded.get(key) != encoded:
+                    self._encoded[key] = encoded
+                    self.snapshot[key] = value
+                    changes[key] = value
+        return changes
+
+
+def get_all_dashboard_data():
+    """Load all dashboard data into a single JSON-serializable dict.
+
+    Stale sources are refreshed together first, so a cold start waits for
+    the slowest one (bounded by its timeout), not for their sum.
+    """
+    refresh_stale()
+    data = {"timestamp": datetime.now().isoformat()}
+    for loader, _, _ in PANELS.values():
+        data.update(loader())
+    return data
@@ -6,7 +6,8 @@ Usage:
     python3 data_analyst_scraper.py --source flowingdata
     python3 data_analyst_scraper.py --source pudding
     python3 data_analyst_scraper.py --source all-priority-1
-    python3 data_analyst_scraper.py --source all
+    python3 data_analyst_scraper.py --source all            # 4 sources at once
+    python3 data_analyst_scraper.py --source all --jobs 1   # One source at a time
     python3 data_analyst_scraper.py --list
 
 Sources (by priority):
@@ -27,7 +28,6 @@ Sources (by priority):
 import logging
 import os
 import sys
-import time
 import json
 import re
 import hashlib
@@ -38,6 +38,11 @@ import requests
 from bs4 import BeautifulSoup
 from markdownify import markdownify as md
 
+from fetch_scheduler import FETCH_MAX_CONCURRENCY, FETCH_WORKERS, get_scheduler
+from concept_tagger import ConceptTagger
+from http_cache import CachingSession
+from sitemap_state import get_sitemap_state
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -134,6 +139,7 @@ DATAVIZ_CONCEPTS = [
     "dimensionality reduction",
 ]
 DATAVIZ_CONCEPTS.sort(key=len, reverse=True)
+_DATAVIZ_TAGGER = ConceptTagger(DATAVIZ_CONCEPTS)
 
 
 def slugify(text: str) -> str:
@@ -144,21 +150,8 @@ def slugify(text: str) -> str:
 
 
 def auto_tag(text: str) -> str:
-    for concept in DATAVIZ_CONCEPTS:
-        pattern = re.compile(r"\b(" + re.escape(concept) + r")\b", re.IGNORECASE)
-
-        def replace_if_not_tagged(match, _text=text):
-            start = match.start()
-            before = _text[max(0, start - 3) : start]
-            after = _text[start + len(match.group(0)) : start + len(match.group(0)) + 3]
-            if "[[" in before or "]]" in after:
-                return match.group(0)
-            if before.endswith("[") or "](" in after:
-                return match.group(0)
-            return f"[[{match.group(0)}]]"
-
-        text = pattern.sub(replace_if_not_tagged, text)
-    return text
+    """Wrap DATAVIZ_CONCEPTS mentions in [[wiki-links]] (one pass, skips linked ones)."""
+    return _DATAVIZ_TAGGER.tag(text)
 
 
 def save_article(output_dir: Path, idx: int, article: dict) -> Path | None:
@@ -218,21 +211,33 @@ def save_metadata(
 
 
 class BaseScraper:
+    fetch_workers = FETCH_WORKERS  # Articles fetched/parsed concurrently in run()
+    sitemap_url: str | None = None  # When set, crawl incrementally by <lastmod>
+    sitemap_filter: str | None = None  # Substring a sitemap URL must contain
+
     def __init__(self, source_name: str, base_url: str, rate_limit: float = 1.5):
         self.source_name = source_name
         self.base_url = base_url
-        self.rate_limit = rate_limit
+        self.rate_limit = rate_limit  # Seconds between requests to one host
+        self.scheduler = get_scheduler()
         self.output_dir = KB_BASE / source_name
         self.output_dir.mkdir(parents=True, exist_ok=True)
         (self.output_dir / "articles").mkdir(exist_ok=True)
-        self.session = requests.Session()
-        self.session.headers.update(
+        session = requests.Session()
+        session.headers.update(
             {
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             }
         )
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=FETCH_MAX_CONCURRENCY)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # Conditional GETs: listing pages unchanged since the last run come back
+        # as 304s and are served from the on-disk cache
+        self.session = CachingSession(session)
         self.articles = []
         self.errors = []
+        self.sitemap_state = get_sitemap_state()  # Scraped URLs + sitemap <lastmod>
         # Content-hash dedup: prevents saving articles with identical content
         # even when slugs differ (e.g., re-scrapes, chapters with same title)
         self._hash_index_path = self.output_dir / "metadata" / "content_hashes.json"
@@ -287,15 +292,14 @@ class BaseScraper:
     def fetch(self, url: str, retry: int = 3) -> requests.Response | None:
         for attempt in range(retry):
             try:
-                time.sleep(self.rate_limit)
-                resp = self.session.get(url, timeout=30)
+                resp = self.scheduler.get(self.session, url, self.rate_limit, timeout=30)
                 resp.raise_for_status()
                 return resp
             except requests.RequestException as e:
                 if attempt == retry - 1:
                     self.errors.append({"url": url, "error": str(e)})
                     return None
-                time.sleep(2**attempt)
+                self.scheduler.backoff(url, 2**attempt)
         return None
 
     def get_article_urls(self) -> list[str]:
@@ -304,6 +308,37 @@ class BaseScraper:
     def parse_article(self, url: str) -> dict | None:
         raise NotImplementedError
 
+    def fetch_sitemap_xml(self, url: str) -> str | None:
+        resp = self.fetch(url)
+        return resp.text if resp else None
+
+    def get_sitemap_lastmods(self) -> dict[str, str | None]:
+        """URL -> <lastmod> from sitemap_url, following sitemap indexes."""
+        lastmods = self.sitemap_state.walk(self.sitemap_url, self.fetch_sitemap_xml)
+        return {
+            url: lastmod
+            for url, lastmod in lastmods.items()
+            if not self.sitemap_filter or self.sitemap_filter in url
+        }
+
+    def _previously_scraped(self) -> dict[str, str | None]:
+        """URL -> filename for articles saved before the sitemap state existed."""
+        found = {}
+        meta_file = self.output_dir / "metadata" / "metadata.json"
+        if meta_file.exists():
+            try:
+                prev = json.loads(meta_file.read_text())
+                found = {a["url"]: None for a in prev.get("articles", []) if a.get("url")}
+            except Exception:
+                pass
+        for f in (self.output_dir / "articles").glob("*.md"):
+            match = re.search(
+                r"^\*\*URL:\*\* (\S+)", f.read_text(encoding="utf-8", errors="replace"), re.M
+            )
+            if match:
+                found[match.group(1)] = f.name
+        return found
+
     def run(self):
         print(f"[{self.source_name}] Starting scrape: {self.base_url}")
         print(f"[{self.source_name}] Output: {self.output_dir}")
@@ -316,20 +351,14 @@ class BaseScraper:
                 f"[{self.source_name}] Found {existing_count} existing articles — will skip duplicates"
             )
 
-        existing_urls = set()
-        meta_file = self.output_dir / "metadata" / "metadata.json"
-        if meta_file.exists():
-            try:
-                prev = json.loads(meta_file.read_text())
-                existing_urls = {
-                    a["url"] for a in prev.get("articles", []) if a.get("url")
-                }
-            except Exception:
-                pass
-
-        # Priority: urls.txt (pre-populated from sitemaps) > get_article_urls() (slow crawl)
+        # Priority: sitemap_url (with <lastmod>) > urls.txt (pre-populated from
+        # sitemaps) > get_article_urls() (slow crawl)
+        lastmods = self.get_sitemap_lastmods() if self.sitemap_url else {}
         urls_file = self.output_dir / "urls.txt"
-        if urls_file.exists():
+        if lastmods:
+            urls = list(lastmods)
+            print(f"[{self.source_name}] Loaded {len(urls)} URLs from {self.sitemap_url}")
+        elif urls_file.exists():
             urls = [
                 line.strip()
                 for line in urls_file.read_text().splitlines()
@@ -338,30 +367,44 @@ class BaseScraper:
             print(f"[{self.source_name}] Loaded {len(urls)} URLs from urls.txt")
         else:
             urls = self.get_article_urls()
+
+        # Scraped URLs live in the sitemap state; earlier runs' metadata.json
+        # and articles are adopted once. A URL is new, or changed when its
+        # sitemap <lastmod> moved since it was saved.
+        state = self.sitemap_state
+        if existing_count and not state.is_seeded(self.source_name):
+            state.seed(self.source_name, self._previously_scraped(), lastmods)
+        new_urls = state.pending(self.source_name, lastmods, urls)
         print(
-            f"[{self.source_name}] Found {len(urls)} URLs, {len(existing_urls)} already scraped"
+            f"[{self.source_name}] Found {len(urls)} URLs, "
+            f"{len(urls) - len(new_urls)} already scraped and unchanged"
         )
-
-        new_urls = [u for u in urls if u not in existing_urls]
-        print(f"[{self.source_name}] Scraping {len(new_urls)} new articles...")
+        print(f"[{self.source_name}] Scraping {len(new_urls)} new or changed articles...")
 
         idx = existing_count
         skipped_dupes = 0
-        for i, url in enumerate(new_urls, 1):
-            print(f"  [{i}/{len(new_urls)}] {url[:80]}...")
-            article = self.parse_article(url)
+        # Fetched/parsed concurrently (paced per host); deduped and saved in order
+        parsed = self.scheduler.map(self.parse_article, new_urls, self.fetch_workers)
+        for i, (url, article) in enumerate(parsed, 1):
+            print(f"  [{self.source_name}] [{i}/{len(new_urls)}] {url[:80]}...")
             if article:
                 # Content-hash dedup: skip if identical content already saved
                 content_hash = self._content_hash(article.get("content", ""))
                 if content_hash in self._content_hashes:
                     skipped_dupes += 1
+                    state.record(self.source_name, url, lastmods.get(url))
                     continue
-                idx += 1
+                # A changed page is rewritten under its old number
+                article_idx = state.previous_index(self.source_name, url)
+                if article_idx is None:
+                    idx += 1
+                    article_idx = idx
                 article["source"] = self.source_name
-                path = save_article(self.output_dir, idx, article)
+                path = save_article(self.output_dir, article_idx, article)
                 if path:
                     self._content_hashes[content_hash] = path.name
                     self.articles.append(article)
+                    state.saved(self.source_name, url, lastmods.get(url), path)
 
         self._save_hash_index()
         save_metadata(
@@ -854,6 +897,9 @@ class SimplyStatisticsScraper(BaseScraper):
 class StatisticalThinkingScraper(BaseScraper):
     """Frank Harrell's Statistical Thinking blog."""
 
+    sitemap_url = "https://www.fharrell.com/sitemap.xml"
+    sitemap_filter = "/post/"
+
     def __init__(self):
         super().__init__(
             "statistical-thinking", "https://www.fharrell.com", rate_limit=2.0
@@ -1439,7 +1485,6 @@ class KozyrkovScraper(BaseScraper):
             # Stop if: fewer items than batch (end of feed), no new URLs, or hit max pages
             if len(items) < batch_size or batch_new == 0 or offset >= 200:
                 break
-            time.sleep(self.rate_limit)
 
         save_metadata(
             self.output_dir, self.source_name, self.base_url, self.articles, self.errors
@@ -2184,6 +2229,12 @@ def main():
         help="Source to scrape (or all, all-priority-1, all-priority-2, all-priority-3)",
     )
     parser.add_argument("--list", action="store_true", help="List available sources")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Sources scraped at once (distinct hosts; each still paced per host)",
+    )
     parser.add_argument(
         "--build-hashes",
         action="store_true",
@@ -2249,13 +2300,19 @@ def main():
         print(f"Available: {', '.join(SCRAPERS.keys())}")
         return
 
-    total = 0
-    for source in sources_to_run:
+    def _run_source(source):
         print(f"\n{'=' * 60}")
-        scraper = SCRAPERS[source]()
-        count = scraper.run()
-        total += count
+        count = SCRAPERS[source]().run()
         print(f"{'=' * 60}\n")
+        return count
+
+    if args.jobs > 1 and len(sources_to_run) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+            total = sum(pool.map(_run_source, sources_to_run))
+    else:
+        total = sum(_run_source(source) for source in sources_to_run)
 
     print(f"\nTotal new articles: {total}")
 
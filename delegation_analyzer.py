@@ -20,6 +20,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path.home() / "Development" / "tools"))
 from llm_router import classify_task, contains_secrets
+from log_aggregates import audit_stats
 
 SESSION_DIR = Path.home() / ".claude" / "projects" / "-Users-nissimagent"
 AUDIT_LOG = Path.home() / ".claude" / ".locks" / "delegation-hook-audit.log"
@@ -131,21 +132,16 @@ def analyze_live_log() -> dict:
     if not AUDIT_LOG.exists():
         return {"error": "No audit log yet — hook hasn't fired"}
 
-    lines = AUDIT_LOG.read_text().strip().split("\n")
-    if not lines or not lines[0]:
+    audit = audit_stats()
+    if not audit["lines"]:
         return {"error": "Audit log is empty"}
 
-    models = Counter()
-    advised_count = 0
-    for line in lines:
-        for token in line.split():
-            if token.startswith("model="):
-                models[token.split("=")[1]] += 1
-            # v2 audit log uses tone=X (not injected=True)
-            if token.startswith("tone=") and token != "tone=none":
-                advised_count += 1
-
-    total = len(lines)
+    models = Counter(audit["counts"]["model"])
+    # v2 audit log uses tone=X (not injected=True)
+    tones = audit["counts"]["tone"]
+    advised_count = sum(n for tone, n in tones.items() if tone != "none")
+
+    total = audit["lines"]
     delegatable = total - models.get("claude", 0)
     return {
         "total_prompts": total,
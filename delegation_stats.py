@@ -8,6 +8,8 @@ import json
 from pathlib import Path
 from collections import Counter
 
+from log_aggregates import audit_stats, value_counts
+
 AUDIT_LOG = Path.home() / ".claude" / ".locks" / "delegation-hook-audit.log"
 EVAL_LOG = Path.home() / ".claude" / ".locks" / "gemini-route-eval.jsonl"
 COMPLIANCE = Path.home() / ".claude" / ".locks" / "delegation-compliance.json"
@@ -15,37 +17,26 @@ COUNTER = Path.home() / ".claude" / ".locks" / "gemini-daily-counter.json"
 ACC_FILE = Path.home() / ".claude" / ".locks" / "delegation-acceptance.json"
 
 
-def parse_audit_line(line):
-    """Extract key=value pairs from audit log line."""
-    parts = {}
-    for token in line.split():
-        if "=" in token and not token.startswith("["):
-            k, v = token.split("=", 1)
-            parts[k] = v
-    return parts
-
-
 def main():
     print("=" * 55)
     print("  DELEGATION VISIBILITY DASHBOARD")
     print("=" * 55)
 
-    # --- Hook Audit ---
-    if AUDIT_LOG.exists():
-        lines = [
-            l.strip() for l in AUDIT_LOG.read_text().strip().split("\n") if l.strip()
-        ]
-        entries = [parse_audit_line(l) for l in lines]
-
-        actions = Counter(e.get("action", "unknown") for e in entries)
-        models = Counter(e.get("exec", "unknown") for e in entries)
-        prefetched = sum(1 for e in entries if e.get("prefetch") == "OK")
-        latencies = [int(e["latency"].rstrip("ms")) for e in entries if "latency" in e]
-        avg_lat = sum(latencies) // max(len(latencies), 1) if latencies else 0
+    # Running aggregates of the audit log (only new lines are parsed)
+    audit = audit_stats() if AUDIT_LOG.exists() else None
 
-        print(f"\n  Hook fires:       {len(entries)}")
+    # --- Hook Audit ---
+    if audit:
+        fires = audit["lines"]
+        actions = Counter(value_counts(audit, "action", missing="unknown"))
+        models = Counter(value_counts(audit, "exec", missing="unknown"))
+        prefetched = audit["prefetched"]
+        latency = audit["latency"]
+        avg_lat = latency["sum"] // max(latency["count"], 1)
+
+        print(f"\n  Hook fires:       {fires}")
         print(
-            f"  Pre-fetched OK:   {prefetched} ({prefetched * 100 // max(len(entries), 1)}%)"
+            f"  Pre-fetched OK:   {prefetched} ({prefetched * 100 // max(fires, 1)}%)"
         )
         print(f"  Avg latency:      {avg_lat}ms")
         print("\n  Actions:")
@@ -58,34 +49,22 @@ def main():
         print("\n  No audit log yet.")
 
     # --- Template Routing (derived from audit log) ---
-    if AUDIT_LOG.exists():
-        lines = [
-            l.strip() for l in AUDIT_LOG.read_text().strip().split("\n") if l.strip()
-        ]
-        # Extract template routing entries from audit log (action=prefetch_template:*)
-        template_entries = []
-        for l in lines:
-            parsed = parse_audit_line(l)
-            action = parsed.get("action", "")
-            if action.startswith("prefetch_template:"):
-                cat = action.split(":", 1)[1]
-                ok = parsed.get("prefetch") == "OK"
-                template_entries.append({"category": cat, "success": ok})
-
+    if audit:
+        # Template routing entries (action=prefetch_template:*)
+        templates = audit["templates"]
         # Count all successful prefetches (template + plain)
-        total_prefetch_ok = sum(
-            1 for l in lines if parse_audit_line(l).get("prefetch") == "OK"
-        )
+        total_prefetch_ok = audit["prefetched"]
 
-        if template_entries:
-            cats = Counter(e["category"] for e in template_entries)
-            ok = sum(1 for e in template_entries if e["success"])
+        if templates:
+            cats = Counter({cat: t["calls"] for cat, t in templates.items()})
+            calls = sum(cats.values())
+            ok = sum(t["ok"] for t in templates.values())
             # Estimate tokens saved: ~2,850 per successful template routing
             est_saved = ok * 2850
 
             print("\n  --- Template Routing (live from audit log) ---")
-            print(f"  Template calls:   {len(template_entries)}")
-            print(f"  Success:          {ok}/{len(template_entries)}")
+            print(f"  Template calls:   {calls}")
+            print(f"  Success:          {ok}/{calls}")
             print(f"  Plain prefetch:   {total_prefetch_ok - ok} additional")
             print(f"  Est tokens saved: ~{est_saved:,}")
             print("\n  By category:")
@@ -118,34 +97,32 @@ def main():
             pass
 
     # --- Skill Delegation (v4.4) ---
-    if AUDIT_LOG.exists():
-        lines = [
-            l.strip() for l in AUDIT_LOG.read_text().strip().split("\n") if l.strip()
-        ]
-        entries = [parse_audit_line(l) for l in lines]
-        skill_entries = [e for e in entries if e.get("source", "").startswith("skill:")]
-        natural_entries = [
-            e for e in entries if e.get("source", "natural") == "natural"
-        ]
-        skill_prefetched = sum(1 for e in skill_entries if e.get("prefetch") == "OK")
-        natural_prefetched = sum(
-            1 for e in natural_entries if e.get("prefetch") == "OK"
+    if audit:
+        sources = value_counts(audit, "source", missing="natural")
+        skill_sources = {s: n for s, n in sources.items() if s.startswith("skill:")}
+        skill_count = sum(skill_sources.values())
+        natural_count = sources.get("natural", 0)
+        prefetched_by_source = audit["prefetched_by_source"]
+        skill_prefetched = sum(
+            n for s, n in prefetched_by_source.items() if s.startswith("skill:")
+        )
+        # Lines without source= are natural too
+        natural_prefetched = audit["prefetched"] - sum(
+            n for s, n in prefetched_by_source.items() if s != "natural"
         )
 
         # Count by skill name
         skill_names = Counter(
-            e.get("source", "").split(":", 1)[1]
-            for e in skill_entries
-            if ":" in e.get("source", "")
+            {s.split(":", 1)[1]: n for s, n in skill_sources.items()}
         )
 
         print("\n  --- Skill Delegation (v4.4) ---")
-        if skill_entries:
+        if skill_count:
             print(
-                f"  Skill-sourced:    {len(skill_entries)} ({skill_prefetched} prefetched)"
+                f"  Skill-sourced:    {skill_count} ({skill_prefetched} prefetched)"
             )
             print(
-                f"  Natural-sourced:  {len(natural_entries)} ({natural_prefetched} prefetched)"
+                f"  Natural-sourced:  {natural_count} ({natural_prefetched} prefetched)"
             )
             if skill_names:
                 print("  By skill:")
@@ -234,28 +211,15 @@ def json_summary():
     data = {}
 
     if AUDIT_LOG.exists():
-        lines = [
-            l.strip() for l in AUDIT_LOG.read_text().strip().split("\n") if l.strip()
-        ]
-        entries = [parse_audit_line(l) for l in lines]
-        prefetched = sum(1 for e in entries if e.get("prefetch") == "OK")
-        data["hook_fires"] = len(entries)
-        data["prefetched"] = prefetched
-
-    # Derive routing stats from audit log (eval log is stale since v4.4)
-    if AUDIT_LOG.exists():
-        lines = [
-            l.strip() for l in AUDIT_LOG.read_text().strip().split("\n") if l.strip()
-        ]
-        template_entries = []
-        for l in lines:
-            parsed = parse_audit_line(l)
-            action = parsed.get("action", "")
-            if action.startswith("prefetch_template:"):
-                template_entries.append(parsed.get("prefetch") == "OK")
-        if template_entries:
-            ok = sum(1 for s in template_entries if s)
-            data["route_calls"] = len(template_entries)
+        audit = audit_stats()
+        data["hook_fires"] = audit["lines"]
+        data["prefetched"] = audit["prefetched"]
+
+        # Derive routing stats from audit log (eval log is stale since v4.4)
+        templates = audit["templates"].values()
+        if templates:
+            ok = sum(t["ok"] for t in templates)
+            data["route_calls"] = sum(t["calls"] for t in templates)
             data["route_success"] = ok
             data["est_tokens_saved"] = ok * 2850
 
@@ -12,6 +12,10 @@ Usage:
     python3 experiment_evaluator.py status                # Show evaluation coverage
 
 Designed to run at session end (via /session-close) or manually.
+
+Tool calls, hook outputs, compact events and models come from the shared
+session store (session_usage.py), which only parses bytes appended since
+its last refresh; this script's own pass over a file extracts message text.
 """
 
 import argparse
@@ -23,6 +27,9 @@ from collections import Counter, defaultdict
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from session_usage import COMPACT_MARKER, SessionUsageStore
+
 JSONL_DIR = Path.home() / '.claude' / 'projects' / '-Users-nissimagent'
 EXPERIMENTS_JSON = Path.home() / '.claude' / '.locks' / 'experiments-state.json'
 EVAL_LOG = Path.home() / '.claude' / '.locks' / 'experiment-eval-log.json'
@@ -55,7 +62,18 @@ def get_session_files(last_n: int = 0, session_id: str = '') -> list:
     return files
 
 
-def extract_session_data(path: Path) -> dict:
+_store = None
+
+
+def get_store() -> SessionUsageStore:
+    """Shared SessionUsageStore (opened once per process)."""
+    global _store
+    if _store is None:
+        _store = SessionUsageStore()
+    return _store
+
+
+def extract_session_data(path: Path, store: SessionUsageStore = None) -> dict:
     """Extract structured data from a session JSONL file.
 
     Returns a dict with:
@@ -85,14 +103,44 @@ def extract_session_data(path: Path) -> dict:
         'at_file_refs': [],
     }
 
+    store = store or get_store()
+    store.refresh([path])
+    file_id = store.file_id(path)
+    if file_id is not None:
+        data['models_used'] = store.models(file_id)
+        for tc in store.tool_calls(file_id):
+            name, inp, i = tc['name'], tc['input'], tc['line']
+            data['tool_calls'].append({
+                'name': name,
+                'input_keys': tc['input_keys'],
+                'input': inp,
+                'line': i,
+            })
+            if name == 'Skill':
+                data['skill_invocations'].append({'skill_name': inp.get('skill', ''), 'line': i})
+            if name == 'Edit':
+                data['file_edits'].append({'path': inp.get('file_path', ''), 'line': i})
+            if name == 'Task':
+                data['task_agents'].append({'description': inp.get('description', ''), 'line': i})
+            if name == 'TaskStop':
+                data['cancel_events'].append({'line': i, 'input': inp})
+
+        # Hook outputs: injected as <system-reminder> tags in user messages
+        # Budget hook: "[Budget] 5-hour window..."
+        # Skill gate: "Skill keyword detected..."
+        # Queue operations are compact events
+        for marker in store.hook_markers(file_id):
+            if marker['hook_type'] == COMPACT_MARKER:
+                data['compact_events'].append({'line': marker['line'], 'data': marker['text']})
+            else:
+                data['hook_outputs'].append({'text': marker['text'], 'line': marker['line'],
+                                             'hook_type': marker['hook_type']})
+
+    # Message text isn't kept in the store: one pass over the file for it
     for i, obj in enumerate(iter_jsonl(path)):
         msg_type = obj.get('type', '')
         msg = obj.get('message', {})
         content = msg.get('content', '')
-        model = msg.get('model', '')
-
-        if model:
-            data['models_used'].add(model)
 
         # User messages
         if msg_type == 'user' and msg.get('role') == 'user':
@@ -112,38 +160,13 @@ def extract_session_data(path: Path) -> dict:
                             for ref in at_refs:
                                 data['at_file_refs'].append({'ref': ref, 'line': i})
 
-        # Assistant messages with tool calls
-        if msg_type == 'assistant':
-            if isinstance(content, list):
-                for block in content:
-                    if isinstance(block, dict):
-                        block_type = block.get('type', '')
-
-                        if block_type == 'tool_use':
-                            name = block.get('name', '')
-                            inp = block.get('input', {})
-                            data['tool_calls'].append({
-                                'name': name,
-                                'input_keys': list(inp.keys()) if isinstance(inp, dict) else [],
-                                'input': inp,
-                                'line': i,
-                            })
-                            if name == 'Skill':
-                                skill_name = inp.get('skill', '') if isinstance(inp, dict) else ''
-                                data['skill_invocations'].append({'skill_name': skill_name, 'line': i})
-                            if name == 'Edit':
-                                file_path = inp.get('file_path', '') if isinstance(inp, dict) else ''
-                                data['file_edits'].append({'path': file_path, 'line': i})
-                            if name == 'Task':
-                                desc = inp.get('description', '') if isinstance(inp, dict) else ''
-                                data['task_agents'].append({'description': desc, 'line': i})
-                            if name == 'TaskStop':
-                                data['cancel_events'].append({'line': i, 'input': inp})
-
-                        if block_type == 'text':
-                            text = block.get('text', '')
-                            if text:
-                                data['assistant_texts'].append({'text': text[:2000], 'line': i})
+        # Assistant text blocks
+        if msg_type == 'assistant' and isinstance(content, list):
+            for block in content:
+                if isinstance(block, dict) and block.get('type') == 'text':
+                    text = block.get('text', '')
+                    if text:
+                        data['assistant_texts'].append({'text': text[:2000], 'line': i})
 
         # System messages
         if msg_type == 'system':
@@ -157,24 +180,6 @@ def extract_session_data(path: Path) -> dict:
                         if text:
                             data['system_messages'].append({'text': text[:2000], 'line': i})
 
-        # Hook outputs: injected as <system-reminder> tags in user messages
-        # Budget hook: "[Budget] 5-hour window..."
-        # Skill gate: "Skill keyword detected..."
-        # Check all message types for hook content (hooks inject into various places)
-        check_text = json.dumps(content) if content else ''
-        if check_text:
-            hook_keywords = ['[Budget]', 'Skill keyword', 'hook success', 'hook fail',
-                           'skill_gate', 'code_first_check', 'session_audit',
-                           'UserPromptSubmit hook', 'PreToolUse hook', 'PostToolUse hook']
-            for kw in hook_keywords:
-                if kw in check_text:
-                    data['hook_outputs'].append({'text': check_text[:500], 'line': i, 'hook_type': kw})
-                    break
-
-        # Queue operations (compact events)
-        if msg_type == 'queue-operation':
-            data['compact_events'].append({'line': i, 'data': str(obj)[:200]})
-
     return data
 
 
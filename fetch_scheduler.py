@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Fetch Scheduler - shared per-host politeness + concurrency for scrapers.
+
+The scrapers used to `time.sleep(rate_limit)` before every request and
+walk their URL lists strictly serially, so a run took
+len(urls) * (rate_limit + latency) even when the network sat idle.
+
+FetchScheduler instead gives every host a token bucket (burst of 1,
+refilled every `interval` seconds) and caps in-flight requests
+globally. Workers reserve the host's next slot, sleep only until it,
+and overlap their request latency and parsing with other workers.
+Each host still sees at most one request per interval. Distinct hosts
+proceed independently.
+
+One scheduler is shared per process (get_scheduler()), so scrapers that
+hit the same host from one process share that host's bucket.
+
+No external dependencies -- stdlib only (requests is passed in by callers).
+
+Usage:
+    from fetch_scheduler import get_scheduler
+    sched = get_scheduler()
+    resp = sched.get(session, url, interval=1.0, timeout=30)   # paced GET
+    for url, page in sched.map(parse_page, urls):              # ordered, concurrent
+        ...
+    for url, resp in sched.fetch_iter(requests, urls, timeout=30):  # prefetching GETs
+        ...
+    sched.backoff(url, 30)    # e.g. after a 429: push this host back 30s
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Optional
+from urllib.parse import urlparse
+
+
+FETCH_MAX_CONCURRENCY = int(os.environ.get("FETCH_MAX_CONCURRENCY", "8"))  # In-flight requests per process
+FETCH_WORKERS = int(os.environ.get("FETCH_WORKERS", "4"))  # Worker threads per map() call
+FETCH_DEFAULT_INTERVAL = 1.0  # Seconds between requests to one host
+
+
+def host_of(url: str) -> str:
+    """Bucket key for a URL: lowercase host (port included)."""
+    return urlparse(url).netloc.lower() or url
+
+
+class FetchScheduler:
+    """Per-host token buckets plus a global in-flight cap."""
+
+    def __init__(
+        self,
+        max_concurrency: int = FETCH_MAX_CONCURRENCY,
+        default_interval: float = FETCH_DEFAULT_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.default_interval = default_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot: dict[str, float] = {}
+        self._intervals: dict[str, float] = {}
+        self._in_flight = threading.BoundedSemaphore(self.max_concurrency)
+
+    def set_interval(self, url_or_host: str, seconds: float):
+        """Fix a host's minimum spacing (overrides per-call intervals)."""
+        host = host_of(url_or_host) if "/" in url_or_host else url_or_host.lower()
+        with self._lock:
+            self._intervals[host] = seconds
+
+    def reserve(self, url: str, interval: Optional[float] = None) -> float:
+        """Claim the host's next free slot; returns seconds until it starts."""
+        host = host_of(url)
+        with self._lock:
+            spacing = self._intervals.get(host)
+            if spacing is None:
+                spacing = self.default_interval if interval is None else interval
+            now = self._clock()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + spacing
+        return slot - now
+
+    def wait(self, url: str, interval: Optional[float] = None) -> float:
+        """Block until this host may be requested again. Returns seconds waited."""
+        delay = self.reserve(url, interval)
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+    def backoff(self, url: str, seconds: float):
+        """Push a host's next slot at least `seconds` into the future (429, 503)."""
+        host = host_of(url)
+        with self._lock:
+            until = self._clock() + seconds
+            self._next_slot[host] = max(self._next_slot.get(host, 0.0), until)
+
+    @contextmanager
+    def slot(self, url: str, interval: Optional[float] = None):
+        """Hold one global in-flight slot, released once the host's turn is used."""
+        with self._in_flight:
+            self.wait(url, interval)
+            yield
+
+    def get(self, session, url: str, interval: Optional[float] = None, **kwargs):
+        """Paced `session.get(url, **kwargs)`; session may be the requests module."""
+        with self.slot(url, interval):
+            return session.get(url, **kwargs)
+
+    def fetch_iter(
+        self,
+        session,
+        urls: Iterable[str],
+        interval: Optional[float] = None,
+        workers: int = FETCH_WORKERS,
+        **kwargs,
+    ) -> Iterator[tuple]:
+        """Yield (url, response) in order, fetching ahead concurrently.
+
+        A failed request yields its exception in place of the response so
+        callers keep their per-URL error handling (`raise` it in a try).
+        """
+        def _get(url):
+            try:
+                return self.get(session, url, interval, **kwargs)
+            except Exception as e:  # Handed to the caller, never lost in a worker
+                return e
+
+        return self.map(_get, urls, workers)
+
+    def map(
+        self,
+        fn: Callable,
+        items: Iterable,
+        workers: int = FETCH_WORKERS,
+    ) -> Iterator[tuple]:
+        """Yield (item, fn(item)) in input order while up to `workers` run ahead.
+
+        fn is expected to fetch through this scheduler, which does the
+        pacing; map() only provides the overlap. An exception raised by fn
+        propagates when its item is reached.
+        """
+        items = list(items)
+        if workers <= 1 or len(items) <= 1:
+            for item in items:
+                yield item, fn(item)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Bounded look-ahead: submit at most 2*workers items beyond the
+            # one being consumed so huge URL lists don't queue all at once
+            window = workers * 2
+            futures = [pool.submit(fn, item) for item in items[:window]]
+            for i, item in enumerate(items):
+                nxt = i + window
+                if nxt < len(items):
+                    futures.append(pool.submit(fn, items[nxt]))
+                yield item, futures[i].result()
+                futures[i] = None  # Release the result once consumed
+
+
+_scheduler: Optional[FetchScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> FetchScheduler:
+    """The process-wide scheduler shared by every scraper."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = FetchScheduler()
+        return _scheduler
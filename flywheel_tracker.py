@@ -19,11 +19,12 @@ Metrics tracked per loop:
 
 import json
 import os
-import subprocess
 import time
 from datetime import datetime
 from pathlib import Path
 
+from kb_counter import kb_total
+
 STATE_DIR = Path.home() / ".claude" / ".locks"
 METRICS_FILE = STATE_DIR / "flywheel-metrics.json"
 OBSIDIAN = Path.home() / "Documents" / "Obsidian"
@@ -152,72 +153,15 @@ def _compound_doc_count() -> int:
 
 
 def _kb_article_count() -> int:
-    """Count KB articles across ~/Development/ (all .md/.html in KB dirs).
+    """Count KB articles across ~/Development/ (.md files in KB dirs).
 
-    Scans known KB directories under ~/Development/ — same source of truth
-    as the dashboard's _scan_kb_directories(). Uses find with -maxdepth 3
-    for speed (~87K articles in <2s).
+    Same census as the dashboard's _scan_kb_directories() (kb_counter),
+    served from the incremental per-directory snapshot.
     """
-    dev_dir = Path.home() / "Development"
-    if not dev_dir.exists():
-        return 0
-
-    # Known KB directories (non-code project dirs with articles)
-    skip_dirs = {
-        "tools",
-        "entropic",
-        "entropic-v2challenger",
-        "cymatics",
-        "figure-isolator",
-        "lyric-analyst",
-        "music-composer",
-        "shared-brain",
-        "AI-Knowledge-Exchange",
-        "knowledge-bases",
-    }
-
-    total = 0
     try:
-        for child in dev_dir.iterdir():
-            if not child.is_dir() or child.name.startswith("."):
-                continue
-            if child.name in skip_dirs:
-                # knowledge-bases has its own sub-dirs
-                if child.name == "knowledge-bases":
-                    result = subprocess.run(
-                        ["find", str(child), "-name", "*.md", "-o", "-name", "*.html"],
-                        capture_output=True,
-                        text=True,
-                        timeout=3,
-                    )
-                    if result.stdout.strip():
-                        total += len(result.stdout.strip().split("\n"))
-                continue
-            # Count .md and .html files
-            result = subprocess.run(
-                [
-                    "find",
-                    str(child),
-                    "-maxdepth",
-                    "3",
-                    "-name",
-                    "*.md",
-                    "-o",
-                    "-name",
-                    "*.html",
-                ],
-                capture_output=True,
-                text=True,
-                timeout=3,
-            )
-            if result.stdout.strip():
-                count = len(result.stdout.strip().split("\n"))
-                if count >= 3:  # Skip dirs with <3 articles (not real KB)
-                    total += count
-    except (subprocess.TimeoutExpired, OSError):
-        pass
-
-    return total
+        return kb_total()
+    except OSError:
+        return 0
 
 
 def _session_tracker() -> dict:
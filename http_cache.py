@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""HTTP Cache - persistent conditional-request cache shared by the scrapers.
+
+Re-running a scraper used to download every archive page and article in
+full; the only dedup happened after the fetch. This cache keeps, per URL,
+the response validators (ETag / Last-Modified), a hash of the body and a
+zlib-compressed copy of the body in SQLite. The next GET of that URL
+sends If-None-Match / If-Modified-Since; a 304 is answered from the
+stored body, so a periodic refresh of the whole KB costs mostly 304s.
+
+Every response returned through the cache carries two extra attributes:
+    resp.from_cache  True when the body came from the cache (server said 304)
+    resp.unchanged   True when the body is the same as last time (304, or a
+                     200 whose body hash matches), so callers can skip parsing
+
+Bodies are only stored when the server sent a validator (no validator
+means no conditional request is possible); the hash is always kept.
+
+No external dependencies -- stdlib only (requests is passed in by callers).
+
+Usage:
+    python3 http_cache.py stats              # Entry count and stored size
+    python3 http_cache.py prune [--days 90]  # Drop entries not seen in N days
+    python3 http_cache.py clear              # Drop everything
+
+    # From Python
+    from http_cache import CachingSession
+    session = CachingSession(requests.Session())
+    resp = session.get(url, timeout=30)
+    if resp.unchanged:
+        ...  # Same page as last run: reuse the previous parse
+"""
+
+import hashlib
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlencode
+
+
+HTTP_CACHE_DB = Path("~/.claude/.locks/http-cache.db").expanduser()
+HTTP_CACHE_PRUNE_DAYS = 90
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        url             TEXT PRIMARY KEY,
+        etag            TEXT,
+        last_modified   TEXT,
+        content_type    TEXT,
+        encoding        TEXT,
+        body            BLOB,       -- zlib; NULL when the server sent no validator
+        body_hash       TEXT NOT NULL,
+        fetched_at      REAL NOT NULL,  -- Last full (200) download
+        checked_at      REAL NOT NULL   -- Last time the server was asked
+    );
+"""
+
+
+def cache_key(url: str, params: Optional[dict] = None) -> str:
+    """URL plus encoded query params (so paged API calls get their own entry)."""
+    if not params:
+        return url
+    return url + ("&" if "?" in url else "?") + urlencode(params, doseq=True)
+
+
+class HTTPCache:
+    """SQLite store of validators and compressed bodies, keyed by URL."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else HTTP_CACHE_DB
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the scheduler's worker threads; several
+        # scraper processes share the file, hence WAL and a busy timeout
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._conn.close()
+
+    def lookup(self, key: str) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT * FROM responses WHERE url = ?", (key,)
+            ).fetchone()
+
+    @staticmethod
+    def conditional_headers(entry: Optional[sqlite3.Row]) -> dict:
+        """Validator headers for a revalidating GET (empty if nothing to revalidate)."""
+        if entry is None or entry["body"] is None:
+            return {}
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key: str, resp, body_hash: str):
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        body = zlib.compress(resp.content, 6) if (etag or last_modified) else None
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT INTO responses (url, etag, last_modified, content_type,
+                       encoding, body, body_hash, fetched_at, checked_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET
+                       etag = excluded.etag,
+                       last_modified = excluded.last_modified,
+                       content_type = excluded.content_type,
+                       encoding = excluded.encoding,
+                       body = excluded.body,
+                       body_hash = excluded.body_hash,
+                       fetched_at = excluded.fetched_at,
+                       checked_at = excluded.checked_at""",
+                (key, etag, last_modified, resp.headers.get("Content-Type"),
+                 resp.encoding, body, body_hash, now, now),
+            )
+
+    def touch(self, key: str, resp):
+        """Record a 304; servers may send refreshed validators with it."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """UPDATE responses SET checked_at = ?,
+                       etag = COALESCE(?, etag),
+                       last_modified = COALESCE(?, last_modified)
+                   WHERE url = ?""",
+                (time.time(), resp.headers.get("ETag"),
+                 resp.headers.get("Last-Modified"), key),
+            )
+
+    def get(self, session, url: str, **kwargs):
+        """Conditional `session.get(url, **kwargs)`; session may be the requests module."""
+        key = cache_key(url, kwargs.get("params"))
+        entry = self.lookup(key)
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers.update(self.conditional_headers(entry))
+        resp = session.get(url, headers=headers, **kwargs)
+
+        if resp.status_code == 304 and entry is not None and entry["body"] is not None:
+            # Answer from the stored copy, as if the server had resent it
+            resp.status_code = 200
+            resp._content = zlib.decompress(entry["body"])
+            resp.encoding = entry["encoding"]
+            if entry["content_type"] and "Content-Type" not in resp.headers:
+                resp.headers["Content-Type"] = entry["content_type"]
+            resp.from_cache = True
+            resp.unchanged = True
+            self.touch(key, resp)
+            return resp
+
+        resp.from_cache = False
+        resp.unchanged = False
+        if resp.status_code == 200:
+            body_hash = hashlib.sha1(resp.content).hexdigest()
+            resp.unchanged = entry is not None and entry["body_hash"] == body_hash
+            self.store(key, resp, body_hash)
+        return resp
+
+    def prune(self, days: float = HTTP_CACHE_PRUNE_DAYS) -> int:
+        """Drop entries the scrapers haven't asked for in `days` days."""
+        cutoff = time.time() - days * 86400
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM responses WHERE checked_at < ?", (cutoff,))
+        return cur.rowcount
+
+    def clear(self) -> int:
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM responses")
+        return cur.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            row = self._conn.execute(
+                """SELECT COUNT(*), COUNT(body), COALESCE(SUM(LENGTH(body)), 0)
+                   FROM responses"""
+            ).fetchone()
+        return {"entries": row[0], "with_body": row[1], "body_bytes": row[2]}
+
+
+class CachingSession:
+    """Wraps a requests session (or the requests module) so GETs go through the cache.
+
+    Everything other than get() (headers, mount, post, ...) is the
+    wrapped session's own.
+    """
+
+    def __init__(self, session, cache: Optional[HTTPCache] = None):
+        self.session = session
+        self.cache = cache or get_http_cache()
+
+    def get(self, url: str, **kwargs):
+        return self.cache.get(self.session, url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+
+_cache: Optional[HTTPCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HTTPCache:
+    """The process-wide cache shared by every scraper."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HTTPCache()
+        return _cache
+
+
+def main():
+    args = sys.argv[1:]
+    cmd = args[0] if args else "stats"
+    cache = get_http_cache()
+    if cmd == "stats":
+        s = cache.stats()
+        print(f"HTTP cache: {cache.db_path}")
+        print(f"  Entries:     {s['entries']} ({s['with_body']} with stored body)")
+        print(f"  Body bytes:  {s['body_bytes'] / 1024 / 1024:.1f} MB (compressed)")
+    elif cmd == "prune":
+        days = float(args[args.index("--days") + 1]) if "--days" in args else HTTP_CACHE_PRUNE_DAYS
+        print(f"Pruned {cache.prune(days)} entries older than {days:g} days")
+    elif cmd == "clear":
+        print(f"Cleared {cache.clear()} entries")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
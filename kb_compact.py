@@ -3,19 +3,29 @@
 
 Code-only (0 LLM tokens). Run once, then periodically.
 
+Each file is read once: its body hash (dedup) and body length (stub
+check) come from the same read. Results are kept in a ledger
+(path -> size, mtime, body hash, body length) so unchanged files are
+only stat'ed on later runs; new or changed files are hashed on a
+process pool.
+
 Usage:
     python3 kb_compact.py --dry-run          # Report only, no changes
     python3 kb_compact.py                     # Execute compaction
     python3 kb_compact.py --sanitize          # Also run content_sanitizer on all files
+    python3 kb_compact.py --near-dups [0.8]   # Also report near-duplicate clusters (MinHash/LSH)
+    python3 kb_compact.py --workers 4         # Hashing processes (default: all cores)
 """
 
 import hashlib
 import os
+import sqlite3
 import sys
 import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import NamedTuple
+from typing import NamedTuple, Optional
 
 # Optional: content sanitizer integration
 try:
@@ -24,6 +34,8 @@ try:
 except ImportError:
     HAS_SANITIZER = False
 
+from kb_near_dup import DEFAULT_THRESHOLD, NearDupIndex, article_body
+
 
 class CompactReport(NamedTuple):
     total_files: int
@@ -33,11 +45,15 @@ class CompactReport(NamedTuple):
     bytes_saved: int
     sanitized: int
     sanitizer_findings: int
+    near_dup_clusters: int = 0
 
 
 # Minimum content length (chars) to keep a file. Below this = stub.
 MIN_CONTENT_LENGTH = 150
 
+KB_HASH_LEDGER = Path("~/.claude/.locks/kb-compact-ledger.db").expanduser()
+POOL_MIN_FILES = 200  # Fewer files to hash than this: hash in-process
+
 # Known boilerplate patterns to strip (common across scraped sites)
 BOILERPLATE_PATTERNS = [
     # Cookie banners
@@ -68,22 +84,21 @@ def find_all_articles(base_dirs=None):
     return articles
 
 
+def _digest(content):
+    """(body hash, body length) of an article's text, frontmatter ignored."""
+    body = article_body(content)
+    # Normalize whitespace for fuzzy dedup
+    normalized = " ".join(body.split()).lower()
+    return hashlib.md5(normalized.encode()).hexdigest(), len(body.strip())
+
+
 def compute_hash(filepath):
     """Compute content hash for dedup (ignores frontmatter)."""
     try:
         content = filepath.read_text(errors="replace")
     except Exception:
         return None
-
-    # Strip YAML frontmatter for hash comparison
-    if content.startswith("---"):
-        end = content.find("---", 3)
-        if end > 0:
-            content = content[end + 3:].strip()
-
-    # Normalize whitespace for fuzzy dedup
-    content = " ".join(content.split()).lower()
-    return hashlib.md5(content.encode()).hexdigest()
+    return _digest(content)[0]
 
 
 def is_stub(filepath):
@@ -92,18 +107,104 @@ def is_stub(filepath):
         content = filepath.read_text(errors="replace")
     except Exception:
         return True
+    return _digest(content)[1] < MIN_CONTENT_LENGTH
 
-    # Strip frontmatter
-    if content.startswith("---"):
-        end = content.find("---", 3)
-        if end > 0:
-            content = content[end + 3:].strip()
-
-    return len(content.strip()) < MIN_CONTENT_LENGTH
 
-
-def compact(dry_run=True, run_sanitizer=False):
-    """Run full compaction pipeline."""
+def scan_file(path):
+    """One read -> (path, body hash or None, body length). Pool worker."""
+    try:
+        content = Path(path).read_text(errors="replace")
+    except Exception:
+        return path, None, 0
+    return (path, *_digest(content))
+
+
+class HashLedger:
+    """path -> (size, mtime_ns, body hash, body length), persisted in SQLite."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else KB_HASH_LEDGER
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS ledger (
+                path        TEXT PRIMARY KEY,
+                size        INTEGER NOT NULL,
+                mtime_ns    INTEGER NOT NULL,
+                body_hash   TEXT NOT NULL,
+                body_length INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+
+    def close(self):
+        self._conn.close()
+
+    def scan(self, articles, workers=None, progress=True):
+        """{path: (size, body hash or None, body length)} for every readable file.
+
+        Files whose size/mtime match the ledger are not read. The rest are
+        hashed (on a process pool when there are enough of them) and
+        recorded. Ledger rows for files no longer listed are dropped.
+        Returns (entries, files hashed this run).
+        """
+        known = {
+            path: (size, mtime_ns, body_hash, body_length)
+            for path, size, mtime_ns, body_hash, body_length in self._conn.execute(
+                "SELECT path, size, mtime_ns, body_hash, body_length FROM ledger"
+            )
+        }
+        entries = {}
+        todo = {}  # str path -> (Path, size, mtime_ns)
+        for f in articles:
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            row = known.pop(str(f), None)
+            if row and row[:2] == (st.st_size, st.st_mtime_ns):
+                entries[f] = (st.st_size, row[2], row[3])
+            else:
+                todo[str(f)] = (f, st.st_size, st.st_mtime_ns)
+
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(todo) >= POOL_MIN_FILES:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(scan_file, list(todo), chunksize=256)
+                fresh = self._collect(results, todo, entries, progress)
+        else:
+            fresh = self._collect(map(scan_file, list(todo)), todo, entries, progress)
+
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO ledger VALUES (?, ?, ?, ?, ?)", fresh)
+            self._conn.executemany("DELETE FROM ledger WHERE path = ?", [(p,) for p in known])
+        return entries, len(todo)
+
+    @staticmethod
+    def _collect(results, todo, entries, progress):
+        fresh = []
+        for i, (path, body_hash, body_length) in enumerate(results):
+            f, size, mtime_ns = todo[path]
+            entries[f] = (size, body_hash, body_length)
+            if body_hash is not None:  # Unreadable files are retried next run
+                fresh.append((path, size, mtime_ns, body_hash, body_length))
+            if progress and (i + 1) % 10000 == 0:
+                print(f"  Hashed {i + 1}/{len(todo)}...")
+        return fresh
+
+    def forget(self, paths):
+        with self._conn:
+            self._conn.executemany("DELETE FROM ledger WHERE path = ?", [(str(p),) for p in paths])
+
+
+def compact(dry_run=True, run_sanitizer=False, near_dup_threshold=None, workers=None):
+    """Run full compaction pipeline.
+
+    near_dup_threshold: if set, also report clusters of near-duplicates
+    (estimated Jaccard >= threshold). Report only -- nothing is removed.
+    workers: processes for hashing new/changed files (default: all cores).
+    """
     start = time.time()
     print(f"{'[DRY RUN] ' if dry_run else ''}KB Compaction starting...")
 
@@ -112,16 +213,17 @@ def compact(dry_run=True, run_sanitizer=False):
 
     # Phase 1: Find duplicates
     print("\n--- Phase 1: Dedup ---")
+    ledger = HashLedger()
+    entries, hashed = ledger.scan(articles, workers=workers)
+    print(f"  {hashed} new/changed files hashed, {len(entries) - hashed} unchanged (ledger)")
     hash_map = defaultdict(list)
     hash_errors = 0
-    for i, f in enumerate(articles):
-        h = compute_hash(f)
-        if h:
-            hash_map[h].append(f)
+    for f in articles:
+        entry = entries.get(f)
+        if entry and entry[1]:
+            hash_map[entry[1]].append(f)
         else:
             hash_errors += 1
-        if (i + 1) % 10000 == 0:
-            print(f"  Hashed {i + 1}/{len(articles)}...")
 
     duplicates = []
     for h, files in hash_map.items():
@@ -132,21 +234,34 @@ def compact(dry_run=True, run_sanitizer=False):
 
     print(f"  {len(duplicates)} exact duplicates found ({hash_errors} hash errors)")
 
+    # Phase 1b: Near-duplicates (report only)
+    near_dups = []
+    if near_dup_threshold is not None:
+        print(f"\n--- Phase 1b: Near-duplicates (Jaccard >= {near_dup_threshold}) ---")
+        index = NearDupIndex()
+        signed = index.update(articles)
+        exact = set(duplicates)
+        for group in index.clusters(near_dup_threshold):
+            group = [f for f in group if f not in exact]
+            if len(group) > 1:
+                near_dups.append(group)
+        index.close()
+        print(f"  {len(near_dups)} near-duplicate clusters "
+              f"({sum(len(g) - 1 for g in near_dups)} extra copies, {signed} files signed)")
+
     # Phase 2: Find stubs and empties
     print("\n--- Phase 2: Stubs & Empties ---")
     stubs = []
     empties = []
+    duplicate_set = set(duplicates)
     for f in articles:
-        if f in duplicates:
-            continue  # Already marked for removal
-        try:
-            size = f.stat().st_size
-            if size == 0:
-                empties.append(f)
-            elif is_stub(f):
-                stubs.append(f)
-        except Exception:
-            pass
+        if f in duplicate_set or f not in entries:
+            continue  # Already marked for removal / vanished
+        size, _, body_length = entries[f]
+        if size == 0:
+            empties.append(f)
+        elif body_length < MIN_CONTENT_LENGTH:
+            stubs.append(f)
 
     print(f"  {len(empties)} empty files, {len(stubs)} stubs (<{MIN_CONTENT_LENGTH} chars)")
 
@@ -155,7 +270,8 @@ def compact(dry_run=True, run_sanitizer=False):
     sanitizer_findings = 0
     if run_sanitizer and HAS_SANITIZER:
         print("\n--- Phase 3: Sanitize ---")
-        remaining = [f for f in articles if f not in duplicates and f not in stubs and f not in empties]
+        removing = duplicate_set.union(stubs, empties)
+        remaining = [f for f in articles if f not in removing]
         for i, f in enumerate(remaining):
             try:
                 report = sanitize_file(f, dry_run=dry_run)
@@ -174,12 +290,15 @@ def compact(dry_run=True, run_sanitizer=False):
     bytes_saved = 0
     if not dry_run:
         print("\n--- Executing removals ---")
+        removed = []
         for f in duplicates + stubs + empties:
             try:
                 bytes_saved += f.stat().st_size
                 f.unlink()
+                removed.append(f)
             except Exception as e:
                 print(f"  ERROR removing {f}: {e}")
+        ledger.forget(removed)
         print(f"  Removed {len(duplicates) + len(stubs) + len(empties)} files, saved {bytes_saved / 1024 / 1024:.1f} MB")
     else:
         for f in duplicates + stubs + empties:
@@ -191,6 +310,8 @@ def compact(dry_run=True, run_sanitizer=False):
         print(f"  Would remove {len(duplicates) + len(stubs) + len(empties)} files")
         print(f"  Would save {bytes_saved / 1024 / 1024:.1f} MB")
 
+    ledger.close()
+
     elapsed = time.time() - start
     print(f"\nCompleted in {elapsed:.1f}s")
 
@@ -202,6 +323,13 @@ def compact(dry_run=True, run_sanitizer=False):
             if len(files) > 1:
                 print(f"  {len(files)} copies: {files[0].parent.parent.name}/{files[0].name}")
 
+    # Show top near-duplicate clusters
+    if near_dups:
+        print("\n--- Top Near-Duplicate Clusters ---")
+        for group in near_dups[:5]:
+            print(f"  {len(group)} near-copies: "
+                  + ", ".join(f"{f.parent.parent.name}/{f.name}" for f in group[:3]))
+
     # Show sample stubs
     if stubs:
         print("\n--- Sample Stubs ---")
@@ -220,6 +348,7 @@ def compact(dry_run=True, run_sanitizer=False):
         bytes_saved=bytes_saved,
         sanitized=sanitized_count,
         sanitizer_findings=sanitizer_findings,
+        near_dup_clusters=len(near_dups),
     )
 
 
@@ -230,15 +359,24 @@ def main():
                         help="Report only, don't remove files")
     parser.add_argument("--sanitize", action="store_true", default=False,
                         help="Also run content_sanitizer on remaining files")
+    parser.add_argument("--near-dups", type=float, nargs="?", const=DEFAULT_THRESHOLD,
+                        default=None, metavar="THRESHOLD",
+                        help="Also report near-duplicate clusters at this Jaccard "
+                             f"similarity (default {DEFAULT_THRESHOLD})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes for hashing new/changed files (default: all cores)")
     args = parser.parse_args()
 
-    report = compact(dry_run=args.dry_run, run_sanitizer=args.sanitize)
+    report = compact(dry_run=args.dry_run, run_sanitizer=args.sanitize,
+                     near_dup_threshold=args.near_dups, workers=args.workers)
     print(f"\n{'=' * 50}")
     print(f"Total files: {report.total_files}")
     print(f"Duplicates: {report.duplicates_removed}")
     print(f"Stubs: {report.stubs_removed}")
     print(f"Empty: {report.empty_removed}")
     print(f"Bytes saved: {report.bytes_saved / 1024 / 1024:.1f} MB")
+    if report.near_dup_clusters:
+        print(f"Near-duplicate clusters: {report.near_dup_clusters}")
     if report.sanitized:
         print(f"Sanitized: {report.sanitized} files ({report.sanitizer_findings} items removed)")
 
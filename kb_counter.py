@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""KB Counter - incremental article counts for every knowledge base.
+
+The dashboard forked `find` for each directory under ~/Development on
+every refresh, and flywheel_tracker, consistency_checker, kb_test and
+registry_sync each recounted the same trees their own way (find with
+-maxdepth, glob, rglob, or not at all), so their numbers disagreed.
+
+This module keeps one persisted snapshot with an entry per directory:
+its mtime, how many files it directly holds per extension, and its
+subdirectories. A directory's mtime changes exactly when entries are
+added, removed or renamed in it, so a count only stats each directory
+and re-lists the ones whose mtime moved. Recursive counts are sums over
+the snapshot. On an unchanged tree that is milliseconds, not a walk.
+
+kb_counts() is the canonical KB census (the dashboard's definition:
+.md files per ~/Development source directory with at least 3 articles,
+sub-sources for leader collections, plus the Obsidian vault). It also
+writes the result to KB_COUNTS_FILE for scripts and hooks.
+
+No external dependencies -- stdlib only.
+
+Usage:
+    python3 kb_counter.py                       # Refresh + print the census
+    python3 kb_counter.py count DIR [--ext .md] [--max-depth N]
+    python3 kb_counter.py stats                 # Snapshot size
+
+    # From Python
+    from kb_counter import get_counter, kb_counts
+    census = kb_counts()                        # {"total", "sources", "vault", ...}
+    n = get_counter().count(path, exts=(".md",), max_depth=1)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+KB_COUNT_SNAPSHOT = Path("~/.claude/.locks/kb-count-snapshot.json").expanduser()
+KB_COUNTS_FILE = Path("~/.claude/.locks/kb-counts.json").expanduser()
+DEV_DIR = Path.home() / "Development"
+OBSIDIAN_VAULT = Path.home() / "Documents" / "Obsidian"
+
+SNAPSHOT_VERSION = 1
+PRUNE_DIRS = {".git"}  # Never hold articles; not worth a stat per object dir
+MIN_ARTICLES = 3  # Fewer .md files than this: not a real KB
+# File timestamps are clock-tick coarse: a directory modified this recently
+# may change again without its mtime moving, so its listing isn't trusted
+RACY_NS = 1_000_000_000
+
+# ~/Development children that are code, not knowledge bases
+KB_SKIP_DIRS = {
+    "AI-Knowledge-Exchange",
+    "claude-code-toolkit",
+    "entropic",
+    "JUCE",
+    "test-scrape-fixed",
+    "fan-capture-mvp",
+    "lyric-analyst",
+    "ghostwriter",
+    "references",
+    "shared-brain",
+    "qwen",
+    "gemini",
+    "cymatics",
+    "dashboard_web",
+}
+# Collections whose subdirectories are each a source of their own
+KB_PARENT_DIRS = ("cto-leaders", "security-leaders", "indie-hackers")
+
+
+class KBCounter:
+    """Per-directory file counts, re-listed only where mtime changed."""
+
+    def __init__(self, snapshot_path: Optional[Path] = None):
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else KB_COUNT_SNAPSHOT
+        self._dirs: dict = {}  # path -> [mtime_ns, {ext: files}, [subdir names]]
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.rescanned = 0  # Directories listed since construction
+        self._load()
+
+    # ── Persistence ─────────────────────────────────────────────────────
+
+    def _load(self):
+        try:
+            data = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == SNAPSHOT_VERSION:
+            self._dirs = data.get("dirs", {})
+
+    def save(self):
+        """Write the snapshot if anything was re-listed (tmp file + rename)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({"version": SNAPSHOT_VERSION, "dirs": self._dirs})
+            self._dirty = False
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.snapshot_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.snapshot_path)
+
+    # ── Snapshot maintenance ────────────────────────────────────────────
+
+    def _forget(self, path: str):
+        prefix = path + os.sep
+        for key in [k for k in self._dirs if k == path or k.startswith(prefix)]:
+            del self._dirs[key]
+        self._dirty = True
+
+    def _entry(self, path: str) -> Optional[list]:
+        """Current snapshot entry of a directory, re-listing it if needed."""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            if path in self._dirs:
+                self._forget(path)
+            return None
+        entry = self._dirs.get(path)
+        if entry is not None and entry[0] == mtime_ns:
+            return entry
+
+        exts = Counter()
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for item in it:
+                    try:
+                        if item.is_dir(follow_symlinks=False):
+                            if item.name not in PRUNE_DIRS:
+                                subdirs.append(item.name)
+                        elif item.is_file(follow_symlinks=False):
+                            ext = os.path.splitext(item.name)[1]
+                            if ext:
+                                exts[ext] += 1
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        if entry is not None:
+            for gone in set(entry[2]) - set(subdirs):
+                self._forget(os.path.join(path, gone))
+        # mtime was read before listing: a change during it shows next time.
+        # A racy mtime is stored as 0 so the next count re-lists
+        if time.time_ns() - mtime_ns < RACY_NS:
+            mtime_ns = 0
+        entry = [mtime_ns, dict(exts), sorted(subdirs)]
+        self._dirs[path] = entry
+        self._dirty = True
+        self.rescanned += 1
+        return entry
+
+    # ── Queries ─────────────────────────────────────────────────────────
+
+    def count(self, path, exts: Iterable[str] = (".md",), max_depth: Optional[int] = None) -> int:
+        """Files with one of exts under path (find -name semantics).
+
+        max_depth follows find -maxdepth: 1 counts only path's own files.
+        Symlinked directories are not followed.
+        """
+        exts = tuple(exts)
+        root = os.path.abspath(os.path.expanduser(os.fspath(path)))
+        total = 0
+        with self._lock:
+            stack = [(root, 0)]
+            while stack:
+                current, depth = stack.pop()
+                entry = self._entry(current)
+                if entry is None:
+                    continue
+                files = entry[1]
+                total += sum(files.get(ext, 0) for ext in exts)
+                if max_depth is None or depth + 1 < max_depth:
+                    stack.extend((os.path.join(current, sub), depth + 1) for sub in entry[2])
+        return total
+
+    def count_dirs(self, path) -> int:
+        """Non-hidden direct subdirectories of path."""
+        root = os.path.abspath(os.path.expanduser(os.fspath(path)))
+        with self._lock:
+            entry = self._entry(root)
+        return sum(1 for name in entry[2] if not name.startswith(".")) if entry else 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"dirs": len(self._dirs), "rescanned": self.rescanned}
+
+
+_counter = None
+_counter_lock = threading.Lock()
+
+
+def get_counter() -> KBCounter:
+    """Shared KBCounter (snapshot loaded once per process)."""
+    global _counter
+    with _counter_lock:
+        if _counter is None:
+            _counter = KBCounter()
+        return _counter
+
+
+def kb_sources(dev_dir: Optional[Path] = None, counter: Optional[KBCounter] = None) -> list:
+    """KB source directories under dev_dir with their .md counts.
+
+    Each: {"name", "dir", "parent", "path", "count"}; parent is the
+    collection dir (KB_PARENT_DIRS) for sub-sources, else None.
+    """
+    counter = counter or get_counter()
+    dev_dir = Path(dev_dir) if dev_dir else DEV_DIR
+    if not dev_dir.is_dir():
+        return []
+
+    sources = []
+    for child in sorted(dev_dir.iterdir()):
+        if not child.is_dir() or child.name.startswith(".") or child.name in KB_SKIP_DIRS:
+            continue
+        if child.name in KB_PARENT_DIRS:
+            for sub in sorted(child.iterdir()):
+                if not sub.is_dir() or sub.name.startswith("."):
+                    continue
+                count = counter.count(sub)
+                if count > 0:
+                    sources.append({
+                        "name": sub.name.replace("-", " ").replace("_", " ").title(),
+                        "dir": sub.name, "parent": child.name, "path": str(sub),
+                        "count": count,
+                    })
+            continue
+        count = counter.count(child)
+        if count < MIN_ARTICLES:
+            continue
+        sources.append({
+            "name": child.name.replace("-", " ").replace("_", " ").title(),
+            "dir": child.name, "parent": None, "path": str(child), "count": count,
+        })
+    return sources
+
+
+def kb_counts(dev_dir: Optional[Path] = None, vault: Optional[Path] = None,
+              counter: Optional[KBCounter] = None, counts_file: Optional[Path] = None) -> dict:
+    """The KB census: {"total", "sources", "vault", "updated"}.
+
+    total is the sum over ~/Development sources; the Obsidian vault is
+    counted separately. Persists the snapshot and, when the numbers
+    changed, rewrites KB_COUNTS_FILE.
+    """
+    counter = counter or get_counter()
+    vault = Path(vault) if vault else OBSIDIAN_VAULT
+    sources = kb_sources(dev_dir, counter)
+    census = {
+        "total": sum(s["count"] for s in sources),
+        "sources": sources,
+        "vault": counter.count(vault) if vault.is_dir() else 0,
+    }
+    counter.save()
+
+    counts_file = Path(counts_file) if counts_file else KB_COUNTS_FILE
+    try:
+        previous = json.loads(counts_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+    if {k: previous.get(k) for k in census} == census:
+        census["updated"] = previous.get("updated")
+        return census
+    census["updated"] = datetime.now().isoformat(timespec="seconds")
+    counts_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = counts_file.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(census, indent=2), encoding="utf-8")
+    os.replace(tmp, counts_file)
+    return census
+
+
+def kb_total() -> int:
+    """Articles across all ~/Development KB sources (kb_counts()["total"])."""
+    return kb_counts()["total"]
+
+
+def main():
+    args = sys.argv[1:]
+    cmd = args[0] if args else "census"
+    if cmd == "census":
+        census = kb_counts()
+        for source in sorted(census["sources"], key=lambda s: -s["count"]):
+            print(f"  {source['count']:>7}  {source['name']}")
+        print(f"Total: {census['total']} articles in {len(census['sources'])} sources "
+              f"(+{census['vault']} in the Obsidian vault)")
+        print(f"Written to {KB_COUNTS_FILE}")
+    elif cmd == "count" and len(args) > 1:
+        exts, max_depth, rest = [], None, args[2:]
+        while rest:
+            flag, value, rest = rest[0], rest[1], rest[2:]
+            if flag == "--ext":
+                exts.append(value)
+            elif flag == "--max-depth":
+                max_depth = int(value)
+        counter = get_counter()
+        print(counter.count(args[1], exts or (".md",), max_depth))
+        counter.save()
+    elif cmd == "stats":
+        s = get_counter().stats()
+        print(f"KB count snapshot: {KB_COUNT_SNAPSHOT}")
+        print(f"  Directories: {s['dirs']}")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
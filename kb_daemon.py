@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""KB Query Daemon - keeps a warm KBLoader behind a local Unix socket.
+
+Every hook call of kb_loader.py otherwise pays interpreter startup, the
+module import, _build_blended_weights and cold index/metadata caches.
+`kb_loader.py serve` runs one long-lived loader; the CLI (and this
+module's client) send requests to it and fall back to in-process
+search when no daemon is listening.
+
+Protocol: one request per connection, newline-terminated JSON both ways.
+    → {"op": "context", "args": {"advisor": "lenny", "query": "pricing"}}
+    ← {"ok": true, "result": "..."}     or {"ok": false, "error": "..."}
+Ops: ping, search, context, consult.
+
+When any toolkit module the daemon has imported (kb_loader.py, kb_index.py,
+...) changes on disk, the request that notices it falls back and the
+daemon re-execs itself with the same command line, so ADVISORS and index
+edits are never served stale and no one has to run `serve` again.
+
+This module imports nothing heavy at top level: hook callers can use
+`python3 kb_daemon.py context --advisor X --query Y` and only import
+kb_loader when the daemon isn't running.
+
+Usage:
+    python3 kb_loader.py serve                  # Start daemon (foreground)
+    python3 kb_daemon.py ping                   # Check daemon
+    python3 kb_daemon.py context --advisor lenny --query "pricing"
+"""
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+KB_DAEMON_SOCKET = Path("~/.claude/.locks/kb-loader.sock").expanduser()
+KB_DAEMON_CONNECT_TIMEOUT = 0.5  # Seconds; a dead socket must fail fast
+KB_DAEMON_TIMEOUT = 30  # Seconds per query (may include an index refresh)
+KB_DAEMON_RESTART_DELAY = 0.5  # Seconds; lets an editor finish writing before re-exec
+
+
+# ── Client ──────────────────────────────────────────────────────
+
+
+def request(op: str, socket_path=None, timeout: float = KB_DAEMON_TIMEOUT, **args):
+    """Send one request to the daemon. Returns the result, or None if unavailable.
+
+    None covers every failure (no socket, refused, timeout, daemon-side
+    error) so callers can simply fall back to an in-process KBLoader.
+    """
+    path = Path(socket_path) if socket_path else KB_DAEMON_SOCKET
+    if not path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(KB_DAEMON_CONNECT_TIMEOUT)
+            sock.connect(str(path))
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps({"op": op, "args": args}).encode() + b"\n")
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+        reply = json.loads(buf)
+    except (OSError, ValueError):
+        return None
+    if not reply.get("ok"):
+        return None
+    return reply.get("result")
+
+
+# ── Server ──────────────────────────────────────────────────────
+
+
+def _dispatch(loader, op: str, args: dict):
+    if op == "ping":
+        return {"pid": os.getpid()}
+    if op == "search":
+        return loader.search(
+            args["advisor"],
+            args["query"],
+            max_results=args.get("max_results", 5),
+            ranking=args.get("ranking", "weighted"),
+        )
+    if op == "context":
+        return loader.get_context(
+            args["advisor"],
+            args["query"],
+            max_tokens=args.get("max_tokens", 4000),
+            max_results=args.get("max_results", 5),
+            ranking=args.get("ranking", "weighted"),
+        )
+    if op == "consult":
+        return loader.get_context_many(
+            args["advisors"],
+            args["query"],
+            max_tokens=args.get("max_tokens", 8000),
+            max_results=args.get("max_results", 5),
+            ranking=args.get("ranking", "weighted"),
+        )
+    raise ValueError(f"unknown op {op!r}")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        try:
+            msg = json.loads(self.rfile.readline())
+            if server.source_changed():
+                reply = {"ok": False, "error": "KB modules changed; daemon restarting"}
+                server.stale = True
+            else:
+                result = _dispatch(server.loader, msg.get("op"), msg.get("args") or {})
+                reply = {"ok": True, "result": result}
+        except Exception as e:  # Reported to the client, never kills the daemon
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+        if server.stale:
+            # shutdown() blocks until serve_forever exits; can't call it inline
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+
+class KBDaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, loader, socket_path, source_files: Iterable[Path] = ()):
+        self.loader = loader
+        self.stale = False
+        self.source_mtimes = {Path(f): Path(f).stat().st_mtime for f in source_files}
+        super().__init__(str(socket_path), _Handler)
+        os.chmod(str(socket_path), 0o600)
+
+    def source_changed(self) -> bool:
+        for path, mtime in self.source_mtimes.items():
+            try:
+                if path.stat().st_mtime != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+
+def local_sources() -> list:
+    """Source files of loaded modules that live next to this one (kb_loader,
+    kb_index, kb_daemon, ...): the code a daemon would serve stale."""
+    here = Path(__file__).resolve().parent
+    sources = []
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and path.endswith(".py") and Path(path).resolve().parent == here:
+            sources.append(Path(path).resolve())
+    return sorted(set(sources))
+
+
+def make_server(loader, socket_path=None, source_files: Iterable[Path] = ()) -> KBDaemonServer:
+    """Bind a daemon for loader, replacing a stale socket file if nobody is listening."""
+    path = Path(socket_path) if socket_path else KB_DAEMON_SOCKET
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        if request("ping", socket_path=path, timeout=KB_DAEMON_CONNECT_TIMEOUT) is not None:
+            raise RuntimeError(f"KB daemon already running on {path}")
+        path.unlink()
+    return KBDaemonServer(loader, path, source_files=source_files)
+
+
+def serve(loader, socket_path=None, source_files: Optional[Iterable[Path]] = None,
+          restart_argv: Optional[list] = None) -> None:
+    """Run the daemon in the foreground until SIGTERM/SIGINT.
+
+    source_files defaults to local_sources(). When one changes, the daemon
+    shuts down and re-execs restart_argv (default: this process's command
+    line) so the new code is loaded.
+    """
+    path = Path(socket_path) if socket_path else KB_DAEMON_SOCKET
+    if source_files is None:
+        source_files = local_sources()
+    server = make_server(loader, path, source_files=source_files)
+
+    def _stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _stop)
+    # Warm caches before accepting queries
+    t0 = time.time()
+    loader._get_index()
+    print(f"KB daemon listening on {path} (pid {os.getpid()}, warm in {time.time() - t0:.2f}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
+    if server.stale:
+        argv = restart_argv or [sys.executable, *sys.argv]
+        print("KB modules changed; restarting daemon", flush=True)
+        time.sleep(KB_DAEMON_RESTART_DELAY)
+        os.execv(argv[0], argv)
+
+
+# ── Lightweight CLI for hooks ───────────────────────────────────
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="KB daemon client (falls back to in-process)")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("ping", help="Check whether the daemon is running")
+    cp = sub.add_parser("context", help="Formatted context for prompt injection")
+    cp.add_argument("--advisor", required=True)
+    cp.add_argument("--query", required=True)
+    cp.add_argument("--max-tokens", type=int, default=4000)
+    cp.add_argument("--ranking", default="weighted")
+    args = parser.parse_args()
+
+    if args.command == "ping":
+        result = request("ping", timeout=KB_DAEMON_CONNECT_TIMEOUT)
+        print(f"running (pid {result['pid']})" if result else "not running")
+        sys.exit(0 if result else 1)
+    elif args.command == "context":
+        kwargs = dict(
+            advisor=args.advisor,
+            query=args.query,
+            max_tokens=args.max_tokens,
+            ranking=args.ranking,
+        )
+        result = request("context", **kwargs)
+        if result is None:
+            sys.path.insert(0, str(Path(__file__).parent))
+            from kb_loader import KBLoader
+
+            result = KBLoader().get_context(**kwargs)
+        print(result)
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
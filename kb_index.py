@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""KB Search Index - persistent inverted index for kb_loader searches.
+
+Replaces the per-term `rg -l -i` fan-out in KBLoader.search with an
+on-disk SQLite index: term → posting list of (article, term frequency).
+Each article_dir is indexed separately and refreshed incrementally from
+file mtimes/sizes, so only new or changed articles are re-tokenized.
+
+Matching keeps rg semantics: a query term matches every article containing
+it as a case-insensitive substring. Terms are resolved against the
+vocabulary (substring scan in SQLite), then posting lists are joined.
+Terms that span token boundaries (e.g. "e-commerce") are not indexable —
+callers fall back to a file scan for those.
+
+The same DB holds an article metadata cache (title/author/date/year/source,
+excerpt, content hash) keyed by path + mtime, so ranking and excerpting
+top results needs a stat instead of a read on warm queries.
+
+No external dependencies -- stdlib only.
+
+Usage:
+    python3 kb_index.py rebuild DIR [DIR ...]   # Full rebuild of given dirs
+    python3 kb_index.py refresh DIR [DIR ...]   # Incremental mtime refresh
+    python3 kb_index.py stats                   # Index size summary
+
+    # From Python
+    from kb_index import KBIndex
+    index = KBIndex()
+    index.ensure_fresh([Path("~/Development/nngroup/articles").expanduser()])
+    rows = index.lookup("usability", [Path(...)])   # [(path, tf, length), ...]
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+KB_INDEX_PATH = Path("~/.claude/.locks/kb-search-index.db").expanduser()
+KB_INDEX_REFRESH_SECONDS = 300  # Re-stat a dir at most every 5 min
+KB_INDEX_SCHEMA_VERSION = 2
+
+# Same notion of "word" the index stores. Query terms that are not a single
+# token under this regex can't be answered from the index.
+TOKEN_RE = re.compile(r"\w+")
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (
+        key     TEXT PRIMARY KEY,
+        value   TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS dirs (
+        id          INTEGER PRIMARY KEY,
+        path        TEXT NOT NULL UNIQUE,
+        last_scan   REAL NOT NULL DEFAULT 0,
+        doc_count   INTEGER NOT NULL DEFAULT 0,
+        total_length INTEGER NOT NULL DEFAULT 0
+    );
+
+    CREATE TABLE IF NOT EXISTS docs (
+        id          INTEGER PRIMARY KEY,
+        dir_id      INTEGER NOT NULL,
+        path        TEXT NOT NULL,
+        mtime_ns    INTEGER NOT NULL,
+        size        INTEGER NOT NULL,
+        length      INTEGER NOT NULL DEFAULT 0,
+        UNIQUE (dir_id, path)
+    );
+
+    CREATE TABLE IF NOT EXISTS terms (
+        id      INTEGER PRIMARY KEY,
+        term    TEXT NOT NULL UNIQUE
+    );
+
+    CREATE TABLE IF NOT EXISTS postings (
+        term_id INTEGER NOT NULL,
+        doc_id  INTEGER NOT NULL,
+        tf      INTEGER NOT NULL,
+        PRIMARY KEY (term_id, doc_id)
+    ) WITHOUT ROWID;
+
+    CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(doc_id);
+
+    -- Parsed article metadata + excerpt, valid while (mtime_ns, size) match.
+    -- Keyed by excerpt_lines too since advisors excerpt at different lengths.
+    CREATE TABLE IF NOT EXISTS article_meta (
+        path            TEXT NOT NULL,
+        excerpt_lines   INTEGER NOT NULL,
+        mtime_ns        INTEGER NOT NULL,
+        size            INTEGER NOT NULL,
+        content_hash    TEXT NOT NULL,
+        title           TEXT,
+        author          TEXT,
+        date            TEXT,
+        year            INTEGER,
+        source          TEXT,
+        excerpt         TEXT,
+        PRIMARY KEY (path, excerpt_lines)
+    );
+"""
+
+_META_FIELDS = ("title", "author", "date", "year", "source", "excerpt", "content_hash")
+
+
+def tokenize(text: str) -> Counter:
+    """Lowercase word tokens with counts."""
+    return Counter(TOKEN_RE.findall(text.lower()))
+
+
+def is_indexable(term: str) -> bool:
+    """True if the index can answer this term (single token, no punctuation)."""
+    return bool(term) and TOKEN_RE.fullmatch(term.lower()) is not None
+
+
+def _walk_markdown(article_dir: Path) -> dict[str, tuple[int, int]]:
+    """Map every visible .md file under article_dir → (mtime_ns, size).
+
+    Mirrors rg's defaults: hidden files/dirs skipped, symlinks not followed.
+    Paths are built the same way rg prints them (str(dir)/relative).
+    """
+    found = {}
+    for root, dirnames, filenames in os.walk(str(article_dir)):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in filenames:
+            if name.startswith(".") or not name.endswith(".md"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            found[path] = (st.st_mtime_ns, st.st_size)
+    return found
+
+
+class KBIndex:
+    """SQLite-backed inverted index over advisor article directories."""
+
+    def __init__(self, db_path=None, refresh_seconds: int = KB_INDEX_REFRESH_SECONDS):
+        self.db_path = Path(db_path).expanduser() if db_path else KB_INDEX_PATH
+        self.refresh_seconds = refresh_seconds
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._init_schema()
+
+    # ------------------------------------------------------------------
+    # Connection / schema
+    # ------------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections aren't shareable)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+        if row is None or int(row[0]) != KB_INDEX_SCHEMA_VERSION:
+            # Unknown/old layout -- start clean rather than misread postings
+            conn.executescript(
+                "DROP TABLE IF EXISTS postings; DROP TABLE IF EXISTS docs;"
+                "DROP TABLE IF EXISTS terms; DROP TABLE IF EXISTS dirs;"
+            )
+            conn.executescript(_SCHEMA)
+            conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('schema', ?)",
+                (str(KB_INDEX_SCHEMA_VERSION),),
+            )
+        conn.commit()
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _dir_row(self, article_dir: Path, create: bool = False) -> Optional[tuple[int, float]]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT id, last_scan FROM dirs WHERE path = ?", (str(article_dir),)
+        ).fetchone()
+        if row is None and create:
+            cur = conn.execute("INSERT INTO dirs(path) VALUES (?)", (str(article_dir),))
+            return cur.lastrowid, 0.0
+        return row
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def refresh(self, article_dir: Path, force: bool = False) -> dict:
+        """Bring one article_dir up to date. Returns counts of added/updated/removed.
+
+        Skipped (no stat walk) when the dir was scanned less than
+        refresh_seconds ago, unless force=True.
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0, "skipped": False}
+        if not article_dir.exists():
+            return stats
+
+        with self._write_lock:
+            conn = self._conn()
+            dir_id, last_scan = self._dir_row(article_dir, create=True)
+            if not force and time.time() - last_scan < self.refresh_seconds:
+                conn.commit()
+                stats["skipped"] = True
+                return stats
+
+            on_disk = _walk_markdown(article_dir)
+            known = {
+                path: (doc_id, mtime_ns, size)
+                for doc_id, path, mtime_ns, size in conn.execute(
+                    "SELECT id, path, mtime_ns, size FROM docs WHERE dir_id = ?", (dir_id,)
+                )
+            }
+
+            for path in known.keys() - on_disk.keys():
+                doc_id = known[path][0]
+                conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+                conn.execute("DELETE FROM article_meta WHERE path = ?", (path,))
+            stats["removed"] = len(known.keys() - on_disk.keys())
+
+            vocab: Optional[dict[str, int]] = None
+            for path, (mtime_ns, size) in on_disk.items():
+                prev = known.get(path)
+                if prev and prev[1] == mtime_ns and prev[2] == size:
+                    continue
+                try:
+                    with open(path, encoding="utf-8", errors="replace") as f:
+                        counts = tokenize(f.read())
+                except OSError:
+                    continue
+                if vocab is None:
+                    vocab = dict(conn.execute("SELECT term, id FROM terms"))
+
+                if prev:
+                    doc_id = prev[0]
+                    conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                    conn.execute(
+                        "UPDATE docs SET mtime_ns = ?, size = ?, length = ? WHERE id = ?",
+                        (mtime_ns, size, sum(counts.values()), doc_id),
+                    )
+                    stats["updated"] += 1
+                else:
+                    cur = conn.execute(
+                        "INSERT INTO docs(dir_id, path, mtime_ns, size, length) VALUES (?, ?, ?, ?, ?)",
+                        (dir_id, path, mtime_ns, size, sum(counts.values())),
+                    )
+                    doc_id = cur.lastrowid
+                    stats["added"] += 1
+
+                postings = []
+                for term, tf in counts.items():
+                    term_id = vocab.get(term)
+                    if term_id is None:
+                        term_id = conn.execute(
+                            "INSERT INTO terms(term) VALUES (?)", (term,)
+                        ).lastrowid
+                        vocab[term] = term_id
+                    postings.append((term_id, doc_id, tf))
+                conn.executemany(
+                    "INSERT INTO postings(term_id, doc_id, tf) VALUES (?, ?, ?)", postings
+                )
+
+            # Corpus stats for BM25 (N, avgdl) -- kept alongside the postings
+            conn.execute(
+                """
+                UPDATE dirs SET last_scan = ?,
+                    doc_count = (SELECT COUNT(*) FROM docs WHERE dir_id = ?),
+                    total_length = (SELECT COALESCE(SUM(length), 0) FROM docs WHERE dir_id = ?)
+                WHERE id = ?
+                """,
+                (time.time(), dir_id, dir_id, dir_id),
+            )
+            conn.commit()
+        return stats
+
+    def ensure_fresh(self, article_dirs: Iterable[Path]) -> None:
+        """Incrementally refresh every dir whose last scan is older than refresh_seconds."""
+        for article_dir in article_dirs:
+            try:
+                self.refresh(article_dir)
+            except sqlite3.Error:
+                # Lookups on this dir fall back to whatever is indexed
+                continue
+
+    def rebuild(self, article_dirs: Iterable[Path]) -> dict:
+        """Drop and re-index the given dirs from scratch."""
+        totals = {"dirs": 0, "docs": 0}
+        for article_dir in article_dirs:
+            with self._write_lock:
+                conn = self._conn()
+                row = self._dir_row(article_dir)
+                if row is not None:
+                    conn.execute(
+                        "DELETE FROM postings WHERE doc_id IN (SELECT id FROM docs WHERE dir_id = ?)",
+                        (row[0],),
+                    )
+                    conn.execute("DELETE FROM docs WHERE dir_id = ?", (row[0],))
+                    conn.execute("DELETE FROM dirs WHERE id = ?", (row[0],))
+                    conn.commit()
+            stats = self.refresh(article_dir, force=True)
+            if article_dir.exists():
+                totals["dirs"] += 1
+                totals["docs"] += stats["added"]
+        # Orphaned vocabulary only costs scan time; drop it on full rebuilds
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute(
+                "DELETE FROM terms WHERE id NOT IN (SELECT DISTINCT term_id FROM postings)"
+            )
+            conn.commit()
+        return totals
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def is_indexed(self, article_dir: Path) -> bool:
+        row = self._dir_row(article_dir)
+        return row is not None and row[1] > 0
+
+    def corpus_stats(self, article_dirs: Iterable[Path]) -> tuple[int, float]:
+        """(document count, average document length in tokens) across indexed dirs."""
+        docs = length = 0
+        for d in article_dirs:
+            row = self._conn().execute(
+                "SELECT doc_count, total_length FROM dirs WHERE path = ?", (str(d),)
+            ).fetchone()
+            if row:
+                docs += row[0]
+                length += row[1]
+        return docs, (length / docs if docs else 0.0)
+
+    def lookup(
+        self, term: str, article_dirs: Iterable[Path], exact_tf: bool = False
+    ) -> list[tuple[str, int, int]]:
+        """Return (path, tf, doc length) for every indexed article containing term.
+
+        Articles match when any token contains term (the rg -i candidate set).
+        tf sums the counts of all vocabulary tokens the term matched; with
+        exact_tf it counts only tokens equal to term, so an article that
+        matched through e.g. "said" for "ai" reports tf=0. One row per
+        (dir, article), so overlapping article_dirs report a file twice —
+        same as running rg once per dir.
+        """
+        dir_ids = []
+        for d in article_dirs:
+            row = self._dir_row(d)
+            if row is not None:
+                dir_ids.append(row[0])
+        if not dir_ids or not is_indexable(term):
+            return []
+
+        term = term.lower()
+        placeholders = ",".join("?" * len(dir_ids))
+        tf = "SUM(CASE WHEN t.term = ? THEN p.tf ELSE 0 END)" if exact_tf else "SUM(p.tf)"
+        return self._conn().execute(
+            f"""
+            SELECT d.path, {tf}, d.length
+            FROM terms t
+            JOIN postings p ON p.term_id = t.id
+            JOIN docs d ON d.id = p.doc_id
+            WHERE instr(t.term, ?) > 0 AND d.dir_id IN ({placeholders})
+            GROUP BY d.id
+            """,
+            ((term,) if exact_tf else ()) + (term, *dir_ids),
+        ).fetchall()
+
+    # ------------------------------------------------------------------
+    # Article metadata cache
+    # ------------------------------------------------------------------
+
+    def get_article_meta(
+        self, path: str, excerpt_lines: int, mtime_ns: int, size: int
+    ) -> Optional[dict]:
+        """Cached metadata for path, or None if missing or the file changed since."""
+        row = self._conn().execute(
+            f"""
+            SELECT mtime_ns, size, {", ".join(_META_FIELDS)}
+            FROM article_meta WHERE path = ? AND excerpt_lines = ?
+            """,
+            (path, excerpt_lines),
+        ).fetchone()
+        if row is None or row[0] != mtime_ns or row[1] != size:
+            return None
+        return dict(zip(_META_FIELDS, row[2:]))
+
+    def put_article_meta(
+        self, path: str, excerpt_lines: int, mtime_ns: int, size: int, meta: dict
+    ) -> None:
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute(
+                f"""
+                INSERT OR REPLACE INTO article_meta
+                    (path, excerpt_lines, mtime_ns, size, {", ".join(_META_FIELDS)})
+                VALUES (?, ?, ?, ?, {", ".join("?" * len(_META_FIELDS))})
+                """,
+                (path, excerpt_lines, mtime_ns, size, *(meta.get(f) for f in _META_FIELDS)),
+            )
+            conn.commit()
+
+    def stats(self) -> dict:
+        conn = self._conn()
+        return {
+            "dirs": conn.execute("SELECT COUNT(*) FROM dirs").fetchone()[0],
+            "docs": conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0],
+            "terms": conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0],
+            "postings": conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0],
+            "meta": conn.execute("SELECT COUNT(*) FROM article_meta").fetchone()[0],
+            "db_bytes": self.db_path.stat().st_size if self.db_path.exists() else 0,
+        }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="KB inverted search index")
+    sub = parser.add_subparsers(dest="command")
+    rp = sub.add_parser("rebuild", help="Rebuild index for dirs from scratch")
+    rp.add_argument("dirs", nargs="+")
+    fp = sub.add_parser("refresh", help="Incrementally refresh dirs")
+    fp.add_argument("dirs", nargs="+")
+    sub.add_parser("stats", help="Show index size")
+    args = parser.parse_args()
+
+    index = KBIndex()
+    if args.command == "rebuild":
+        t0 = time.time()
+        totals = index.rebuild(Path(d).expanduser() for d in args.dirs)
+        print(f"Indexed {totals['docs']} articles in {totals['dirs']} dirs ({time.time() - t0:.1f}s)")
+    elif args.command == "refresh":
+        for d in args.dirs:
+            s = index.refresh(Path(d).expanduser(), force=True)
+            print(f"{d}: +{s['added']} ~{s['updated']} -{s['removed']}")
+    elif args.command == "stats":
+        for k, v in index.stats().items():
+            print(f"  {k:<10} {v}")
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,14 +11,22 @@ Usage:
     python3 kb_loader.py search --advisor cherie --query "AI music tools"
     python3 kb_loader.py list                    # Show all advisors and article counts
     python3 kb_loader.py context --advisor lenny --query "pricing" --max-tokens 4000
+    python3 kb_loader.py consult --advisors lenny,cherie --query "pricing"
+    python3 kb_loader.py --rebuild-index         # Rebuild persistent search index
+    python3 kb_loader.py serve                   # Warm query daemon (CLI uses it when up)
 
     # From Python
     from kb_loader import KBLoader
     loader = KBLoader()
     context = loader.get_context("lenny", "product market fit", max_tokens=4000)
+    merged = loader.get_context_many(["lenny", "cherie"], "pricing", max_tokens=8000)
 """
 
+import hashlib
 import json
+import math
+import os
+import sqlite3
 import statistics
 import subprocess
 import re
@@ -28,6 +36,20 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+# Optional: query daemon client (CLI answers from a warm daemon when running)
+try:
+    import kb_daemon
+    HAS_DAEMON = True
+except ImportError:
+    HAS_DAEMON = False
+
+# Optional: persistent inverted index (falls back to rg/grep scans)
+try:
+    from kb_index import KBIndex, is_indexable
+    HAS_INDEX = True
+except ImportError:
+    HAS_INDEX = False
+
 
 # ── Advisor → Knowledge Base Mapping ────────────────────────────────
 ADVISORS = {
@@ -2521,6 +2543,21 @@ QUERY_SYNONYMS = {
 }
 
 
+# ── Ranking ────────────────────────────────────────────────────
+# "weighted": sum of expanded-term weights for each term a file contains.
+# "bm25": Okapi BM25 over index postings (tf + doc length), scaled by the
+#         same expanded-term weights. Needs the search index; falls back
+#         to "weighted" when no dir is indexed.
+RANKING_MODES = ("weighted", "bm25")
+DEFAULT_RANKING = "weighted"
+BM25_K1 = 1.2  # Term-frequency saturation
+BM25_B = 0.75  # Document-length normalization
+
+
+# ── Multi-Advisor Consults ─────────────────────────────────────
+MAX_PARALLEL_ADVISORS = 6  # Worker threads for get_context_many()
+
+
 # ── Confidence Gating ──────────────────────────────────────────
 MIN_HITS_FOR_CONFIDENCE = 3  # Below this, show low-confidence warning
 MIN_KB_ARTICLES = 25  # Below this, show degraded KB warning
@@ -2534,6 +2571,8 @@ class KBLoader:
         self.aliases = ALIASES
         self._craft_cache = {}
         self._ghostwriter_slugs = None
+        self._index = None  # KBIndex, opened lazily; False = unavailable
+        self._source_profiles: dict[str, tuple] = {}
         # Build blended weights on first use (cached to disk for 24h)
         if not SOURCE_WEIGHTS:
             SOURCE_WEIGHTS.update(_build_blended_weights())
@@ -2585,11 +2624,23 @@ class KBLoader:
 
         return expanded
 
-    def search(self, advisor: str, query: str, max_results: int = 5) -> list[dict]:
+    def search(
+        self,
+        advisor: str,
+        query: str,
+        max_results: int = 5,
+        ranking: str = DEFAULT_RANKING,
+        expanded_terms: Optional[list[tuple[str, float]]] = None,
+    ) -> list[dict]:
         """Search an advisor's KB for articles matching query.
 
+        ranking: "weighted" (term-presence weights) or "bm25" (see RANKING_MODES).
+        expanded_terms: precomputed _expand_query_terms(query), to share one
+            expansion across several advisors.
         Returns list of dicts with: path, title, author, relevance_score, excerpt
         """
+        if ranking not in RANKING_MODES:
+            raise ValueError(f"Unknown ranking {ranking!r} (expected one of {RANKING_MODES})")
         key = self.resolve_advisor(advisor)
         if not key:
             return []
@@ -2599,47 +2650,33 @@ class KBLoader:
         weighted_matches: dict[str, float] = {}
 
         # Expand query into weighted terms
-        expanded_terms = self._expand_query_terms(query)
+        if expanded_terms is None:
+            expanded_terms = self._expand_query_terms(query)
         # Keep raw terms for dynamic weight computation
         raw_terms = query.lower().split()
 
-        for article_dir in config["article_dirs"]:
-            if not article_dir.exists():
-                continue
+        article_dirs = [d for d in config["article_dirs"] if d.exists()]
+        index = self._get_index()
+        if index:
+            index.ensure_fresh(article_dirs)
 
-            import re as _re
+        doc_count, avg_length = (
+            index.corpus_stats(article_dirs) if index and ranking == "bm25" else (0, 0.0)
+        )
+        if not doc_count:
+            ranking = "weighted"
 
-            for term, weight in expanded_terms:
-                safe_term = _re.escape(term)
-                try:
-                    result = subprocess.run(
-                        ["rg", "-l", "-i", safe_term, str(article_dir)],
-                        capture_output=True,
-                        text=True,
-                        timeout=10,
-                    )
-                    if result.returncode == 0:
-                        for path in result.stdout.strip().split("\n"):
-                            if path and path.endswith(".md"):
-                                weighted_matches[path] = (
-                                    weighted_matches.get(path, 0) + weight
-                                )
-                except (FileNotFoundError, subprocess.TimeoutExpired):
-                    try:
-                        result = subprocess.run(
-                            ["grep", "-rl", "-i", safe_term, str(article_dir)],
-                            capture_output=True,
-                            text=True,
-                            timeout=10,
-                        )
-                        if result.returncode == 0:
-                            for path in result.stdout.strip().split("\n"):
-                                if path and path.endswith(".md"):
-                                    weighted_matches[path] = (
-                                        weighted_matches.get(path, 0) + weight
-                                    )
-                    except subprocess.TimeoutExpired:
-                        pass
+        for term, weight in expanded_terms:
+            postings = self._find_term_matches(
+                term, article_dirs, index, exact_tf=ranking == "bm25"
+            )
+            if ranking == "bm25":
+                term_scores = self._bm25_term_scores(postings, doc_count, avg_length)
+                for path, term_score in term_scores.items():
+                    weighted_matches[path] = weighted_matches.get(path, 0) + weight * term_score
+            else:
+                for path, _tf, _length in postings:
+                    weighted_matches[path] = weighted_matches.get(path, 0) + weight
 
         # Score by weighted frequency * dynamic weight (quality × domain relevance)
         scored = sorted(
@@ -2651,7 +2688,7 @@ class KBLoader:
         top_candidates = scored[:20]
         if top_candidates:
             recency_scored = [
-                (path, score * self._compute_recency_boost(path))
+                (path, score * self._compute_recency_boost(path, config["excerpt_lines"]))
                 for path, score in top_candidates
             ]
             recency_scored.sort(key=lambda x: -x[1])
@@ -2677,6 +2714,110 @@ class KBLoader:
 
         return results
 
+    def _get_index(self):
+        """Open the persistent search index once per loader. None if unavailable."""
+        if self._index is None:
+            self._index = False
+            if HAS_INDEX:
+                try:
+                    self._index = KBIndex()
+                except sqlite3.Error:
+                    pass
+        return self._index or None
+
+    def rebuild_index(self) -> dict:
+        """Rebuild the search index for every advisor's article_dirs."""
+        index = self._get_index()
+        if not index:
+            return {"dirs": 0, "docs": 0}
+        dirs = []
+        for config in self.advisors.values():
+            for d in config["article_dirs"]:
+                if d not in dirs:
+                    dirs.append(d)
+        return index.rebuild(dirs)
+
+    @staticmethod
+    def _bm25_term_scores(
+        postings: list[tuple], doc_count: int, avg_length: float
+    ) -> dict[str, float]:
+        """BM25 contribution of one query term for each matching path.
+
+        tf and df count exact-token occurrences; articles that only matched
+        as a substring (tf=0) stay candidates with a zero contribution. Scan
+        fallbacks carry no tf/length, so they score as tf=1 at average length.
+        """
+        df = len({path for path, tf, _length in postings if tf})
+        idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+        scores: dict[str, float] = {}
+        for path, tf, length in postings:
+            if not tf:
+                scores.setdefault(path, 0.0)
+                continue
+            if length is None:
+                length = avg_length
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (avg_length or 1.0))
+            scores[path] = scores.get(path, 0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def _find_term_matches(
+        self, term: str, article_dirs: list[Path], index=None, exact_tf: bool = False
+    ) -> list[tuple[str, int, Optional[int]]]:
+        """(path, tf, length) for .md files under article_dirs containing term.
+
+        Answered from the inverted index when the term is a single token and
+        the dir is indexed (exact_tf: tf counts whole-token matches only, see
+        KBIndex.lookup); otherwise falls back to one rg/grep scan per dir,
+        which reports tf=1 and no length.
+        """
+        if not index or not is_indexable(term):
+            scan_dirs = article_dirs
+            paths = []
+        else:
+            scan_dirs = []
+            indexed = []
+            for d in article_dirs:
+                (indexed if index.is_indexed(d) else scan_dirs).append(d)
+            try:
+                paths = index.lookup(term, indexed, exact_tf=exact_tf)
+            except sqlite3.Error:
+                scan_dirs = article_dirs
+                paths = []
+
+        for article_dir in scan_dirs:
+            paths.extend((path, 1, None) for path in self._scan_term(term, article_dir))
+        return paths
+
+    @staticmethod
+    def _scan_term(term: str, article_dir: Path) -> list[str]:
+        """Fallback: list .md files containing term via rg (or grep)."""
+        safe_term = re.escape(term)
+        for cmd in (
+            ["rg", "-l", "-i", safe_term, str(article_dir)],
+            ["grep", "-rl", "-i", safe_term, str(article_dir)],
+        ):
+            try:
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    timeout=10,
+                )
+            except FileNotFoundError:
+                continue
+            except subprocess.TimeoutExpired:
+                if cmd[0] == "rg":
+                    continue
+                return []
+            if result.returncode != 0:
+                return []
+            return [
+                path
+                for path in result.stdout.strip().split("\n")
+                if path and path.endswith(".md")
+            ]
+        return []
+
     def _get_craft_weight(self, path: str) -> float:
         """Look up song_weight from craft_index.json for a ghostwriter article path."""
         if "ghostwriter/articles" not in path:
@@ -2783,8 +2924,27 @@ class KBLoader:
                 return weight
         return 1.0  # default weight for unlisted sources
 
-    @staticmethod
-    def _compute_dynamic_weight(path: str, query_terms: list[str]) -> float:
+    def _get_source_profile(self, path: str) -> tuple[float, list[list[str]]]:
+        """Static quality weight + matching SOURCE_DOMAINS keyword lists for a path.
+
+        Depends only on the path, so it's memoized per loader instead of
+        re-scanning SOURCE_WEIGHTS/SOURCE_DOMAINS for every candidate.
+        """
+        profile = self._source_profiles.get(path)
+        if profile is None:
+            base_weight = 1.0
+            for source_key, weight in SOURCE_WEIGHTS.items():
+                if source_key in path:
+                    base_weight = weight
+                    break
+            domains = [
+                keywords for source_key, keywords in SOURCE_DOMAINS.items()
+                if source_key in path
+            ]
+            profile = self._source_profiles[path] = (base_weight, domains)
+        return profile
+
+    def _compute_dynamic_weight(self, path: str, query_terms: list[str]) -> float:
         """Compute context-aware weight: static quality + domain relevance.
 
         Uses ADDITIVE combination so domain relevance can rescue low-base-weight
@@ -2796,21 +2956,14 @@ class KBLoader:
 
         Note: query_terms are lowercased internally for case-insensitive matching.
         """
-        # Start with the static quality weight
-        base_weight = 1.0
-        for source_key, weight in SOURCE_WEIGHTS.items():
-            if source_key in path:
-                base_weight = weight
-                break
+        base_weight, domains = self._get_source_profile(path)
 
         # Normalize query terms to lowercase for case-insensitive matching
         query_lower = [qt.lower() for qt in query_terms]
 
         # Check domain relevance — additive boost independent of base weight
         best_boost = 0.0
-        for source_key, domain_keywords in SOURCE_DOMAINS.items():
-            if source_key not in path:
-                continue
+        for domain_keywords in domains:
             # Count query terms that match this source's domain
             hits = 0
             for qt in query_lower:
@@ -2831,6 +2984,53 @@ class KBLoader:
 
     def _read_article(self, path: str, excerpt_lines: int) -> Optional[dict]:
         """Read article metadata and excerpt."""
+        meta = self._get_article_meta(path, excerpt_lines)
+        if not meta:
+            return None
+        return {
+            "path": path,
+            "title": meta["title"],
+            "author": meta["author"],
+            "date": meta["date"],
+            "source": meta["source"],
+            "excerpt": meta["excerpt"],
+        }
+
+    def _get_article_meta(self, path: str, excerpt_lines: int) -> Optional[dict]:
+        """Parsed metadata, excerpt and recency year for path.
+
+        Served from the index's metadata cache while the file's mtime/size
+        are unchanged (one stat, no read); otherwise parsed and re-cached.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        index = self._get_index()
+        if index:
+            try:
+                cached = index.get_article_meta(
+                    path, excerpt_lines, st.st_mtime_ns, st.st_size
+                )
+                if cached:
+                    return cached
+            except sqlite3.Error:
+                index = None
+
+        meta = self._parse_article(path, excerpt_lines)
+        if meta and index:
+            try:
+                index.put_article_meta(
+                    path, excerpt_lines, st.st_mtime_ns, st.st_size, meta
+                )
+            except sqlite3.Error:
+                pass
+        return meta
+
+    @staticmethod
+    def _parse_article(path: str, excerpt_lines: int) -> Optional[dict]:
+        """Read a file once: frontmatter metadata, cleaned excerpt, recency year, hash."""
         try:
             p = Path(path)
             content = p.read_text(encoding="utf-8", errors="replace")
@@ -2887,66 +3087,66 @@ class KBLoader:
             excerpt = re.sub(r"\n{3,}", "\n\n", excerpt)  # Collapse blank lines
 
             return {
-                "path": path,
                 "title": metadata.get("title", metadata.get("guest", p.stem)),
                 "author": metadata.get("author", metadata.get("guest", "Unknown")),
                 "date": metadata.get(
                     "date",
                     metadata.get("publish_date", metadata.get("date_published", "")),
                 ),
+                "year": KBLoader._extract_recency_year(lines[:20]),
                 "source": metadata.get("source", ""),
                 "excerpt": excerpt,
+                "content_hash": hashlib.md5(
+                    content.encode("utf-8", errors="replace")
+                ).hexdigest(),
             }
         except Exception:
             return None
 
     @staticmethod
-    def _compute_recency_boost(path: str) -> float:
-        """Compute recency multiplier from article date in YAML frontmatter.
+    def _extract_recency_year(lines: list[str]) -> Optional[int]:
+        """Publication year from the first lines of an article, if present."""
+        date_str = None
+        for line in lines:
+            stripped = line.strip()
+            # YAML frontmatter: date: 2024-01-15 or date: "January 2024"
+            if (
+                stripped.startswith("date:")
+                or stripped.startswith("publish_date:")
+                or stripped.startswith("date_published:")
+            ):
+                date_str = stripped.split(":", 1)[1].strip().strip("\"'")
+                break
+            # Markdown format: **Date:** 2024-01-15
+            if stripped.startswith("**Date:**"):
+                date_str = stripped.replace("**Date:**", "").strip()
+                break
 
-        Returns: 1.2 (<1yr), 1.0 (1-3yr), 0.8 (>3yr), 1.0 (no date found).
-        Only reads first 20 lines to minimize I/O.
-        """
-        try:
-            p = Path(path)
-            lines = p.read_text(encoding="utf-8", errors="replace").split("\n")[:20]
-
-            date_str = None
-            for line in lines:
-                stripped = line.strip()
-                # YAML frontmatter: date: 2024-01-15 or date: "January 2024"
-                if (
-                    stripped.startswith("date:")
-                    or stripped.startswith("publish_date:")
-                    or stripped.startswith("date_published:")
-                ):
-                    date_str = stripped.split(":", 1)[1].strip().strip("\"'")
-                    break
-                # Markdown format: **Date:** 2024-01-15
-                if stripped.startswith("**Date:**"):
-                    date_str = stripped.replace("**Date:**", "").strip()
-                    break
+        if not date_str:
+            return None
 
-            if not date_str:
-                return 1.0
+        # Parse year from various date formats
+        year_match = re.search(r"20[12]\d", date_str)
+        return int(year_match.group()) if year_match else None
 
-            # Parse year from various date formats
-            year_match = re.search(r"20[12]\d", date_str)
-            if not year_match:
-                return 1.0
+    def _compute_recency_boost(self, path: str, excerpt_lines: int) -> float:
+        """Compute recency multiplier from article date in YAML frontmatter.
 
-            year = int(year_match.group())
-            current_year = datetime.now().year
-            age = current_year - year
+        Returns: 1.2 (<1yr), 1.0 (1-3yr), 0.8 (>3yr), 1.0 (no date found).
+        Year comes from the metadata cache, so warm queries don't read the file.
+        """
+        meta = self._get_article_meta(path, excerpt_lines)
+        year = meta.get("year") if meta else None
+        if not year:
+            return 1.0
 
-            if age < 1:
-                return 1.2
-            elif age <= 3:
-                return 1.0
-            else:
-                return 0.8
-        except (OSError, ValueError):
+        age = datetime.now().year - year
+        if age < 1:
+            return 1.2
+        elif age <= 3:
             return 1.0
+        else:
+            return 0.8
 
     @staticmethod
     def _suggest_alternates(query: str, current_advisor: str) -> list[str]:
@@ -2969,7 +3169,13 @@ class KBLoader:
         return suggestions[:3]
 
     def get_context(
-        self, advisor: str, query: str, max_tokens: int = 4000, max_results: int = 5
+        self,
+        advisor: str,
+        query: str,
+        max_tokens: int = 4000,
+        max_results: int = 5,
+        ranking: str = DEFAULT_RANKING,
+        expanded_terms: Optional[list[tuple[str, float]]] = None,
     ) -> str:
         """Get formatted context block ready for prompt injection.
 
@@ -3000,7 +3206,13 @@ class KBLoader:
         if config["index_dir"] and config["index_dir"].exists():
             index_context = self._search_index(config["index_dir"], query)
 
-        results = self.search(advisor, query, max_results=max_results)
+        results = self.search(
+            advisor,
+            query,
+            max_results=max_results,
+            ranking=ranking,
+            expanded_terms=expanded_terms,
+        )
 
         # Sprint 2.2: Confidence gating
         if len(results) < MIN_HITS_FOR_CONFIDENCE:
@@ -3067,6 +3279,67 @@ class KBLoader:
 
         return "\n".join(lines)
 
+    def get_context_many(
+        self,
+        advisors: list[str],
+        query: str,
+        max_tokens: int = 8000,
+        max_results: int = 5,
+        ranking: str = DEFAULT_RANKING,
+        max_workers: int = MAX_PARALLEL_ADVISORS,
+    ) -> str:
+        """Consult several advisors at once; one merged context block.
+
+        The query is expanded once and shared. Each advisor's search runs on a
+        bounded thread pool (index lookups and rg fallbacks release the GIL),
+        so wall-clock time tracks the slowest advisor rather than the sum.
+        max_tokens is the total budget, split evenly across advisors. Output
+        keeps the caller's advisor order; unknown advisors get their usual
+        "[No knowledge base found ...]" line.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Dedupe on canonical key so aliases of one advisor don't run twice
+        ordered: list[str] = []
+        seen = set()
+        for name in advisors:
+            key = self.resolve_advisor(name) or name
+            if key not in seen:
+                seen.add(key)
+                ordered.append(name)
+        if not ordered:
+            return ""
+
+        expanded_terms = self._expand_query_terms(query)
+        per_advisor = max(max_tokens // len(ordered), 1)
+        index = self._get_index()
+        if index:
+            # Refresh shared dirs once, up front, instead of racing per thread
+            dirs = []
+            for name in ordered:
+                key = self.resolve_advisor(name)
+                if key:
+                    dirs.extend(
+                        d for d in self.advisors[key]["article_dirs"]
+                        if d.exists() and d not in dirs
+                    )
+            index.ensure_fresh(dirs)
+
+        workers = max(1, min(max_workers, len(ordered)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            blocks = pool.map(
+                lambda name: self.get_context(
+                    name,
+                    query,
+                    max_tokens=per_advisor,
+                    max_results=max_results,
+                    ranking=ranking,
+                    expanded_terms=expanded_terms,
+                ),
+                ordered,
+            )
+            return "\n\n---\n\n".join(blocks)
+
     def _search_index(self, index_dir: Path, query: str) -> str:
         """Search topic index files (Lenny-specific)."""
         terms = query.lower().split()
@@ -3123,6 +3396,16 @@ def main():
     parser = argparse.ArgumentParser(
         description="Knowledge Base Loader for advisor agents"
     )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Search in-process even if the KB daemon is running",
+    )
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Rebuild the persistent search index for all advisors, then run command",
+    )
     sub = parser.add_subparsers(dest="command")
 
     # search
@@ -3132,43 +3415,139 @@ def main():
     )
     sp.add_argument("--query", required=True, help="Search query")
     sp.add_argument("--max", type=int, default=5, help="Max results")
+    sp.add_argument(
+        "--ranking", choices=RANKING_MODES, default=DEFAULT_RANKING, help="Scoring mode"
+    )
 
     # context (for prompt injection)
     cp = sub.add_parser("context", help="Get formatted context for prompt injection")
     cp.add_argument("--advisor", required=True, help="Advisor name")
     cp.add_argument("--query", required=True, help="Search query")
     cp.add_argument("--max-tokens", type=int, default=4000, help="Max token budget")
+    cp.add_argument(
+        "--ranking", choices=RANKING_MODES, default=DEFAULT_RANKING, help="Scoring mode"
+    )
+
+    # consult (several advisors, one query, in parallel)
+    mp = sub.add_parser("consult", help="Merged context from several advisors")
+    mp.add_argument(
+        "--advisors", required=True, help="Comma-separated advisor names"
+    )
+    mp.add_argument("--query", required=True, help="Search query")
+    mp.add_argument(
+        "--max-tokens", type=int, default=8000, help="Total token budget (split evenly)"
+    )
+    mp.add_argument(
+        "--ranking", choices=RANKING_MODES, default=DEFAULT_RANKING, help="Scoring mode"
+    )
 
     # list
     sub.add_parser("list", help="List all advisors and KB stats")
 
+    # serve (long-lived daemon with warm caches, see kb_daemon.py)
+    vp = sub.add_parser("serve", help="Run the KB query daemon on a Unix socket")
+    vp.add_argument("--socket", help="Socket path (default: ~/.claude/.locks/kb-loader.sock)")
+
     args = parser.parse_args()
+
+    # Fast path: a running daemon answers without building a loader here
+    if HAS_DAEMON and not args.no_daemon and not args.rebuild_index:
+        if args.command == "search":
+            results = kb_daemon.request(
+                "search",
+                advisor=args.advisor,
+                query=args.query,
+                max_results=args.max,
+                ranking=args.ranking,
+            )
+        elif args.command == "context":
+            results = kb_daemon.request(
+                "context",
+                advisor=args.advisor,
+                query=args.query,
+                max_tokens=args.max_tokens,
+                ranking=args.ranking,
+            )
+        elif args.command == "consult":
+            results = kb_daemon.request(
+                "consult",
+                advisors=[a.strip() for a in args.advisors.split(",") if a.strip()],
+                query=args.query,
+                max_tokens=args.max_tokens,
+                ranking=args.ranking,
+            )
+        else:
+            results = None
+        if results is not None:
+            _print_results(args, results)
+            return
+
     loader = KBLoader()
 
-    if args.command == "search":
-        results = loader.search(args.advisor, args.query, max_results=args.max)
+    if args.rebuild_index:
+        t0 = time.time()
+        totals = loader.rebuild_index()
         print(
-            f"\nFound {len(results)} results for '{args.query}' in {args.advisor}'s KB:\n"
+            f"Rebuilt search index: {totals['docs']} articles in {totals['dirs']} dirs "
+            f"({time.time() - t0:.1f}s)"
         )
-        for r in results:
-            print(
-                f"  [{r['relevance_score']}] {r['title']} - {r['author']} ({r['date']})"
-            )
-            print(f"      {r['path']}")
-            print()
+        if not args.command:
+            return
+
+    if args.command == "search":
+        results = loader.search(
+            args.advisor, args.query, max_results=args.max, ranking=args.ranking
+        )
+        _print_results(args, results)
 
     elif args.command == "context":
         context = loader.get_context(
-            args.advisor, args.query, max_tokens=args.max_tokens
+            args.advisor, args.query, max_tokens=args.max_tokens, ranking=args.ranking
+        )
+        _print_results(args, context)
+
+    elif args.command == "consult":
+        advisors = [a.strip() for a in args.advisors.split(",") if a.strip()]
+        _print_results(
+            args,
+            loader.get_context_many(
+                advisors, args.query, max_tokens=args.max_tokens, ranking=args.ranking
+            ),
         )
-        print(context)
 
     elif args.command == "list":
         print(loader.list_advisors())
 
+    elif args.command == "serve":
+        if not HAS_DAEMON:
+            print("kb_daemon.py not importable", file=sys.stderr)
+            sys.exit(1)
+        try:
+            kb_daemon.serve(loader, socket_path=args.socket)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+
     else:
         parser.print_help()
 
 
+def _print_results(args, results) -> None:
+    """Print search results or a context block for the CLI."""
+    if args.command == "search":
+        print(
+            f"\nFound {len(results)} results for '{args.query}' in {args.advisor}'s KB:\n"
+        )
+        for r in results:
+            print(
+                f"  [{r['relevance_score']}] {r['title']} - {r['author']} ({r['date']})"
+            )
+            print(f"      {r['path']}")
+            print()
+
+    else:
+        print(results)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""KB Near-Dup - MinHash/LSH near-duplicate detection for kb_compact.
+
+kb_compact only catches exact duplicates (MD5 of the normalized body), so
+a re-scrape that differs by a footer, a date banner or tracking text is
+kept as a second copy. This module finds those:
+
+    - Each article body (frontmatter stripped, lowercased, whitespace
+      normalized) is cut into 5-word shingles.
+    - A MinHash signature is built with one-permutation hashing: every
+      shingle is hashed once (crc32) into one of NUM_PERM bins keeping the
+      bin minimum; empty bins borrow the next non-empty bin (densification).
+      So signing costs one hash per shingle, not NUM_PERM.
+    - LSH banding (bands x rows picked from the Jaccard threshold) yields
+      candidate pairs; each is verified by the fraction of equal bins
+      (the Jaccard estimate) and verified pairs are merged into clusters.
+
+Signatures are persisted in SQLite keyed by path + mtime/size, so a later
+run only reads and signs new or changed files.
+
+No external dependencies -- stdlib only.
+
+Usage:
+    python3 kb_near_dup.py scan [--threshold 0.8] [DIR ...]   # Report clusters
+    python3 kb_near_dup.py stats                             # Stored signatures
+
+    # From Python
+    from kb_near_dup import NearDupIndex
+    index = NearDupIndex()
+    index.update(paths)                       # Signs only new/changed files
+    for cluster in index.clusters(threshold=0.8):
+        ...                                   # [Path, ...] sorted, >= 2 each
+"""
+
+import sqlite3
+import sys
+import threading
+import zlib
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+KB_NEAR_DUP_DB = Path("~/.claude/.locks/kb-minhash.db").expanduser()
+NUM_PERM = 128  # Signature length (bins)
+SHINGLE_WORDS = 5
+DEFAULT_THRESHOLD = 0.8  # Estimated Jaccard similarity to call two articles near-duplicates
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS signatures (
+        path        TEXT PRIMARY KEY,
+        mtime_ns    INTEGER NOT NULL,
+        size        INTEGER NOT NULL,
+        sig         BLOB
+    ) WITHOUT ROWID;
+"""
+
+
+def article_body(content: str) -> str:
+    """Article text without YAML frontmatter."""
+    if content.startswith("---"):
+        end = content.find("---", 3)
+        if end > 0:
+            content = content[end + 3:].strip()
+    return content
+
+
+def minhash(text: str, num_perm: int = NUM_PERM) -> Optional[tuple]:
+    """One-permutation MinHash of a body's word shingles (None if empty)."""
+    words = text.lower().split()
+    if not words:
+        return None
+    k = min(SHINGLE_WORDS, len(words))
+    hashes = {
+        zlib.crc32(" ".join(words[i : i + k]).encode()) for i in range(len(words) - k + 1)
+    }
+    empty = 1 << 32
+    bins = [empty] * num_perm
+    for h in hashes:
+        b = h % num_perm
+        v = h // num_perm
+        if v < bins[b]:
+            bins[b] = v
+    # Densify: an empty bin takes the next non-empty bin's value (cyclic),
+    # offset by the distance so borrowed values don't collide by accident
+    filled = [i for i, v in enumerate(bins) if v != empty]
+    if len(filled) < num_perm:
+        for i in range(num_perm):
+            if bins[i] == empty:
+                dist = 1
+                while bins[(i + dist) % num_perm] == empty:
+                    dist += 1
+                bins[i] = (bins[(i + dist) % num_perm] + dist * 0x9E3779B1) & 0xFFFFFFFF
+    return tuple(bins)
+
+
+def similarity(a: tuple, b: tuple) -> float:
+    """Jaccard estimate: fraction of equal signature bins."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def lsh_shape(threshold: float, num_perm: int = NUM_PERM) -> tuple:
+    """(bands, rows) whose LSH S-curve midpoint (1/b)^(1/r) sits just below
+    threshold, so true pairs are rarely missed; verification drops the rest."""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold * 0.9:
+            best = (bands, rows)
+    return best
+
+
+class NearDupIndex:
+    """Persisted MinHash signatures + LSH clustering over article files."""
+
+    def __init__(self, db_path: Optional[Path] = None, num_perm: int = NUM_PERM):
+        self.db_path = Path(db_path) if db_path else KB_NEAR_DUP_DB
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.num_perm = num_perm
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self.signatures: dict = {}  # Path -> signature, for the last update()
+
+    def close(self):
+        self._conn.close()
+
+    def update(self, paths: Iterable[Path], prune: bool = True) -> int:
+        """Load or compute the signature of every path; returns files signed.
+
+        Files whose mtime/size match the stored row are not read. With
+        prune, stored rows for paths not given are dropped.
+        """
+        with self._lock:
+            stored = {
+                path: (mtime_ns, size, sig)
+                for path, mtime_ns, size, sig in self._conn.execute(
+                    "SELECT path, mtime_ns, size, sig FROM signatures"
+                )
+            }
+
+        self.signatures = {}
+        fresh = []
+        for path in paths:
+            path = Path(path)
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            row = stored.pop(str(path), None)
+            if row and row[:2] == (st.st_mtime_ns, st.st_size) and (
+                row[2] is None or len(row[2]) == 4 * self.num_perm
+            ):
+                sig = tuple(array("I", row[2])) if row[2] else None
+            else:
+                try:
+                    sig = minhash(article_body(path.read_text(errors="replace")), self.num_perm)
+                except OSError:
+                    continue
+                blob = array("I", sig).tobytes() if sig else None
+                fresh.append((str(path), st.st_mtime_ns, st.st_size, blob))
+            if sig:
+                self.signatures[path] = sig
+
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO signatures VALUES (?, ?, ?, ?)", fresh)
+            if prune and stored:
+                self._conn.executemany(
+                    "DELETE FROM signatures WHERE path = ?", [(p,) for p in stored]
+                )
+        return len(fresh)
+
+    def clusters(self, threshold: float = DEFAULT_THRESHOLD) -> list:
+        """Groups (>= 2, each sorted by path) of articles whose estimated
+        Jaccard similarity to another member is >= threshold; largest first."""
+        bands, rows = lsh_shape(threshold, self.num_perm)
+        paths = sorted(self.signatures, key=str)
+        sigs = [self.signatures[p] for p in paths]
+
+        parent = list(range(len(paths)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        checked = set()
+        for band in range(bands):
+            buckets = defaultdict(list)
+            lo, hi = band * rows, (band + 1) * rows
+            for i, sig in enumerate(sigs):
+                buckets[sig[lo:hi]].append(i)
+            for members in buckets.values():
+                # Verify each member against the bucket's first: linear per
+                # bucket, and other bands give other pairings a chance
+                first = members[0]
+                for other in members[1:]:
+                    if (first, other) in checked or find(first) == find(other):
+                        continue
+                    checked.add((first, other))
+                    if similarity(sigs[first], sigs[other]) >= threshold:
+                        parent[find(other)] = find(first)
+
+        groups = defaultdict(list)
+        for i, path in enumerate(paths):
+            groups[find(i)].append(path)
+        return sorted((g for g in groups.values() if len(g) > 1), key=lambda g: (-len(g), str(g[0])))
+
+    def stats(self) -> dict:
+        with self._lock:
+            total, signed = self._conn.execute(
+                "SELECT COUNT(*), COUNT(sig) FROM signatures"
+            ).fetchone()
+        return {"files": total, "signed": signed}
+
+
+def main():
+    args = sys.argv[1:]
+    cmd = args[0] if args else "stats"
+    if cmd == "scan":
+        threshold = DEFAULT_THRESHOLD
+        rest = args[1:]
+        if "--threshold" in rest:
+            i = rest.index("--threshold")
+            threshold = float(rest[i + 1])
+            rest = rest[:i] + rest[i + 2:]
+        from kb_compact import find_all_articles
+
+        dirs = [Path(d).expanduser() for d in rest] or None
+        index = NearDupIndex()
+        articles = find_all_articles(dirs)
+        signed = index.update(articles, prune=dirs is None)
+        groups = index.clusters(threshold)
+        print(f"{len(articles)} articles ({signed} signed this run)")
+        print(f"{len(groups)} near-duplicate clusters at Jaccard >= {threshold}")
+        for group in groups[:20]:
+            print(f"  {len(group)} copies:")
+            for path in group:
+                print(f"    {path}")
+    elif cmd == "stats":
+        index = NearDupIndex()
+        s = index.stats()
+        print(f"Near-dup signatures: {index.db_path}")
+        print(f"  Files: {s['files']} ({s['signed']} with a signature)")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
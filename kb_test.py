@@ -6,6 +6,7 @@ Tests:
 2. Article count accuracy (declared vs actual)
 3. Article format validation (frontmatter, content)
 4. Retrieval quality (queries return relevant results, not noise)
+   4b. Ranking comparison (precision@5 per ranking mode)
 5. Routing correctness (advisors don't cross-contaminate)
 6. Alias resolution (all aliases resolve to valid advisors)
 
@@ -14,6 +15,8 @@ Usage:
     python3 kb_test.py --verbose        # Show details
     python3 kb_test.py --fix            # Auto-fix article counts
     python3 kb_test.py --category dirs  # Run only directory tests
+    python3 kb_test.py -c retrieval --ranking bm25   # Retrieval tests under BM25
+    python3 kb_test.py -c ranking -v    # Compare precision@5 across ranking modes
 """
 
 import sys
@@ -25,12 +28,57 @@ from typing import Optional
 
 # Add tools dir to path
 sys.path.insert(0, str(Path(__file__).parent))
-from kb_loader import KBLoader, ADVISORS, ALIASES
+from kb_counter import get_counter
+from kb_loader import KBLoader, ADVISORS, ALIASES, DEFAULT_RANKING, RANKING_MODES
+
+
+# Retrieval cases: query → advisor → should/shouldn't match patterns
+RETRIEVAL_CASES = [
+    # (advisor, query, should_match_pattern, should_not_match_pattern)
+    # ── Core advisors ──
+    ("cto", "reverb design algorithm", r"reverb|algorithm|dsp", r"obsidian vault|obsidian sync|obsidian plugin"),
+    ("cto", "code signing notarization", r"code sign|notariz|certificate", r"obsidian vault|obsidian sync"),
+    ("cto", "JUCE component GUI", r"juce|component|gui", r"obsidian vault|obsidian sync"),
+    ("lenny", "product market fit", r"product|market|fit|pmf", None),
+    ("cherie", "streaming revenue", r"stream|revenue|music", None),
+    ("atrium", "contemporary art", r"art|contemporary|gallery", None),
+    ("don-norman", "usability design", r"usability|design|user", None),
+    ("airwindows", "saturation distortion", r"saturation|distortion|clip", None),
+    ("valhalla", "reverb delay", r"reverb|delay", None),
+    # ── Wave 1: CTO Leaders (new content must surface) ──
+    ("cto", "lock-free wait-free algorithm", r"lock.free|wait.free|real.time|audio thread", None),
+    ("cto", "pricing strategy software", r"pricing|charge|money|conversion|sales", None),
+    ("cto", "CI/CD audio plugin GitHub Actions", r"ci|github.actions|build|cmake|workflow", None),
+    ("cto", "JUCE painting performance jank", r"paint|jank|component|repaint|performance", None),
+    ("cto", "profiling CPU Perfetto", r"profil|perfetto|cpu|performance", None),
+    # ── Wave 2: WolfSound + GetDunne ──
+    ("cto", "SIMD optimization vectorization", r"simd|vector|sse|avx|neon|optimization", None),
+    ("cto", "wavetable synthesis oscillator", r"wavetable|oscillat|synthesis", None),
+    ("cto", "FM synthesis modulation", r"fm|frequency.modulation|modula|synthesis", None),
+    ("cto", "JUCE parameter automation APVTS", r"parameter|apvts|automation|slider", None),
+    ("cto", "IIR FIR filter design", r"iir|fir|filter|biquad|frequency", None),
+    # ── Wave 2: Julia Evans + Daniel Miessler ──
+    ("cto", "debugging strace perf", r"debug|strace|perf|tracing|profil", None),
+    ("cto", "networking DNS TCP packets", r"dns|tcp|packet|network|socket", None),
+    ("cto", "git internals branching merge", r"git|branch|merge|commit|rebase", None),
+    ("cto", "AI security prompt injection LLM", r"ai|prompt|injection|llm|security|threat", None),
+    ("cto", "containers kubernetes docker", r"container|kubernetes|docker|k8s", None),
+    # ── Wave 3: Simon Willison ──
+    ("cto", "LLM prompt injection security", r"llm|prompt.injection|security|jailbreak", None),
+    ("cto", "datasette sqlite data tool", r"datasette|sqlite|data|query", None),
+    ("cto", "AI agent tool use function calling", r"agent|tool.use|function.call|llm|ai", None),
+    # ── Wave 3: Kent Beck ──
+    ("cto", "TDD test driven development", r"tdd|test.driven|test|refactor", None),
+    ("cto", "tidy first code design", r"tidy|design|structure|coupling", None),
+    # ── Wave 3: Swyx ──
+    ("cto", "AI engineering LLM ops", r"ai.engineer|llm|ops|deploy|inference", None),
+]
 
 
 class KBTestSuite:
-    def __init__(self, verbose=False, fix=False):
+    def __init__(self, verbose=False, fix=False, ranking=DEFAULT_RANKING):
         self.loader = KBLoader()
+        self.ranking = ranking
         self.verbose = verbose
         self.fix = fix
         self.passed = 0
@@ -73,11 +121,9 @@ class KBTestSuite:
 
     def test_counts(self):
         print("\n=== 2. Article Count Accuracy ===")
+        counter = get_counter()
         for key, config in ADVISORS.items():
-            actual = 0
-            for d in config["article_dirs"]:
-                if d.exists():
-                    actual += sum(1 for _ in d.rglob("*.md"))
+            actual = sum(counter.count(d) for d in config["article_dirs"] if d.exists())
             declared = config["article_count"]
             drift = actual - declared
             threshold = max(10, declared * 0.1)  # 10% or 10, whichever is larger
@@ -90,6 +136,7 @@ class KBTestSuite:
                 self.fail(f"{key}: drift {drift:+d} (declared={declared}, actual={actual})")
                 if self.fix:
                     print(f"    \033[36mFIX\033[0m Would update {key} article_count to {actual}")
+        counter.save()
 
     # ── Test Category 3: Article Format ──
 
@@ -130,52 +177,10 @@ class KBTestSuite:
     # ── Test Category 4: Retrieval Quality ──
 
     def test_retrieval(self):
-        print("\n=== 4. Retrieval Quality ===")
-
-        # Define expected query → advisor → should/shouldn't match patterns
-        test_cases = [
-            # (advisor, query, should_match_pattern, should_not_match_pattern)
-            # ── Core advisors ──
-            ("cto", "reverb design algorithm", r"reverb|algorithm|dsp", r"obsidian vault|obsidian sync|obsidian plugin"),
-            ("cto", "code signing notarization", r"code sign|notariz|certificate", r"obsidian vault|obsidian sync"),
-            ("cto", "JUCE component GUI", r"juce|component|gui", r"obsidian vault|obsidian sync"),
-            ("lenny", "product market fit", r"product|market|fit|pmf", None),
-            ("cherie", "streaming revenue", r"stream|revenue|music", None),
-            ("atrium", "contemporary art", r"art|contemporary|gallery", None),
-            ("don-norman", "usability design", r"usability|design|user", None),
-            ("airwindows", "saturation distortion", r"saturation|distortion|clip", None),
-            ("valhalla", "reverb delay", r"reverb|delay", None),
-            # ── Wave 1: CTO Leaders (new content must surface) ──
-            ("cto", "lock-free wait-free algorithm", r"lock.free|wait.free|real.time|audio thread", None),
-            ("cto", "pricing strategy software", r"pricing|charge|money|conversion|sales", None),
-            ("cto", "CI/CD audio plugin GitHub Actions", r"ci|github.actions|build|cmake|workflow", None),
-            ("cto", "JUCE painting performance jank", r"paint|jank|component|repaint|performance", None),
-            ("cto", "profiling CPU Perfetto", r"profil|perfetto|cpu|performance", None),
-            # ── Wave 2: WolfSound + GetDunne ──
-            ("cto", "SIMD optimization vectorization", r"simd|vector|sse|avx|neon|optimization", None),
-            ("cto", "wavetable synthesis oscillator", r"wavetable|oscillat|synthesis", None),
-            ("cto", "FM synthesis modulation", r"fm|frequency.modulation|modula|synthesis", None),
-            ("cto", "JUCE parameter automation APVTS", r"parameter|apvts|automation|slider", None),
-            ("cto", "IIR FIR filter design", r"iir|fir|filter|biquad|frequency", None),
-            # ── Wave 2: Julia Evans + Daniel Miessler ──
-            ("cto", "debugging strace perf", r"debug|strace|perf|tracing|profil", None),
-            ("cto", "networking DNS TCP packets", r"dns|tcp|packet|network|socket", None),
-            ("cto", "git internals branching merge", r"git|branch|merge|commit|rebase", None),
-            ("cto", "AI security prompt injection LLM", r"ai|prompt|injection|llm|security|threat", None),
-            ("cto", "containers kubernetes docker", r"container|kubernetes|docker|k8s", None),
-            # ── Wave 3: Simon Willison ──
-            ("cto", "LLM prompt injection security", r"llm|prompt.injection|security|jailbreak", None),
-            ("cto", "datasette sqlite data tool", r"datasette|sqlite|data|query", None),
-            ("cto", "AI agent tool use function calling", r"agent|tool.use|function.call|llm|ai", None),
-            # ── Wave 3: Kent Beck ──
-            ("cto", "TDD test driven development", r"tdd|test.driven|test|refactor", None),
-            ("cto", "tidy first code design", r"tidy|design|structure|coupling", None),
-            # ── Wave 3: Swyx ──
-            ("cto", "AI engineering LLM ops", r"ai.engineer|llm|ops|deploy|inference", None),
-        ]
-
-        for advisor, query, should_match, should_not_match in test_cases:
-            results = self.loader.search(advisor, query, max_results=3)
+        print(f"\n=== 4. Retrieval Quality (ranking={self.ranking}) ===")
+
+        for advisor, query, should_match, should_not_match in RETRIEVAL_CASES:
+            results = self.loader.search(advisor, query, max_results=3, ranking=self.ranking)
 
             if not results:
                 self.fail(f"{advisor}: '{query}' — returned 0 results")
@@ -196,6 +201,45 @@ class KBTestSuite:
                 else:
                     self.ok(f"{advisor}: '{query}' — no noise detected")
 
+    # ── Test Category 4b: Ranking Comparison ──
+
+    def test_ranking(self):
+        """Top-5 precision per ranking mode over RETRIEVAL_CASES.
+
+        A result counts as relevant when its title/excerpt matches the case's
+        should_match pattern and not its should_not_match pattern. Reports
+        only — a mode is never failed for losing to another.
+        """
+        print("\n=== 4b. Ranking Comparison (precision@5) ===")
+        totals = {mode: [] for mode in RANKING_MODES}
+        for advisor, query, should_match, should_not_match in RETRIEVAL_CASES:
+            row = []
+            for mode in RANKING_MODES:
+                results = self.loader.search(advisor, query, max_results=5, ranking=mode)
+                if not results:
+                    row.append(f"{mode}=n/a")
+                    continue
+                relevant = 0
+                for r in results:
+                    text = (r.get("title", "") + " " + r.get("excerpt", "")).lower()
+                    if should_match and not re.search(should_match, text, re.IGNORECASE):
+                        continue
+                    if should_not_match and re.search(should_not_match, text, re.IGNORECASE):
+                        continue
+                    relevant += 1
+                precision = relevant / len(results)
+                totals[mode].append(precision)
+                row.append(f"{mode}={precision:.2f}")
+            if self.verbose:
+                print(f"  {advisor}: '{query}' — " + ", ".join(row))
+
+        for mode, scores in totals.items():
+            if scores:
+                self.ok(f"{mode}: mean P@5 {sum(scores) / len(scores):.3f} over {len(scores)} queries")
+                print(f"  {mode:<10} mean P@5 {sum(scores) / len(scores):.3f} ({len(scores)} queries)")
+            else:
+                self.warn(f"{mode}: no queries returned results")
+
     # ── Test Category 5: Routing Correctness ──
 
     def test_routing(self):
@@ -301,6 +345,7 @@ class KBTestSuite:
             "counts": self.test_counts,
             "format": self.test_format,
             "retrieval": self.test_retrieval,
+            "ranking": self.test_ranking,
             "routing": self.test_routing,
             "aliases": self.test_aliases,
             "scrape": self.test_scrape_output,
@@ -331,11 +376,13 @@ def main():
     parser = argparse.ArgumentParser(description="KB Test Suite")
     parser.add_argument("--verbose", "-v", action="store_true", help="Show all results")
     parser.add_argument("--fix", action="store_true", help="Auto-fix counts")
-    parser.add_argument("--category", "-c", choices=["dirs", "counts", "format", "retrieval", "routing", "aliases", "scrape"],
+    parser.add_argument("--category", "-c", choices=["dirs", "counts", "format", "retrieval", "ranking", "routing", "aliases", "scrape"],
                        help="Run specific test category")
+    parser.add_argument("--ranking", choices=RANKING_MODES, default=DEFAULT_RANKING,
+                       help="Ranking mode for retrieval tests")
     args = parser.parse_args()
 
-    suite = KBTestSuite(verbose=args.verbose, fix=args.fix)
+    suite = KBTestSuite(verbose=args.verbose, fix=args.fix, ranking=args.ranking)
     success = suite.run(category=args.category)
     sys.exit(0 if success else 1)
 
@@ -3,16 +3,117 @@
 
 Provides fast full-text search, faceted filtering, and analytics for knowledge base articles.
 Syncs with YAML frontmatter files (YAML = source of truth).
+
+Bulk mode (sync_from_yaml(..., bulk=True)) parses files on a process pool,
+skips files whose file_hash is unchanged, writes rows with executemany in
+one transaction with the FTS triggers dropped, and rebuilds the FTS
+index once at the end. Multi-source syncs pass rebuild_fts=False and call
+rebuild_fts() once after the last source.
+
+Tags and topics are denormalized into articles.tags/articles.topics (and
+so into the FTS row) at ingest, so search is a single FTS MATCH ranked by
+per-column bm25() weights, with no tag/topic joins or GROUP BY. The
+tags/topics tables keep the counts for stats.
 """
 
+import hashlib
+import os
 import sqlite3
 import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 import yaml
 
 
+KNOWN_FIELDS = {'title', 'author', 'source', 'source_url', 'skill', 'date_published',
+                'date_scraped', 'date_analyzed', 'type', 'tags', 'topics'}
+
+# Triggers to keep FTS in sync (dropped and recreated around bulk loads).
+# articles_fts is an external-content table: stale rows are removed with the
+# 'delete' command and the old values, since the content row has changed.
+FTS_TRIGGERS = {
+    "articles_ai": """
+        CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts(rowid, title, author, content, tags, topics)
+            VALUES (new.id, new.title, new.author, new.content, new.tags, new.topics);
+        END
+    """,
+    "articles_ad": """
+        CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, author, content, tags, topics)
+            VALUES ('delete', old.id, old.title, old.author, old.content, old.tags, old.topics);
+        END
+    """,
+    "articles_au": """
+        CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, author, content, tags, topics)
+            VALUES ('delete', old.id, old.title, old.author, old.content, old.tags, old.topics);
+            INSERT INTO articles_fts(rowid, title, author, content, tags, topics)
+            VALUES (new.id, new.title, new.author, new.content, new.tags, new.topics);
+        END
+    """,
+}
+FTS_SCHEMA_VERSION = 2  # PRAGMA user_version; 2 = denormalized tags/topics
+
+# bm25() weights per FTS column: title, author, content, tags, topics
+SEARCH_WEIGHTS = (10.0, 2.0, 1.0, 5.0, 3.0)
+
+ARTICLE_COLUMNS = ("file_path", "file_hash", "title", "author", "source", "source_url", "skill",
+                   "date_published", "date_scraped", "date_analyzed", "date_indexed",
+                   "type", "content", "word_count", "domain_metadata", "tags", "topics")
+
+
+def normalize_metadata(metadata: Dict) -> Dict:
+    """Coerce date objects to strings (YAML parses bare dates as date objects)"""
+    for key in list(metadata.keys()):
+        if hasattr(metadata[key], 'isoformat'):
+            metadata[key] = metadata[key].isoformat()
+    return metadata
+
+
+def article_hash(metadata: Dict, content: str) -> str:
+    """Change-detection hash over body and frontmatter (a tag edit counts)"""
+    meta = json.dumps(metadata, sort_keys=True, default=str)
+    return hashlib.md5(f"{meta}\0{content}".encode()).hexdigest()
+
+
+def article_row(file_path, file_hash: str, metadata: Dict, content: str, indexed_at: str) -> tuple:
+    """Values for ARTICLE_COLUMNS"""
+    domain_fields = {k: v for k, v in metadata.items() if k not in KNOWN_FIELDS}
+    return (
+        str(file_path),
+        file_hash,
+        metadata.get('title', 'Untitled'),
+        metadata.get('author', 'Unknown'),
+        metadata.get('source', ''),
+        metadata.get('source_url', ''),
+        metadata.get('skill', ''),
+        metadata.get('date_published', ''),
+        metadata.get('date_scraped', ''),
+        metadata.get('date_analyzed', ''),
+        indexed_at,
+        metadata.get('type', 'article'),
+        content,
+        len(content.split()),
+        json.dumps(domain_fields, default=str) if domain_fields else None,
+        ','.join(_term_list(metadata.get('tags'))),
+        ','.join(_term_list(metadata.get('topics'))),
+    )
+
+
+def _term_list(value) -> List[str]:
+    """Frontmatter tags/topics as a de-duplicated list of strings"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    return list(dict.fromkeys(str(v) for v in value))
+
+
 class KnowledgeDB:
     """SQLite FTS5 wrapper for knowledge base"""
 
@@ -57,6 +158,10 @@ class KnowledgeDB:
                 -- Domain-specific (JSON field)
                 domain_metadata TEXT,  -- JSON blob for flexible fields
 
+                -- Denormalized from article_tags/article_topics (comma-joined)
+                tags TEXT NOT NULL DEFAULT '',
+                topics TEXT NOT NULL DEFAULT '',
+
                 -- Timestamps
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -116,90 +221,89 @@ class KnowledgeDB:
             )
         """)
 
-        # Triggers to keep FTS in sync
-        cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
-                INSERT INTO articles_fts(rowid, title, author, content, tags, topics)
-                VALUES (new.id, new.title, new.author, new.content, '', '');
-            END
-        """)
-
-        cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
-                DELETE FROM articles_fts WHERE rowid = old.id;
-            END
-        """)
-
-        cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
-                UPDATE articles_fts SET title = new.title, author = new.author, content = new.content
-                WHERE rowid = new.id;
-            END
-        """)
-
-        # Indexes for fast queries
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_source ON articles(source)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_skill ON articles(skill)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_type ON articles(type)")
+        if cursor.execute("PRAGMA user_version").fetchone()[0] < FTS_SCHEMA_VERSION:
+            self._migrate_denormalized_terms(cursor)
+
+        # Triggers to keep FTS in sync. Missing ones mean a migration or a
+        # deferred bulk load left the FTS index stale: rebuild it first.
+        if not self._fts_triggers_present():
+            cursor.execute("INSERT INTO articles_fts(articles_fts) VALUES('rebuild')")
+        for trigger_sql in FTS_TRIGGERS.values():
+            cursor.execute(trigger_sql)
+
+        # Indexes for fast queries. Filter column + date_published: the
+        # filtered listings (WHERE source = ? ORDER BY date_published) and
+        # filtered searches resolve from the index without a sort.
+        for name in ("idx_source", "idx_skill", "idx_type"):
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")  # Prefixes of the ones below
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_source_date ON articles(source, date_published)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_skill_date ON articles(skill, date_published)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_type_date ON articles(type, date_published)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_date_published ON articles(date_published)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_file_hash ON articles(file_hash)")
 
         self.conn.commit()
 
+    def _migrate_denormalized_terms(self, cursor):
+        """Pre-v2 databases: drop the old triggers, add articles.tags/topics
+        and backfill them from the link tables (_init_schema then rebuilds
+        the FTS index and recreates the triggers)."""
+        # First: the v1 articles_au trigger UPDATEs the external-content FTS
+        # table, which corrupts it when the backfill below fires it
+        for name in FTS_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(articles)")}
+        for column in ("tags", "topics"):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE articles ADD COLUMN {column} TEXT NOT NULL DEFAULT ''")
+        cursor.execute("""
+            UPDATE articles SET
+                tags = COALESCE((SELECT GROUP_CONCAT(t.tag) FROM article_tags at
+                                 JOIN tags t ON at.tag_id = t.id
+                                 WHERE at.article_id = articles.id), ''),
+                topics = COALESCE((SELECT GROUP_CONCAT(tp.topic) FROM article_topics atop
+                                   JOIN topics tp ON atop.topic_id = tp.id
+                                   WHERE atop.article_id = articles.id), '')
+        """)
+        cursor.execute(f"PRAGMA user_version = {FTS_SCHEMA_VERSION}")
+
     def add_article(self, file_path: Path, metadata: Dict, content: str) -> int:
         """Add article to database"""
         cursor = self.conn.cursor()
 
+        normalize_metadata(metadata)
+
         # Calculate file hash
-        file_hash = self._hash_content(content)
-
-        # Coerce date objects to strings (YAML parses bare dates as date objects)
-        for key in list(metadata.keys()):
-            if hasattr(metadata[key], 'isoformat'):
-                metadata[key] = metadata[key].isoformat()
-
-        # Extract domain-specific metadata
-        domain_fields = {}
-        known_fields = {'title', 'author', 'source', 'source_url', 'skill', 'date_published',
-                       'date_scraped', 'date_analyzed', 'type', 'tags', 'topics'}
-        for key, value in metadata.items():
-            if key not in known_fields:
-                domain_fields[key] = value
-
-        # Insert article
-        cursor.execute("""
-            INSERT OR REPLACE INTO articles
-            (file_path, file_hash, title, author, source, source_url, skill,
-             date_published, date_scraped, date_analyzed, date_indexed,
-             type, content, word_count, domain_metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            str(file_path),
-            file_hash,
-            metadata.get('title', 'Untitled'),
-            metadata.get('author', 'Unknown'),
-            metadata.get('source', ''),
-            metadata.get('source_url', ''),
-            metadata.get('skill', ''),
-            metadata.get('date_published', ''),
-            metadata.get('date_scraped', ''),
-            metadata.get('date_analyzed', ''),
-            datetime.now().isoformat(),
-            metadata.get('type', 'article'),
-            content,
-            len(content.split()),
-            json.dumps(domain_fields, default=str) if domain_fields else None
-        ))
-
-        article_id = cursor.lastrowid
+        file_hash = article_hash(metadata, content)
+
+        # Insert article (or update it in place, keeping its id and FTS row)
+        cursor.execute(f"""
+            INSERT INTO articles ({', '.join(ARTICLE_COLUMNS)})
+            VALUES ({', '.join('?' * len(ARTICLE_COLUMNS))})
+            ON CONFLICT(file_path) DO UPDATE SET
+                {', '.join(f'{c} = excluded.{c}' for c in ARTICLE_COLUMNS[1:])},
+                updated_at = CURRENT_TIMESTAMP
+        """, article_row(file_path, file_hash, metadata, content, datetime.now().isoformat()))
+
+        cursor.execute("SELECT id FROM articles WHERE file_path = ?", (str(file_path),))
+        article_id = cursor.fetchone()[0]
+
+        # Re-synced article: drop its previous tag/topic links first
+        for table, link_table, link_col in (('tags', 'article_tags', 'tag_id'),
+                                            ('topics', 'article_topics', 'topic_id')):
+            cursor.execute(f"""
+                UPDATE {table} SET count = count - 1
+                WHERE id IN (SELECT {link_col} FROM {link_table} WHERE article_id = ?)
+            """, (article_id,))
+            cursor.execute(f"DELETE FROM {link_table} WHERE article_id = ?", (article_id,))
 
         # Add tags
-        tags = metadata.get('tags', [])
+        tags = _term_list(metadata.get('tags'))
         if tags:
             self._add_tags(article_id, tags)
 
         # Add topics
-        topics = metadata.get('topics', [])
+        topics = _term_list(metadata.get('topics'))
         if topics:
             self._add_topics(article_id, topics)
 
@@ -246,22 +350,132 @@ class KnowledgeDB:
                 VALUES (?, ?)
             """, (article_id, topic_id))
 
+    def bulk_load(self, articles: Iterable[tuple], rebuild_fts: bool = True) -> Dict[str, int]:
+        """Load (file_path, metadata, content) tuples in one transaction.
+
+        Articles whose file_hash matches the stored row are skipped. New
+        rows are inserted and changed rows updated in place (same id) with
+        executemany; tag/topic counts and links are adjusted in batches.
+        The FTS triggers are dropped for the load and the FTS index is
+        rebuilt once from the articles table before they're restored.
+        With rebuild_fts=False the triggers stay dropped and the rebuild is
+        left to a later rebuild_fts() call, so several loads share one pass.
+        Returns {'new': n, 'changed': n, 'unchanged': n}.
+        """
+        existing = {
+            row['file_path']: (row['id'], row['file_hash'])
+            for row in self.conn.execute("SELECT id, file_path, file_hash FROM articles")
+        }
+        indexed_at = datetime.now().isoformat()
+        new_rows, changed_rows = [], []
+        terms = {}  # file_path -> (tags, topics)
+        counts = {'new': 0, 'changed': 0, 'unchanged': 0}
+
+        for file_path, metadata, content in articles:
+            normalize_metadata(metadata)
+            file_hash = article_hash(metadata, content)
+            key = str(file_path)
+            old = existing.get(key)
+            if old and old[1] == file_hash:
+                counts['unchanged'] += 1
+                continue
+            row = article_row(key, file_hash, metadata, content, indexed_at)
+            if old:
+                changed_rows.append(row[1:] + (old[0],))
+            else:
+                new_rows.append(row)
+            terms[key] = (_term_list(metadata.get('tags')), _term_list(metadata.get('topics')))
+        counts['new'], counts['changed'] = len(new_rows), len(changed_rows)
+        if not terms:
+            return counts
+
+        with self.conn:
+            # Explicit BEGIN: the trigger DDL is part of the same transaction
+            self.conn.execute("BEGIN")
+            for name in FTS_TRIGGERS:
+                self.conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+            self.conn.executemany(f"""
+                INSERT INTO articles ({', '.join(ARTICLE_COLUMNS)})
+                VALUES ({', '.join('?' * len(ARTICLE_COLUMNS))})
+            """, new_rows)
+            self.conn.executemany(f"""
+                UPDATE articles SET {', '.join(c + ' = ?' for c in ARTICLE_COLUMNS[1:])},
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, changed_rows)
+
+            # Changed articles: drop their previous tag/topic links first
+            changed_ids = [(row[-1],) for row in changed_rows]
+            for table, link_table, link_col in (('tags', 'article_tags', 'tag_id'),
+                                                ('topics', 'article_topics', 'topic_id')):
+                self.conn.executemany(f"""
+                    UPDATE {table} SET count = count - 1
+                    WHERE id IN (SELECT {link_col} FROM {link_table} WHERE article_id = ?)
+                """, changed_ids)
+                self.conn.executemany(f"DELETE FROM {link_table} WHERE article_id = ?", changed_ids)
+
+            ids = {row['file_path']: row['id']
+                   for row in self.conn.execute("SELECT id, file_path FROM articles")}
+            self._bulk_link('tags', 'tag', 'article_tags', 'tag_id',
+                            {ids[path]: tags for path, (tags, _) in terms.items()})
+            self._bulk_link('topics', 'topic', 'article_topics', 'topic_id',
+                            {ids[path]: topics for path, (_, topics) in terms.items()})
+
+            # One FTS pass instead of a trigger firing per row
+            if rebuild_fts:
+                self._rebuild_fts()
+
+        return counts
+
+    def rebuild_fts(self):
+        """Rebuild the FTS index and restore its triggers after loads made
+        with rebuild_fts=False (no-op if no load left them dropped)."""
+        if self._fts_triggers_present():
+            return
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self._rebuild_fts()
+
+    def _fts_triggers_present(self) -> bool:
+        present = self.conn.execute(
+            f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' "
+            f"AND name IN ({', '.join('?' * len(FTS_TRIGGERS))})", tuple(FTS_TRIGGERS)
+        ).fetchone()[0]
+        return present == len(FTS_TRIGGERS)
+
+    def _rebuild_fts(self):
+        self.conn.execute("INSERT INTO articles_fts(articles_fts) VALUES('rebuild')")
+        for trigger_sql in FTS_TRIGGERS.values():
+            self.conn.execute(trigger_sql)
+
+    def _bulk_link(self, table: str, column: str, link_table: str, link_col: str,
+                   article_terms: Dict[int, List[str]]):
+        """Upsert term counts and article links for many articles at once"""
+        term_counts = Counter(t for terms in article_terms.values() for t in terms)
+        if not term_counts:
+            return
+        self.conn.executemany(f"""
+            INSERT INTO {table} ({column}, count) VALUES (?, ?)
+            ON CONFLICT({column}) DO UPDATE SET count = count + excluded.count
+        """, term_counts.items())
+        term_ids = {row[column]: row['id']
+                    for row in self.conn.execute(f"SELECT id, {column} FROM {table}")}
+        self.conn.executemany(
+            f"INSERT OR IGNORE INTO {link_table} (article_id, {link_col}) VALUES (?, ?)",
+            [(article_id, term_ids[t]) for article_id, terms in article_terms.items() for t in terms]
+        )
+
     def search(self, query: str, filters: Optional[Dict] = None, limit: int = 20) -> List[Dict]:
         """Full-text search with optional filters"""
         cursor = self.conn.cursor()
 
-        # Base FTS query
-        sql = """
+        # Single FTS MATCH; tags/topics are columns of the row (no joins)
+        sql = f"""
             SELECT a.*,
-                   GROUP_CONCAT(DISTINCT t.tag) as tags,
-                   GROUP_CONCAT(DISTINCT tp.topic) as topics,
-                   articles_fts.rank
+                   bm25(articles_fts, {', '.join(str(w) for w in SEARCH_WEIGHTS)}) as rank
             FROM articles_fts
-            JOIN articles a ON articles_fts.rowid = a.id
-            LEFT JOIN article_tags at ON a.id = at.article_id
-            LEFT JOIN tags t ON at.tag_id = t.id
-            LEFT JOIN article_topics atop ON a.id = atop.article_id
-            LEFT JOIN topics tp ON atop.topic_id = tp.id
+            JOIN articles a ON a.id = articles_fts.rowid
             WHERE articles_fts MATCH ?
         """
 
@@ -289,7 +503,7 @@ class KnowledgeDB:
                 sql += " AND a.date_published <= ?"
                 params.append(filters['date_to'])
 
-        sql += " GROUP BY a.id ORDER BY rank LIMIT ?"
+        sql += " ORDER BY rank LIMIT ?"
         params.append(limit)
 
         cursor.execute(sql, params)
@@ -300,17 +514,9 @@ class KnowledgeDB:
         """Get all articles from a source"""
         cursor = self.conn.cursor()
         cursor.execute("""
-            SELECT a.*,
-                   GROUP_CONCAT(DISTINCT t.tag) as tags,
-                   GROUP_CONCAT(DISTINCT tp.topic) as topics
-            FROM articles a
-            LEFT JOIN article_tags at ON a.id = at.article_id
-            LEFT JOIN tags t ON at.tag_id = t.id
-            LEFT JOIN article_topics atop ON a.id = atop.article_id
-            LEFT JOIN topics tp ON atop.topic_id = tp.id
-            WHERE a.source = ?
-            GROUP BY a.id
-            ORDER BY a.date_published DESC
+            SELECT * FROM articles
+            WHERE source = ?
+            ORDER BY date_published DESC
         """, (source,))
 
         return [dict(row) for row in cursor.fetchall()]
@@ -319,17 +525,9 @@ class KnowledgeDB:
         """Get all articles for a skill"""
         cursor = self.conn.cursor()
         cursor.execute("""
-            SELECT a.*,
-                   GROUP_CONCAT(DISTINCT t.tag) as tags,
-                   GROUP_CONCAT(DISTINCT tp.topic) as topics
-            FROM articles a
-            LEFT JOIN article_tags at ON a.id = at.article_id
-            LEFT JOIN tags t ON at.tag_id = t.id
-            LEFT JOIN article_topics atop ON a.id = atop.article_id
-            LEFT JOIN topics tp ON atop.topic_id = tp.id
-            WHERE a.skill = ?
-            GROUP BY a.id
-            ORDER BY a.date_published DESC
+            SELECT * FROM articles
+            WHERE skill = ?
+            ORDER BY date_published DESC
         """, (skill,))
 
         return [dict(row) for row in cursor.fetchall()]
@@ -368,7 +566,6 @@ class KnowledgeDB:
 
     def _hash_content(self, content: str) -> str:
         """Simple hash of content for change detection"""
-        import hashlib
         return hashlib.md5(content.encode()).hexdigest()
 
     def close(self):
@@ -403,43 +600,70 @@ def parse_markdown_header(content: str) -> tuple:
     return metadata, body
 
 
-def sync_from_yaml(source_dir: Path, db: KnowledgeDB, source_hint: str = '', skill_hint: str = ''):
-    """Sync articles from YAML frontmatter OR markdown-header files into database"""
+def parse_article_file(md_file: Path, source_hint: str = '', skill_hint: str = '') -> Optional[tuple]:
+    """(metadata, content) for a YAML-frontmatter or markdown-header file, None if neither"""
+    content = md_file.read_text(encoding='utf-8')
+
+    if content.startswith('---'):
+        # YAML frontmatter format
+        parts = content.split('---', 2)
+        if len(parts) < 3:
+            return None
+
+        metadata = yaml.safe_load(parts[1]) or {}
+        article_content = parts[2].strip()
+    elif content.startswith('# '):
+        # Markdown-header format (from new scrapers)
+        metadata, article_content = parse_markdown_header(content)
+        if not metadata.get('title'):
+            return None
+    else:
+        return None
+
+    # Apply hints if not already in metadata
+    if source_hint and not metadata.get('source'):
+        metadata['source'] = source_hint
+    if skill_hint and not metadata.get('skill'):
+        metadata['skill'] = skill_hint
+
+    return normalize_metadata(metadata), article_content
+
+
+def _parse_worker(md_file: Path, source_hint: str, skill_hint: str) -> tuple:
+    """Pool worker: (path, parsed or None, error message or None)"""
+    try:
+        return md_file, parse_article_file(md_file, source_hint, skill_hint), None
+    except Exception as e:
+        return md_file, None, str(e)
+
+
+def _article_files(source_dir: Path) -> List[Path]:
+    # Skip INDEX.md and README.md
+    return [f for f in source_dir.rglob("*.md") if f.name not in ('INDEX.md', 'README.md')]
+
+
+def sync_from_yaml(source_dir: Path, db: KnowledgeDB, source_hint: str = '', skill_hint: str = '',
+                   bulk: bool = False, workers: Optional[int] = None, rebuild_fts: bool = True):
+    """Sync articles from YAML frontmatter OR markdown-header files into database
+
+    bulk: parse on a process pool (workers, default all cores) and load
+    via KnowledgeDB.bulk_load -- unchanged files skipped, one transaction.
+    rebuild_fts=False defers the bulk FTS rebuild to db.rebuild_fts().
+    """
+    if bulk:
+        return _bulk_sync(source_dir, db, source_hint, skill_hint, workers, rebuild_fts)
+
     synced = 0
     errors = 0
 
-    for md_file in source_dir.rglob("*.md"):
-        # Skip INDEX.md and README.md
-        if md_file.name in ('INDEX.md', 'README.md'):
-            continue
-
+    for md_file in _article_files(source_dir):
         try:
-            content = md_file.read_text(encoding='utf-8')
-
-            if content.startswith('---'):
-                # YAML frontmatter format
-                parts = content.split('---', 2)
-                if len(parts) < 3:
-                    continue
-
-                metadata = yaml.safe_load(parts[1]) or {}
-                article_content = parts[2].strip()
-            elif content.startswith('# '):
-                # Markdown-header format (from new scrapers)
-                metadata, article_content = parse_markdown_header(content)
-                if not metadata.get('title'):
-                    continue
-            else:
+            parsed = parse_article_file(md_file, source_hint, skill_hint)
+            if parsed is None:
                 continue
 
-            # Apply hints if not already in metadata
-            if source_hint and not metadata.get('source'):
-                metadata['source'] = source_hint
-            if skill_hint and not metadata.get('skill'):
-                metadata['skill'] = skill_hint
-
             # Add to database
-            db.add_article(md_file, metadata, article_content)
+            db.add_article(md_file, *parsed)
             synced += 1
 
         except Exception as e:
@@ -449,6 +673,33 @@ def sync_from_yaml(source_dir: Path, db: KnowledgeDB, source_hint: str = '', ski
     return synced, errors
 
 
+def _bulk_sync(source_dir: Path, db: KnowledgeDB, source_hint: str, skill_hint: str,
+               workers: Optional[int], rebuild_fts: bool = True):
+    files = _article_files(source_dir)
+    parse = partial(_parse_worker, source_hint=source_hint, skill_hint=skill_hint)
+    workers = workers or os.cpu_count() or 1
+    errors = 0
+
+    def parsed_articles(results):
+        nonlocal errors
+        for md_file, parsed, error in results:
+            if error is not None:
+                print(f"ERROR syncing {md_file}: {error}")
+                errors += 1
+            elif parsed is not None:
+                yield (md_file, *parsed)
+
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = db.bulk_load(parsed_articles(pool.map(parse, files, chunksize=64)), rebuild_fts)
+    else:
+        counts = db.bulk_load(parsed_articles(map(parse, files)), rebuild_fts)
+
+    print(f"  Bulk load: {counts['new']} new, {counts['changed']} changed, "
+          f"{counts['unchanged']} unchanged")
+    return sum(counts.values()), errors
+
+
 def main():
     """CLI for knowledge database"""
     import argparse
@@ -460,6 +711,9 @@ def main():
     parser.add_argument("--query", help="Search query")
     parser.add_argument("--skill", help="Filter by skill")
     parser.add_argument("--limit", type=int, default=20, help="Result limit")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Sync via parallel parse + single-transaction bulk load")
+    parser.add_argument("--workers", type=int, help="Parse processes for --bulk (default: all cores)")
 
     args = parser.parse_args()
 
@@ -472,7 +726,7 @@ def main():
 
         source_path = Path(args.source).expanduser()
         print(f"Syncing from {source_path}...")
-        synced, errors = sync_from_yaml(source_path, db)
+        synced, errors = sync_from_yaml(source_path, db, bulk=args.bulk, workers=args.workers)
         print(f"✅ Synced {synced} articles ({errors} errors)")
 
     elif args.command == 'stats':
@@ -507,7 +761,7 @@ def main():
         for result in results:
             print(f"\n{result['title']}")
             print(f"  By {result['author']} | {result['source']} | {result['date_published']}")
-            print(f"  Tags: {result.get('tags', 'None')}")
+            print(f"  Tags: {result.get('tags') or 'None'}")
             print(f"  {result['file_path']}")
 
     elif args.command == 'query':
@@ -191,8 +191,9 @@ KNOWLEDGE_DIRS = {
 }
 
 
-def sync_all(db_path: str, verbose: bool = True):
-    """Sync all knowledge bases to database"""
+def sync_all(db_path: str, verbose: bool = True, bulk: bool = True):
+    """Sync all knowledge bases to database (bulk: parallel parse, one
+    transaction per source, unchanged files skipped, one FTS rebuild at the end)"""
     db = KnowledgeDB(db_path)
 
     total_synced = 0
@@ -212,7 +213,9 @@ def sync_all(db_path: str, verbose: bool = True):
         synced, errors = sync_from_yaml(
             source_path, db,
             source_hint=config["source_hint"],
-            skill_hint=config["skill_hint"]
+            skill_hint=config["skill_hint"],
+            bulk=bulk,
+            rebuild_fts=False
         )
 
         if verbose:
@@ -221,6 +224,8 @@ def sync_all(db_path: str, verbose: bool = True):
         total_synced += synced
         total_errors += errors
 
+    db.rebuild_fts()
+
     if verbose:
         print(f"\n  Complete! Synced {total_synced} total articles ({total_errors} errors)")
         print(f"\n  Database statistics:")
@@ -238,7 +243,7 @@ def sync_all(db_path: str, verbose: bool = True):
     return total_synced, total_errors
 
 
-def sync_source(source_id: str, db_path: str, verbose: bool = True):
+def sync_source(source_id: str, db_path: str, verbose: bool = True, bulk: bool = True):
     """Sync single source to database"""
     if source_id not in KNOWLEDGE_DIRS:
         print(f"ERROR: Unknown source '{source_id}'")
@@ -260,7 +265,8 @@ def sync_source(source_id: str, db_path: str, verbose: bool = True):
     synced, errors = sync_from_yaml(
         source_path, db,
         source_hint=config["source_hint"],
-        skill_hint=config["skill_hint"]
+        skill_hint=config["skill_hint"],
+        bulk=bulk
     )
 
     if verbose:
@@ -277,15 +283,17 @@ def main():
     parser.add_argument("--source", help="Sync specific source only")
     parser.add_argument("--all", action="store_true", help="Sync all knowledge bases")
     parser.add_argument("--quiet", action="store_true", help="Suppress output")
+    parser.add_argument("--per-article", action="store_true",
+                        help="Insert files one by one instead of the bulk load")
 
     args = parser.parse_args()
 
     verbose = not args.quiet
 
     if args.all:
-        sync_all(args.db, verbose=verbose)
+        sync_all(args.db, verbose=verbose, bulk=not args.per_article)
     elif args.source:
-        sync_source(args.source, args.db, verbose=verbose)
+        sync_source(args.source, args.db, verbose=verbose, bulk=not args.per_article)
     else:
         print("ERROR: Must specify --all or --source <source_id>")
         print(f"Available sources: {', '.join(KNOWLEDGE_DIRS.keys())}")
@@ -19,6 +19,7 @@ Usage:
 import json
 import os
 import re
+import sqlite3
 import subprocess
 import sys
 import time
@@ -48,7 +49,7 @@ except ImportError:
 
 # --- Constants ---
 
-RATE_LIMITS_FILE = Path.home() / ".openclaw" / "llm-rate-limits.json"
+RATE_LIMITS_FILE = Path.home() / ".openclaw" / "llm-rate-limits.json"  # Legacy; buckets live in .db
 BUDGET_FILE = Path.home() / ".budget-state.json"
 QUEUE_FILE = Path.home() / "Documents" / "Obsidian" / "process" / "CLAUDE-QUEUE.md"
 TOOLS_DIR = Path.home() / "Development" / "tools"
@@ -284,56 +285,142 @@ def log_event(status: str, detail: str) -> None:
 
 
 # --- Rate Limit Tracking ---
-
-def load_rate_limits() -> dict:
-    """Load rate limit state from disk."""
+#
+# Per-model token buckets in a small SQLite WAL database shared by every
+# router process. A bucket holds up to rpm_limit tokens and refills at
+# rpm_limit/60 per second; each call spends one. Timestamps are wall-clock
+# time.time() floats, so they stay comparable across processes, reboots and
+# sleep, and no ISO parsing is needed per check. A timestamp in the future
+# means the clock was stepped back; that bucket is treated as refilled
+# rather than locked out until the clock catches up. Each update is a
+# single UPSERT statement, atomic across processes.
+
+RATE_BUCKET_WINDOW = 60.0  # Seconds for an empty bucket to refill completely
+
+_clock = time.time
+_rate_conn: Optional[sqlite3.Connection] = None
+_rate_conn_path: Optional[Path] = None
+
+
+def _rate_db_path() -> Path:
+    return RATE_LIMITS_FILE.with_suffix(".db")
+
+
+def _rate_db() -> sqlite3.Connection:
+    """Connection to the rate-limit database (opened once per process)."""
+    global _rate_conn, _rate_conn_path
+    path = _rate_db_path()
+    if _rate_conn is not None and _rate_conn_path == path:
+        return _rate_conn
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=2.0, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS buckets (
+            model   TEXT PRIMARY KEY,
+            tokens  REAL NOT NULL,
+            ts      REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS router_state (
+            key     TEXT PRIMARY KEY,
+            value   TEXT
+        );
+    """)
+    # One-time carry-over of the last model from the old JSON state file
     if RATE_LIMITS_FILE.exists():
         try:
-            return json.loads(RATE_LIMITS_FILE.read_text())
-        except (json.JSONDecodeError, OSError):
-            pass
-    return {}
+            last = json.loads(RATE_LIMITS_FILE.read_text()).get("_last_model")
+        except (json.JSONDecodeError, OSError, AttributeError):
+            last = None
+        if last:
+            conn.execute(
+                "INSERT OR IGNORE INTO router_state (key, value) VALUES ('last_model', ?)",
+                (last,),
+            )
+    if _rate_conn is not None:
+        _rate_conn.close()
+    _rate_conn, _rate_conn_path = conn, path
+    return conn
 
 
-def save_rate_limits(state: dict) -> None:
-    """Save rate limit state to disk."""
-    RATE_LIMITS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    RATE_LIMITS_FILE.write_text(json.dumps(state, indent=2))
+def _bucket_params(model_name: str) -> Optional[tuple[float, float]]:
+    """(capacity, refill tokens/sec) for a rate-limited model, else None."""
+    model = MODELS.get(model_name)
+    if not model or model["rpm_limit"] is None:
+        return None
+    capacity = float(model["rpm_limit"])
+    return capacity, capacity / RATE_BUCKET_WINDOW
+
+
+def _available_tokens(tokens: float, ts: float, now: float,
+                      capacity: float, rate: float) -> float:
+    if now < ts:
+        return capacity  # Clock stepped back: don't lock the model out
+    return min(capacity, tokens + (now - ts) * rate)
 
 
 def record_call(model_name: str) -> None:
-    """Record a call to a model for rate limit tracking."""
-    state = load_rate_limits()
-    now = datetime.now(timezone.utc).isoformat()
-    if model_name not in state:
-        state[model_name] = {"calls": []}
-    state[model_name]["calls"].append(now)
-    # Prune calls older than 60 seconds
-    cutoff = time.time() - 60
-    state[model_name]["calls"] = [
-        c for c in state[model_name]["calls"]
-        if datetime.fromisoformat(c.replace("Z", "+00:00")).timestamp() > cutoff
-    ]
-    save_rate_limits(state)
+    """Record a call to a model for rate limit tracking (spends one token)."""
+    params = _bucket_params(model_name)
+    if params is None:
+        return
+    capacity, rate = params
+    now = _clock()
+    try:
+        _rate_db().execute(
+            """INSERT INTO buckets (model, tokens, ts) VALUES (:m, :cap - 1, :now)
+               ON CONFLICT(model) DO UPDATE SET
+                   tokens = CASE WHEN :now < ts THEN :cap
+                                 ELSE MIN(:cap, tokens + (:now - ts) * :rate)
+                            END - 1,
+                   ts = :now""",
+            {"m": model_name, "cap": capacity, "rate": rate, "now": now},
+        )
+    except sqlite3.Error as e:
+        log_event("RATE_DB_ERROR", f"record_call({model_name}): {e}")
 
 
 def check_rate_limit(model_name: str) -> bool:
     """Return True if model has capacity, False if rate-limited."""
-    model = MODELS.get(model_name)
-    if not model or model["rpm_limit"] is None:
+    params = _bucket_params(model_name)
+    if params is None:
         return True  # no rate limit
+    capacity, rate = params
 
-    state = load_rate_limits()
-    if model_name not in state:
+    try:
+        row = _rate_db().execute(
+            "SELECT tokens, ts FROM buckets WHERE model = ?", (model_name,)
+        ).fetchone()
+    except sqlite3.Error:
+        return True  # Fail open, like a missing state file
+    if row is None:
         return True
 
-    cutoff = time.time() - 60
-    recent_calls = [
-        c for c in state.get(model_name, {}).get("calls", [])
-        if datetime.fromisoformat(c.replace("Z", "+00:00")).timestamp() > cutoff
-    ]
-    remaining = model["rpm_limit"] - len(recent_calls)
-    return remaining > model["headroom"]
+    available = _available_tokens(row[0], row[1], _clock(), capacity, rate)
+    return available > MODELS[model_name]["headroom"]
+
+
+def load_rate_limits() -> dict:
+    """Snapshot of rate limit state: {model: {"tokens": available}, "_last_model": ...}."""
+    state = {}
+    try:
+        conn = _rate_db()
+        rows = conn.execute("SELECT model, tokens, ts FROM buckets").fetchall()
+        last = conn.execute(
+            "SELECT value FROM router_state WHERE key = 'last_model'"
+        ).fetchone()
+    except sqlite3.Error:
+        return state
+    now = _clock()
+    for model_name, tokens, ts in rows:
+        params = _bucket_params(model_name)
+        if params is None:
+            continue
+        state[model_name] = {"tokens": _available_tokens(tokens, ts, now, *params)}
+    if last:
+        state["_last_model"] = last[0]
+    return state
 
 
 # --- Model Health ---
@@ -416,15 +503,24 @@ def is_followup(message: str) -> bool:
 
 def get_last_model() -> Optional[str]:
     """Get the model used for the last routed task."""
-    state = load_rate_limits()
-    return state.get("_last_model")
+    try:
+        row = _rate_db().execute(
+            "SELECT value FROM router_state WHERE key = 'last_model'"
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
 
 
 def set_last_model(model_name: str) -> None:
     """Record which model was used for the last task."""
-    state = load_rate_limits()
-    state["_last_model"] = model_name
-    save_rate_limits(state)
+    try:
+        _rate_db().execute(
+            "INSERT OR REPLACE INTO router_state (key, value) VALUES ('last_model', ?)",
+            (model_name,),
+        )
+    except sqlite3.Error as e:
+        log_event("RATE_DB_ERROR", f"set_last_model({model_name}): {e}")
 
 
 # --- DeepSeek Filter ---
@@ -926,17 +1022,14 @@ def main():
     if args.rates:
         state = load_rate_limits()
         print("Rate Limit State:")
-        cutoff = time.time() - 60
         for name in MODELS:
-            if name in state:
-                recent = [
-                    c for c in state[name].get("calls", [])
-                    if datetime.fromisoformat(c.replace("Z", "+00:00")).timestamp() > cutoff
-                ]
-                rpm = MODELS[name]["rpm_limit"] or "unlimited"
-                print(f"  {name:12s} {len(recent)} calls/min (limit: {rpm})")
-            else:
-                print(f"  {name:12s} 0 calls/min")
+            rpm = MODELS[name]["rpm_limit"]
+            if rpm is None:
+                print(f"  {name:12s} unlimited")
+                continue
+            tokens = state.get(name, {}).get("tokens", float(rpm))
+            print(f"  {name:12s} {tokens:5.1f}/{rpm} tokens available "
+                  f"(headroom: {MODELS[name]['headroom']})")
         print(f"\n  Last model: {state.get('_last_model', 'none')}")
         return
 
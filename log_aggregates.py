@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Log Aggregates - tail-following running totals for the delegation logs.
+
+The dashboard (every refresh), delegation_stats.py, delegation_analyzer.py
+and startup_checks.py each read the whole delegation hook audit log and
+the Gemini route eval log and re-tokenized every line ever written, so
+they got slower as the logs grew.
+
+Each log gets an aggregator that remembers the byte offset it has folded
+up to and keeps its running aggregates in a JSON state file:
+
+    - Audit log (key=value lines): value counts for action/model/exec/
+      tone/source, prefetch successes, template routing per category, a
+      latency histogram and per-date buckets.
+    - Eval log (JSONL): calls/successes/tokens saved in total, per
+      category and per date, plus recent (ts, tokens) pairs for
+      session-window sums.
+
+A refresh reads only bytes appended since the last offset, and only up
+to the last complete line. A replaced (new inode) or truncated log is
+re-folded from the start.
+
+No external dependencies -- stdlib only.
+
+Usage:
+    python3 log_aggregates.py              # Refresh both logs + print totals
+    python3 log_aggregates.py reset        # Forget state (re-fold on next run)
+
+    # From Python
+    from log_aggregates import audit_stats, eval_stats
+    audit = audit_stats()                  # {"lines", "counts", "latency", ...}
+    routes = eval_stats()                  # {"calls", "by_category", "by_date", ...}
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+
+LOCKS = Path.home() / ".claude" / ".locks"
+AUDIT_LOG = LOCKS / "delegation-hook-audit.log"
+EVAL_LOG = LOCKS / "gemini-route-eval.jsonl"
+LOG_AGGREGATES_DIR = LOCKS / "log-aggregates"
+
+STATE_VERSION = 1
+READ_CHUNK = 1 << 20
+AUDIT_COUNT_KEYS = ("action", "model", "exec", "tone", "source")
+TEMPLATE_ACTION = "prefetch_template:"
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000)  # Upper bounds; rest is "inf"
+RECENT_DAYS = 7  # Eval entries kept individually for session-window sums
+
+_DATE_RE = re.compile(r"\[?(\d{4}-\d{2}-\d{2})")
+
+
+def parse_audit_line(line: str) -> dict:
+    """Extract key=value pairs from an audit log line."""
+    parts = {}
+    for token in line.split():
+        if "=" in token and not token.startswith("["):
+            k, v = token.split("=", 1)
+            parts[k] = v
+    return parts
+
+
+def latency_bucket(ms: int) -> str:
+    for bound in LATENCY_BUCKETS_MS:
+        if ms <= bound:
+            return str(bound)
+    return "inf"
+
+
+def _bump(counts: dict, key: str, n: int = 1):
+    counts[key] = counts.get(key, 0) + n
+
+
+class LogAggregator:
+    """Offset-tracking fold of a line-oriented log into a JSON aggregate.
+
+    Subclasses define empty() and fold(); finish() runs after each refresh.
+    """
+
+    name = "log"
+
+    def __init__(self, log_path: Path, state_path: Optional[Path] = None):
+        self.log_path = Path(log_path)
+        self.state_path = Path(state_path) if state_path else LOG_AGGREGATES_DIR / f"{self.name}.json"
+        self._lock = threading.Lock()
+
+    def empty(self) -> dict:
+        raise NotImplementedError
+
+    def fold(self, agg: dict, line: str):
+        raise NotImplementedError
+
+    def finish(self, agg: dict):
+        pass
+
+    # ── Persistence ─────────────────────────────────────────────────────
+
+    def _fresh_state(self) -> dict:
+        return {"version": STATE_VERSION, "inode": None, "offset": 0, "agg": self.empty()}
+
+    def _load(self) -> dict:
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            if state.get("version") == STATE_VERSION:
+                return state
+        except (OSError, ValueError):
+            pass
+        return self._fresh_state()
+
+    def _save(self, state: dict):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    def reset(self):
+        with self._lock:
+            self.state_path.unlink(missing_ok=True)
+
+    # ── Tail ────────────────────────────────────────────────────────────
+
+    def refresh(self) -> dict:
+        """Fold lines appended since the last refresh; returns the aggregate.
+
+        The state file is re-read each time, so another process's progress
+        is picked up instead of re-folded.
+        """
+        with self._lock:
+            state = self._load()
+            try:
+                st = self.log_path.stat()
+            except OSError:
+                return self._fresh_state()["agg"]
+            if state["inode"] != st.st_ino or st.st_size < state["offset"]:
+                state = self._fresh_state()  # Rotated, replaced or truncated
+                state["inode"] = st.st_ino
+            if st.st_size == state["offset"]:
+                return state["agg"]
+
+            agg = state["agg"]
+            offset = state["offset"]
+            with open(self.log_path, "rb") as f:
+                f.seek(offset)
+                pending = b""
+                while True:
+                    chunk = f.read(READ_CHUNK)
+                    if not chunk:
+                        break
+                    data = pending + chunk
+                    end = data.rfind(b"\n")
+                    if end < 0:
+                        pending = data
+                        continue
+                    # Only whole lines: a half-written last line waits
+                    for raw in data[:end].split(b"\n"):
+                        line = raw.decode("utf-8", errors="replace").strip()
+                        if line:
+                            self.fold(agg, line)
+                    offset += end + 1  # data starts at offset
+                    pending = data[end + 1:]
+            self.finish(agg)
+            state["offset"] = offset
+            self._save(state)
+            return agg
+
+
+class AuditLogAggregator(LogAggregator):
+    """delegation-hook-audit.log: one key=value line per hook fire."""
+
+    name = "delegation-audit"
+
+    def empty(self) -> dict:
+        return {
+            "lines": 0,
+            "prefetched": 0,
+            "counts": {key: {} for key in AUDIT_COUNT_KEYS},
+            "prefetched_by_source": {},
+            "templates": {},  # category -> {"calls", "ok"}
+            "latency": {"count": 0, "sum": 0, "hist": {}},
+            "by_date": {},  # date -> {"lines", "prefetched"}
+        }
+
+    def fold(self, agg: dict, line: str):
+        parts = parse_audit_line(line)
+        agg["lines"] += 1
+        for key in AUDIT_COUNT_KEYS:
+            if key in parts:
+                _bump(agg["counts"][key], parts[key])
+        ok = parts.get("prefetch") == "OK"
+        if ok:
+            agg["prefetched"] += 1
+            if "source" in parts:
+                _bump(agg["prefetched_by_source"], parts["source"])
+
+        action = parts.get("action", "")
+        if action.startswith(TEMPLATE_ACTION):
+            template = agg["templates"].setdefault(action[len(TEMPLATE_ACTION):], {"calls": 0, "ok": 0})
+            template["calls"] += 1
+            template["ok"] += ok
+
+        if "latency" in parts:
+            try:
+                ms = int(parts["latency"].rstrip("ms"))
+            except ValueError:
+                pass
+            else:
+                latency = agg["latency"]
+                latency["count"] += 1
+                latency["sum"] += ms
+                _bump(latency["hist"], latency_bucket(ms))
+
+        m = _DATE_RE.match(line)
+        day = agg["by_date"].setdefault(m.group(1) if m else "unknown", {"lines": 0, "prefetched": 0})
+        day["lines"] += 1
+        day["prefetched"] += ok
+
+
+class EvalLogAggregator(LogAggregator):
+    """gemini-route-eval.jsonl: one JSON object per template routing call."""
+
+    name = "gemini-route-eval"
+
+    def empty(self) -> dict:
+        return {
+            "calls": 0,
+            "success": 0,
+            "tokens_saved": 0,
+            "bad_lines": 0,
+            "by_category": {},
+            "by_date": {},  # date -> {"calls", "success", "tokens_saved"}
+            "recent": [],  # [ts, tokens_saved] for the last RECENT_DAYS
+        }
+
+    def fold(self, agg: dict, line: str):
+        try:
+            entry = json.loads(line)
+            ts = str(entry.get("ts", ""))
+            saved = int(entry.get("est_tokens_saved", 0) or 0)
+        except (ValueError, TypeError, AttributeError):
+            agg["bad_lines"] += 1
+            return
+        success = bool(entry.get("success", False))
+        agg["calls"] += 1
+        agg["success"] += success
+        agg["tokens_saved"] += saved
+        _bump(agg["by_category"], entry.get("category", "unknown"))
+        day = agg["by_date"].setdefault(
+            ts[:10] if len(ts) >= 10 else "unknown", {"calls": 0, "success": 0, "tokens_saved": 0}
+        )
+        day["calls"] += 1
+        day["success"] += success
+        day["tokens_saved"] += saved
+        agg["recent"].append([ts, saved])
+
+    def finish(self, agg: dict):
+        cutoff = (datetime.now() - timedelta(days=RECENT_DAYS)).strftime("%Y-%m-%d")
+        agg["recent"] = [r for r in agg["recent"] if r[0] >= cutoff]
+
+
+def value_counts(agg: dict, key: str, missing: Optional[str] = None) -> dict:
+    """Audit counts of key's values; lines without key go under missing."""
+    counts = dict(agg["counts"][key])
+    absent = agg["lines"] - sum(counts.values())
+    if missing is not None and absent > 0:
+        _bump(counts, missing, absent)
+    return counts
+
+
+def tokens_saved_since(agg: dict, since: str) -> tuple:
+    """(tokens saved, calls) of eval entries with ts >= since.
+
+    Exact for windows within the last RECENT_DAYS.
+    """
+    recent = [saved for ts, saved in agg["recent"] if ts >= since]
+    return sum(recent), len(recent)
+
+
+_aggregators: dict = {}
+_aggregators_lock = threading.Lock()
+
+
+def _get(cls, log_path: Path) -> LogAggregator:
+    with _aggregators_lock:
+        if cls.name not in _aggregators:
+            _aggregators[cls.name] = cls(log_path)
+        return _aggregators[cls.name]
+
+
+def get_audit_aggregator() -> AuditLogAggregator:
+    return _get(AuditLogAggregator, AUDIT_LOG)
+
+
+def get_eval_aggregator() -> EvalLogAggregator:
+    return _get(EvalLogAggregator, EVAL_LOG)
+
+
+def audit_stats() -> dict:
+    """Running aggregates of the delegation hook audit log."""
+    return get_audit_aggregator().refresh()
+
+
+def eval_stats() -> dict:
+    """Running aggregates of the Gemini route eval log."""
+    return get_eval_aggregator().refresh()
+
+
+def main():
+    args = sys.argv[1:]
+    cmd = args[0] if args else "show"
+    if cmd == "show":
+        audit = audit_stats()
+        routes = eval_stats()
+        latency = audit["latency"]
+        print(f"Audit log: {AUDIT_LOG}")
+        print(f"  Lines: {audit['lines']} ({audit['prefetched']} prefetched)")
+        print(f"  Avg latency: {latency['sum'] // max(latency['count'], 1)}ms")
+        for bucket in [str(b) for b in LATENCY_BUCKETS_MS] + ["inf"]:
+            if bucket in latency["hist"]:
+                print(f"    <= {bucket:>5}ms  {latency['hist'][bucket]}")
+        print(f"Eval log: {EVAL_LOG}")
+        print(f"  Calls: {routes['calls']} ({routes['success']} ok)")
+        print(f"  Tokens saved: {routes['tokens_saved']:,}")
+    elif cmd == "reset":
+        get_audit_aggregator().reset()
+        get_eval_aggregator().reset()
+        print("Reset")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,24 @@
 """
 Session Monitor - Track outputs across Claude Code sessions
 Monitors all active and recent sessions for files created, tasks completed, errors
+
+Session contents come from the shared session store (session_usage.py):
+each parse only ingests bytes appended since the last one.
 """
 
-import json
+import sys
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent))
+from session_usage import SessionUsageStore
+
 class SessionMonitor:
-    def __init__(self, sessions_dir="~/.claude/projects/-Users-nissimagent"):
+    def __init__(self, sessions_dir="~/.claude/projects/-Users-nissimagent", store=None):
         self.sessions_dir = Path(sessions_dir).expanduser()
         self.current_session = None
+        self.store = store or SessionUsageStore()
 
     def list_sessions(self, limit=10):
         """List recent sessions by modification time"""
@@ -21,13 +28,13 @@ class SessionMonitor:
         return session_files[:limit]
 
     def parse_session(self, session_file):
-        """Parse a session JSONL file"""
+        """Summarize a session JSONL file"""
         session_data = {
             'session_id': session_file.stem,
             'file_path': str(session_file),
             'size': session_file.stat().st_size,
             'modified': datetime.fromtimestamp(session_file.stat().st_mtime),
-            'messages': [],
+            'messages': 0,
             'files_created': set(),
             'files_modified': set(),
             'tasks': [],
@@ -36,65 +43,43 @@ class SessionMonitor:
         }
 
         try:
-            with open(session_file, 'r') as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    try:
-                        entry = json.loads(line)
-                        self._process_entry(entry, session_data)
-                    except json.JSONDecodeError:
-                        continue
+            self.store.refresh([session_file])
         except Exception as e:
             session_data['parse_error'] = str(e)
-
-        return session_data
-
-    def _process_entry(self, entry, session_data):
-        """Process a single JSONL entry"""
-        # Track messages
-        if 'role' in entry:
-            session_data['messages'].append({
-                'role': entry['role'],
-                'timestamp': entry.get('timestamp'),
-                'content_length': len(str(entry.get('content', '')))
-            })
-
-        # Track tool usage
-        if entry.get('type') == 'tool_use':
-            tool_name = entry.get('name', 'unknown')
-            session_data['tools_used'][tool_name] += 1
-
-            # Extract file operations
-            if tool_name == 'Write':
-                file_path = entry.get('input', {}).get('file_path')
-                if file_path:
-                    session_data['files_created'].add(file_path)
-
-            elif tool_name == 'Edit':
-                file_path = entry.get('input', {}).get('file_path')
-                if file_path:
-                    session_data['files_modified'].add(file_path)
-
-        # Track tool results for errors
-        if entry.get('type') == 'tool_result':
-            if entry.get('is_error'):
-                error_content = entry.get('content', '')
-                session_data['errors'].append({
-                    'tool': entry.get('tool_use_id', 'unknown'),
-                    'error': str(error_content)[:200]  # Truncate
+            return session_data
+        file_id = self.store.file_id(session_file)
+        if file_id is None:
+            return session_data
+
+        session_data['messages'] = self.store.conversation_totals(file_id)['messages']
+        session_data['tools_used'].update(self.store.tool_counts(file_id))
+
+        # Extract file and task operations
+        for call in self.store.tool_calls(file_id, names=['Write', 'Edit', 'TaskCreate', 'TaskUpdate']):
+            tool_input = call['input']
+            if call['name'] == 'Write':
+                if tool_input.get('file_path'):
+                    session_data['files_created'].add(tool_input['file_path'])
+            elif call['name'] == 'Edit':
+                if tool_input.get('file_path'):
+                    session_data['files_modified'].add(tool_input['file_path'])
+            else:
+                session_data['tasks'].append({
+                    'action': call['name'],
+                    'task_id': tool_input.get('taskId'),
+                    'status': tool_input.get('status'),
+                    'subject': tool_input.get('subject')
                 })
 
-        # Track task operations
-        if entry.get('type') == 'tool_use' and entry.get('name') in ['TaskCreate', 'TaskUpdate']:
-            task_input = entry.get('input', {})
-            session_data['tasks'].append({
-                'action': entry.get('name'),
-                'task_id': task_input.get('taskId'),
-                'status': task_input.get('status'),
-                'subject': task_input.get('subject')
+        # Tool results flagged as errors
+        for error in self.store.tool_errors(file_id):
+            session_data['errors'].append({
+                'tool': error['tool_use_id'] or 'unknown',
+                'error': error['error']
             })
 
+        return session_data
+
     def get_active_sessions(self):
         """Find sessions modified in last 24 hours"""
         now = datetime.now()
@@ -134,7 +119,7 @@ class SessionMonitor:
             comparison['sessions'].append({
                 'id': session_data['session_id'][:8],
                 'modified': session_data['modified'].strftime('%Y-%m-%d %H:%M'),
-                'messages': len(session_data['messages']),
+                'messages': session_data['messages'],
                 'files': len(session_data['files_created']) + len(session_data['files_modified']),
                 'tasks': len(session_data['tasks']),
                 'tools': dict(session_data['tools_used'])
@@ -203,7 +188,7 @@ class SessionMonitor:
             report += f"### Session: {session_data['session_id'][:16]}...\n\n"
             report += f"**Modified:** {session_data['modified'].strftime('%Y-%m-%d %H:%M:%S')}\n"
             report += f"**Size:** {session_data['size'] / 1024:.1f} KB\n"
-            report += f"**Messages:** {len(session_data['messages'])}\n\n"
+            report += f"**Messages:** {session_data['messages']}\n\n"
 
             if session_data['files_created']:
                 report += "**Files Created:**\n"
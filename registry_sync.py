@@ -18,6 +18,8 @@ import sys
 from datetime import date
 from pathlib import Path
 
+from kb_counter import kb_total
+
 # ──────────────────────────────────────────────
 # Configuration
 # ──────────────────────────────────────────────
@@ -145,10 +147,10 @@ def rebuild_registry(disk_state):
 
     counts = {
         "total_skills": len(disk_state["skills_active"]),
-        "total_articles": existing.get("__counts_total_articles", 0),
+        "total_articles": kb_total(),
     }
-    # Try to preserve article count from existing registry
-    if REGISTRY_PATH.exists():
+    # No KB on this machine: preserve the article count from the existing registry
+    if not counts["total_articles"] and REGISTRY_PATH.exists():
         try:
             with open(REGISTRY_PATH) as f:
                 old = json.load(f)
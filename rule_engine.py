@@ -4,19 +4,26 @@
 Loads scored rules from rules.yaml, classifies prompts by domain/tool,
 returns the top relevant behavioral principle reminders.
 
-State (spikes, activation counts, dormancy) persists in rule-engine-state.json.
+State (spikes, activation counts, dormancy) persists in rule-engine-state.json
+plus an append-only event log (rule-engine-state.events.jsonl) that
+advance_day folds back into the snapshot.
+rules.yaml is compiled to rule-engine-compiled.pickle (rules + domain/tool
+indexes) so each hook process skips YAML parsing and scores only candidates.
 Lifecycle events (decay, dormancy, merge detection) run via session-close.
 
 Must complete scoring in <100ms (called from learning_hook.py on every prompt).
 """
 
+import copy
 import datetime
 import fcntl
 import json
 import os
+import pickle
 import re
 import tempfile
 import time
+import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
@@ -29,6 +36,9 @@ import yaml
 
 RULES_PATH = Path(__file__).parent / "rules.yaml"
 STATE_PATH = Path.home() / ".claude/.locks/rule-engine-state.json"
+# Pickled snapshot of rules.yaml + inverted indexes; rebuilt when the YAML changes
+COMPILED_PATH = Path.home() / ".claude/.locks/rule-engine-compiled.pickle"
+COMPILED_VERSION = 1  # Bump when Rule fields or the snapshot layout change
 
 # ============================================================
 # CONSTANTS (must match rule_engine_sim.py exactly)
@@ -45,6 +55,7 @@ SPIKE_DECAY_PER_DAY = 0.010
 INACTIVE_THRESHOLD_DAYS = 60
 UNMERGE_COOLDOWN_DAYS = 30
 CO_ACTIVATION_MERGE_THRESHOLD = 0.90
+CO_ACTIVATION_MERGE_MIN_EITHER = 10  # Minimum prompts before a pair can merge
 SPREAD_BONUS_FACTOR = 0.2
 CO_ACTIVATION_MAX_PAIRS = 500
 CO_ACTIVATION_MIN_EITHER = 5  # Prune pairs below this in advance_day
@@ -105,13 +116,17 @@ class Rule:
 
 _rules_cache = None
 _rules_mtime = 0
+_rules_index = None  # {"by_domain", "by_tool", "always", "ordinal"} for _rules_cache
 
 
 def clear_cache():
     """Clear rules cache. Public method for testability."""
-    global _rules_cache, _rules_mtime
+    global _rules_cache, _rules_mtime, _rules_index, _domain_keywords, _tool_keywords
     _rules_cache = None
     _rules_mtime = 0
+    _rules_index = None
+    _domain_keywords = None
+    _tool_keywords = None
 
 
 def validate_rules(rules: dict[str, Rule]) -> list[str]:
@@ -142,22 +157,8 @@ def validate_rules(rules: dict[str, Rule]) -> list[str]:
     return warnings
 
 
-def load_rules() -> dict[str, Rule]:
-    """Load rules from YAML. Cached by mtime."""
-    global _rules_cache, _rules_mtime
-
-    if not RULES_PATH.exists():
-        return {}
-
-    mtime = RULES_PATH.stat().st_mtime
-    if _rules_cache and mtime == _rules_mtime:
-        return _rules_cache
-
-    try:
-        data = yaml.safe_load(RULES_PATH.read_text())
-    except (yaml.YAMLError, OSError):
-        return {}
-
+def _parse_rules(data: dict) -> dict[str, Rule]:
+    """Build Rule objects from parsed rules.yaml data."""
     rules = {}
     for r in data.get("rules", []):
         rules[r["id"]] = Rule(
@@ -173,50 +174,383 @@ def load_rules() -> dict[str, Rule]:
             connections=r.get("connections", {}),
             reminder=r.get("reminder", ""),
         )
+    return rules
+
+
+def _build_rule_index(rules: dict[str, Rule]) -> dict:
+    """Inverted indexes used to limit scoring to reachable rules.
+
+    A rule can only reach THRESHOLD through a domain match (explicit or
+    "all") or a tool trigger, unless consequence + max spike alone clear it —
+    those go in "always" so candidate scoring stays identical to a full scan.
+    "ordinal" preserves YAML order, which breaks score ties.
+    """
+    by_domain: dict[str, list[str]] = {}
+    by_tool: dict[str, list[str]] = {}
+    always = []
+    for rid, r in rules.items():
+        for d in r.domains:
+            by_domain.setdefault(d, []).append(rid)
+        for t in r.tool_triggers:
+            by_tool.setdefault(t, []).append(rid)
+        if r.consequence + SPIKE_CAP >= THRESHOLD:
+            always.append(rid)
+    return {
+        "by_domain": by_domain,
+        "by_tool": by_tool,
+        "always": always,
+        "ordinal": {rid: i for i, rid in enumerate(rules)},
+    }
+
+
+def _load_compiled(mtime_ns: int, size: int) -> Optional[dict]:
+    """Compiled snapshot if it matches rules.yaml (mtime + size + version)."""
+    try:
+        with open(COMPILED_PATH, "rb") as f:
+            snap = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if (
+        not isinstance(snap, dict)
+        or snap.get("version") != COMPILED_VERSION
+        or snap.get("source_mtime_ns") != mtime_ns
+        or snap.get("source_size") != size
+    ):
+        return None
+    return snap
+
+
+def _save_compiled(snap: dict):
+    """Write the compiled snapshot atomically (tmp + rename). Best effort."""
+    try:
+        COMPILED_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=str(COMPILED_PATH.parent),
+            prefix=".rule-engine-compiled-",
+            suffix=".tmp",
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(snap, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp_path, str(COMPILED_PATH))
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    except (OSError, pickle.PicklingError):
+        pass
+
+
+def compile_rules() -> Optional[dict]:
+    """Load the compiled snapshot for rules.yaml, rebuilding it if stale.
+
+    One yaml.safe_load per rules.yaml change instead of two per process
+    (rules + classification keywords). Returns None if the YAML is missing
+    or unparseable.
+    """
+    try:
+        st = RULES_PATH.stat()
+    except OSError:
+        return None
+
+    snap = _load_compiled(st.st_mtime_ns, st.st_size)
+    if snap is not None:
+        return snap
+
+    try:
+        data = yaml.safe_load(RULES_PATH.read_text())
+    except (yaml.YAMLError, OSError):
+        return None
+
+    rules = _parse_rules(data)
+    snap = {
+        "version": COMPILED_VERSION,
+        "source_mtime_ns": st.st_mtime_ns,
+        "source_size": st.st_size,
+        "rules": rules,
+        "index": _build_rule_index(rules),
+        "domain_keywords": data.get("domain_keywords", {}),
+        "tool_keywords": data.get("tool_keywords", {}),
+    }
+    _save_compiled(snap)
+    return snap
+
 
-    _rules_cache = rules
+def load_rules() -> dict[str, Rule]:
+    """Load rules from the compiled snapshot (rebuilt from YAML when stale). Cached by mtime."""
+    global _rules_cache, _rules_mtime, _rules_index, _domain_keywords, _tool_keywords
+
+    if not RULES_PATH.exists():
+        return {}
+
+    mtime = RULES_PATH.stat().st_mtime
+    if _rules_cache and mtime == _rules_mtime:
+        return _rules_cache
+
+    snap = compile_rules()
+    if snap is None:
+        return {}
+
+    _rules_cache = snap["rules"]
     _rules_mtime = mtime
-    return rules
+    _rules_index = snap["index"]
+    _domain_keywords = snap["domain_keywords"]
+    _tool_keywords = snap["tool_keywords"]
+    return _rules_cache
+
+
+def candidate_rules(rules: dict[str, Rule], domain: str, tool: str) -> list[Rule]:
+    """Rules that can score >= THRESHOLD for (domain, tool), in YAML order.
+
+    Uses the compiled inverted indexes; falls back to every rule when the
+    index doesn't belong to this rules dict (e.g. a caller-built dict).
+    """
+    index = _rules_index
+    if index is None or rules is not _rules_cache:
+        return list(rules.values())
+    ids = set(index["always"])
+    ids.update(index["by_domain"].get(domain, ()))
+    ids.update(index["by_domain"].get("all", ()))
+    ids.update(index["by_tool"].get(tool, ()))
+    ordinal = index["ordinal"]
+    return [rules[rid] for rid in sorted(ids, key=ordinal.__getitem__) if rid in rules]
 
 
 _state_lock_fd = None  # held during locked_state() context
 
+# Per-prompt updates are appended to an event log next to the snapshot
+# instead of rewriting the whole JSON. The log's first line names the
+# snapshot "epoch" it extends; a log whose epoch doesn't match the snapshot
+# (snapshot replaced by hand, crash mid-compaction) is ignored.
+STATE_LOG_COMPACT_BYTES = 256 * 1024  # Fold the log into the snapshot past this
 
-def load_state() -> dict:
-    """Load persistent state from JSON."""
+
+def _state_log_path() -> Path:
+    return STATE_PATH.with_suffix(".events.jsonl")
+
+
+def _state_lock_path() -> Path:
+    return STATE_PATH.parent / ".rule-engine-state.lock"
+
+
+def _read_snapshot() -> dict:
     if not STATE_PATH.exists():
         return {}
     try:
-        return json.loads(STATE_PATH.read_text())
+        state = json.loads(STATE_PATH.read_text())
     except (json.JSONDecodeError, OSError):
         return {}
+    return state if isinstance(state, dict) else {}
+
+
+def _read_log() -> tuple[Optional[str], list[tuple[int, dict]], int]:
+    """(epoch, [(end_offset, event), ...], size) for the event log."""
+    try:
+        data = _state_log_path().read_bytes()
+    except OSError:
+        return None, [], 0
+    epoch = None
+    events = []
+    offset = 0
+    for i, line in enumerate(data.split(b"\n")):
+        end = offset + len(line) + 1
+        if line.strip():
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                rec = None  # Torn/corrupt line: skip, keep replaying
+            if i == 0:
+                epoch = rec.get("epoch") if isinstance(rec, dict) else None
+            elif isinstance(rec, dict):
+                events.append((min(end, len(data)), rec))
+        offset = end
+    return epoch, events, len(data)
+
+
+def _apply_event(state: dict, event: dict, co: Optional["CoActivation"] = None):
+    """Fold one activation/violation event into a state dict (in place).
+
+    Co-activations go to co when given (see _replay_events); the caller
+    then writes co back to state["co_activation"].
+    """
+    rule_states = state.setdefault("rules", {})
+
+    def _entry(rid):
+        return rule_states.setdefault(
+            rid,
+            {
+                "adaptive_spike": 0.0,
+                "dormant": False,
+                "days_since_activation": 0,
+                "activation_count": 0,
+            },
+        )
+
+    kind = event.get("ev")
+    if kind == "act":
+        ids = event.get("ids", [])
+        for rid in ids:
+            entry = _entry(rid)
+            try:
+                count = max(0, int(entry.get("activation_count", 0)))
+            except (TypeError, ValueError):
+                count = 0
+            entry["activation_count"] = count + 1
+            entry["days_since_activation"] = 0
+        co_ids = event.get("co", [])
+        if co_ids:
+            if co is None:
+                single = CoActivation.from_state(
+                    state.get("co_activation", {}), load_rules()
+                )
+                single.record(co_ids)
+                state["co_activation"] = single.to_state()
+            else:
+                co.record(co_ids)
+    elif kind == "viol":
+        entry = _entry(event.get("id"))
+        try:
+            spike = max(0.0, min(float(entry.get("adaptive_spike", 0.0)), IMMUNE_SPIKE))
+        except (TypeError, ValueError):
+            spike = 0.0
+        if bool(entry.get("dormant", False)):
+            entry["dormant"] = False
+            entry["adaptive_spike"] = IMMUNE_SPIKE
+        else:
+            amount = SPIKE_AMOUNT.get(event.get("src"), 0.08)
+            entry["adaptive_spike"] = min(spike + amount, SPIKE_CAP)
+    if "ts" in event:
+        state["updated_at"] = event["ts"]
+
+
+def _replay_events(state: dict, events: list[dict]):
+    """Apply events in order, converting co-activation counts only once."""
+    co = None
+    for event in events:
+        if event.get("co") and co is None:
+            co = CoActivation.from_state(state.get("co_activation", {}), load_rules())
+        _apply_event(state, event, co)
+    if co is not None:
+        state["co_activation"] = co.to_state()
+
+
+def _load_state_unlocked() -> dict:
+    state = _read_snapshot()
+    if not state.get("epoch"):
+        return state
+    epoch, events, _size = _read_log()
+    offset = 0
+    if epoch == state["epoch"] and events:
+        _replay_events(state, [event for _end, event in events])
+        offset = events[-1][0]
+    state["_log_offset"] = offset
+    return state
+
+
+def load_state() -> dict:
+    """Load persistent state: JSON snapshot plus replay of the event log tail."""
+    return _load_state_unlocked()
+
+
+def _write_snapshot(state: dict):
+    """Write snapshot under a new epoch, then reset the log to that epoch.
+
+    Caller holds the exclusive state lock.
+    """
+    snap = {k: v for k, v in state.items() if k != "_log_offset"}
+    snap["epoch"] = uuid.uuid4().hex[:16]
+    fd, tmp_path = tempfile.mkstemp(
+        dir=str(STATE_PATH.parent),
+        prefix=".rule-engine-state-",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(snap, f, indent=2)
+        os.rename(tmp_path, str(STATE_PATH))
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    # Same tmp+rename dance so readers never see a half-written header
+    fd, tmp_path = tempfile.mkstemp(
+        dir=str(STATE_PATH.parent),
+        prefix=".rule-engine-events-",
+        suffix=".tmp",
+    )
+    with os.fdopen(fd, "w") as f:
+        f.write(json.dumps({"epoch": snap["epoch"]}) + "\n")
+    os.rename(tmp_path, str(_state_log_path()))
 
 
 def save_state(state: dict):
-    """Save state to JSON atomically (write tmp + rename, flock-protected).
+    """Save a full state snapshot atomically (write tmp + rename, flock-protected).
 
+    Also compacts: the event log is reset under the new snapshot's epoch.
+    If state came from load_state(), events appended since then are folded
+    in first so concurrent prompts' activations aren't lost.
     Learning #192: concurrent sessions must not lose increments.
     """
     try:
         STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        lock_path = STATE_PATH.parent / ".rule-engine-state.lock"
-        with open(lock_path, "w") as lock_f:
+        with open(_state_lock_path(), "w") as lock_f:
             fcntl.flock(lock_f, fcntl.LOCK_EX)
-            fd, tmp_path = tempfile.mkstemp(
-                dir=str(STATE_PATH.parent),
-                prefix=".rule-engine-state-",
-                suffix=".tmp",
-            )
-            try:
-                with os.fdopen(fd, "w") as f:
-                    json.dump(state, f, indent=2)
-                os.rename(tmp_path, str(STATE_PATH))
-            except Exception:
+            loaded_offset = state.get("_log_offset")
+            if loaded_offset is not None:
+                epoch, events, _size = _read_log()
+                newer = [ev for end, ev in events if end > loaded_offset]
+                if newer and epoch and epoch == state.get("epoch"):
+                    state = copy.deepcopy(state)  # Never mutate the caller's dict
+                    _replay_events(state, newer)
+            _write_snapshot(state)
+    except OSError:
+        pass
+
+
+def compact_state():
+    """Fold the event log into the snapshot (also happens in advance_day)."""
+    _record_event(None)
+
+
+def _record_event(event: Optional[dict], loaded: Optional[dict] = None):
+    """Persist one event: a single O_APPEND write on the fast path.
+
+    Fast path (shared lock, so prompts never serialize on each other): the
+    log belongs to the snapshot the caller loaded and is under the size cap.
+    Otherwise compact under the exclusive lock: reload, apply, rewrite.
+    """
+    try:
+        STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        line = (json.dumps(event, separators=(",", ":")) + "\n").encode() if event else None
+        with open(_state_lock_path(), "w") as lock_f:
+            if line is not None and loaded is not None and loaded.get("epoch"):
+                fcntl.flock(lock_f, fcntl.LOCK_SH)
+                log_path = _state_log_path()
                 try:
-                    os.unlink(tmp_path)
-                except OSError:
-                    pass
-                raise
+                    with open(log_path, "rb") as f:
+                        header = f.readline()
+                    current = json.loads(header).get("epoch")
+                    size = log_path.stat().st_size
+                except (OSError, ValueError, AttributeError):
+                    current, size = None, 0
+                if current == loaded["epoch"] and size < STATE_LOG_COMPACT_BYTES:
+                    fd = os.open(str(log_path), os.O_WRONLY | os.O_APPEND)
+                    try:
+                        os.write(fd, line)
+                    finally:
+                        os.close(fd)
+                    return
+                fcntl.flock(lock_f, fcntl.LOCK_UN)
+
+            fcntl.flock(lock_f, fcntl.LOCK_EX)
+            state = _load_state_unlocked()
+            if event:
+                _apply_event(state, event)
+            _write_snapshot(state)
     except OSError:
         pass
 
@@ -261,13 +595,18 @@ def extract_state(rules: dict[str, Rule], existing_state: dict) -> dict:
             "activation_count": rule.activation_count,
         }
 
-    return {
+    extracted = {
         "rules": rule_states,
         "co_activation": existing_state.get("co_activation", {}),
         "recently_unmerged": existing_state.get("recently_unmerged", {}),
         "last_decay": existing_state.get("last_decay", ""),
         "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
     }
+    # Carry the log position so save_state can merge events appended since load
+    for key in ("epoch", "_log_offset"):
+        if key in existing_state:
+            extracted[key] = existing_state[key]
+    return extracted
 
 
 # ============================================================
@@ -279,16 +618,16 @@ _tool_keywords = None
 
 
 def _load_classification_keywords():
-    """Load domain and tool keywords from rules.yaml."""
+    """Load domain and tool keywords from the compiled rules snapshot."""
     global _domain_keywords, _tool_keywords
     if _domain_keywords is not None:
         return
 
-    try:
-        data = yaml.safe_load(RULES_PATH.read_text())
-        _domain_keywords = data.get("domain_keywords", {})
-        _tool_keywords = data.get("tool_keywords", {})
-    except (yaml.YAMLError, OSError):
+    snap = compile_rules()
+    if snap is not None:
+        _domain_keywords = snap["domain_keywords"]
+        _tool_keywords = snap["tool_keywords"]
+    else:
         _domain_keywords = {}
         _tool_keywords = {}
 
@@ -383,6 +722,116 @@ def domain_specificity(rule: Rule, domain: str) -> int:
     return -1
 
 
+class CoActivation:
+    """Sparse upper-triangular co-activation counts keyed by rule ordinal.
+
+    Rules get integer ordinals in YAML order (ids seen only in old state,
+    e.g. deleted rules, are appended). Counts live in {(i, j): [both, either]}
+    with i < j, plus a per-rule partner list, so recording a prompt touches
+    only the activated rules' existing pairs instead of every rule.
+    Persisted state keeps the "r1:r2" keys, which survive rules.yaml edits.
+    """
+
+    __slots__ = ("ids", "ordinal", "tracked", "pairs", "partners")
+
+    def __init__(self, rules: dict[str, Rule]):
+        self.ids = list(rules)
+        self.ordinal = {rid: i for i, rid in enumerate(self.ids)}
+        # Only current non-universal rules accrue "either" counts
+        self.tracked = {
+            i for i, rid in enumerate(self.ids) if "all" not in rules[rid].domains
+        }
+        self.pairs: dict[tuple[int, int], list[int]] = {}
+        self.partners: list[list[int]] = [[] for _ in self.ids]
+
+    def _ord(self, rid: str) -> int:
+        i = self.ordinal.get(rid)
+        if i is None:
+            i = self.ordinal[rid] = len(self.ids)
+            self.ids.append(rid)
+            self.partners.append([])
+        return i
+
+    def _pair(self, i: int, j: int) -> list[int]:
+        key = (i, j) if i < j else (j, i)
+        counts = self.pairs.get(key)
+        if counts is None:
+            counts = self.pairs[key] = [0, 0]
+            self.partners[i].append(j)
+            self.partners[j].append(i)
+        return counts
+
+    @classmethod
+    def from_state(cls, co_act: dict, rules: dict[str, Rule]) -> "CoActivation":
+        co = cls(rules)
+        for key, counts in co_act.items():
+            r1, _, r2 = key.partition(":")
+            pair = co._pair(co._ord(r1), co._ord(r2))
+            pair[0] = counts.get("both", 0)
+            pair[1] = counts.get("either", 0)
+        return co
+
+    def to_state(self) -> dict:
+        ids = self.ids
+        out = {}
+        for (i, j), (both, either) in self.pairs.items():
+            r1, r2 = sorted((ids[i], ids[j]))
+            out[f"{r1}:{r2}"] = {"both": both, "either": either}
+        return out
+
+    def record(self, rule_ids: list[str]):
+        """Count one prompt that activated rule_ids (non-universal rules only).
+
+        Activated pairs gain both+either; existing pairs with exactly one
+        activated rule gain either.
+        """
+        active = sorted({self._ord(rid) for rid in rule_ids})
+        active_set = set(active)
+        for n, i in enumerate(active):
+            for j in active[n + 1 :]:
+                counts = self._pair(i, j)
+                counts[0] += 1
+                counts[1] += 1
+        pairs = self.pairs
+        tracked = self.tracked
+        for i in active:
+            if i not in tracked:
+                continue
+            for j in self.partners[i]:
+                if j not in active_set and j in tracked:
+                    pairs[(i, j) if i < j else (j, i)][1] += 1
+
+    def prune(self, min_either: int, max_pairs: int):
+        """Drop low-signal pairs, then keep the max_pairs highest by either."""
+        if len(self.pairs) <= max_pairs:
+            return
+        kept = {k: v for k, v in self.pairs.items() if v[1] >= min_either}
+        if len(kept) > max_pairs:
+            top = sorted(kept.items(), key=lambda kv: kv[1][1], reverse=True)
+            kept = dict(top[:max_pairs])
+        self.pairs = kept
+        self.partners = [[] for _ in self.ids]
+        for i, j in kept:
+            self.partners[i].append(j)
+            self.partners[j].append(i)
+
+    def merge_candidates(
+        self, min_either: int, threshold: float, exclude=()
+    ) -> list[tuple[str, str, float]]:
+        """Pairs (r1, r2, both/either) that co-activate at >= threshold."""
+        ids = self.ids
+        out = []
+        for (i, j), (both, either) in self.pairs.items():
+            if either < min_either or either <= 0:
+                continue
+            ratio = both / either
+            if ratio >= threshold:
+                r1, r2 = sorted((ids[i], ids[j]))
+                if r1 not in exclude and r2 not in exclude:
+                    out.append((r1, r2, ratio))
+        return out
+
+
 def get_relevant_rules(prompt_text: str) -> list[dict]:
     """Main entry point. Returns top relevant rules with reminders.
 
@@ -397,9 +846,9 @@ def get_relevant_rules(prompt_text: str) -> list[dict]:
 
     domain, tool = classify_prompt(prompt_text)
 
-    # Score all rules
+    # Score rules reachable from (domain, tool) -- others can't clear THRESHOLD
     scored = []
-    for rule in rules.values():
+    for rule in candidate_rules(rules, domain, tool):
         s = score_rule(rule, domain, tool)
         if s >= THRESHOLD:
             scored.append((rule, s))
@@ -432,34 +881,20 @@ def get_relevant_rules(prompt_text: str) -> list[dict]:
         rule.activation_count += 1
         rule.days_since_activation = 0
 
-    # Track co-activations (exclude "all"-domain rules)
-    co_act = state.get("co_activation", {})
+    # Persist as one appended event; co-activations (excluding "all"-domain
+    # rules) are folded in by _apply_event when the log is replayed
     non_universal = sorted(
         r.id for r, _ in activated if "all" not in rules[r.id].domains
     )
-    activated_id_set = {r.id for r, _ in activated}
-    for i, r1 in enumerate(non_universal):
-        for r2 in non_universal[i + 1 :]:
-            key = f"{r1}:{r2}"
-            if key not in co_act:
-                co_act[key] = {"both": 0, "either": 0}
-            co_act[key]["both"] += 1
-            co_act[key]["either"] += 1
-    for r_id in non_universal:
-        for other_id in rules:
-            if (
-                other_id != r_id
-                and other_id not in activated_id_set
-                and "all" not in rules[other_id].domains
-            ):
-                key = ":".join(sorted([r_id, other_id]))
-                if key in co_act:
-                    co_act[key]["either"] += 1
-
-    # Save updated state
-    updated_state = extract_state(rules, state)
-    updated_state["co_activation"] = co_act
-    save_state(updated_state)
+    _record_event(
+        {
+            "ev": "act",
+            "ids": [r.id for r, _ in activated],
+            "co": non_universal,
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        loaded=state,
+    )
 
     # Return top INJECTION_LIMIT rules with reminders + reason
     result = []
@@ -496,19 +931,25 @@ def record_violation(rule_id: str, source: str = "hook") -> str | None:
         return None
 
     rule = rules[rule_id]
+    event = {
+        "ev": "viol",
+        "id": rule_id,
+        "src": source,
+        "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
 
     # Immune reactivation
     if rule.dormant:
         rule.dormant = False
         rule.adaptive_spike = IMMUNE_SPIKE
         msg = f"IMMUNE REACTIVATION: {rule.id} ({rule.name}) spike={IMMUNE_SPIKE}"
-        save_state(extract_state(rules, state))
+        _record_event(event, loaded=state)
         return msg
 
     # Normal spike
     spike = SPIKE_AMOUNT.get(source, 0.08)
     rule.adaptive_spike = min(rule.adaptive_spike + spike, SPIKE_CAP)
-    save_state(extract_state(rules, state))
+    _record_event(event, loaded=state)
     return None
 
 
@@ -559,18 +1000,9 @@ def advance_day(days: int = None):
     # Prune co-activation pairs: remove low-signal pairs, cap total
     co_act = state.get("co_activation", {})
     if len(co_act) > CO_ACTIVATION_MAX_PAIRS:
-        # Remove pairs with either < threshold
-        co_act = {
-            k: v
-            for k, v in co_act.items()
-            if v.get("either", 0) >= CO_ACTIVATION_MIN_EITHER
-        }
-        # If still over limit, keep top pairs by 'either' count
-        if len(co_act) > CO_ACTIVATION_MAX_PAIRS:
-            sorted_pairs = sorted(
-                co_act.items(), key=lambda x: x[1]["either"], reverse=True
-            )
-            co_act = dict(sorted_pairs[:CO_ACTIVATION_MAX_PAIRS])
+        co = CoActivation.from_state(co_act, rules)
+        co.prune(CO_ACTIVATION_MIN_EITHER, CO_ACTIVATION_MAX_PAIRS)
+        co_act = co.to_state()
 
     updated = extract_state(rules, state)
     updated["recently_unmerged"] = unmerged
@@ -598,18 +1030,12 @@ def detect_inactive() -> list[str]:
 def detect_merge_candidates() -> list[tuple[str, str, float]]:
     """Find rule pairs with >90% co-activation rate."""
     state = load_state()
-    unmerged = state.get("recently_unmerged", {})
-    candidates = []
-
-    for key, counts in state.get("co_activation", {}).items():
-        if counts["either"] >= 10:
-            ratio = counts["both"] / counts["either"]
-            if ratio >= CO_ACTIVATION_MERGE_THRESHOLD:
-                r1, r2 = key.split(":")
-                if r1 not in unmerged and r2 not in unmerged:
-                    candidates.append((r1, r2, ratio))
-
-    return candidates
+    co = CoActivation.from_state(state.get("co_activation", {}), load_rules())
+    return co.merge_candidates(
+        CO_ACTIVATION_MERGE_MIN_EITHER,
+        CO_ACTIVATION_MERGE_THRESHOLD,
+        exclude=state.get("recently_unmerged", {}),
+    )
 
 
 def get_lifecycle_report() -> dict:
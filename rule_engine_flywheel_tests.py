@@ -125,16 +125,19 @@ PRINCIPLES_PATH = (
 
 
 def backup_state():
-    """Backup current state before tests."""
+    """Backup current state (snapshot + event log tail) before tests."""
     if STATE_PATH.exists():
-        return json.loads(STATE_PATH.read_text())
+        state = load_state()
+        state.pop("_log_offset", None)
+        state.pop("epoch", None)
+        return state
     return None
 
 
 def restore_state(backup):
     """Restore state after tests. Never deletes state file."""
     if backup is not None:
-        STATE_PATH.write_text(json.dumps(backup, indent=2))
+        save_state(backup)
     # If backup was None (no state existed), leave current state as-is.
     # NEVER unlink state file — tests should be non-destructive.
 
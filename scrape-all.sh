@@ -10,14 +10,42 @@ DEV_DIR="$HOME/Development"
 # Activate venv
 source "$TOOLS_DIR/venv/bin/activate"
 
+# Every source is a different host, so sources scrape concurrently (at
+# most SCRAPE_PARALLEL at a time). Per-host politeness stays inside each
+# scraper. Output goes to one log per source so runs don't interleave.
+MAX_PARALLEL="${SCRAPE_PARALLEL:-6}"
+LOG_DIR="$TOOLS_DIR/logs/scrape-all"
+mkdir -p "$LOG_DIR"
+FAILED_FILE="$LOG_DIR/failed.txt"
+: > "$FAILED_FILE"
+
+run_source() {
+    local label="$1"
+    shift
+    # bash 3.2 (macOS) has no `wait -n`: poll the running-job count
+    while [ "$(jobs -rp | wc -l)" -ge "$MAX_PARALLEL" ]; do
+        sleep 1
+    done
+    local log="$LOG_DIR/$(printf "%s" "$label" | tr -cs 'A-Za-z0-9' '-').log"
+    (
+        if "$@" > "$log" 2>&1; then
+            echo "   ✅ $label"
+        else
+            echo "   ❌ $label (see $log)"
+            echo "$label" >> "$FAILED_FILE"
+        fi
+    ) &
+}
+
 echo "🚀 Scraping all advisor sources (no tokens burned)"
+echo "   Up to $MAX_PARALLEL sources at once; logs in $LOG_DIR"
 echo ""
 
 # ===== EXISTING SOURCES =====
 
 # Jesse Cannon (Beehiiv)
 echo "1️⃣  Jesse Cannon - Music Marketing Trends"
-python "$TOOLS_DIR/scraper.py" beehiiv \
+run_source "jesse-cannon" python "$TOOLS_DIR/scraper.py" beehiiv \
     https://musicmarketingtrends.beehiiv.com \
     "$DEV_DIR/jesse-cannon"
 
@@ -25,7 +53,7 @@ echo ""
 
 # ChatPRD Blog
 echo "2️⃣  ChatPRD - AI Workflows"
-python "$TOOLS_DIR/scraper.py" chatprd \
+run_source "chatprd-blog" python "$TOOLS_DIR/scraper.py" chatprd \
     https://chatprd.ai/blog \
     "$DEV_DIR/chatprd-blog"
 
@@ -33,21 +61,20 @@ echo ""
 
 # Lenny (GitHub - just git pull)
 echo "3️⃣  Lenny's Podcast (GitHub)"
-cd "$DEV_DIR/lennys-podcast-transcripts"
-git pull origin main
-echo "   ✅ Updated from GitHub"
+run_source "lennys-podcast-transcripts" \
+    git -C "$DEV_DIR/lennys-podcast-transcripts" pull origin main
 
 echo ""
 
 # Water & Music (Cherie Hu)
 echo "4️⃣  Water & Music (Cherie Hu)"
-python "$TOOLS_DIR/scraper.py" waterandmusic \
+run_source "cherie-hu" python "$TOOLS_DIR/scraper.py" waterandmusic \
     https://www.waterandmusic.com \
     "$DEV_DIR/cherie-hu"
 
 # Indie Hackers - Pieter Levels (levels.io)
 echo "5️⃣  Pieter Levels - Indie Hacker"
-python "$TOOLS_DIR/scraper.py" levelsio \
+run_source "indie-hackers/pieter-levels" python "$TOOLS_DIR/scraper.py" levelsio \
     https://levels.io \
     "$DEV_DIR/indie-hackers/pieter-levels"
 
@@ -55,7 +82,7 @@ echo ""
 
 # Justin Welsh (Beehiiv)
 echo "6️⃣  Justin Welsh - Solopreneur"
-python "$TOOLS_DIR/scraper.py" beehiiv \
+run_source "indie-hackers/justin-welsh" python "$TOOLS_DIR/scraper.py" beehiiv \
     https://justinwelsh.beehiiv.com \
     "$DEV_DIR/indie-hackers/justin-welsh"
 
@@ -63,7 +90,7 @@ echo ""
 
 # Daniel Vassallo (Small Bets)
 echo "7️⃣  Daniel Vassallo - Small Bets"
-python "$TOOLS_DIR/scraper.py" smallbets \
+run_source "indie-hackers/daniel-vassallo" python "$TOOLS_DIR/scraper.py" smallbets \
     https://dvassallo.me \
     "$DEV_DIR/indie-hackers/daniel-vassallo"
 
@@ -73,7 +100,7 @@ echo ""
 
 # Don Norman (jnd.org)
 echo "8️⃣  Don Norman - Design & UX Essays"
-python "$TOOLS_DIR/scraper.py" jnd \
+run_source "don-norman" python "$TOOLS_DIR/scraper.py" jnd \
     https://jnd.org \
     "$DEV_DIR/don-norman"
 
@@ -81,7 +108,7 @@ echo ""
 
 # Valhalla DSP (Sean Costello)
 echo "9️⃣  Valhalla DSP - Plugin Design Blog"
-python "$TOOLS_DIR/scraper.py" valhalla \
+run_source "plugin-devs/valhalla-dsp" python "$TOOLS_DIR/scraper.py" valhalla \
     https://valhalladsp.com \
     "$DEV_DIR/plugin-devs/valhalla-dsp"
 
@@ -89,7 +116,7 @@ echo ""
 
 # Airwindows (Chris Johnson)
 echo "🔟 Airwindows - Open Source Plugin Philosophy"
-python "$TOOLS_DIR/scraper.py" airwindows \
+run_source "plugin-devs/airwindows" python "$TOOLS_DIR/scraper.py" airwindows \
     https://www.airwindows.com \
     "$DEV_DIR/plugin-devs/airwindows"
 
@@ -97,7 +124,7 @@ echo ""
 
 # e-flux Journal (Art Critical Theory)
 echo "1️⃣1️⃣ e-flux Journal - Art Critical Theory"
-python "$TOOLS_DIR/scraper.py" eflux \
+run_source "art-criticism/e-flux-journal" python "$TOOLS_DIR/scraper.py" eflux \
     https://www.e-flux.com \
     "$DEV_DIR/art-criticism/e-flux-journal"
 
@@ -105,7 +132,7 @@ echo ""
 
 # Hyperallergic (Art Criticism)
 echo "1️⃣2️⃣ Hyperallergic - Art Criticism & News"
-python "$TOOLS_DIR/scraper.py" hyperallergic \
+run_source "art-criticism/hyperallergic" python "$TOOLS_DIR/scraper.py" hyperallergic \
     https://hyperallergic.com \
     "$DEV_DIR/art-criticism/hyperallergic"
 
@@ -113,7 +140,7 @@ echo ""
 
 # FabFilter Learn (Audio Education)
 echo "1️⃣3️⃣ FabFilter Learn - Audio Education"
-python "$TOOLS_DIR/scraper.py" fabfilter \
+run_source "plugin-devs/fabfilter" python "$TOOLS_DIR/scraper.py" fabfilter \
     https://www.fabfilter.com \
     "$DEV_DIR/plugin-devs/fabfilter"
 
@@ -121,13 +148,13 @@ echo ""
 
 # Creative Capital (Grants)
 echo "1️⃣4️⃣ Creative Capital - Grant Awardees"
-python "$TOOLS_DIR/scraper.py" creativecapital \
+run_source "art-criticism/creative-capital" python "$TOOLS_DIR/scraper.py" creativecapital \
     https://creative-capital.org \
     "$DEV_DIR/art-criticism/creative-capital"
 
 # Kilohearts Blog (Plugin Development + Sound Design)
 echo "1️⃣5️⃣ Kilohearts - Plugin Development & Sound Design"
-python "$TOOLS_DIR/scraper.py" kilohearts \
+run_source "plugin-devs/kilohearts" python "$TOOLS_DIR/scraper.py" kilohearts \
     https://kilohearts.com/blog \
     "$DEV_DIR/plugin-devs/kilohearts"
 
@@ -137,7 +164,7 @@ echo ""
 
 # Brian Eno Interviews (moredarkthanshark.org)
 echo "1️⃣6️⃣ Brian Eno - Interview Archive"
-python "$TOOLS_DIR/scraper.py" eno \
+run_source "creative-interviews/brian-eno" python "$TOOLS_DIR/scraper.py" eno \
     https://www.moredarkthanshark.org \
     "$DEV_DIR/creative-interviews/brian-eno"
 
@@ -145,7 +172,7 @@ echo ""
 
 # The Creative Independent (1,000+ creative interviews)
 echo "1️⃣7️⃣ The Creative Independent - Creative Interviews"
-python "$TOOLS_DIR/scraper.py" creative-independent \
+run_source "creative-interviews/creative-independent" python "$TOOLS_DIR/scraper.py" creative-independent \
     https://thecreativeindependent.com \
     "$DEV_DIR/creative-interviews/creative-independent"
 
@@ -153,7 +180,7 @@ echo ""
 
 # David Lynch Interviews (lynchnet.com)
 echo "1️⃣8️⃣ David Lynch - Interview Archive"
-python "$TOOLS_DIR/scraper.py" lynchnet \
+run_source "creative-interviews/david-lynch" python "$TOOLS_DIR/scraper.py" lynchnet \
     https://www.lynchnet.com \
     "$DEV_DIR/creative-interviews/david-lynch"
 
@@ -161,7 +188,7 @@ echo ""
 
 # BOMB Magazine Interviews
 echo "1️⃣9️⃣ BOMB Magazine - Artist Interviews"
-python "$TOOLS_DIR/scraper.py" bomb-magazine \
+run_source "creative-interviews/bomb-magazine" python "$TOOLS_DIR/scraper.py" bomb-magazine \
     https://bombmagazine.org \
     "$DEV_DIR/creative-interviews/bomb-magazine"
 
@@ -171,7 +198,7 @@ echo ""
 
 # It's Nice That (Art Direction Blog)
 echo "2️⃣0️⃣ It's Nice That - Art Direction Blog"
-python "$TOOLS_DIR/scraper.py" itsnicethat \
+run_source "art-direction/its-nice-that" python "$TOOLS_DIR/scraper.py" itsnicethat \
     https://www.itsnicethat.com \
     "$DEV_DIR/art-direction/its-nice-that"
 
@@ -179,7 +206,7 @@ echo ""
 
 # Creative Boom (Art/Design Articles)
 echo "2️⃣1️⃣ Creative Boom - Art & Design Articles"
-python "$TOOLS_DIR/scraper.py" creativeboom \
+run_source "art-direction/creative-boom" python "$TOOLS_DIR/scraper.py" creativeboom \
     https://www.creativeboom.com \
     "$DEV_DIR/art-direction/creative-boom"
 
@@ -187,7 +214,7 @@ echo ""
 
 # Fonts In Use (Typography Specimens)
 echo "2️⃣2️⃣ Fonts In Use - Typography Specimens"
-python "$TOOLS_DIR/scraper.py" fontsinuse \
+run_source "art-direction/fonts-in-use" python "$TOOLS_DIR/scraper.py" fontsinuse \
     https://fontsinuse.com \
     "$DEV_DIR/art-direction/fonts-in-use"
 
@@ -195,7 +222,7 @@ echo ""
 
 # The Brand Identity (Brand/Identity Design)
 echo "2️⃣3️⃣ The Brand Identity - Brand & Identity Design"
-python "$TOOLS_DIR/scraper.py" thebrandidentity \
+run_source "art-direction/the-brand-identity" python "$TOOLS_DIR/scraper.py" thebrandidentity \
     https://the-brand-identity.com \
     "$DEV_DIR/art-direction/the-brand-identity"
 
@@ -203,14 +230,23 @@ python "$TOOLS_DIR/scraper.py" thebrandidentity \
 
 echo ""
 
-# Circuit Modeling KB (PDFs, HTML, GitHub repos, forums)
+# Circuit Modeling KB (PDFs, HTML, GitHub repos, forums), then re-index
+# into SQLite once its scrape has finished
 echo "2️⃣4️⃣ Circuit Modeling - VA/WDF/SPICE/ML/Spring Reverb"
-python "$TOOLS_DIR/scrape_circuit_modeling.py"
-# Re-index into SQLite
-python "$TOOLS_DIR/index_circuit_modeling.py"
+run_source "circuit-modeling" sh -c \
+    'python "$1/scrape_circuit_modeling.py" && python "$1/index_circuit_modeling.py"' \
+    _ "$TOOLS_DIR"
+
+echo ""
+echo "⏳ Waiting for running scrapes..."
+wait
 
 echo ""
-echo "✅ All sources scraped!"
+if [ -s "$FAILED_FILE" ]; then
+    echo "⚠️  Failed sources: $(tr '\n' ' ' < "$FAILED_FILE")"
+else
+    echo "✅ All sources scraped!"
+fi
 echo ""
 echo "📊 Summary:"
 echo "   --- Existing ---"
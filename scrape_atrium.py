@@ -46,10 +46,12 @@ import requests
 from bs4 import BeautifulSoup
 from markdownify import markdownify as md
 
+from http_cache import CachingSession
+
 # === CONFIG ===
 BASE_OUTPUT = Path.home() / "Development" / "art-criticism"
 RATE_LIMIT = 1.5  # seconds between requests (be polite)
-SESSION = requests.Session()
+SESSION = CachingSession(requests.Session())  # Conditional GETs (ETag/Last-Modified)
 SESSION.headers.update({
     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) PopChaos Labs Art Research'
 })
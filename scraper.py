@@ -6,7 +6,6 @@ Runs independently, no token burn, saves structured markdown
 
 import os
 import sys
-import time
 import json
 import hashlib
 from pathlib import Path
@@ -16,6 +15,10 @@ import requests
 from bs4 import BeautifulSoup
 from markdownify import markdownify as md
 
+from fetch_scheduler import FETCH_MAX_CONCURRENCY, FETCH_WORKERS, get_scheduler
+from concept_tagger import ConceptTagger
+from http_cache import CachingSession
+
 # Content sanitizer for injection prevention
 try:
     from content_sanitizer import sanitize_content as _sanitize
@@ -23,15 +26,55 @@ try:
 except ImportError:
     HAS_SANITIZER = False
 
+# Key concepts to auto-tag (audio production, music business, creative tools)
+ADVISOR_CONCEPTS = [
+    # Audio Production
+    'LUFS', 'loudness', 'saturation', 'granulation', 'reverb', 'delay',
+    'compression', 'EQ', 'equalization', 'mastering', 'mixing',
+    'transient', 'sidechain', 'stereo imaging', 'bit depth', 'sample rate',
+    'clipping', 'distortion', 'harmonics', 'frequency', 'resonance',
+    'envelope', 'ADSR', 'LFO', 'modulation', 'automation',
+
+    # Music Business
+    'streaming', 'Spotify', 'Apple Music', 'distribution', 'sync licensing',
+    'royalties', 'publishing', 'PRO', 'ASCAP', 'BMI', 'mechanicals',
+    'playlist', 'algorithm', 'TikTok', 'Instagram', 'social media',
+    'NFT', 'Web3', 'blockchain', 'fan engagement', 'monetization',
+
+    # Creative Tools & Concepts
+    'JUCE', 'VST', 'AU', 'AAX', 'plugin', 'DAW', 'Ableton', 'Logic',
+    'Pro Tools', 'FL Studio', 'Reaper', 'synthesizer', 'sampler',
+    'drum machine', 'MIDI', 'audio interface', 'microphone',
+
+    # Business & Strategy
+    'indie hacker', 'bootstrapping', 'revenue', 'MRR', 'ARR',
+    'product-market fit', 'MVP', 'iteration', 'launch', 'marketing',
+    'SEO', 'content marketing', 'email list', 'funnel', 'conversion',
+    'pricing', 'positioning', 'competitive analysis', 'differentiation',
+
+    # Creative Process
+    'workflow', 'productivity', 'creativity', 'inspiration', 'iteration',
+    'feedback', 'collaboration', 'remote work', 'async', 'documentation'
+]
+_ADVISOR_TAGGER = ConceptTagger(ADVISOR_CONCEPTS)
+
+
 class AdvisorScraper:
+    fetch_workers = FETCH_WORKERS  # Articles fetched/parsed concurrently in run()
+
     def __init__(self, base_url, output_dir, rate_limit=1.0):
         self.base_url = base_url
         self.output_dir = Path(output_dir)
-        self.rate_limit = rate_limit  # seconds between requests
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.rate_limit = rate_limit  # seconds between requests to one host
+        self.scheduler = get_scheduler()
+        session = requests.Session()
+        session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) Claude Code Advisor Builder'
         })
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=FETCH_MAX_CONCURRENCY)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        self.session = CachingSession(session)  # Conditional GETs (ETag/Last-Modified)
 
         # Create directory structure
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -40,20 +83,24 @@ class AdvisorScraper:
 
         self.articles = []
         self.errors = []
+        self._previous = {}  # url -> article record from the last run's metadata.json
+        self._fetched = {}  # url -> response already fetched by _scrape_article()
 
     def fetch_page(self, url, retry=3):
-        """Fetch page with retry logic"""
+        """Fetch page with retry logic (paced per host by the shared scheduler)"""
+        response = self._fetched.pop(url, None)
+        if response is not None:
+            return response
         for attempt in range(retry):
             try:
-                time.sleep(self.rate_limit)  # Rate limiting
-                response = self.session.get(url, timeout=30)
+                response = self.scheduler.get(self.session, url, self.rate_limit, timeout=30)
                 response.raise_for_status()
                 return response
             except requests.RequestException as e:
                 if attempt == retry - 1:
                     self.errors.append({'url': url, 'error': str(e)})
                     return None
-                time.sleep(2 ** attempt)  # Exponential backoff
+                self.scheduler.backoff(url, 2 ** attempt)  # Exponential backoff
         return None
 
     def extract_article_urls(self, archive_url):
@@ -64,66 +111,43 @@ class AdvisorScraper:
         """Extract article content and metadata"""
         raise NotImplementedError("Override in subclass")
 
-    def auto_tag_concepts(self, text):
-        """Auto-tag key concepts with [[wiki-links]] for Obsidian knowledge graph"""
-        import re
-
-        # Key concepts to auto-tag (audio production, music business, creative tools)
-        concepts = [
-            # Audio Production
-            'LUFS', 'loudness', 'saturation', 'granulation', 'reverb', 'delay',
-            'compression', 'EQ', 'equalization', 'mastering', 'mixing',
-            'transient', 'sidechain', 'stereo imaging', 'bit depth', 'sample rate',
-            'clipping', 'distortion', 'harmonics', 'frequency', 'resonance',
-            'envelope', 'ADSR', 'LFO', 'modulation', 'automation',
-
-            # Music Business
-            'streaming', 'Spotify', 'Apple Music', 'distribution', 'sync licensing',
-            'royalties', 'publishing', 'PRO', 'ASCAP', 'BMI', 'mechanicals',
-            'playlist', 'algorithm', 'TikTok', 'Instagram', 'social media',
-            'NFT', 'Web3', 'blockchain', 'fan engagement', 'monetization',
-
-            # Creative Tools & Concepts
-            'JUCE', 'VST', 'AU', 'AAX', 'plugin', 'DAW', 'Ableton', 'Logic',
-            'Pro Tools', 'FL Studio', 'Reaper', 'synthesizer', 'sampler',
-            'drum machine', 'MIDI', 'audio interface', 'microphone',
-
-            # Business & Strategy
-            'indie hacker', 'bootstrapping', 'revenue', 'MRR', 'ARR',
-            'product-market fit', 'MVP', 'iteration', 'launch', 'marketing',
-            'SEO', 'content marketing', 'email list', 'funnel', 'conversion',
-            'pricing', 'positioning', 'competitive analysis', 'differentiation',
-
-            # Creative Process
-            'workflow', 'productivity', 'creativity', 'inspiration', 'iteration',
-            'feedback', 'collaboration', 'remote work', 'async', 'documentation'
-        ]
-
-        # Sort by length (longest first) to avoid partial matches
-        concepts.sort(key=len, reverse=True)
-
-        # Tag each concept if not already tagged
-        for concept in concepts:
-            # Case-insensitive search, but preserve original case
-            pattern = re.compile(r'\b(' + re.escape(concept) + r')\b', re.IGNORECASE)
-
-            # Don't tag if already in [[brackets]] or inside a link
-            def replace_if_not_tagged(match):
-                # Check if already inside [[...]] or [...](...)
-                start_pos = match.start()
-                context_before = text[max(0, start_pos-3):start_pos]
-                context_after = text[start_pos+len(match.group(0)):start_pos+len(match.group(0))+3]
-
-                if '[[' in context_before or ']]' in context_after:
-                    return match.group(0)  # Already tagged
-                if context_before.endswith('[') or '](' in context_after:
-                    return match.group(0)  # Inside markdown link
-
-                return f"[[{match.group(0)}]]"
+    def load_previous_articles(self):
+        """Index the last run's article records by URL (for unchanged pages)"""
+        json_path = self.output_dir / 'metadata' / 'metadata.json'
+        try:
+            articles = json.loads(json_path.read_text(encoding='utf-8')).get('articles', [])
+        except (OSError, ValueError):
+            return {}
+        return {
+            a['url']: a for a in articles
+            if a.get('url') and a.get('file') and (self.output_dir / a['file']).exists()
+        }
 
-            text = pattern.sub(replace_if_not_tagged, text)
+    def _scrape_article(self, url):
+        """extract_article_content(), skipped when the page is unchanged since last run"""
+        previous = self._previous.get(url)
+        if previous:
+            response = self.fetch_page(url)
+            if response is not None and getattr(response, 'unchanged', False):
+                return dict(previous, unchanged=True)
+            if response is not None:
+                self._fetched[url] = response  # Parse below without refetching
+        return self.extract_article_content(url)
+
+    def reuse_article(self, article_data):
+        """Keep an unchanged article's file, renumbering it if its position moved"""
+        old_path = self.output_dir / article_data['file']
+        filename = f"articles/{article_data['id']:03d}-{self.slugify(article_data['title'])}.md"
+        if filename != article_data['file']:
+            old_path.rename(self.output_dir / filename)
+            article_data['file'] = filename
+        self.articles.append(article_data)
+        return self.output_dir / filename
 
-        return text
+    def auto_tag_concepts(self, text):
+        """Auto-tag key concepts with [[wiki-links]] for Obsidian knowledge graph"""
+        # One pass over the text for all concepts; already-linked mentions are skipped
+        return _ADVISOR_TAGGER.tag(text)
 
     def save_article(self, article_data):
         """Save article as markdown with metadata"""
@@ -233,14 +257,23 @@ class AdvisorScraper:
         urls = self.extract_article_urls(self.base_url)
         print(f"   Found {len(urls)} articles")
 
-        # Scrape articles
+        # Scrape articles (fetched concurrently, saved in order). Pages the
+        # server reports unchanged since the last run aren't parsed again.
         print("\n2️⃣  Scraping articles...")
-        for i, url in enumerate(urls, 1):
+        self._previous = self.load_previous_articles()
+        unchanged = 0
+        scraped = self.scheduler.map(self._scrape_article, urls, self.fetch_workers)
+        for i, (url, article_data) in enumerate(scraped, 1):
             print(f"   [{i}/{len(urls)}] {url}")
-            article_data = self.extract_article_content(url)
             if article_data:
                 article_data['id'] = i
-                self.save_article(article_data)
+                if article_data.pop('unchanged', False):
+                    self.reuse_article(article_data)
+                    unchanged += 1
+                else:
+                    self.save_article(article_data)
+        if unchanged:
+            print(f"   {unchanged} unchanged since last run (not re-parsed)")
 
         # Save metadata
         print("\n3️⃣  Saving metadata...")
@@ -0,0 +1,710 @@
+#!/usr/bin/env python3
+"""Session Usage Store - incremental index of Claude Code session JSONL.
+
+track_resources.py, the web dashboard's current-session panel,
+monitor_sessions.py and experiment_evaluator.py each used to json.loads
+every line of the session JSONL under ~/.claude/projects on every run.
+This store is the one ingestion layer they share: it keeps a per-file
+cursor (inode, size, byte offset) in SQLite and parses only bytes
+appended since the last refresh.
+
+Stored per file:
+    - sessions: per-session aggregates in parse_session_file() shape
+      (token totals, message count, first model, first/last timestamp)
+    - session_models: per-session, per-model aggregates
+    - messages: one row per message with usage (ts, model, 4 token counts)
+      so rolling windows are SQL range queries over a covering index on ts
+    - tool_calls: one row per tool_use block (name, file_path and the few
+      input fields consumers read -- never Write/Edit bodies)
+    - tool_errors: tool_result blocks flagged is_error (first 200 chars)
+    - hook_markers: records carrying hook output (HOOK_KEYWORDS) and
+      queue-operation (compact) records, first 500 chars
+
+Tool calls, errors and markers carry the record's line: its index among
+the file's JSON records, so rows from different tables can be ordered
+against each other and against a consumer's own pass over the file.
+
+A file whose inode changed or that shrank is re-parsed from byte 0.
+Files that vanished are dropped. A trailing partial line (a session
+still being written) is left for the next refresh. Refreshes from
+concurrent processes are serialized by an IMMEDIATE transaction.
+
+No external dependencies -- stdlib only.
+
+Usage:
+    python3 session_usage.py refresh      # Parse new session bytes
+    python3 session_usage.py rebuild      # Drop everything and re-parse
+    python3 session_usage.py stats        # Store size summary
+
+    # From Python
+    from session_usage import SessionUsageStore
+    store = SessionUsageStore()
+    store.refresh()                       # Or refresh([path, ...]) for just those files
+    sessions = store.sessions()
+    per_model = store.usage_by_model(since_ts)
+    current = store.current_session(max_age_s=300)
+    calls = store.tool_calls(store.file_id(path))
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+SESSION_USAGE_DB = Path("~/.claude/.locks/session-usage.db").expanduser()
+SESSIONS_ROOT = Path.home() / ".claude" / "projects"
+SESSION_USAGE_SCHEMA_VERSION = 2
+
+# Tool input fields kept per call; everything else (file bodies, prompts,
+# commands) stays in the JSONL
+TOOL_INPUT_KEYS = ("file_path", "skill", "description", "subagent_type",
+                   "taskId", "status", "subject")
+# Substrings marking hook output injected into a record's content
+HOOK_KEYWORDS = ("[Budget]", "Skill keyword", "hook success", "hook fail",
+                 "skill_gate", "code_first_check", "session_audit",
+                 "UserPromptSubmit hook", "PreToolUse hook", "PostToolUse hook")
+COMPACT_MARKER = "queue-operation"
+
+_TABLES = ("files", "sessions", "session_models", "messages",
+           "tool_calls", "tool_errors", "hook_markers")
+_FILE_TABLES = _TABLES[1:]  # Rows keyed by file_id
+
+_SCHEMA = """
+    -- Cursor: bytes [0, offset) of path (with this inode) are ingested,
+    -- holding `records` JSON records.
+    CREATE TABLE IF NOT EXISTS files (
+        id          INTEGER PRIMARY KEY,
+        path        TEXT NOT NULL UNIQUE,
+        inode       INTEGER NOT NULL,
+        size        INTEGER NOT NULL,
+        mtime       REAL NOT NULL DEFAULT 0,
+        offset      INTEGER NOT NULL,
+        records     INTEGER NOT NULL DEFAULT 0
+    );
+
+    CREATE TABLE IF NOT EXISTS sessions (
+        file_id         INTEGER PRIMARY KEY,
+        session_id      TEXT NOT NULL,
+        model           TEXT,
+        start_ts        REAL,
+        end_ts          REAL,
+        input_tokens    INTEGER NOT NULL DEFAULT 0,
+        output_tokens   INTEGER NOT NULL DEFAULT 0,
+        cache_creation_tokens INTEGER NOT NULL DEFAULT 0,
+        cache_read_tokens     INTEGER NOT NULL DEFAULT 0,
+        messages        INTEGER NOT NULL DEFAULT 0
+    );
+
+    CREATE TABLE IF NOT EXISTS session_models (
+        file_id         INTEGER NOT NULL,
+        model           TEXT NOT NULL,
+        input           INTEGER NOT NULL DEFAULT 0,
+        output          INTEGER NOT NULL DEFAULT 0,
+        cache_create    INTEGER NOT NULL DEFAULT 0,
+        cache_read      INTEGER NOT NULL DEFAULT 0,
+        msgs            INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (file_id, model)
+    ) WITHOUT ROWID;
+
+    CREATE TABLE IF NOT EXISTS messages (
+        file_id         INTEGER NOT NULL,
+        ts              REAL,
+        model           TEXT,
+        input           INTEGER NOT NULL,
+        output          INTEGER NOT NULL,
+        cache_create    INTEGER NOT NULL,
+        cache_read      INTEGER NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS tool_calls (
+        file_id         INTEGER NOT NULL,
+        line            INTEGER NOT NULL,
+        ts              REAL,
+        tool_use_id     TEXT,
+        name            TEXT NOT NULL,
+        file_path       TEXT,
+        input_keys      TEXT NOT NULL DEFAULT '',
+        input           TEXT NOT NULL DEFAULT '{}'
+    );
+
+    CREATE TABLE IF NOT EXISTS tool_errors (
+        file_id         INTEGER NOT NULL,
+        line            INTEGER NOT NULL,
+        tool_use_id     TEXT,
+        error           TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS hook_markers (
+        file_id         INTEGER NOT NULL,
+        line            INTEGER NOT NULL,
+        ts              REAL,
+        hook_type       TEXT NOT NULL,
+        text            TEXT NOT NULL
+    );
+
+    -- Covering: window and per-session token queries never touch the table
+    CREATE INDEX IF NOT EXISTS idx_messages_ts ON messages(ts, model, input, output);
+    CREATE INDEX IF NOT EXISTS idx_messages_file_ts
+        ON messages(file_id, ts, model, input, output);
+    CREATE INDEX IF NOT EXISTS idx_tool_calls_file ON tool_calls(file_id, line);
+    CREATE INDEX IF NOT EXISTS idx_tool_calls_name ON tool_calls(file_id, name);
+    CREATE INDEX IF NOT EXISTS idx_tool_errors_file ON tool_errors(file_id, line);
+    CREATE INDEX IF NOT EXISTS idx_hook_markers_file ON hook_markers(file_id, line);
+"""
+
+
+def _parse_ts(value) -> Optional[float]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _is_real_model(model) -> bool:
+    return bool(model) and model != "<synthetic>"
+
+
+def _tool_input(inp) -> dict:
+    """The TOOL_INPUT_KEYS subset of a tool input (strings capped at 500)."""
+    if not isinstance(inp, dict):
+        return {}
+    kept = {}
+    for key in TOOL_INPUT_KEYS:
+        value = inp.get(key)
+        if isinstance(value, str):
+            kept[key] = value[:500]
+        elif isinstance(value, (int, float, bool)):
+            kept[key] = value
+    return kept
+
+
+def _hook_marker(content) -> Optional[tuple[str, str]]:
+    """(hook_type, text) if content carries hook output, else None."""
+    if not content:
+        return None
+    text = json.dumps(content)
+    for keyword in HOOK_KEYWORDS:
+        if keyword in text:
+            return keyword, text[:500]
+    return None
+
+
+def _parse_records(data: bytes) -> tuple[list[dict], int]:
+    """Decode complete JSONL records from data → (records, bytes consumed).
+
+    The last line is consumed without a trailing newline only if it is
+    already valid JSON (a record can't be a prefix of another record).
+    """
+    end = data.rfind(b"\n") + 1
+    records = []
+    for line in data[:end].split(b"\n"):
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    tail = data[end:]
+    if tail.strip():
+        try:
+            records.append(json.loads(tail))
+            end = len(data)
+        except ValueError:
+            pass
+    return [r for r in records if isinstance(r, dict)], end
+
+
+class SessionUsageStore:
+    """SQLite-backed, append-aware index of session JSONL records."""
+
+    def __init__(self, db_path: Optional[Path] = None, root: Optional[Path] = None):
+        # Resolved at call time so tests can monkeypatch the module defaults
+        self.db_path = Path(db_path) if db_path else SESSION_USAGE_DB
+        self.root = Path(root) if root else SESSIONS_ROOT
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self):
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self.conn.execute("SELECT value FROM meta WHERE key='schema_version'").fetchone()
+        if row is None or int(row[0]) != SESSION_USAGE_SCHEMA_VERSION:
+            # Older layouts are dropped before _SCHEMA runs, so its indexes
+            # never meet a table missing their columns
+            self.conn.executescript(
+                "".join(f"DROP TABLE IF EXISTS {table};" for table in _TABLES)
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(SESSION_USAGE_SCHEMA_VERSION),),
+            )
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def _session_files(self, paths: Optional[Iterable] = None) -> dict[str, os.stat_result]:
+        found = {}
+        if paths is None:
+            if not self.root.exists():
+                return found
+            paths = self.root.rglob("*.jsonl")
+        for path in paths:
+            if "subagents" in str(path):
+                continue
+            try:
+                found[str(path)] = Path(path).stat()
+            except OSError:
+                continue
+        return found
+
+    def _drop_file(self, file_id: int):
+        for table in _FILE_TABLES:
+            self.conn.execute(f"DELETE FROM {table} WHERE file_id = ?", (file_id,))
+        self.conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def refresh(self, paths: Optional[Iterable] = None) -> dict:
+        """Ingest bytes appended since the last refresh. Returns counters.
+
+        With paths, only those files are checked and nothing else is
+        dropped; by default every session file under root is.
+        """
+        stats = {"files": 0, "new": 0, "appended": 0, "reset": 0, "removed": 0,
+                 "bytes": 0, "messages": 0}
+        on_disk = self._session_files(paths)
+        with self.conn:
+            # Take the write lock before reading cursors: two processes
+            # refreshing at once would otherwise both ingest the same bytes
+            self.conn.execute("BEGIN IMMEDIATE")
+            known = {
+                path: (fid, inode, offset, records, mtime)
+                for fid, path, inode, offset, records, mtime in self.conn.execute(
+                    "SELECT id, path, inode, offset, records, mtime FROM files"
+                )
+            }
+            if paths is None:
+                for path in set(known) - set(on_disk):
+                    self._drop_file(known[path][0])
+                    stats["removed"] += 1
+
+            for path, st in on_disk.items():
+                stats["files"] += 1
+                prior = known.get(path)
+                if prior is not None:
+                    fid, inode, offset, records, mtime = prior
+                    if inode == st.st_ino and st.st_size == offset:
+                        if mtime != st.st_mtime:  # Touched: recency still counts
+                            self.conn.execute(
+                                "UPDATE files SET mtime = ? WHERE id = ?", (st.st_mtime, fid)
+                            )
+                        continue  # Nothing appended
+                    if inode != st.st_ino or st.st_size < offset:
+                        # Replaced or truncated: start over
+                        self._drop_file(fid)
+                        stats["reset"] += 1
+                        prior = None
+                    else:
+                        stats["appended"] += 1
+                else:
+                    stats["new"] += 1
+                if prior is None:
+                    fid = self.conn.execute(
+                        "INSERT INTO files (path, inode, size, mtime, offset) VALUES (?, ?, ?, ?, 0)",
+                        (path, st.st_ino, st.st_size, st.st_mtime),
+                    ).lastrowid
+                    self.conn.execute(
+                        "INSERT INTO sessions (file_id, session_id) VALUES (?, ?)",
+                        (fid, Path(path).stem),
+                    )
+                    offset = records = 0
+                consumed, n_records, n_msgs = self._ingest(fid, path, offset, records)
+                stats["bytes"] += consumed
+                stats["messages"] += n_msgs
+                self.conn.execute(
+                    "UPDATE files SET inode = ?, size = ?, mtime = ?, offset = ?, records = ? "
+                    "WHERE id = ?",
+                    (st.st_ino, st.st_size, st.st_mtime, offset + consumed,
+                     records + n_records, fid),
+                )
+        return stats
+
+    def _ingest(self, file_id: int, path: str, offset: int, first_line: int = 0
+                ) -> tuple[int, int, int]:
+        """Parse path from offset; fold records into the store.
+
+        first_line is the number of records already ingested from the file.
+        Returns (bytes consumed, records, usage messages).
+        """
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except OSError as e:
+            print(f"Error parsing {path}: {e}", file=sys.stderr)
+            return 0, 0, 0
+        records, consumed = _parse_records(data)
+        if not records:
+            return consumed, 0, 0
+
+        cur = self.conn.execute(
+            "SELECT model, start_ts, end_ts FROM sessions WHERE file_id = ?", (file_id,)
+        ).fetchone()
+        first_model, start_ts, end_ts = cur if cur else (None, None, None)
+        totals = [0, 0, 0, 0, 0]
+        per_model: dict[str, list[int]] = {}
+        rows, tool_rows, error_rows, marker_rows = [], [], [], []
+
+        for line, record in enumerate(records, start=first_line):
+            ts = _parse_ts(record.get("timestamp"))
+            if ts is not None:
+                if start_ts is None:
+                    start_ts = ts
+                end_ts = ts
+            record_type = record.get("type")
+            if record_type == COMPACT_MARKER:
+                marker_rows.append((file_id, line, ts, COMPACT_MARKER, str(record)[:200]))
+            elif record_type == "tool_use":
+                # Older transcripts: tool calls as top-level records
+                tool_rows.append(self._tool_row(file_id, line, ts, record))
+            elif record_type == "tool_result" and record.get("is_error"):
+                error_rows.append((file_id, line, record.get("tool_use_id"),
+                                   str(record.get("content", ""))[:200]))
+
+            msg = record.get("message")
+            if not isinstance(msg, dict):
+                continue
+            content = msg.get("content")
+            marker = _hook_marker(content)
+            if marker:
+                marker_rows.append((file_id, line, ts, *marker))
+            if isinstance(content, list):
+                for block in content:
+                    if not isinstance(block, dict):
+                        continue
+                    block_type = block.get("type")
+                    if block_type == "tool_use" and record_type == "assistant":
+                        tool_rows.append(self._tool_row(file_id, line, ts, block))
+                    elif block_type == "tool_result" and block.get("is_error"):
+                        error_rows.append((file_id, line, block.get("tool_use_id"),
+                                           str(block.get("content", ""))[:200]))
+
+            model = msg.get("model")
+            if _is_real_model(model) and not first_model:
+                first_model = model
+            usage = msg.get("usage")
+            if not isinstance(usage, dict):
+                continue
+            inp = usage.get("input_tokens", 0) or 0
+            out = usage.get("output_tokens", 0) or 0
+            cc = usage.get("cache_creation_input_tokens", 0) or 0
+            cr = usage.get("cache_read_input_tokens", 0) or 0
+            if inp > 0 or out > 0 or cc > 0 or cr > 0:
+                rows.append((file_id, ts, model, inp, out, cc, cr))
+                for i, v in enumerate((inp, out, cc, cr, 1)):
+                    totals[i] += v
+                if _is_real_model(model):
+                    m = per_model.setdefault(model, [0, 0, 0, 0, 0])
+                    for i, v in enumerate((inp, out, cc, cr, 1)):
+                        m[i] += v
+
+        self.conn.executemany(
+            "INSERT INTO messages (file_id, ts, model, input, output, cache_create, cache_read) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self.conn.executemany(
+            "INSERT INTO tool_calls (file_id, line, ts, tool_use_id, name, file_path, "
+            "input_keys, input) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            tool_rows,
+        )
+        self.conn.executemany("INSERT INTO tool_errors VALUES (?, ?, ?, ?)", error_rows)
+        self.conn.executemany("INSERT INTO hook_markers VALUES (?, ?, ?, ?, ?)", marker_rows)
+        self.conn.execute(
+            """UPDATE sessions SET model = ?, start_ts = ?, end_ts = ?,
+                   input_tokens = input_tokens + ?, output_tokens = output_tokens + ?,
+                   cache_creation_tokens = cache_creation_tokens + ?,
+                   cache_read_tokens = cache_read_tokens + ?, messages = messages + ?
+               WHERE file_id = ?""",
+            (first_model, start_ts, end_ts, *totals, file_id),
+        )
+        self.conn.executemany(
+            """INSERT INTO session_models
+                   (file_id, model, input, output, cache_create, cache_read, msgs)
+               VALUES (?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(file_id, model) DO UPDATE SET
+                   input = input + excluded.input, output = output + excluded.output,
+                   cache_create = cache_create + excluded.cache_create,
+                   cache_read = cache_read + excluded.cache_read,
+                   msgs = msgs + excluded.msgs""",
+            [(file_id, model, *v) for model, v in per_model.items()],
+        )
+        return consumed, len(records), len(rows)
+
+    @staticmethod
+    def _tool_row(file_id: int, line: int, ts: Optional[float], block: dict) -> tuple:
+        inp = block.get("input")
+        kept = _tool_input(inp)
+        file_path = kept.get("file_path")
+        return (
+            file_id, line, ts, block.get("id") or block.get("tool_use_id"),
+            block.get("name") or "unknown",
+            file_path if isinstance(file_path, str) else None,
+            ",".join(inp) if isinstance(inp, dict) else "",
+            json.dumps(kept),
+        )
+
+    def rebuild(self) -> dict:
+        """Forget every cursor and re-parse all session files."""
+        with self.conn:
+            for table in _TABLES:
+                self.conn.execute(f"DELETE FROM {table}")
+        return self.refresh()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def sessions(self) -> list[dict]:
+        """Sessions with any usage, newest first, in parse_session_file() shape.
+
+        Extra keys: session_file, session_id, file_id.
+        """
+        def _dt(ts):
+            return datetime.fromtimestamp(ts, timezone.utc) if ts is not None else None
+
+        models: dict[int, dict] = {}
+        for fid, model, inp, out, cc, cr, msgs in self.conn.execute(
+            "SELECT file_id, model, input, output, cache_create, cache_read, msgs "
+            "FROM session_models"
+        ):
+            models.setdefault(fid, {})[model] = {
+                "input": inp, "output": out, "cache_create": cc,
+                "cache_read": cr, "msgs": msgs,
+            }
+
+        out_sessions = []
+        for row in self.conn.execute(
+            """SELECT s.file_id, f.path, s.session_id, s.model, s.start_ts, s.end_ts,
+                      s.input_tokens, s.output_tokens, s.cache_creation_tokens,
+                      s.cache_read_tokens, s.messages
+               FROM sessions s JOIN files f ON f.id = s.file_id
+               WHERE s.input_tokens + s.output_tokens
+                     + s.cache_creation_tokens + s.cache_read_tokens > 0"""
+        ):
+            fid, path, sid, model, start, end, inp, out, cc, cr, msgs = row
+            out_sessions.append({
+                "input_tokens": inp,
+                "output_tokens": out,
+                "cache_creation_tokens": cc,
+                "cache_read_tokens": cr,
+                "messages": msgs,
+                "model": model,
+                "models_used": models.get(fid, {}),
+                "start_time": _dt(start),
+                "end_time": _dt(end),
+                "session_file": path,
+                "session_id": sid,
+                "file_id": fid,
+            })
+        out_sessions.sort(
+            key=lambda s: s["start_time"] or datetime.min.replace(tzinfo=timezone.utc),
+            reverse=True,
+        )
+        return out_sessions
+
+    @staticmethod
+    def _file_filter(file_ids: Optional[Iterable[int]]) -> tuple[str, list]:
+        if file_ids is None:
+            return "", []
+        ids = list(file_ids)
+        return f" AND file_id IN ({','.join('?' * len(ids))})", ids
+
+    def usage_by_model(
+        self, since_ts: float, file_ids: Optional[Iterable[int]] = None
+    ) -> dict[Optional[str], tuple[int, int]]:
+        """{model: (input+output tokens, messages)} for conversational messages
+        (input or output > 0) at or after since_ts."""
+        where, params = self._file_filter(file_ids)
+        if file_ids is not None and not params:
+            return {}
+        return {
+            model: (tokens, msgs)
+            for model, tokens, msgs in self.conn.execute(
+                "SELECT model, SUM(input + output), COUNT(*) FROM messages "
+                "WHERE ts >= ? AND (input > 0 OR output > 0)" + where
+                + " GROUP BY model",
+                [since_ts, *params],
+            )
+        }
+
+    def conversational_messages(
+        self, since_ts: float, file_ids: Optional[Iterable[int]] = None
+    ) -> list[tuple[float, int, Optional[str]]]:
+        """[(ts, input+output tokens, model)] at or after since_ts, oldest first."""
+        where, params = self._file_filter(file_ids)
+        if file_ids is not None and not params:
+            return []
+        return self.conn.execute(
+            "SELECT ts, input + output, model FROM messages "
+            "WHERE ts >= ? AND (input > 0 OR output > 0)" + where + " ORDER BY ts",
+            [since_ts, *params],
+        ).fetchall()
+
+    def file_id(self, path) -> Optional[int]:
+        row = self.conn.execute("SELECT id FROM files WHERE path = ?", (str(path),)).fetchone()
+        return row[0] if row else None
+
+    def session_files(self, directory: Optional[Path] = None,
+                      since_mtime: Optional[float] = None) -> list[dict]:
+        """Ingested files, most recently modified first (as of the last refresh).
+
+        directory limits the result to session files directly inside it.
+        Each dict: file_id, path, session_id, mtime, size.
+        """
+        sql = ("SELECT f.id, f.path, s.session_id, f.mtime, f.size "
+               "FROM files f JOIN sessions s ON s.file_id = f.id")
+        params: list = []
+        if since_mtime is not None:
+            sql += " WHERE f.mtime > ?"
+            params.append(since_mtime)
+        result = []
+        for fid, path, sid, mtime, size in self.conn.execute(sql + " ORDER BY f.mtime DESC", params):
+            if directory is not None and Path(path).parent != Path(directory):
+                continue
+            result.append({"file_id": fid, "path": path, "session_id": sid,
+                           "mtime": mtime, "size": size})
+        return result
+
+    def current_session(self, max_age_s: float = 300) -> Optional[dict]:
+        """The session written to most recently, if within max_age_s.
+
+        Adds tokens (input + output) and messages over its conversational
+        messages to the session_files() dict.
+        """
+        recent = self.session_files(since_mtime=time.time() - max_age_s)
+        if not recent:
+            return None
+        current = recent[0]
+        return {**current, **self.conversation_totals(current["file_id"])}
+
+    def conversation_totals(self, file_id: int) -> dict:
+        """{tokens: input + output, messages} over a session's conversational messages."""
+        tokens, messages = self.conn.execute(
+            "SELECT COALESCE(SUM(input + output), 0), COUNT(*) FROM messages "
+            "WHERE file_id = ? AND (input > 0 OR output > 0)",
+            (file_id,),
+        ).fetchone()
+        return {"tokens": tokens, "messages": messages}
+
+    def tool_calls(self, file_id: int, names: Optional[Iterable[str]] = None) -> list[dict]:
+        """[{name, input, input_keys, tool_use_id, line, ts}] in file order.
+
+        input holds only the TOOL_INPUT_KEYS fields of the call.
+        """
+        sql = ("SELECT name, input, input_keys, tool_use_id, line, ts FROM tool_calls "
+               "WHERE file_id = ?")
+        params: list = [file_id]
+        if names is not None:
+            names = list(names)
+            sql += f" AND name IN ({','.join('?' * len(names))})"
+            params += names
+        return [
+            {"name": name, "input": json.loads(inp),
+             "input_keys": keys.split(",") if keys else [],
+             "tool_use_id": tool_use_id, "line": line, "ts": ts}
+            for name, inp, keys, tool_use_id, line, ts in self.conn.execute(
+                sql + " ORDER BY line, rowid", params
+            )
+        ]
+
+    def tool_counts(self, file_id: int) -> dict[str, int]:
+        return dict(self.conn.execute(
+            "SELECT name, COUNT(*) FROM tool_calls WHERE file_id = ? GROUP BY name", (file_id,)
+        ))
+
+    def tool_errors(self, file_id: int) -> list[dict]:
+        """[{tool_use_id, error, line}] in file order."""
+        return [
+            {"tool_use_id": tool_use_id, "error": error, "line": line}
+            for tool_use_id, error, line in self.conn.execute(
+                "SELECT tool_use_id, error, line FROM tool_errors WHERE file_id = ? "
+                "ORDER BY line, rowid",
+                (file_id,),
+            )
+        ]
+
+    def hook_markers(self, file_id: int, hook_types: Optional[Iterable[str]] = None) -> list[dict]:
+        """[{hook_type, text, line, ts}] in file order (COMPACT_MARKER included)."""
+        sql = "SELECT hook_type, text, line, ts FROM hook_markers WHERE file_id = ?"
+        params: list = [file_id]
+        if hook_types is not None:
+            hook_types = list(hook_types)
+            sql += f" AND hook_type IN ({','.join('?' * len(hook_types))})"
+            params += hook_types
+        return [
+            {"hook_type": hook_type, "text": text, "line": line, "ts": ts}
+            for hook_type, text, line, ts in self.conn.execute(sql + " ORDER BY line, rowid", params)
+        ]
+
+    def models(self, file_id: int) -> set[str]:
+        """Real models that produced usage in the session."""
+        return {m for (m,) in self.conn.execute(
+            "SELECT model FROM session_models WHERE file_id = ?", (file_id,)
+        )}
+
+    def stats(self) -> dict:
+        files, size, offset = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(offset), 0) FROM files"
+        ).fetchone()
+        (messages,) = self.conn.execute("SELECT COUNT(*) FROM messages").fetchone()
+        (tool_calls,) = self.conn.execute("SELECT COUNT(*) FROM tool_calls").fetchone()
+        try:
+            db_bytes = self.db_path.stat().st_size
+        except OSError:
+            db_bytes = 0
+        return {
+            "files": files,
+            "bytes_ingested": offset,
+            "bytes_on_disk": size,
+            "messages": messages,
+            "tool_calls": tool_calls,
+            "db_bytes": db_bytes,
+        }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incremental session usage store")
+    parser.add_argument("command", choices=["refresh", "rebuild", "stats"])
+    args = parser.parse_args()
+
+    store = SessionUsageStore()
+    t0 = time.time()
+    if args.command == "refresh":
+        result = store.refresh()
+    elif args.command == "rebuild":
+        result = store.rebuild()
+    else:
+        result = store.stats()
+    result["elapsed_s"] = round(time.time() - t0, 3)
+    print(json.dumps(result, indent=2))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""Sitemap State - incremental crawl state for the sitemap-driven scrapers.
+
+The scrapers used to re-derive every URL on each run and then work out
+what was already scraped by re-reading every saved article (wave9) or by
+loading metadata.json whole (data_analyst_scraper). This store keeps, in
+SQLite:
+
+    - sitemap_entries: every <loc>/<lastmod> seen, per (child) sitemap
+    - sitemaps: each child sitemap's <lastmod> in its parent index, so an
+      unchanged child isn't fetched again (its entries come from the store)
+    - scraped: per source, the URL's <lastmod> when it was last saved and
+      the file it was saved to
+
+A URL is pending when it was never scraped, or when its sitemap <lastmod>
+differs from the one recorded at save time. So a scheduled refresh does
+work proportional to what changed, not to the size of the archive.
+
+No external dependencies -- stdlib only.
+
+Usage:
+    python3 sitemap_state.py stats              # Rows per source
+    python3 sitemap_state.py reset <source>     # Forget a source (full re-crawl)
+
+    # From Python
+    from sitemap_state import SitemapState
+    state = SitemapState()
+    lastmods = state.walk(sitemap_url, fetch_text)   # url -> lastmod
+    for url in state.pending(source, lastmods):
+        ...
+        state.record(source, url, lastmods[url], path.name)
+"""
+
+import re
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+
+SITEMAP_STATE_DB = Path("~/.claude/.locks/sitemap-state.db").expanduser()
+SITEMAP_MAX_DEPTH = 3  # Index -> index -> urlset is as deep as real sites go
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sitemaps (
+        url         TEXT PRIMARY KEY,
+        lastmod     TEXT
+    ) WITHOUT ROWID;
+
+    CREATE TABLE IF NOT EXISTS sitemap_entries (
+        sitemap     TEXT NOT NULL,
+        url         TEXT NOT NULL,
+        lastmod     TEXT,
+        PRIMARY KEY (sitemap, url)
+    ) WITHOUT ROWID;
+
+    CREATE TABLE IF NOT EXISTS scraped (
+        source      TEXT NOT NULL,
+        url         TEXT NOT NULL,
+        lastmod     TEXT,
+        file        TEXT,
+        PRIMARY KEY (source, url)
+    ) WITHOUT ROWID;
+"""
+
+_BLOCK_RE = re.compile(r"<(url|sitemap)\b[^>]*>(.*?)</\1>", re.S | re.I)
+_LOC_RE = re.compile(r"<loc>\s*(?:<!\[CDATA\[)?\s*([^<\]]+?)\s*(?:\]\]>)?\s*</loc>", re.I)
+_LASTMOD_RE = re.compile(r"<lastmod>\s*([^<]+?)\s*</lastmod>", re.I)
+
+
+def parse_sitemap(xml: str) -> tuple[bool, list[tuple[str, Optional[str]]]]:
+    """(is_index, [(loc, lastmod or None)]) for a <sitemapindex> or <urlset>."""
+    is_index = re.search(r"<sitemapindex\b", xml, re.I) is not None
+    entries = []
+    for _tag, body in _BLOCK_RE.findall(xml):
+        loc = _LOC_RE.search(body)
+        if not loc:
+            continue
+        lastmod = _LASTMOD_RE.search(body)
+        entries.append((loc.group(1).replace("&amp;", "&"), lastmod.group(1) if lastmod else None))
+    if not entries:
+        # Bare <loc> lists (no <url> wrappers) still occur on small sites
+        entries = [(loc.replace("&amp;", "&"), None) for loc in _LOC_RE.findall(xml)]
+    return is_index, entries
+
+
+def scraped_files(output_dir: Path) -> dict:
+    """url -> filename for saved articles whose frontmatter carries `url: "..."`."""
+    found = {}
+    if not output_dir.exists():
+        return found
+    for f in output_dir.glob("*.md"):
+        try:
+            text = f.read_text(encoding="utf-8")
+        except OSError:
+            continue
+        match = re.search(r'^url:\s*"([^"]*)"', text, re.MULTILINE)
+        if match:
+            found[match.group(1)] = f.name
+    return found
+
+
+class SitemapState:
+    """Per-URL <lastmod> bookkeeping for incremental sitemap crawls."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else SITEMAP_STATE_DB
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._conn.close()
+
+    # ── Sitemaps ────────────────────────────────────────────────────────
+
+    def walk(
+        self,
+        sitemap_url: str,
+        fetch: Callable[[str], Optional[str]],
+        _depth: int = 0,
+        _lastmod: Optional[str] = None,
+    ) -> dict:
+        """url -> lastmod for every page under sitemap_url, following indexes.
+
+        fetch(url) returns the sitemap XML, or None on failure. A child
+        sitemap whose <lastmod> in its index is unchanged since the last
+        walk is answered from the store without being fetched. A failed
+        fetch also falls back to the stored entries.
+        """
+        if _depth and _lastmod is not None and self._child_unchanged(sitemap_url, _lastmod):
+            return self._stored_pages(sitemap_url)
+
+        xml = fetch(sitemap_url)
+        if xml is None:
+            if _depth:
+                self._mark_child(sitemap_url, None)  # Refetch next time
+            return self._stored_pages(sitemap_url)
+        is_index, entries = parse_sitemap(xml)
+        self._store_entries(sitemap_url, entries)
+        if _depth:
+            self._mark_child(sitemap_url, _lastmod)
+
+        if not is_index:
+            return dict(entries)
+        pages = {}
+        if _depth + 1 < SITEMAP_MAX_DEPTH:
+            for child, lastmod in entries:
+                pages.update(self.walk(child, fetch, _depth + 1, lastmod))
+        return pages
+
+    def _mark_child(self, sitemap_url: str, lastmod: Optional[str]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sitemaps (url, lastmod) VALUES (?, ?)",
+                (sitemap_url, lastmod),
+            )
+
+    def _child_unchanged(self, sitemap_url: str, lastmod: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT lastmod FROM sitemaps WHERE url = ?", (sitemap_url,)
+            ).fetchone()
+        return row is not None and row[0] == lastmod
+
+    def _store_entries(self, sitemap_url: str, entries: list):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sitemap_entries WHERE sitemap = ?", (sitemap_url,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sitemap_entries (sitemap, url, lastmod) VALUES (?, ?, ?)",
+                [(sitemap_url, loc, lastmod) for loc, lastmod in entries],
+            )
+
+    def _stored_pages(self, sitemap_url: str, _depth: int = 0) -> dict:
+        """Pages recorded under a sitemap (recursing into stored child indexes)."""
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT e.url, e.lastmod, s.url IS NOT NULL
+                   FROM sitemap_entries e LEFT JOIN sitemaps s ON s.url = e.url
+                   WHERE e.sitemap = ?""",
+                (sitemap_url,),
+            ).fetchall()
+        pages = {}
+        for url, lastmod, is_child in rows:
+            if is_child:
+                if _depth + 1 < SITEMAP_MAX_DEPTH:
+                    pages.update(self._stored_pages(url, _depth + 1))
+            else:
+                pages[url] = lastmod
+        return pages
+
+    # ── Scraped URLs ────────────────────────────────────────────────────
+
+    def is_seeded(self, source: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM scraped WHERE source = ? LIMIT 1", (source,)
+            ).fetchone()
+        return row is not None
+
+    def seed(self, source: str, files: dict, lastmods: Optional[dict] = None):
+        """Adopt articles scraped before this store existed (url -> filename).
+
+        They take the sitemap's current <lastmod> so only later changes
+        make them pending again.
+        """
+        lastmods = lastmods or {}
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO scraped (source, url, lastmod, file) VALUES (?, ?, ?, ?)",
+                [(source, url, lastmods.get(url), name) for url, name in files.items()],
+            )
+
+    def pending(self, source: str, lastmods: dict, urls: Optional[Iterable[str]] = None) -> list:
+        """URLs (in `urls` order, default lastmods order) never scraped or changed since."""
+        with self._lock:
+            done = dict(
+                self._conn.execute(
+                    "SELECT url, lastmod FROM scraped WHERE source = ?", (source,)
+                ).fetchall()
+            )
+        result = []
+        for url in (lastmods if urls is None else urls):
+            if url not in done:
+                result.append(url)
+                continue
+            current, saved = lastmods.get(url), done[url]
+            if current is not None and saved is not None and current != saved:
+                result.append(url)
+        return result
+
+    def previous_file(self, source: str, url: str) -> Optional[str]:
+        """Filename an earlier run saved this URL to, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file FROM scraped WHERE source = ? AND url = ?", (source, url)
+            ).fetchone()
+        return row[0] if row else None
+
+    def previous_index(self, source: str, url: str) -> Optional[int]:
+        """Article number of an earlier save ("0042-slug.md" -> 42), so a
+        changed page is rewritten in place rather than appended."""
+        name = self.previous_file(source, url) or ""
+        digits = name.split("-", 1)[0]
+        return int(digits) if digits.isdigit() else None
+
+    def saved(self, source: str, url: str, lastmod: Optional[str], path: Path):
+        """record() a freshly written article, removing an earlier revision
+        left under another name (e.g. the title and so the slug changed)."""
+        previous = self.previous_file(source, url)
+        if previous and previous != path.name:
+            (path.parent / previous).unlink(missing_ok=True)
+        self.record(source, url, lastmod, path.name)
+
+    def record(self, source: str, url: str, lastmod: Optional[str], file: Optional[str] = None):
+        """Mark a URL done at this <lastmod>. Skipped pages pass no file; an
+        earlier save's file is kept."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT INTO scraped (source, url, lastmod, file) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(source, url) DO UPDATE SET
+                       lastmod = excluded.lastmod,
+                       file = COALESCE(excluded.file, scraped.file)""",
+                (source, url, lastmod, file),
+            )
+
+    def reset(self, source: str) -> int:
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM scraped WHERE source = ?", (source,))
+        return cur.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            per_source = dict(
+                self._conn.execute(
+                    "SELECT source, COUNT(*) FROM scraped GROUP BY source ORDER BY source"
+                ).fetchall()
+            )
+            entries = self._conn.execute("SELECT COUNT(*) FROM sitemap_entries").fetchone()[0]
+        return {"sources": per_source, "sitemap_entries": entries}
+
+
+_state: Optional[SitemapState] = None
+_state_lock = threading.Lock()
+
+
+def get_sitemap_state() -> SitemapState:
+    """The process-wide store shared by every scraper."""
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = SitemapState()
+        return _state
+
+
+def main():
+    args = sys.argv[1:]
+    cmd = args[0] if args else "stats"
+    state = get_sitemap_state()
+    if cmd == "stats":
+        s = state.stats()
+        print(f"Sitemap state: {state.db_path}")
+        print(f"  Sitemap entries: {s['sitemap_entries']}")
+        for source, count in s["sources"].items():
+            print(f"  {source}: {count} scraped URLs")
+    elif cmd == "reset" and len(args) == 2:
+        print(f"Forgot {state.reset(args[1])} URLs for {args[1]}")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,9 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from log_aggregates import audit_stats
+
 HOME = Path.home()
 TOOLS = HOME / "Development" / "tools"
 HOOKS = HOME / ".claude" / "hooks"
@@ -221,17 +224,10 @@ def check_delegation():
         if not log.exists():
             return {"status": "no_data", "message": "No audit log yet"}
 
-        lines = log.read_text().strip().split("\n")
-        models, tones = {}, {}
-        for line in lines:
-            for token in line.split():
-                if token.startswith("model="):
-                    m = token.split("=")[1]
-                    models[m] = models.get(m, 0) + 1
-                if token.startswith("tone="):
-                    t = token.split("=")[1]
-                    tones[t] = tones.get(t, 0) + 1
-        total = len(lines)
+        audit = audit_stats()
+        models = audit["counts"]["model"]
+        tones = audit["counts"]["tone"]
+        total = audit["lines"]
         delegatable = total - models.get("claude", 0)
 
         compliance = {}
@@ -473,23 +469,8 @@ def check_gemini_routing():
     audit_log = LOCKS / "delegation-hook-audit.log"
     if audit_log.exists():
         try:
-            lines = [
-                l.strip()
-                for l in audit_log.read_text().strip().split("\n")
-                if l.strip()
-            ]
-
-            # Extract template routing entries (action=prefetch_template:*)
-            by_cat = {}
-            for line in lines:
-                for token in line.split():
-                    if token.startswith("action=prefetch_template:"):
-                        cat = token.split(":", 1)[1]
-                        if cat not in by_cat:
-                            by_cat[cat] = {"calls": 0, "ok": 0}
-                        by_cat[cat]["calls"] += 1
-                        if "prefetch=OK" in line:
-                            by_cat[cat]["ok"] += 1
+            # Template routing entries (action=prefetch_template:*)
+            by_cat = audit_stats()["templates"]
 
             total = sum(v["calls"] for v in by_cat.values())
             ok = sum(v["ok"] for v in by_cat.values())
@@ -11,6 +11,7 @@ fallback chains, full routing, edge cases.
 
 import json
 import os
+import subprocess
 import sys
 import tempfile
 import time
@@ -394,12 +395,47 @@ class TestRateLimits:
         assert router.check_rate_limit("gemini") is False
 
     def test_calls_expire_after_60s(self, monkeypatch):
-        """Calls older than 60s should be pruned."""
+        """An exhausted bucket refills completely within 60s."""
+        now = [1000.0]
+        monkeypatch.setattr(router, "_clock", lambda: now[0])
         router.record_call("gemini")
         # Verify it was recorded
         state = router.load_rate_limits()
-        assert len(state["gemini"]["calls"]) == 1
+        assert state["gemini"]["tokens"] == pytest.approx(14)
+        for _ in range(14):
+            router.record_call("gemini")
+        assert router.check_rate_limit("gemini") is False
+        now[0] += 60
+        assert router.check_rate_limit("gemini") is True
+        assert router.load_rate_limits()["gemini"]["tokens"] == pytest.approx(15)
+
+    def test_clock_stepped_back_does_not_lock_out(self, monkeypatch):
+        """A bucket stamped in the future (clock reset) counts as refilled."""
+        now = [1_000_000.0]
+        monkeypatch.setattr(router, "_clock", lambda: now[0])
+        for _ in range(15):
+            router.record_call("gemini")
+        assert router.check_rate_limit("gemini") is False
+        now[0] = 30.0  # e.g. a stored monotonic stamp from before a reboot
         assert router.check_rate_limit("gemini") is True
+        router.record_call("gemini")
+        assert router.load_rate_limits()["gemini"]["tokens"] == pytest.approx(14)
+
+    def test_buckets_shared_across_processes(self):
+        """Another router process sees calls recorded by this one."""
+        for _ in range(13):
+            router.record_call("gemini")
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1]); import llm_router as r; "
+            "from pathlib import Path; r.RATE_LIMITS_FILE = Path(sys.argv[2]); "
+            "print(r.check_rate_limit('gemini'))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", script, str(Path(router.__file__).parent),
+             str(router.RATE_LIMITS_FILE)],
+            capture_output=True, text=True, timeout=30,
+        )
+        assert out.stdout.strip() == "False"
 
     def test_unknown_model_returns_true(self):
         """Unknown model names should return True (no limit info)."""
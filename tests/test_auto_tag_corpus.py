@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Tests for auto_tag_corpus.py — serial vs map-reduce TF-IDF pipeline."""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import auto_tag_corpus
+import tfidf_matrix
+from auto_tag_corpus import TFIDFTagger
+
+TOPICS = [
+    "pricing strategy", "mixing console", "newsletter growth", "sync licensing",
+    "audience building", "playlist pitching", "product launch", "cohort retention",
+]
+FILLER = ["quickly", "really", "music", "songs", "writer", "listeners", "market", "revenue"]
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    monkeypatch.setattr(auto_tag_corpus, "SHARD_SIZE", 7)  # Several shards per run
+    rng = random.Random(5)
+    root = tmp_path / "blog"
+    (root / "articles").mkdir(parents=True)
+    (root / "episodes" / "ep1").mkdir(parents=True)
+    for i in range(40):
+        words = []
+        for _ in range(120):
+            words.append(rng.choice(TOPICS[: 2 + i % 6]) if rng.random() < 0.2 else rng.choice(FILLER))
+        (root / "articles" / f"{i:03d}.md").write_text(" ".join(words) + ".\n", encoding="utf-8")
+    (root / "episodes" / "ep1" / "transcript.md").write_text("pricing strategy talk\n", encoding="utf-8")
+    return root
+
+
+def _run(corpus, workers, backend="dict"):
+    tagger = TFIDFTagger([corpus], workers=workers, backend=backend)
+    tagger.load_corpus()
+    concepts = tagger.extract_top_concepts(min_doc_freq=2, max_doc_ratio=0.9, max_concepts=20)
+    return tagger, concepts
+
+
+def test_map_reduce_matches_serial(corpus):
+    serial, serial_concepts = _run(corpus, 1)
+    parallel, parallel_concepts = _run(corpus, 2)
+    assert parallel.num_docs == serial.num_docs == 41
+    assert parallel.documents == []  # Paths only
+    assert parallel.doc_freq == serial.doc_freq
+    assert set(parallel_concepts) == set(serial_concepts)
+    assert serial.tag_corpus(serial_concepts, dry_run=True) == parallel.tag_corpus(
+        parallel_concepts, dry_run=True
+    )
+
+
+def test_parallel_tagging_rewrites_files(corpus, tmp_path):
+    tagger, concepts = _run(corpus, 2)
+    expected = {
+        p: tagger.tag_document(p.read_text(encoding="utf-8"), concepts) for p in tagger.paths
+    }
+    differ = sum(p.read_text(encoding="utf-8") != t for p, t in expected.items())
+    assert tagger.tag_corpus(concepts) == differ > 0
+    assert all(p.read_text(encoding="utf-8") == t for p, t in expected.items())
+
+    index = tmp_path / "INDEX.md"
+    tagger.generate_concept_index(concepts, index)
+    assert "**Corpus size:** 41 articles" in index.read_text(encoding="utf-8")
+
+
+@pytest.mark.skipif(not tfidf_matrix.HAS_SPARSE, reason="numpy/scipy not installed")
+def test_sparse_backend_matches_dict(corpus, tmp_path, monkeypatch):
+    monkeypatch.setattr(tfidf_matrix, "TFIDF_MATRIX_DIR", tmp_path / "matrix")
+    dict_tagger, dict_concepts = _run(corpus, 1)
+    sparse_tagger, sparse_concepts = _run(corpus, 1, backend="sparse")
+    assert sparse_tagger.doc_freq == dict_tagger.doc_freq
+    assert set(sparse_concepts) == set(dict_concepts)
+    # Second run reuses the persisted matrix
+    assert set(_run(corpus, 2, backend="sparse")[1]) == set(dict_concepts)
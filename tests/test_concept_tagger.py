@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Tests for concept_tagger.py — single-pass [[wiki-link]] tagging."""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from concept_tagger import ConceptTagger, get_tagger
+
+CONCEPTS = [
+    "EQ", "mixing", "mastering", "sample rate", "sync licensing", "Pro Tools", "PRO",
+    "reverb", "delay", "A/B testing", "product-market fit", "MIDI",
+]
+
+
+def _legacy_tag(text, concepts):
+    """Reference: the per-concept regex loop the scrapers used."""
+    for concept in sorted(concepts, key=len, reverse=True):
+        pattern = re.compile(r"\b(" + re.escape(concept) + r")\b", re.IGNORECASE)
+
+        def replace_if_not_tagged(match, _text=text):
+            start = match.start()
+            before = _text[max(0, start - 3) : start]
+            after = _text[start + len(match.group(0)) : start + len(match.group(0)) + 3]
+            if "[[" in before or "]]" in after:
+                return match.group(0)
+            if before.endswith("[") or "](" in after:
+                return match.group(0)
+            return f"[[{match.group(0)}]]"
+
+        text = pattern.sub(replace_if_not_tagged, text)
+    return text
+
+
+def _prose(rng, n=300):
+    filler = ["the", "a", "track", "needs", "more", "and", "then", "we", "mixed", "EQs", "remix"]
+    words = [rng.choice(CONCEPTS + filler * 3) for _ in range(n)]
+    return " ".join(words) + "."
+
+
+def test_matches_legacy_regex_loop_on_prose():
+    tagger = ConceptTagger(CONCEPTS)
+    rng = random.Random(3)
+    for _ in range(50):
+        text = _prose(rng)
+        assert tagger.tag(text) == _legacy_tag(text, CONCEPTS)
+
+
+def test_longest_concept_wins_and_case_is_kept():
+    tagger = ConceptTagger(CONCEPTS)
+    assert tagger.tag("Set the Sample Rate in pro tools.") == "Set the [[Sample Rate]] in [[pro tools]]."
+    assert tagger.tag("remixing EQs") == "remixing EQs"  # Word boundaries
+    assert tagger.tag("run A/B testing") == "run [[A/B testing]]"
+
+
+def test_already_linked_mentions_are_skipped():
+    tagger = ConceptTagger(CONCEPTS)
+    text = "[[mixing]] and [the EQ](http://x) plus [[a mastering chain]] then [reverb]"
+    assert tagger.tag(text) == text
+    assert tagger.tag(tagger.tag("mixing then mastering")) == "[[mixing]] then [[mastering]]"
+
+
+def test_first_only_tags_first_occurrence_per_concept():
+    tagger = get_tagger(tuple(CONCEPTS))
+    assert get_tagger(tuple(CONCEPTS)) is tagger
+    text = "MIDI, MIDI and [[EQ]] then EQ and MIDI"
+    # EQ's first occurrence is already linked, so no later EQ is tagged
+    assert tagger.tag(text, first_only=True) == "[[MIDI]], MIDI and [[EQ]] then EQ and MIDI"
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Tests for the web dashboard's data cache and change-driven panel refresh
+(dashboard_web/data_loader.py)."""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dashboard_web"))
+import data_loader
+from data_loader import PanelWatcher, cache_source, cached, input_fingerprint
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    """Register test sources; forget them (and their cache) afterwards."""
+    monkeypatch.setattr(data_loader, "ERROR_LOG", tmp_path / "errors.json")
+    before = set(data_loader.CACHE_SOURCES)
+    yield tmp_path
+    for key in set(data_loader.CACHE_SOURCES) - before:
+        data_loader.CACHE_SOURCES.pop(key)
+        data_loader._cache.pop(key, None)
+        data_loader._generation.pop(key, None)
+
+
+def _wait_idle(key):
+    future = data_loader._inflight.get(key)
+    if future is not None:
+        try:
+            future.result(timeout=5)
+        except Exception:
+            pass
+
+
+def test_value_follows_input_fingerprint(sources):
+    budget = sources / "budget.json"
+    budget.write_text("1")
+    calls = []
+
+    @cache_source("t_budget", inputs=(budget,))
+    def load():
+        calls.append(1)
+        return budget.read_text()
+
+    assert cached("t_budget") == "1"
+    assert cached("t_budget") == "1"
+    assert len(calls) == 1  # No max age: unchanged file is never re-read
+
+    budget.write_text("22")
+    assert cached("t_budget") == "1"  # Stale value served while refreshing
+    _wait_idle("t_budget")
+    assert cached("t_budget") == "22"
+    assert len(calls) == 2
+
+
+def test_cold_load_waits_at_most_timeout_then_serves_default(sources):
+    release = threading.Event()
+
+    @cache_source("t_slow", timeout=0.05, default="pending")
+    def load():
+        release.wait(5)
+        return "done"
+
+    start = time.time()
+    assert cached("t_slow") == "pending"
+    assert time.time() - start < 1
+    assert "first load still running" in (sources / "errors.json").read_text()
+    release.set()
+    _wait_idle("t_slow")
+    assert cached("t_slow") == "done"
+
+
+def test_concurrent_callers_share_one_refresh(sources):
+    calls = []
+    gate = threading.Event()
+
+    @cache_source("t_shared", max_age=60)
+    def load():
+        calls.append(1)
+        gate.wait(5)
+        return len(calls)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cached("t_shared")))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert results == [1] * 5 and calls == [1]
+
+
+def test_failed_refresh_keeps_last_good_value(sources):
+    outcomes = ["ok", RuntimeError("boom")]
+
+    flag = sources / "flag"
+    flag.write_text("a")
+
+    @cache_source("t_flaky", inputs=(flag,))
+    def load():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert cached("t_flaky") == "ok"
+    flag.write_text("bb")
+    assert cached("t_flaky") == "ok"  # Stale: the refresh fails in the pool
+    _wait_idle("t_flaky")
+    assert "boom" in (sources / "errors.json").read_text()
+    assert cached("t_flaky") == "ok"  # Not retried until the input changes again
+    assert data_loader._inflight.get("t_flaky") is None
+
+
+def test_watcher_recomputes_only_panels_whose_sources_reloaded(sources):
+    budget = sources / "budget.json"
+    budget.write_text("1")
+    panel_calls = {"budget": 0, "clock": 0}
+
+    @cache_source("t_usage", inputs=(budget,))
+    def load_usage():
+        return budget.read_text()
+
+    @cache_source("t_clock", max_age=0.3)
+    def load_clock():
+        return "constant"
+
+    def budget_panel():
+        panel_calls["budget"] += 1
+        return {"usage": cached("t_usage"), "budget_state": "ok"}
+
+    def clock_panel():
+        panel_calls["clock"] += 1
+        return {"system": cached("t_clock")}
+
+    watcher = PanelWatcher({
+        "budget": (budget_panel, ("t_usage",), None),
+        "clock": (clock_panel, ("t_clock",), None),
+    })
+    assert watcher.poll() == {"usage": "1", "budget_state": "ok", "system": "constant"}
+    assert watcher.poll() == {}  # May recompute once: the cold load landed mid-poll
+    settled = dict(panel_calls)
+    assert watcher.poll() == {}
+    assert panel_calls == settled
+
+    budget.write_text("42")
+    watcher.poll()  # Starts the refresh
+    _wait_idle("t_usage")
+    changes = watcher.poll()
+    assert changes == {"usage": "42"}  # budget_state didn't change
+    assert panel_calls["budget"] > settled["budget"]
+
+    time.sleep(0.4)
+    watcher.poll()
+    _wait_idle("t_clock")
+    assert watcher.poll() == {}  # Reloaded, same value: no delta
+    assert watcher.snapshot["system"] == "constant"
+
+
+def test_fingerprint_tracks_missing_files(tmp_path):
+    path = tmp_path / "queue.md"
+    assert input_fingerprint([path]) == ((str(path), None, None),)
+    path.write_text("x")
+    st = os.stat(path)
+    assert input_fingerprint([path]) == ((str(path), st.st_mtime_ns, 1),)
+
+
+def test_panels_make_up_the_full_payload():
+    for loader, keys, max_age in data_loader.PANELS.values():
+        assert keys and set(keys) <= set(data_loader.CACHE_SOURCES)
+    watcher = PanelWatcher()
+    watcher.poll()
+    data = data_loader.get_all_dashboard_data()
+    assert set(watcher.snapshot) == set(data) - {"timestamp"}
+    assert {"usage", "kb", "tasks", "next_action", "warnings", "delegation"} <= set(data)
+
+
+def test_broadcaster_sends_snapshot_then_deltas(sources):
+    pytest.importorskip("flask")
+    import app
+
+    budget = sources / "budget.json"
+    budget.write_text("1")
+
+    @cache_source("t_stream", inputs=(budget,))
+    def load():
+        return budget.read_text()
+
+    hub = app.DashboardBroadcaster(PanelWatcher({
+        "budget": (lambda: {"usage": cached("t_stream"), "budget_state": "ok"},
+                   ("t_stream",), None),
+    }))
+    hub._thread = object()  # Drive poll() by hand instead of the refresher thread
+    early = hub.subscribe()
+    hub.poll()
+    event, payload = early.get_nowait()
+    assert event == "snapshot" and payload["data"]["budget_state"] == "ok"
+
+    late = hub.subscribe()
+    assert late.get_nowait()[0] == "snapshot"
+    budget.write_text("99")
+    hub.poll()
+    _wait_idle("t_stream")
+    hub.poll()
+    for q in (early, late):
+        event, payload = q.get_nowait()
+        assert (event, payload["data"]) == ("delta", {"usage": "99"})
+
+
+def test_broadcaster_drops_stalled_subscriber_without_blocking(sources, monkeypatch):
+    pytest.importorskip("flask")
+    import app
+
+    monkeypatch.setattr(app, "STREAM_QUEUE_SIZE", 2)
+    counter = iter(range(1000))
+    hub = app.DashboardBroadcaster(PanelWatcher({
+        "tick": (lambda: {"tick": next(counter)}, (), 0),
+    }))
+    hub._thread = object()
+    stalled = hub.subscribe()  # Never drained
+
+    done = threading.Event()
+
+    def pump():
+        for _ in range(5):
+            hub.poll()
+        done.set()
+
+    threading.Thread(target=pump, daemon=True).start()
+    assert done.wait(2), "poll() blocked on a full subscriber queue"
+    assert stalled not in hub._subscribers
+    fresh = hub.subscribe()  # Lock is free again
+    assert fresh in hub._subscribers
+
+    events = []
+    while not stalled.empty():
+        events.append(stalled.get_nowait()[0])
+    assert events[-1] == "close"
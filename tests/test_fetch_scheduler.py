@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Tests for fetch_scheduler.py — per-host pacing for the scrapers."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from fetch_scheduler import FetchScheduler, host_of
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_hosts_are_paced_independently():
+    clock = FakeClock()
+    sched = FetchScheduler(clock=clock, sleep=clock.sleep)
+    assert sched.wait("https://a.com/1", 2.0) == 0
+    assert sched.wait("https://b.com/1", 2.0) == 0  # Other host: no wait
+    assert sched.wait("https://A.com/2", 2.0) == 2.0  # Same host, any case
+    assert sched.reserve("https://a.com/3", 2.0) == 2.0
+    assert sched.reserve("https://a.com/4", 2.0) == 4.0  # Slots queue up
+
+
+def test_backoff_and_fixed_interval():
+    clock = FakeClock()
+    sched = FetchScheduler(clock=clock, sleep=clock.sleep)
+    sched.wait("https://a.com/", 1.0)
+    sched.backoff("https://a.com/x", 30)
+    assert sched.reserve("https://a.com/y", 1.0) == 30
+    sched.set_interval("b.com", 5.0)
+    sched.wait("https://b.com/1", 0.1)
+    assert sched.reserve("https://b.com/2", 0.1) == 5.0
+    assert host_of("https://b.com:8080/p?q=1") == "b.com:8080"
+
+
+def test_map_preserves_order_and_overlaps_work():
+    sched = FetchScheduler()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def work(n):
+        if n < 3:
+            barrier.wait()  # Only passes if three items run at once
+        time.sleep(0.01 * (5 - n))
+        return n * n
+
+    got = list(sched.map(work, range(6), workers=3))
+    assert got == [(n, n * n) for n in range(6)]
+
+
+def test_fetch_iter_hands_errors_to_the_caller():
+    class Session:
+        def get(self, url, **kwargs):
+            if url.endswith("bad"):
+                raise ConnectionError(url)
+            return (url, kwargs["timeout"])
+
+    sched = FetchScheduler(default_interval=0)
+    urls = ["http://a/ok", "http://b/bad", "http://c/ok"]
+    got = list(sched.fetch_iter(Session(), urls, timeout=30))
+    assert [u for u, _ in got] == urls
+    assert got[0][1] == ("http://a/ok", 30)
+    assert isinstance(got[1][1], ConnectionError)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Tests for http_cache.py — conditional-request cache for the scrapers."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from http_cache import CachingSession, HTTPCache, cache_key
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self._content = content
+        self.headers = dict(headers or {})
+        self.encoding = "utf-8" if content else None
+
+    @property
+    def content(self):
+        return self._content
+
+
+class FakeServer:
+    """Answers like a server that honours If-None-Match."""
+
+    def __init__(self, body, etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append((url, dict(headers or {}), kwargs))
+        validators = {"ETag": self.etag} if self.etag else {}
+        if self.etag and (headers or {}).get("If-None-Match") == self.etag:
+            return FakeResponse(304, headers=validators)
+        return FakeResponse(200, self.body, {"Content-Type": "text/html", **validators})
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = HTTPCache(tmp_path / "http.db")
+    yield c
+    c.close()
+
+
+def test_unchanged_page_is_served_from_cache(cache):
+    server = FakeServer(b"<html>hello</html>")
+    session = CachingSession(server, cache)
+    first = session.get("https://a.com/p", timeout=30, headers={"User-Agent": "x"})
+    assert (first.from_cache, first.unchanged) == (False, False)
+
+    second = session.get("https://a.com/p", timeout=30, headers={"User-Agent": "x"})
+    assert server.requests[1][1] == {"User-Agent": "x", "If-None-Match": '"v1"'}
+    assert (second.status_code, second.content) == (200, b"<html>hello</html>")
+    assert (second.from_cache, second.unchanged) == (True, True)
+    assert second.headers["Content-Type"] == "text/html"
+
+    server.body, server.etag = b"<html>new</html>", '"v2"'
+    third = session.get("https://a.com/p", timeout=30)
+    assert (third.content, third.unchanged) == (b"<html>new</html>", False)
+
+
+def test_no_validators_keeps_only_the_hash(cache):
+    server = FakeServer(b"same body", etag=None)
+    session = CachingSession(server, cache)
+    session.get("https://b.com/")
+    again = session.get("https://b.com/")
+    assert "If-None-Match" not in server.requests[1][1]
+    assert (again.from_cache, again.unchanged) == (False, True)
+    assert cache.stats() == {"entries": 1, "with_body": 0, "body_bytes": 0}
+
+
+def test_params_are_part_of_the_key(cache):
+    server = FakeServer(b"page")
+    session = CachingSession(server, cache)
+    session.get("https://c.com/api", params={"page": 1})
+    assert not session.get("https://c.com/api", params={"page": 2}).from_cache
+    assert session.get("https://c.com/api", params={"page": 1}).from_cache
+    assert cache_key("https://c.com/api?x=1", {"page": 2}) == "https://c.com/api?x=1&page=2"
+
+
+def test_prune_drops_stale_entries(cache):
+    CachingSession(FakeServer(b"x"), cache).get("https://d.com/")
+    assert cache.prune(days=1) == 0
+    assert cache.prune(days=-1) == 1
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Tests for kb_compact.py — hash ledger and compaction phases."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import kb_compact
+from kb_compact import HashLedger, compute_hash, is_stub
+
+LONG = "A real article body about mastering and mixing. " * 10
+
+
+@pytest.fixture
+def kb(tmp_path, monkeypatch):
+    articles = tmp_path / "site" / "articles"
+    articles.mkdir(parents=True)
+    (articles / "a.md").write_text('---\nurl: "a"\n---\n' + LONG)
+    (articles / "b.md").write_text('---\nurl: "b"\n---\n' + LONG.upper() + "\n\n")  # Dup of a
+    (articles / "c.md").write_text("---\nurl: c\n---\nToo short.")
+    (articles / "d.md").write_text("")
+    (articles / "e.md").write_text("Another article entirely. " * 20)
+    monkeypatch.setattr(kb_compact, "KB_HASH_LEDGER", tmp_path / "ledger.db")
+    return articles
+
+
+def test_ledger_skips_unchanged_files(kb, monkeypatch):
+    files = sorted(kb.glob("*.md"))
+    ledger = HashLedger()
+    entries, hashed = ledger.scan(files, progress=False)
+    assert hashed == 5
+    assert entries[kb / "a.md"][1] == entries[kb / "b.md"][1] == compute_hash(kb / "a.md")
+    assert entries[kb / "c.md"][2] < kb_compact.MIN_CONTENT_LENGTH and is_stub(kb / "c.md")
+
+    assert ledger.scan(files, progress=False)[1] == 0
+    (kb / "e.md").write_text("Rewritten. " * 30)
+    os.utime(kb / "e.md", ns=(1, 1))
+    monkeypatch.setattr(kb_compact, "POOL_MIN_FILES", 1)  # Exercise the process pool
+    entries, hashed = ledger.scan(files[1:], workers=2, progress=False)
+    assert hashed == 1 and entries[kb / "e.md"][1] == compute_hash(kb / "e.md")
+    assert ledger.scan(files, progress=False)[1] == 1  # a.md was dropped from the ledger
+    ledger.close()
+
+
+def test_compact_uses_single_read_results(kb, monkeypatch):
+    monkeypatch.setattr(kb_compact, "find_all_articles", lambda: sorted(kb.glob("*.md")))
+    report = kb_compact.compact(dry_run=False)
+    assert (report.total_files, report.duplicates_removed) == (5, 1)
+    assert (report.stubs_removed, report.empty_removed) == (1, 1)
+    assert sorted(p.name for p in kb.glob("*.md")) == ["a.md", "e.md"]
+    assert kb_compact.compact(dry_run=True).total_files == 2
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Tests for kb_counter.py — incremental per-directory article counts."""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from kb_counter import KBCounter, kb_counts, kb_sources
+
+
+def _touch(path: Path, *names):
+    path.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        (path / name).write_text("x")
+
+
+def _age(root: Path, seconds=60):
+    """Backdate every directory so its mtime is no longer racy."""
+    past = time.time() - seconds
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, (past, past))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "kb"
+    _touch(root, "a.md", "b.md", "c.html", "notes.txt")
+    _touch(root / "sub", "d.md", ".hidden.md")
+    _touch(root / "sub" / "deep", "e.md", "f.html")
+    _touch(root / ".git" / "objects", "g.md")
+    _touch(tmp_path / "outside", "h.md", "i.md")
+    (root / "link").symlink_to(tmp_path / "outside")
+    _age(tmp_path)
+    return root
+
+
+def test_counts_match_find_semantics(tree, tmp_path):
+    counter = KBCounter(tmp_path / "snapshot.json")
+    assert counter.count(tree) == 5  # .git pruned, symlink not followed
+    assert counter.count(tree, exts=(".md", ".html")) == 7
+    assert counter.count(tree, max_depth=1) == 2
+    assert counter.count(tree, max_depth=2) == 4
+    assert counter.count(tree / "missing") == 0
+    assert counter.count_dirs(tree) == 1  # sub (not .git, not the symlink)
+
+
+def test_only_changed_directories_are_relisted(tree, tmp_path):
+    snapshot = tmp_path / "snapshot.json"
+    counter = KBCounter(snapshot)
+    assert counter.count(tree) == 5
+    first = counter.rescanned
+    assert first == 3
+
+    counter.save()
+    reloaded = KBCounter(snapshot)
+    assert reloaded.count(tree) == 5
+    assert reloaded.rescanned == 0  # Unchanged tree: stats only
+
+    _touch(tree / "sub" / "deep", "new.md")
+    _age(tree / "sub" / "deep")
+    assert reloaded.count(tree) == 6
+    assert reloaded.rescanned == 1
+
+    # A removed subtree is dropped from the snapshot
+    for name in ("e.md", "f.html", "new.md"):
+        (tree / "sub" / "deep" / name).unlink()
+    (tree / "sub" / "deep").rmdir()
+    _age(tree / "sub")
+    assert reloaded.count(tree) == 4
+    assert reloaded.stats()["dirs"] == 2
+
+
+def test_recently_modified_directory_is_relisted(tmp_path):
+    root = tmp_path / "fresh"
+    _touch(root, "a.md")
+    counter = KBCounter(tmp_path / "snapshot.json")
+    assert counter.count(root) == 1
+    _touch(root, "b.md")  # Possibly within the same timestamp tick
+    assert counter.count(root) == 2
+
+
+def test_kb_census_and_counts_file(tmp_path):
+    dev = tmp_path / "Development"
+    _touch(dev / "hormozi" / "articles", "1.md", "2.md", "3.md")
+    _touch(dev / "tiny", "1.md")
+    _touch(dev / "entropic", "1.md", "2.md", "3.md")  # KB_SKIP_DIRS
+    _touch(dev / "cto-leaders" / "will-larson", "1.md")
+    _touch(dev / "cto-leaders" / "empty")
+    _touch(tmp_path / "vault", "note.md")
+    _age(tmp_path)
+
+    counter = KBCounter(tmp_path / "snapshot.json")
+    sources = kb_sources(dev, counter)
+    assert [(s["name"], s["parent"], s["count"]) for s in sources] == [
+        ("Will Larson", "cto-leaders", 1),
+        ("Hormozi", None, 3),
+    ]
+
+    counts_file = tmp_path / "kb-counts.json"
+    census = kb_counts(dev, tmp_path / "vault", counter, counts_file)
+    assert (census["total"], census["vault"]) == (4, 1)
+    assert json.loads(counts_file.read_text())["total"] == 4
+    assert (tmp_path / "snapshot.json").exists()
+
+    stamp = counts_file.stat().st_mtime_ns
+    again = kb_counts(dev, tmp_path / "vault", counter, counts_file)
+    assert again == census
+    assert counts_file.stat().st_mtime_ns == stamp  # Unchanged: not rewritten
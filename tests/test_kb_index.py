@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Tests for kb_index.py — persistent inverted index behind KBLoader.search."""
+
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import kb_index
+import kb_loader
+from kb_index import KBIndex
+
+
+@pytest.fixture
+def kb_dir(tmp_path):
+    d = tmp_path / "source-a" / "articles"
+    d.mkdir(parents=True)
+    (d / "pricing.md").write_text("# Pricing\n\nPricing strategy and pricing pages.\n")
+    (d / "growth.md").write_text("# Growth\n\nProduct-led growth, usage based PRICING.\n")
+    (d / "design.md").write_text("# Design\n\nUsability heuristics.\n")
+    (d / ".hidden.md").write_text("pricing\n")
+    (d / "notes.txt").write_text("pricing\n")
+    return d
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = KBIndex(tmp_path / "index.db")
+    yield idx
+    idx.close()
+
+
+def test_lookup_substring_case_insensitive(index, kb_dir):
+    """Terms match any token containing them, like `rg -l -i`."""
+    index.refresh(kb_dir, force=True)
+    rows = {path: tf for path, tf, _length in index.lookup("pric", [kb_dir])}
+    assert set(rows) == {str(kb_dir / "pricing.md"), str(kb_dir / "growth.md")}
+    assert rows[str(kb_dir / "pricing.md")] == 3
+    assert index.lookup("usability", [kb_dir]) == [(str(kb_dir / "design.md"), 1, 3)]
+
+
+def test_hidden_and_non_markdown_skipped(index, kb_dir):
+    stats = index.refresh(kb_dir, force=True)
+    assert stats["added"] == 3
+
+
+def test_refresh_is_incremental(index, kb_dir):
+    index.refresh(kb_dir, force=True)
+    stats = index.refresh(kb_dir, force=True)
+    assert (stats["added"], stats["updated"], stats["removed"]) == (0, 0, 0)
+
+    (kb_dir / "design.md").unlink()
+    growth = kb_dir / "growth.md"
+    growth.write_text("Nothing about money here.\n")
+    os.utime(growth, ns=(time.time_ns(), time.time_ns() + 10**9))
+    stats = index.refresh(kb_dir, force=True)
+    assert (stats["added"], stats["updated"], stats["removed"]) == (0, 1, 1)
+    assert [row[0] for row in index.lookup("pricing", [kb_dir])] == [str(kb_dir / "pricing.md")]
+    assert index.lookup("usability", [kb_dir]) == []
+
+
+def test_corpus_stats_track_lengths(index, kb_dir):
+    index.refresh(kb_dir, force=True)
+    docs, avg_length = index.corpus_stats([kb_dir])
+    assert docs == 3
+    assert avg_length == pytest.approx((6 + 7 + 3) / 3)
+
+
+def test_refresh_throttled_until_stale(index, kb_dir):
+    index.refresh(kb_dir)
+    assert index.refresh(kb_dir)["skipped"] is True
+    index.refresh_seconds = 0
+    assert index.refresh(kb_dir)["skipped"] is False
+
+
+def test_punctuated_terms_not_indexable():
+    assert kb_index.is_indexable("pricing")
+    assert not kb_index.is_indexable("e-commerce")
+    assert not kb_index.is_indexable("c++")
+
+
+def test_search_ranking_matches_scan(tmp_path, kb_dir, monkeypatch):
+    """Indexed search returns the same scores as the grep fallback."""
+    (kb_dir / ".hidden.md").unlink()  # grep (unlike rg) doesn't skip dotfiles
+    monkeypatch.setattr(kb_index, "KB_INDEX_PATH", tmp_path / "loader-index.db")
+    config = {
+        "name": "Test",
+        "source": "Test",
+        "article_dirs": [kb_dir],
+        "index_dir": None,
+        "pattern": "*.md",
+        "article_count": 3,
+        "excerpt_lines": 5,
+    }
+    indexed = kb_loader.KBLoader()
+    indexed.advisors = {"test": config}
+    indexed.aliases = {"test": "test"}
+
+    scanned = kb_loader.KBLoader()
+    scanned.advisors = indexed.advisors
+    scanned.aliases = indexed.aliases
+    scanned._index = False
+
+    query = "pricing growth"
+    a = [(r["path"], r["relevance_score"]) for r in indexed.search("test", query)]
+    b = [(r["path"], r["relevance_score"]) for r in scanned.search("test", query)]
+    assert a and sorted(a) == sorted(b)
+
+
+def _loader_for(article_dir):
+    loader = kb_loader.KBLoader()
+    loader.advisors = {
+        "test": {
+            "name": "Test",
+            "source": "Test",
+            "article_dirs": [article_dir],
+            "index_dir": None,
+            "pattern": "*.md",
+            "article_count": 3,
+            "excerpt_lines": 5,
+        }
+    }
+    loader.aliases = {"test": "test"}
+    return loader
+
+
+def test_bm25_prefers_short_focused_articles(tmp_path, monkeypatch):
+    """A long transcript mentioning the terms once loses to a short precise article."""
+    monkeypatch.setattr(kb_index, "KB_INDEX_PATH", tmp_path / "bm25-index.db")
+    d = tmp_path / "articles"
+    d.mkdir()
+    filler = " ".join(f"word{i}" for i in range(2000))
+    (d / "transcript.md").write_text(f"# Episode\n\nreverb and delay. {filler}\n")
+    (d / "focused.md").write_text("# Reverb\n\nReverb design: reverb tails, reverb density, delay.\n")
+    (d / "other.md").write_text("# Compressors\n\nAttack and release.\n")
+
+    loader = _loader_for(d)
+    weighted = loader.search("test", "reverb delay", ranking="weighted")
+    bm25 = loader.search("test", "reverb delay", ranking="bm25")
+    assert weighted[0]["relevance_score"] == weighted[1]["relevance_score"]
+    assert bm25[0]["path"] == str(d / "focused.md")
+    assert bm25[0]["relevance_score"] > bm25[1]["relevance_score"]
+
+
+def test_lookup_exact_tf_keeps_substring_candidates(index, kb_dir):
+    index.refresh(kb_dir, force=True)
+    substring = dict((path, tf) for path, tf, _length in index.lookup("pric", [kb_dir]))
+    exact = dict((path, tf) for path, tf, _length in index.lookup("pric", [kb_dir], exact_tf=True))
+    assert set(exact) == set(substring)
+    assert set(exact.values()) == {0}
+
+
+def test_bm25_counts_whole_tokens_not_substrings(tmp_path, monkeypatch):
+    """The term "ai" inside "said"/"maintain" neither inflates df nor adds tf."""
+    monkeypatch.setattr(kb_index, "KB_INDEX_PATH", tmp_path / "bm25-exact.db")
+    d = tmp_path / "articles"
+    d.mkdir()
+    (d / "ai.md").write_text("ai tools here\n")
+    (d / "said.md").write_text("said maintain said maintain\n")
+    for i in range(3):
+        (d / f"other{i}.md").write_text("some unrelated words\n")
+
+    loader = _loader_for(d)
+    index = loader._get_index()
+    index.refresh(d, force=True)
+    postings = loader._find_term_matches("ai", [d], index, exact_tf=True)
+    scores = loader._bm25_term_scores(postings, 5, 3.4)
+    # df = 1 of 5 documents, tf = 1 in a 3-token article
+    idf = math.log(1 + (5 - 1 + 0.5) / (1 + 0.5))
+    norm = kb_loader.BM25_K1 * (1 - kb_loader.BM25_B + kb_loader.BM25_B * 3 / 3.4)
+    assert scores == {
+        str(d / "ai.md"): pytest.approx(idf * (kb_loader.BM25_K1 + 1) / (1 + norm)),
+        str(d / "said.md"): 0.0,  # Still a candidate, like rg -i
+    }
+    assert loader.search("test", "ai", ranking="bm25")[0]["path"] == str(d / "ai.md")
+
+
+def test_unknown_ranking_rejected():
+    with pytest.raises(ValueError):
+        kb_loader.KBLoader().search("lenny", "pricing", ranking="tfidf")
+
+
+def test_article_meta_cached_until_file_changes(tmp_path, kb_dir, monkeypatch):
+    """Warm searches take recency year + excerpt from the cache, not the file."""
+    monkeypatch.setattr(kb_index, "KB_INDEX_PATH", tmp_path / "meta-index.db")
+    (kb_dir / "pricing.md").write_text("---\ntitle: Pricing\ndate: 2021-03-01\n---\nPricing pages.\n")
+    loader = _loader_for(kb_dir)
+    cold = loader.search("test", "pricing")
+
+    parses = []
+    original = kb_loader.KBLoader._parse_article
+    monkeypatch.setattr(
+        kb_loader.KBLoader,
+        "_parse_article",
+        staticmethod(lambda path, n: parses.append(path) or original(path, n)),
+    )
+    warm = loader.search("test", "pricing")
+    assert warm == cold
+    assert parses == []
+
+    meta = loader._get_article_meta(str(kb_dir / "pricing.md"), 5)
+    assert (meta["title"], meta["year"]) == ("Pricing", 2021)
+
+    target = kb_dir / "pricing.md"
+    target.write_text("---\ntitle: Pricing v2\n---\nPricing pages.\n")
+    os.utime(target, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert loader._read_article(str(target), 5)["title"] == "Pricing v2"
+    assert parses == [str(target)]
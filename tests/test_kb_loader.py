@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Tests for kb_loader.py — multi-advisor consults."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import kb_index
+import kb_loader
+
+
+def _config(name, article_dir):
+    return {
+        "name": name,
+        "source": name,
+        "article_dirs": [article_dir],
+        "index_dir": None,
+        "pattern": "*.md",
+        "article_count": 100,
+        "excerpt_lines": 5,
+    }
+
+
+@pytest.fixture
+def loader(tmp_path, monkeypatch):
+    monkeypatch.setattr(kb_index, "KB_INDEX_PATH", tmp_path / "index.db")
+    for name in ("alpha", "beta"):
+        d = tmp_path / name / "articles"
+        d.mkdir(parents=True)
+        for i in range(3):
+            (d / f"{name}-{i}.md").write_text(f"# {name} {i}\n\nPricing notes from {name}.\n")
+    kb = kb_loader.KBLoader()
+    kb.advisors = {
+        "alpha": _config("Alpha", tmp_path / "alpha" / "articles"),
+        "beta": _config("Beta", tmp_path / "beta" / "articles"),
+    }
+    kb.aliases = {"alpha": "alpha", "a": "alpha", "beta": "beta"}
+    return kb
+
+
+def test_get_context_many_merges_in_caller_order(loader):
+    merged = loader.get_context_many(["beta", "alpha", "nobody"], "pricing")
+    blocks = merged.split("\n\n---\n\n")
+    assert len(blocks) == 3
+    assert "Knowledge Base Context: Beta" in blocks[0]
+    assert "Knowledge Base Context: Alpha" in blocks[1]
+    assert blocks[2] == "[No knowledge base found for advisor: nobody]"
+
+
+def test_get_context_many_expands_once_and_runs_concurrently(loader, monkeypatch):
+    expansions = []
+    original = kb_loader.KBLoader._expand_query_terms
+    monkeypatch.setattr(
+        kb_loader.KBLoader,
+        "_expand_query_terms",
+        staticmethod(lambda q: expansions.append(q) or original(q)),
+    )
+    # Both searches must be in flight at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    original_search = loader.search
+
+    def tracking_search(*args, **kwargs):
+        barrier.wait()
+        return original_search(*args, **kwargs)
+
+    loader.search = tracking_search
+    merged = loader.get_context_many(["alpha", "beta"], "pricing")
+    assert expansions == ["pricing"]
+    assert "Alpha" in merged and "Beta" in merged
+
+
+def test_get_context_many_dedupes_aliases_and_splits_budget(loader):
+    merged = loader.get_context_many(["alpha", "a"], "pricing", max_tokens=100)
+    assert merged.count("Knowledge Base Context: Alpha") == 1
+    # Whole 100-token budget goes to the single distinct advisor
+    assert len(merged) <= 100 * 4 + 200
+
+
+@pytest.fixture
+def daemon(loader, tmp_path):
+    import kb_daemon
+
+    sock = tmp_path / "kb.sock"
+    source = tmp_path / "kb_loader_stub.py"
+    source.write_text("# stands in for kb_loader.py\n")
+    server = kb_daemon.make_server(loader, sock, source_files=[source])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield sock, source, server
+    server.shutdown()
+    server.server_close()
+
+
+def test_daemon_round_trip_matches_in_process(loader, daemon):
+    import kb_daemon
+
+    sock, _source, _server = daemon
+    assert kb_daemon.request("ping", socket_path=sock)["pid"] > 0
+    remote = kb_daemon.request("context", socket_path=sock, advisor="alpha", query="pricing")
+    assert remote == loader.get_context("alpha", "pricing")
+    hits = kb_daemon.request("search", socket_path=sock, advisor="beta", query="pricing")
+    assert [h["path"] for h in hits] == [r["path"] for r in loader.search("beta", "pricing")]
+
+
+def test_daemon_errors_and_absence_fall_back_to_none(tmp_path, daemon):
+    import kb_daemon
+
+    sock, _source, _server = daemon
+    assert kb_daemon.request("explode", socket_path=sock) is None
+    assert kb_daemon.request("ping", socket_path=tmp_path / "missing.sock") is None
+    with pytest.raises(RuntimeError):
+        kb_daemon.make_server(None, sock)
+
+
+def test_daemon_stops_serving_when_source_changes(daemon):
+    import os
+    import kb_daemon
+
+    sock, source, server = daemon
+    os.utime(source, (1, 1))
+    assert kb_daemon.request("ping", socket_path=sock) is None
+    assert server.stale
+
+
+def test_daemon_watches_every_local_module():
+    import kb_daemon
+    import kb_index
+    import kb_loader
+
+    sources = kb_daemon.local_sources()
+    for module in (kb_daemon, kb_index, kb_loader):
+        assert Path(module.__file__).resolve() in sources
+    assert all(p.parent == Path(kb_daemon.__file__).resolve().parent for p in sources)
+
+
+def test_daemon_restarts_itself_after_a_source_change(loader, tmp_path, monkeypatch):
+    import os
+    import kb_daemon
+
+    sock = tmp_path / "kb.sock"
+    watched = [tmp_path / "kb_loader_stub.py", tmp_path / "kb_index_stub.py"]
+    for path in watched:
+        path.write_text("# stub\n")
+    execs = []
+    monkeypatch.setattr(kb_daemon, "KB_DAEMON_RESTART_DELAY", 0)
+    monkeypatch.setattr(kb_daemon.os, "execv", lambda exe, argv: execs.append(argv))
+    monkeypatch.setattr(kb_daemon.signal, "signal", lambda *a: None)  # Not main thread
+
+    argv = ["python3", "kb_loader.py", "serve"]
+    thread = threading.Thread(target=kb_daemon.serve, args=(loader, sock, watched, argv), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if kb_daemon.request("ping", socket_path=sock):
+            break
+        time.sleep(0.05)
+    os.utime(watched[1], (1, 1))  # Not kb_loader.py: the index module
+    assert kb_daemon.request("ping", socket_path=sock) is None
+    thread.join(5)
+    assert execs == [argv]
+    assert not sock.exists()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Tests for kb_near_dup.py — MinHash/LSH near-duplicate clusters."""
+
+import os
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from kb_near_dup import NearDupIndex, lsh_shape, minhash, similarity
+
+
+def _article(rng, words=800):
+    vocab = [f"term{i}" for i in range(5000)]
+    return " ".join(rng.choice(vocab) for _ in range(words))
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = NearDupIndex(tmp_path / "minhash.db")
+    yield idx
+    idx.close()
+
+
+def test_signature_similarity_tracks_jaccard():
+    rng = random.Random(7)
+    body = _article(rng)
+    rescrape = "Updated June 2026\n\n" + body + "\n\nShare this post. Subscribe for weekly updates."
+    assert minhash(body) == minhash(body.upper().replace(" ", "\n  "))  # Case/whitespace
+    assert similarity(minhash(body), minhash(rescrape)) >= 0.9
+    assert similarity(minhash(body), minhash(_article(rng))) < 0.1
+    assert minhash("   ") is None
+    bands, rows = lsh_shape(0.8)
+    assert bands * rows == 128 and (1 / bands) ** (1 / rows) < 0.8
+
+
+def test_clusters_and_incremental_signing(index, tmp_path):
+    rng = random.Random(11)
+    articles = tmp_path / "site" / "articles"
+    articles.mkdir(parents=True)
+    body = _article(rng)
+    (articles / "0001-post.md").write_text('---\nurl: "a"\n---\n' + body)
+    (articles / "0002-post-rescrape.md").write_text(
+        '---\nurl: "a?utm=1"\n---\nPosted 3 days ago\n' + body + "\nFollow us on Twitter"
+    )
+    (articles / "0003-other.md").write_text(_article(rng))
+    paths = sorted(articles.glob("*.md"))
+
+    assert index.update(paths) == 3
+    assert index.clusters(0.8) == [paths[:2]]
+
+    # Unchanged files are not re-read; an edited one is
+    assert index.update(paths) == 0
+    (articles / "0003-other.md").write_text(body + " one more line")
+    os.utime(articles / "0003-other.md", ns=(1, 1))
+    assert index.update(paths) == 1
+    assert index.clusters(0.8) == [paths]
+    assert index.stats() == {"files": 3, "signed": 3}
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Tests for knowledge_db.py — per-article and bulk sync paths."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from knowledge_db import FTS_TRIGGERS, KnowledgeDB, sync_from_yaml
+
+
+def _write(path, title, tags, body):
+    path.write_text(
+        f"---\ntitle: {title}\nauthor: Ann\ndate_published: 2026-01-02\ntags: [{', '.join(tags)}]\n"
+        f"topics: [music]\n---\n{body}\n",
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture
+def kb(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    _write(src / "a.md", "Mixing", ["audio", "eq"], "How to mix vocals with reverb")
+    _write(src / "b.md", "Mastering", ["audio"], "Loudness targets for streaming")
+    (src / "c.md").write_text("# Pricing\n**Author:** Bo\n---\nCharge more for sync licensing\n")
+    (src / "README.md").write_text("# Readme\n")
+    (src / "bad.md").write_text("---\ntitle: [unclosed\n---\nbody\n")
+    return src
+
+
+def _snapshot(db):
+    rows = db.conn.execute(
+        "SELECT file_path, title, author, source, skill, date_published, content FROM articles ORDER BY file_path"
+    ).fetchall()
+    tags = dict(db.conn.execute("SELECT tag, count FROM tags").fetchall())
+    topics = dict(db.conn.execute("SELECT topic, count FROM topics").fetchall())
+    return [tuple(r) for r in rows], tags, topics
+
+
+def test_bulk_matches_per_article_sync(kb, tmp_path):
+    serial = KnowledgeDB(tmp_path / "serial.db")
+    assert sync_from_yaml(kb, serial, source_hint="s", skill_hint="k") == (3, 1)
+    bulk = KnowledgeDB(tmp_path / "bulk.db")
+    assert sync_from_yaml(kb, bulk, source_hint="s", skill_hint="k", bulk=True, workers=2) == (3, 1)
+
+    assert _snapshot(bulk) == _snapshot(serial)
+    assert [r["title"] for r in bulk.search("reverb")] == ["Mixing"]
+    assert [r["title"] for r in bulk.search("licensing")] == ["Pricing"]
+    triggers = {r[0] for r in bulk.conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    assert triggers == set(FTS_TRIGGERS)
+    serial.close()
+    bulk.close()
+
+
+def test_bulk_resync_skips_unchanged_and_updates_in_place(kb, tmp_path):
+    db = KnowledgeDB(tmp_path / "kb.db")
+    sync_from_yaml(kb, db, bulk=True, workers=1)
+    ids = dict(db.conn.execute("SELECT file_path, id FROM articles").fetchall())
+
+    assert db.bulk_load(iter([])) == {"new": 0, "changed": 0, "unchanged": 0}
+
+    _write(kb / "a.md", "Mixing", ["eq"], "How to mix vocals with delay")  # Changed: tags + body
+    _write(kb / "d.md", "Drums", ["audio"], "Tuning snares")
+    assert sync_from_yaml(kb, db, bulk=True, workers=1) == (4, 1)
+    assert dict(db.conn.execute("SELECT file_path, id FROM articles").fetchall())[str(kb / "a.md")] == ids[str(kb / "a.md")]
+    assert dict(db.conn.execute("SELECT tag, count FROM tags").fetchall()) == {"audio": 2, "eq": 1}
+    assert [r["title"] for r in db.search("delay")] == ["Mixing"]
+    assert db.search("reverb") == []
+    db.close()
+
+
+def test_deferred_fts_rebuild_runs_once_after_several_loads(kb, tmp_path):
+    other = tmp_path / "other"
+    other.mkdir()
+    _write(other / "x.md", "Synths", ["modular"], "Patching oscillators")
+    db = KnowledgeDB(tmp_path / "kb.db")
+    rebuilds = []
+    db.conn.set_trace_callback(lambda sql: "'rebuild'" in sql and rebuilds.append(sql))
+
+    sync_from_yaml(kb, db, bulk=True, workers=1, rebuild_fts=False)
+    sync_from_yaml(other, db, bulk=True, workers=1, rebuild_fts=False)
+    assert rebuilds == []
+    assert db.conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0] == 0
+    db.rebuild_fts()
+    db.rebuild_fts()  # Triggers already back: nothing to do
+    assert len(rebuilds) == 1
+    assert [r["title"] for r in db.search("oscillators")] == ["Synths"]
+    db.close()
+
+    # A deferred load that never reached rebuild_fts() is repaired on open
+    sync_from_yaml(other, KnowledgeDB(tmp_path / "crash.db"), bulk=True, workers=1, rebuild_fts=False)
+    db = KnowledgeDB(tmp_path / "crash.db")
+    assert [r["title"] for r in db.search("oscillators")] == ["Synths"]
+    db.close()
+
+
+def test_search_matches_denormalized_tags_without_joins(kb, tmp_path):
+    db = KnowledgeDB(tmp_path / "kb.db")
+    sync_from_yaml(kb, db, bulk=True, workers=1)
+    hit = db.search("eq")  # Only in a.md's tags
+    assert [r["title"] for r in hit] == ["Mixing"] and hit[0]["tags"] == "audio,eq"
+    assert {r["title"] for r in db.search("audio", filters={"skill": ""})} == {"Mixing", "Mastering"}
+
+    # Title weight outranks a body-only mention
+    db.add_article(kb / "e.md", {"title": "Notes", "author": "Cy"}, "mastering " * 3)
+    assert db.search("mastering")[0]["title"] == "Mastering"
+
+    # Re-adding keeps the id and leaves no stale FTS row behind
+    first = db.add_article(kb / "e.md", {"title": "Notes", "author": "Cy"}, "compression")
+    assert db.add_article(kb / "e.md", {"title": "Notes", "author": "Cy"}, "limiting") == first
+    assert db.search("compression") == []
+    plan = " ".join(r[3] for r in db.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM articles WHERE skill = 'k' ORDER BY date_published DESC"
+    ))
+    assert "idx_skill_date" in plan and "TEMP B-TREE" not in plan
+    db.close()
+
+
+def test_readding_article_replaces_its_tag_links(tmp_path):
+    db = KnowledgeDB(tmp_path / "kb.db")
+    first = db.add_article(Path("/a.md"), {"title": "A", "tags": ["alpha", "beta"]}, "body")
+    assert db.add_article(Path("/a.md"), {"title": "A", "tags": ["alpha"]}, "body") == first
+    db.add_article(Path("/a.md"), {"title": "A", "tags": ["alpha"]}, "body")
+
+    linked = [r[0] for r in db.conn.execute(
+        "SELECT t.tag FROM article_tags at JOIN tags t ON at.tag_id = t.id WHERE at.article_id = ?",
+        (first,))]
+    assert linked == ["alpha"]
+    assert db.conn.execute("SELECT tags FROM articles WHERE id = ?", (first,)).fetchone()[0] == "alpha"
+    assert dict(db.conn.execute("SELECT tag, count FROM tags").fetchall()) == {"alpha": 1, "beta": 0}
+    db.close()
+
+
+def test_scalar_tags_link_the_same_on_both_sync_paths(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.md").write_text("---\ntitle: A\ntags: foo\ntopics: [music, music]\n---\nbody\n")
+    serial = KnowledgeDB(tmp_path / "serial.db")
+    sync_from_yaml(src, serial)
+    bulk = KnowledgeDB(tmp_path / "bulk.db")
+    sync_from_yaml(src, bulk, bulk=True, workers=1)
+
+    assert _snapshot(serial)[1:] == _snapshot(bulk)[1:] == ({"foo": 1}, {"music": 1})
+    assert serial.conn.execute("SELECT tags FROM articles").fetchone()[0] == "foo"
+    serial.close()
+    bulk.close()
+
+
+def test_v1_database_is_migrated(tmp_path):
+    import sqlite3
+
+    # Schema and triggers exactly as the pre-v2 KnowledgeDB created them
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE articles (id INTEGER PRIMARY KEY AUTOINCREMENT, file_path TEXT UNIQUE NOT NULL,
+            file_hash TEXT NOT NULL, title TEXT NOT NULL, author TEXT NOT NULL, source TEXT NOT NULL,
+            source_url TEXT, skill TEXT NOT NULL, date_published TEXT, date_scraped TEXT,
+            date_analyzed TEXT, date_indexed TEXT, type TEXT, content TEXT NOT NULL, word_count INTEGER,
+            domain_metadata TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE tags (id INTEGER PRIMARY KEY AUTOINCREMENT, tag TEXT UNIQUE NOT NULL, count INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE article_tags (article_id INTEGER, tag_id INTEGER, PRIMARY KEY (article_id, tag_id));
+        CREATE TABLE topics (id INTEGER PRIMARY KEY AUTOINCREMENT, topic TEXT UNIQUE NOT NULL,
+            count INTEGER DEFAULT 1, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE article_topics (article_id INTEGER, topic_id INTEGER, PRIMARY KEY (article_id, topic_id));
+        CREATE VIRTUAL TABLE articles_fts USING fts5(title, author, content, tags, topics,
+            content='articles', content_rowid='id');
+        CREATE TRIGGER articles_ai AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts(rowid, title, author, content, tags, topics)
+            VALUES (new.id, new.title, new.author, new.content, '', '');
+        END;
+        CREATE TRIGGER articles_ad AFTER DELETE ON articles BEGIN
+            DELETE FROM articles_fts WHERE rowid = old.id;
+        END;
+        CREATE TRIGGER articles_au AFTER UPDATE ON articles BEGIN
+            UPDATE articles_fts SET title = new.title, author = new.author, content = new.content
+            WHERE rowid = new.id;
+        END;
+        CREATE INDEX idx_source ON articles(source);
+        INSERT OR REPLACE INTO articles (file_path, file_hash, title, author, source, skill, content)
+            VALUES ('/a.md', 'h', 'Old', 'Ann', 's', 'k', 'legacy body');
+        INSERT INTO tags (tag) VALUES ('vintage');
+        INSERT INTO article_tags VALUES (1, 1);
+        INSERT INTO topics (topic) VALUES ('saas');
+        INSERT INTO article_topics VALUES (1, 1);
+    """)
+    conn.commit()
+    conn.close()
+
+    db = KnowledgeDB(path)
+    assert [(r["title"], r["tags"]) for r in db.search("vintage")] == [("Old", "vintage")]
+    assert [r["topics"] for r in db.search("saas")] == ["saas"]
+    assert [r["title"] for r in db.search("legacy")] == ["Old"]
+    assert db.conn.execute("PRAGMA user_version").fetchone()[0] == 2
+    assert db.conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    db.close()
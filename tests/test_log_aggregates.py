@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Tests for log_aggregates.py — tail-following delegation log aggregates."""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from log_aggregates import (
+    AuditLogAggregator,
+    EvalLogAggregator,
+    tokens_saved_since,
+    value_counts,
+)
+
+AUDIT_LINES = [
+    "[2026-03-01 10:00:00] action=prefetch_template:summarize model=gemini exec=gemini prefetch=OK latency=80ms",
+    "[2026-03-01 10:05:00] action=advise model=claude tone=none latency=400ms",
+    "[2026-03-02 09:00:00] action=prefetch_template:summarize model=gemini exec=ollama prefetch=FAIL source=skill:research latency=12000ms",
+    "[2026-03-02 09:30:00] model=ollama exec=ollama prefetch=OK source=skill:research tone=direct",
+]
+
+
+def _append(path: Path, text: str):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_audit_folds_only_appended_whole_lines(tmp_path):
+    log = tmp_path / "audit.log"
+    state = tmp_path / "audit.json"
+    _append(log, "\n".join(AUDIT_LINES[:2]) + "\n" + AUDIT_LINES[2][:30])
+
+    agg = AuditLogAggregator(log, state).refresh()
+    assert agg["lines"] == 2  # Half-written third line waits
+    assert json.loads(state.read_text())["offset"] == log.read_bytes().rfind(b"\n") + 1
+
+    _append(log, AUDIT_LINES[2][30:] + "\n\n" + AUDIT_LINES[3] + "\n")
+    agg = AuditLogAggregator(log, state).refresh()  # Fresh instance: resumes from state
+    assert agg["lines"] == 4
+    assert agg["prefetched"] == 2
+    assert agg["counts"]["model"] == {"gemini": 2, "claude": 1, "ollama": 1}
+    assert value_counts(agg, "action", missing="unknown") == {
+        "prefetch_template:summarize": 2, "advise": 1, "unknown": 1,
+    }
+    assert agg["templates"] == {"summarize": {"calls": 2, "ok": 1}}
+    assert agg["prefetched_by_source"] == {"skill:research": 1}
+    assert agg["latency"] == {
+        "count": 3, "sum": 12480, "hist": {"100": 1, "500": 1, "inf": 1},
+    }
+    assert agg["by_date"] == {
+        "2026-03-01": {"lines": 2, "prefetched": 1},
+        "2026-03-02": {"lines": 2, "prefetched": 1},
+    }
+
+
+def test_truncated_or_replaced_log_is_refolded(tmp_path):
+    log = tmp_path / "audit.log"
+    aggregator = AuditLogAggregator(log, tmp_path / "audit.json")
+    _append(log, "\n".join(AUDIT_LINES) + "\n")
+    assert aggregator.refresh()["lines"] == 4
+
+    log.write_text(AUDIT_LINES[0] + "\n")  # Truncated in place
+    assert aggregator.refresh()["lines"] == 1
+
+    replacement = tmp_path / "audit.log.new"
+    replacement.write_text("\n".join(AUDIT_LINES[:3]) + "\n")
+    os.replace(replacement, log)  # Rotated: new inode
+    assert aggregator.refresh()["lines"] == 3
+
+    log.unlink()
+    assert aggregator.refresh()["lines"] == 0
+
+
+def test_eval_log_dates_and_session_window(tmp_path):
+    log = tmp_path / "eval.jsonl"
+    now = datetime.now()
+    old = (now - timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%S")
+    recent = [(now - timedelta(hours=h)).strftime("%Y-%m-%dT%H:%M:%S") for h in (3, 1)]
+    rows = [
+        {"ts": old, "category": "summarize", "success": True, "est_tokens_saved": 1000},
+        {"ts": recent[0], "category": "summarize", "success": False, "est_tokens_saved": 0},
+        {"ts": recent[1], "category": "extract", "success": True, "est_tokens_saved": 2500},
+    ]
+    _append(log, "\n".join(json.dumps(r) for r in rows) + "\nnot json\n")
+
+    agg = EvalLogAggregator(log, tmp_path / "eval.json").refresh()
+    assert (agg["calls"], agg["success"], agg["tokens_saved"]) == (3, 2, 3500)
+    assert agg["bad_lines"] == 1
+    assert agg["by_category"] == {"summarize": 2, "extract": 1}
+    assert agg["by_date"][old[:10]] == {"calls": 1, "success": 1, "tokens_saved": 1000}
+    assert len(agg["recent"]) == 2  # Older than RECENT_DAYS: dated buckets only
+    assert tokens_saved_since(agg, recent[1]) == (2500, 1)
+    assert tokens_saved_since(agg, recent[0]) == (2500, 2)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Tests for rule_engine.py — compiled rules snapshot and candidate index."""
+
+import os
+import random
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import rule_engine
+
+
+@pytest.fixture(autouse=True)
+def isolate(tmp_path, monkeypatch):
+    rules_copy = tmp_path / "rules.yaml"
+    shutil.copy(rule_engine.RULES_PATH, rules_copy)
+    monkeypatch.setattr(rule_engine, "RULES_PATH", rules_copy)
+    monkeypatch.setattr(rule_engine, "STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr(rule_engine, "COMPILED_PATH", tmp_path / "compiled.pickle")
+    rule_engine.clear_cache()
+    yield
+    rule_engine.clear_cache()
+
+
+def _full_scan(rules, domain, tool):
+    scored = [(r, rule_engine.score_rule(r, domain, tool)) for r in rules.values()]
+    scored = [(r, s) for r, s in scored if s >= rule_engine.THRESHOLD]
+    scored.sort(
+        key=lambda x: (x[1], rule_engine.domain_specificity(x[0], domain)), reverse=True
+    )
+    return [(r.id, s) for r, s in scored]
+
+
+def test_compiled_snapshot_skips_yaml_on_warm_load(monkeypatch):
+    rules = rule_engine.load_rules()
+    assert rules and rule_engine.COMPILED_PATH.exists()
+
+    rule_engine.clear_cache()
+    monkeypatch.setattr(
+        rule_engine.yaml, "safe_load", lambda *_: pytest.fail("YAML reparsed")
+    )
+    assert list(rule_engine.load_rules()) == list(rules)
+    assert rule_engine.classify_prompt("git commit the fix")[0] == "git"
+
+
+def test_snapshot_rebuilt_when_rules_yaml_changes():
+    rule_engine.load_rules()
+    text = rule_engine.RULES_PATH.read_text()
+    rule_engine.RULES_PATH.write_text(text.replace('name: "Code > Tokens"', 'name: "Code Over Tokens"'))
+    st = rule_engine.RULES_PATH.stat()
+    os.utime(rule_engine.RULES_PATH, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    rule_engine.clear_cache()
+    assert rule_engine.load_rules()["R5"].name == "Code Over Tokens"
+
+
+def test_candidate_scoring_identical_to_full_scan():
+    rules = rule_engine.load_rules()
+    rng = random.Random(7)
+    domains = sorted(rule_engine.VALID_DOMAINS)
+    tools = sorted({t for r in rules.values() for t in r.tool_triggers} | {"read"})
+    for _ in range(20):
+        for r in rules.values():
+            r.adaptive_spike = rng.choice([0.0, 0.05, rule_engine.SPIKE_CAP, rule_engine.IMMUNE_SPIKE])
+            r.dormant = rng.random() < 0.1
+        for domain in domains:
+            for tool in tools:
+                candidates = rule_engine.candidate_rules(rules, domain, tool)
+                got = [(r, rule_engine.score_rule(r, domain, tool)) for r in candidates]
+                got = [(r, s) for r, s in got if s >= rule_engine.THRESHOLD]
+                got.sort(
+                    key=lambda x: (x[1], rule_engine.domain_specificity(x[0], domain)),
+                    reverse=True,
+                )
+                assert [(r.id, s) for r, s in got] == _full_scan(rules, domain, tool)
+
+
+def test_candidate_rules_falls_back_for_foreign_dicts():
+    rules = dict(rule_engine.load_rules())
+    assert len(rule_engine.candidate_rules(rules, "git", "bash")) == len(rules)
+
+
+def _log_lines():
+    return rule_engine._state_log_path().read_text().splitlines()
+
+
+def test_activation_appends_one_event_not_a_snapshot():
+    rule_engine.save_state({"rules": {}})
+    snapshot = rule_engine.STATE_PATH.read_text()
+    activated = rule_engine.get_relevant_rules("git commit and push the fix")
+    assert activated
+    assert rule_engine.STATE_PATH.read_text() == snapshot
+    assert len(_log_lines()) == 2  # header + one event
+
+    state = rule_engine.load_state()
+    for r in activated:
+        assert state["rules"][r["id"]]["activation_count"] == 1
+
+
+def test_replay_matches_full_rewrite():
+    rule_engine.save_state({"rules": {}})
+    for prompt in ("git commit", "refactor the python module", "git push"):
+        rule_engine.get_relevant_rules(prompt)
+    rule_engine.record_violation("R4", "self_check")
+    rule_engine.record_violation("R4", "audit")
+    replayed = rule_engine.load_state()
+    assert len(_log_lines()) == 6
+
+    rule_engine.compact_state()
+    assert len(_log_lines()) == 1
+    compacted = rule_engine.load_state()
+    for state in (replayed, compacted):
+        state.pop("epoch")
+        state.pop("_log_offset")
+    assert compacted == replayed
+    assert replayed["rules"]["R4"]["adaptive_spike"] == pytest.approx(
+        rule_engine.SPIKE_AMOUNT["self_check"] + rule_engine.SPIKE_AMOUNT["audit"]
+    )
+
+
+def test_save_state_keeps_events_appended_after_load():
+    rule_engine.save_state({"rules": {}})
+    loaded = rule_engine.load_state()
+    rule_engine.record_violation("R4", "hook")  # Concurrent session
+    loaded["last_decay"] = "2026-01-01"
+    rule_engine.save_state(loaded)
+    state = rule_engine.load_state()
+    assert state["last_decay"] == "2026-01-01"
+    assert state["rules"]["R4"]["adaptive_spike"] == rule_engine.SPIKE_AMOUNT["hook"]
+
+
+def test_log_compacts_past_size_cap_and_ignores_stale_epochs(monkeypatch):
+    rule_engine.save_state({"rules": {}})
+    monkeypatch.setattr(rule_engine, "STATE_LOG_COMPACT_BYTES", 1)
+    rule_engine.record_violation("R4", "hook")
+    assert len(_log_lines()) == 1
+    assert rule_engine.load_state()["rules"]["R4"]["adaptive_spike"] > 0
+
+    # A snapshot written by hand (no epoch) must not pick up the old log
+    monkeypatch.setattr(rule_engine, "STATE_LOG_COMPACT_BYTES", 1 << 20)
+    rule_engine.record_violation("R4", "hook")
+    rule_engine.STATE_PATH.write_text('{"rules": {}}')
+    assert rule_engine.load_state()["rules"] == {}
+
+
+def _legacy_co_activation(co_act, non_universal, activated_ids, rules):
+    """Reference: the string-keyed update CoActivation replaced."""
+    for i, r1 in enumerate(non_universal):
+        for r2 in non_universal[i + 1 :]:
+            key = f"{r1}:{r2}"
+            co_act.setdefault(key, {"both": 0, "either": 0})
+            co_act[key]["both"] += 1
+            co_act[key]["either"] += 1
+    for r_id in non_universal:
+        for other_id in rules:
+            if (
+                other_id != r_id
+                and other_id not in activated_ids
+                and "all" not in rules[other_id].domains
+            ):
+                key = ":".join(sorted([r_id, other_id]))
+                if key in co_act:
+                    co_act[key]["either"] += 1
+
+
+def test_co_activation_matches_string_keyed_counts():
+    rules = rule_engine.load_rules()
+    non_universal = [rid for rid, r in rules.items() if "all" not in r.domains]
+    rng = random.Random(11)
+    legacy = {":".join(sorted(["R_GONE", non_universal[0]])): {"both": 3, "either": 4}}
+    co = rule_engine.CoActivation.from_state(legacy, rules)
+    for _ in range(200):
+        ids = sorted(rng.sample(non_universal, rng.randint(0, 4)))
+        _legacy_co_activation(legacy, ids, set(ids), rules)
+        co.record(ids)
+    assert co.to_state() == legacy
+
+    co.prune(min_either=5, max_pairs=10)
+    assert len(co.to_state()) == 10
+    assert min(v["either"] for v in co.to_state().values()) >= 5
+
+
+def test_merge_candidates_from_matrix():
+    rules = rule_engine.load_rules()
+    co = rule_engine.CoActivation.from_state(
+        {
+            "R1:R2": {"both": 10, "either": 10},
+            "R3:R4": {"both": 9, "either": 10},
+            "R5:R6": {"both": 5, "either": 6},  # Too few prompts
+            "R7:R8": {"both": 8, "either": 10},  # Below threshold
+        },
+        rules,
+    )
+    found = co.merge_candidates(10, 0.9)
+    assert [(r1, r2) for r1, r2, _ in found] == [("R1", "R2"), ("R3", "R4")]
+    assert co.merge_candidates(10, 0.9, exclude={"R3"})[0][:2] == ("R1", "R2")
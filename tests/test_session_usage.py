@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Tests for session_usage.py — incremental session JSONL usage store."""
+
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import track_resources
+from session_usage import SessionUsageStore
+
+
+def _record(ts, model="claude-opus-4-6", inp=10, out=5, cache_read=0):
+    return json.dumps({
+        "timestamp": ts,
+        "message": {
+            "model": model,
+            "usage": {
+                "input_tokens": inp,
+                "output_tokens": out,
+                "cache_read_input_tokens": cache_read,
+            },
+        },
+    }) + "\n"
+
+
+@pytest.fixture
+def root(tmp_path):
+    d = tmp_path / "projects" / "-root-proj"
+    d.mkdir(parents=True)
+    return tmp_path / "projects"
+
+
+@pytest.fixture
+def store(tmp_path, root):
+    s = SessionUsageStore(tmp_path / "usage.db", root=root)
+    yield s
+    s.close()
+
+
+def test_sessions_match_full_parse(store, root):
+    path = root / "-root-proj" / "abc.jsonl"
+    path.write_text(
+        _record("2026-01-01T10:00:00Z", model="<synthetic>", inp=1, out=0)
+        + "not json\n"
+        + _record("2026-01-01T10:05:00Z", cache_read=7)
+        + _record("2026-01-01T10:06:00Z", model="claude-sonnet-4-5-20250929")
+    )
+    (root / "-root-proj" / "subagents").mkdir()
+    (root / "-root-proj" / "subagents" / "x.jsonl").write_text(_record("2026-01-01T10:00:00Z"))
+
+    store.refresh()
+    [session] = store.sessions()
+    expected = track_resources.parse_session_file(path)
+    for key in ("input_tokens", "output_tokens", "cache_read_tokens", "messages",
+                "model", "start_time", "end_time"):
+        assert session[key] == expected[key], key
+    assert session["models_used"] == {k: dict(v) for k, v in expected["models_used"].items()}
+    assert session["session_id"] == "abc"
+
+
+def test_refresh_parses_only_appended_bytes(store, root):
+    path = root / "-root-proj" / "abc.jsonl"
+    path.write_text(_record("2026-01-01T10:00:00Z"))
+    first = store.refresh()
+    assert (first["new"], first["messages"]) == (1, 1)
+
+    assert store.refresh()["bytes"] == 0  # Unchanged file isn't read
+
+    with open(path, "a") as f:
+        f.write(_record("2026-01-01T10:01:00Z", inp=100))
+        f.write('{"timestamp": "2026-01-01T10:02:00Z", "mess')  # Still being written
+    stats = store.refresh()
+    assert (stats["appended"], stats["messages"]) == (1, 1)
+    assert store.sessions()[0]["input_tokens"] == 110
+
+    with open(path, "a") as f:
+        f.write('age": {"usage": {"input_tokens": 1000}}}\n')
+    store.refresh()
+    session = store.sessions()[0]
+    assert (session["input_tokens"], session["messages"]) == (1110, 3)
+
+
+def test_replaced_or_removed_files_are_reingested(store, root):
+    path = root / "-root-proj" / "abc.jsonl"
+    path.write_text(_record("2026-01-01T10:00:00Z") * 3)
+    store.refresh()
+    path.write_text(_record("2026-01-01T11:00:00Z", inp=1, out=1))
+    assert store.refresh()["reset"] == 1
+    assert store.sessions()[0]["input_tokens"] == 1
+
+    os.unlink(path)
+    assert store.refresh()["removed"] == 1
+    assert store.sessions() == []
+
+
+def test_window_queries_use_message_timestamps(store, root):
+    (root / "-root-proj" / "a.jsonl").write_text(
+        _record("2026-01-01T10:00:00Z", inp=1, out=1)
+        + _record("2026-01-01T12:00:00Z", inp=10, out=0, model="claude-sonnet-4-5-20250929")
+        + _record("2026-01-01T12:30:00Z", inp=0, out=0, cache_read=50)
+    )
+    store.refresh()
+    since = 1767268800.0  # 2026-01-01T12:00:00Z
+    assert store.usage_by_model(since) == {"claude-sonnet-4-5-20250929": (10, 1)}
+    assert store.conversational_messages(since) == [(since, 10, "claude-sonnet-4-5-20250929")]
+    assert store.usage_by_model(since, file_ids=[]) == {}
+
+
+def _assistant(ts, *blocks, model="claude-opus-4-6"):
+    return json.dumps({
+        "type": "assistant",
+        "timestamp": ts,
+        "message": {"model": model, "content": list(blocks),
+                    "usage": {"input_tokens": 3, "output_tokens": 2}},
+    }) + "\n"
+
+
+def _tool_use(name, **inp):
+    return {"type": "tool_use", "id": f"tu-{name}", "name": name, "input": inp}
+
+
+def test_tool_calls_errors_and_markers_keep_record_lines(store, root):
+    path = root / "-root-proj" / "abc.jsonl"
+    path.write_text(
+        _assistant("2026-01-01T10:00:00Z", _tool_use("Read", file_path="/a.py"))
+        + json.dumps({"type": "user", "message": {"role": "user", "content": [
+            {"type": "tool_result", "tool_use_id": "tu-Read", "is_error": True,
+             "content": "boom"},
+            {"type": "text", "text": "[Budget] 5-hour window at 40%"},
+        ]}}) + "\n"
+    )
+    store.refresh()
+    with open(path, "a") as f:
+        f.write(_assistant("2026-01-01T10:01:00Z",
+                           _tool_use("Write", file_path="/b.py", content="x" * 5000),
+                           _tool_use("Skill", skill="commit")))
+        f.write(json.dumps({"type": "queue-operation", "operation": "enqueue"}) + "\n")
+    store.refresh()
+
+    fid = store.file_id(path)
+    calls = store.tool_calls(fid)
+    assert [(c["name"], c["line"]) for c in calls] == [("Read", 0), ("Write", 2), ("Skill", 2)]
+    assert calls[1]["input"] == {"file_path": "/b.py"}  # Write body isn't stored
+    assert calls[1]["input_keys"] == ["file_path", "content"]
+    assert store.tool_counts(fid) == {"Read": 1, "Write": 1, "Skill": 1}
+    assert [c["name"] for c in store.tool_calls(fid, names=["Skill"])] == ["Skill"]
+    assert store.tool_errors(fid) == [{"tool_use_id": "tu-Read", "error": "boom", "line": 1}]
+    markers = store.hook_markers(fid)
+    assert [(m["hook_type"], m["line"]) for m in markers] == [("[Budget]", 1), ("queue-operation", 3)]
+    assert store.models(fid) == {"claude-opus-4-6"}
+
+
+def test_current_session_is_newest_recent_file(store, root):
+    old = root / "-root-proj" / "old.jsonl"
+    new = root / "-root-proj" / "new.jsonl"
+    old.write_text(_record("2026-01-01T10:00:00Z"))
+    new.write_text(_record("2026-01-01T10:00:00Z", inp=7, out=3) * 2)
+    os.utime(old, (0, 0))
+    store.refresh()
+    current = store.current_session(max_age_s=300)
+    assert (current["session_id"], current["tokens"], current["messages"]) == ("new", 20, 2)
+
+    os.utime(new, (0, 0))
+    store.refresh()
+    assert store.current_session(max_age_s=300) is None
+
+
+def test_older_schema_is_dropped_and_rebuilt(tmp_path, root):
+    db = tmp_path / "old.db"
+    conn = sqlite3.connect(db)
+    conn.executescript("""
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        INSERT INTO meta VALUES ('schema_version', '1');
+        CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT, inode INTEGER,
+                            size INTEGER, offset INTEGER);
+        CREATE TABLE messages (file_id INTEGER, ts REAL);
+        CREATE INDEX idx_messages_ts ON messages(ts);
+    """)
+    conn.close()
+    (root / "-root-proj" / "a.jsonl").write_text(_record("2026-01-01T10:00:00Z"))
+    s = SessionUsageStore(db, root=root)
+    assert s.refresh()["new"] == 1
+    assert s.stats()["messages"] == 1
+    s.close()
+
+
+def test_monitor_and_evaluator_read_the_store(store, root):
+    import experiment_evaluator
+    from monitor_sessions import SessionMonitor
+
+    path = root / "-root-proj" / "abc.jsonl"
+    path.write_text(
+        json.dumps({"type": "user", "message": {"role": "user",
+                                                "content": "see @notes.md please"}}) + "\n"
+        + _assistant("2026-01-01T10:00:00Z",
+                     {"type": "text", "text": "Reading it"},
+                     _tool_use("Read", file_path="/notes.md"),
+                     _tool_use("Edit", file_path="/notes.md", old_string="a", new_string="b"),
+                     _tool_use("TaskCreate", subject="Ship it", taskId="7"))
+    )
+
+    monitor = SessionMonitor(sessions_dir=root / "-root-proj", store=store)
+    summary = monitor.parse_session(path)
+    assert summary["files_modified"] == {"/notes.md"}
+    assert summary["tasks"] == [{"action": "TaskCreate", "task_id": "7",
+                                 "status": None, "subject": "Ship it"}]
+    assert summary["messages"] == 1
+    assert dict(summary["tools_used"]) == {"Read": 1, "Edit": 1, "TaskCreate": 1}
+
+    data = experiment_evaluator.extract_session_data(path, store=store)
+    assert [(tc["name"], tc["line"]) for tc in data["tool_calls"]] == [
+        ("Read", 1), ("Edit", 1), ("TaskCreate", 1)]
+    assert data["file_edits"] == [{"path": "/notes.md", "line": 1}]
+    assert data["user_messages"] == [{"text": "see @notes.md please", "line": 0}]
+    assert data["at_file_refs"] == [{"ref": "@notes.md", "line": 0}]
+    assert data["assistant_texts"] == [{"text": "Reading it", "line": 1}]
+    assert "1/1 had corresponding Read calls" in experiment_evaluator.eval_016_at_file_ref(data)["observation"]
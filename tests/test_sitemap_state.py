@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Tests for sitemap_state.py — incremental sitemap crawl state."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from sitemap_state import SitemapState, parse_sitemap
+
+
+def _urlset(*entries):
+    body = "".join(
+        f"<url><loc>{loc}</loc>" + (f"<lastmod>{mod}</lastmod>" if mod else "") + "</url>"
+        for loc, mod in entries
+    )
+    return f'<?xml version="1.0"?><urlset xmlns="x">{body}</urlset>'
+
+
+def _index(*entries):
+    body = "".join(
+        f"<sitemap><loc>{loc}</loc><lastmod>{mod}</lastmod></sitemap>" for loc, mod in entries
+    )
+    return f"<sitemapindex>{body}</sitemapindex>"
+
+
+@pytest.fixture
+def state(tmp_path):
+    s = SitemapState(tmp_path / "sitemaps.db")
+    yield s
+    s.close()
+
+
+def test_parse_sitemap_shapes():
+    assert parse_sitemap(_urlset(("https://a/1", "2026-01-01"), ("https://a/2?x=1&amp;y=2", None))) == (
+        False,
+        [("https://a/1", "2026-01-01"), ("https://a/2?x=1&y=2", None)],
+    )
+    assert parse_sitemap(_index(("https://a/posts.xml", "2026-02-01")))[0] is True
+    assert parse_sitemap("<urlset><loc>https://a/3</loc></urlset>") == (False, [("https://a/3", None)])
+
+
+def test_walk_skips_unchanged_child_sitemaps(state):
+    site = {
+        "https://a/sitemap.xml": _index(("https://a/posts.xml", "d1"), ("https://a/pages.xml", "d1")),
+        "https://a/posts.xml": _urlset(("https://a/p1", "m1"), ("https://a/p2", "m1")),
+        "https://a/pages.xml": _urlset(("https://a/about", None)),
+    }
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return site.get(url)
+
+    first = state.walk("https://a/sitemap.xml", fetch)
+    assert first == {"https://a/p1": "m1", "https://a/p2": "m1", "https://a/about": None}
+
+    # Only posts.xml changed: pages.xml comes from the store
+    site["https://a/sitemap.xml"] = _index(("https://a/posts.xml", "d2"), ("https://a/pages.xml", "d1"))
+    site["https://a/posts.xml"] = _urlset(("https://a/p1", "m2"), ("https://a/p2", "m1"), ("https://a/p3", "m2"))
+    fetched.clear()
+    second = state.walk("https://a/sitemap.xml", fetch)
+    assert fetched == ["https://a/sitemap.xml", "https://a/posts.xml"]
+    assert second["https://a/p1"] == "m2" and "https://a/about" in second
+
+    # Root unreachable: last known pages, nested index included
+    assert state.walk("https://a/sitemap.xml", lambda url: None) == second
+
+
+def test_pending_is_new_or_changed_only(state, tmp_path):
+    state.seed("src", {"https://a/p1": "0001-one.md", "https://a/p2": None}, {"https://a/p1": "m1"})
+    assert state.is_seeded("src") and not state.is_seeded("other")
+
+    lastmods = {"https://a/p1": "m1", "https://a/p2": "m9", "https://a/p3": None}
+    assert state.pending("src", lastmods) == ["https://a/p3"]  # p2 had no lastmod saved
+
+    lastmods["https://a/p1"] = "m2"
+    assert state.pending("src", lastmods) == ["https://a/p1", "https://a/p3"]
+    assert state.previous_index("src", "https://a/p1") == 1
+
+    old = tmp_path / "0001-one.md"
+    old.write_text("old")
+    new = tmp_path / "0001-one-renamed.md"
+    new.write_text("new")
+    state.saved("src", "https://a/p1", "m2", new)
+    assert not old.exists()
+    state.record("src", "https://a/p1", "m2")  # A later skip keeps the file
+    assert state.previous_file("src", "https://a/p1") == "0001-one-renamed.md"
+    assert state.pending("src", lastmods) == ["https://a/p3"]
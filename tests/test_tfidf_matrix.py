@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for tfidf_matrix.py — sparse, incremental TF-IDF backend."""
+
+import math
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("scipy")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from tfidf_matrix import TFIDFMatrix
+
+
+def _count(paths):
+    return [Counter(Path(p).read_text().split()) for p in paths]
+
+
+def test_incremental_update_and_scores(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    texts = {"a": "mixing mixing mastering", "b": "mastering reverb", "c": "reverb delay delay"}
+    for name, text in texts.items():
+        (docs / name).write_text(text)
+    paths = sorted(docs.iterdir())
+
+    calls = []
+    counter = lambda ps: calls.append(list(ps)) or _count(ps)  # noqa: E731
+
+    matrix = TFIDFMatrix(tmp_path / "store")
+    assert matrix.update(paths, counter) == 3
+    assert matrix.doc_freq_counter() == {"mixing": 1, "mastering": 2, "reverb": 2, "delay": 1}
+
+    # Same scoring as the dict backend: sum_d(count / total) * log(N / (1 + df))
+    scores = matrix.concept_scores()
+    assert scores["mastering"] == pytest.approx((1 / 3 + 1 / 2) * math.log(3 / 3))
+    assert scores["delay"] == pytest.approx((2 / 3) * math.log(3 / 2))
+    assert set(matrix.concept_scores(min_doc_freq=2)) == {"mastering", "reverb"}
+    matrix.save()
+
+    # Reloaded store: only the changed file is tokenized again; a deleted one drops out
+    (docs / "b").write_text("reverb sidechain")
+    os.utime(docs / "b", ns=(1, 1))
+    (docs / "c").unlink()
+    calls.clear()
+    again = TFIDFMatrix(tmp_path / "store")
+    assert again.update(sorted(docs.iterdir()), counter) == 1
+    assert calls == [[docs / "b"]]
+    assert again.num_docs == 2
+    assert again.doc_freq_counter() == {"mixing": 1, "mastering": 1, "reverb": 1, "sidechain": 1}
+
+
+def test_vocabulary_compacts_terms_no_document_uses(tmp_path, monkeypatch):
+    import tfidf_matrix
+
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(10):
+        (docs / f"d{i}").write_text(f"shared word{i}")
+    matrix = TFIDFMatrix(tmp_path / "store")
+    matrix.update(sorted(docs.iterdir()), _count)
+    assert len(matrix.terms) == 11
+
+    # One dead term out of 11 stays below the threshold
+    monkeypatch.setattr(tfidf_matrix, "VOCAB_COMPACT_FRACTION", 0.5)
+    (docs / "d0").unlink()
+    matrix.update(sorted(docs.iterdir()), _count)
+    assert len(matrix.terms) == 11
+
+    for i in range(1, 6):
+        (docs / f"d{i}").unlink()
+    matrix.update(sorted(docs.iterdir()), _count)
+    assert sorted(matrix.terms) == ["shared", "word6", "word7", "word8", "word9"]
+    assert matrix.counts.shape == (4, 5)
+    assert matrix.doc_freq_counter() == {"shared": 4, "word6": 1, "word7": 1, "word8": 1, "word9": 1}
+    matrix.save()
+    assert TFIDFMatrix(tmp_path / "store").vocab == matrix.vocab
+
+    # New terms after a compaction get fresh columns
+    (docs / "d1").write_text("shared fresh")
+    matrix.update(sorted(docs.iterdir()), _count)
+    assert matrix.doc_freq_counter()["fresh"] == 1 and matrix.doc_freq_counter()["shared"] == 5
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""TF-IDF Matrix - sparse, persisted TF-IDF backend for auto_tag_corpus.py.
+
+TFIDFTagger.compute_tfidf builds tfidf_scores[doc_id][term] as nested
+dicts: one Python float per (document, term), phrases included, which is
+gigabytes on the full corpus and is recomputed from scratch every run.
+
+This backend interns terms into an integer vocabulary and keeps raw term
+counts in a scipy CSR matrix (documents x terms). Document frequency,
+normalized TF and the aggregated concept scores are vectorized NumPy
+operations over that matrix. Vocabulary, matrix and each row's file
+mtime/size are persisted, so the biweekly run re-tokenizes only files
+that are new or changed; rows of deleted files are dropped. Terms no
+document uses any more are compacted out of the vocabulary once they make
+up VOCAB_COMPACT_FRACTION of it, so the store doesn't grow run over run.
+
+Requires numpy + scipy (requirements.txt); auto_tag_corpus.py falls back
+to the dict backend without them.
+
+Usage:
+    python3 tfidf_matrix.py stats        # Documents, vocabulary, non-zeros
+    python3 tfidf_matrix.py clear        # Forget the persisted matrix
+
+    # From Python
+    from tfidf_matrix import TFIDFMatrix
+    matrix = TFIDFMatrix()
+    matrix.update(paths, count_terms)    # count_terms(paths) -> [Counter]
+    scores = matrix.concept_scores(min_doc_freq=10, max_doc_count=400)
+    matrix.save()
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+try:
+    import numpy as np
+    from scipy import sparse
+
+    HAS_SPARSE = True
+except ImportError:
+    HAS_SPARSE = False
+
+
+TFIDF_MATRIX_DIR = Path("~/.claude/.locks/tfidf-matrix").expanduser()
+VOCAB_COMPACT_FRACTION = 0.1  # Share of zero-df columns that triggers a compaction
+
+
+def _file_key(path: Path) -> list:
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+class TFIDFMatrix:
+    """Documents x terms count matrix with an interned, periodically compacted vocabulary."""
+
+    def __init__(self, store_dir: Optional[Path] = None):
+        if not HAS_SPARSE:
+            raise ImportError("tfidf_matrix needs numpy and scipy")
+        self.store_dir = Path(store_dir) if store_dir else TFIDF_MATRIX_DIR
+        self.terms: list = []  # Column -> term
+        self.vocab: dict = {}  # Term -> column
+        self.docs: list = []  # Row -> [path, mtime_ns, size]
+        self.counts = sparse.csr_matrix((0, 0), dtype=np.int32)
+        self.load()
+
+    # ── Persistence ─────────────────────────────────────────────────────
+
+    def load(self):
+        meta_path = self.store_dir / "meta.json"
+        matrix_path = self.store_dir / "counts.npz"
+        if not (meta_path.exists() and matrix_path.exists()):
+            return
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            counts = sparse.load_npz(matrix_path).tocsr()
+        except (OSError, ValueError):
+            return  # Unreadable store: rebuilt from scratch on update()
+        if counts.shape != (len(meta["docs"]), len(meta["terms"])):
+            return
+        self.terms = meta["terms"]
+        self.vocab = {term: i for i, term in enumerate(self.terms)}
+        self.docs = meta["docs"]
+        self.counts = counts
+
+    def save(self):
+        """Write matrix and metadata (tmp file + rename, so a crash keeps the old pair)."""
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        matrix_tmp = self.store_dir / "counts.tmp.npz"
+        sparse.save_npz(matrix_tmp, self.counts)
+        meta_tmp = self.store_dir / "meta.json.tmp"
+        meta_tmp.write_text(json.dumps({"terms": self.terms, "docs": self.docs}), encoding="utf-8")
+        os.replace(matrix_tmp, self.store_dir / "counts.npz")
+        os.replace(meta_tmp, self.store_dir / "meta.json")
+
+    def clear(self):
+        for name in ("counts.npz", "meta.json"):
+            (self.store_dir / name).unlink(missing_ok=True)
+        self.terms, self.vocab, self.docs = [], {}, []
+        self.counts = sparse.csr_matrix((0, 0), dtype=np.int32)
+
+    # ── Incremental update ──────────────────────────────────────────────
+
+    def update(self, paths: Iterable, count_terms: Callable[[list], list]) -> int:
+        """Sync rows with `paths`; returns how many files were (re)tokenized.
+
+        count_terms(paths) returns one Counter of terms per path, in order.
+        Rows of unchanged files are kept as they are; new and changed files
+        are counted and appended; rows of files no longer listed are dropped.
+        Columns left without documents are compacted past the threshold.
+        """
+        current = {}
+        for path in paths:
+            path = Path(path)
+            current[str(path)] = _file_key(path)
+
+        keep = [i for i, (path, *key) in enumerate(self.docs) if current.get(path) == key]
+        kept = {self.docs[i][0] for i in keep}
+        changed = [path for path in current if path not in kept]
+
+        rows = count_terms([Path(p) for p in changed]) if changed else []
+        indptr, indices, data = [0], [], []
+        for tf in rows:
+            for term, count in tf.items():
+                col = self.vocab.get(term)
+                if col is None:
+                    col = self.vocab[term] = len(self.terms)
+                    self.terms.append(term)
+                indices.append(col)
+                data.append(count)
+            indptr.append(len(indices))
+
+        width = len(self.terms)
+        kept_counts = self.counts[keep] if keep else sparse.csr_matrix((0, width), dtype=np.int32)
+        kept_counts.resize((len(keep), width))
+        new_counts = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.int32), np.asarray(indices, dtype=np.int32), indptr),
+            shape=(len(rows), width),
+        )
+        self.counts = sparse.vstack([kept_counts, new_counts], format="csr")
+        self.docs = [self.docs[i] for i in keep] + [[p, *current[p]] for p in changed]
+        dead = len(self.terms) - np.count_nonzero(self.doc_freq())
+        if dead and dead >= VOCAB_COMPACT_FRACTION * len(self.terms):
+            self.compact()
+        return len(changed)
+
+    def compact(self) -> int:
+        """Drop zero-df columns and renumber the vocabulary; returns columns dropped."""
+        live = np.flatnonzero(self.doc_freq())
+        dropped = len(self.terms) - len(live)
+        if dropped:
+            self.counts = self.counts[:, live].tocsr()
+            self.terms = [self.terms[i] for i in live]
+            self.vocab = {term: i for i, term in enumerate(self.terms)}
+        return dropped
+
+    # ── Scores ──────────────────────────────────────────────────────────
+
+    @property
+    def num_docs(self) -> int:
+        return self.counts.shape[0]
+
+    def doc_freq(self) -> "np.ndarray":
+        """Documents containing each term (one stored entry per (doc, term))."""
+        return np.bincount(self.counts.indices, minlength=len(self.terms))
+
+    def concept_scores(self, min_doc_freq: int = 0, max_doc_count: Optional[int] = None) -> dict:
+        """{term: sum over docs of tf_normalized * idf} for terms in the df band.
+
+        Same scoring as TFIDFTagger's dict backend: tf = count / tokens in
+        the document, idf = log(N / (1 + df)).
+        """
+        if not self.num_docs or not self.terms:
+            return {}
+        df = self.doc_freq()
+        totals = np.asarray(self.counts.sum(axis=1), dtype=np.float64).ravel()
+        totals[totals == 0] = 1  # Empty documents contribute nothing
+        # Row-normalize: each stored count divided by its document's total
+        row_of_entry = np.repeat(np.arange(self.num_docs), np.diff(self.counts.indptr))
+        normalized = self.counts.data / totals[row_of_entry]
+        tf_sums = np.bincount(self.counts.indices, weights=normalized, minlength=len(self.terms))
+        idf = np.log(self.num_docs / (1 + df))
+        scores = tf_sums * idf
+
+        upper = self.num_docs if max_doc_count is None else max_doc_count
+        band = np.flatnonzero((df >= min_doc_freq) & (df <= upper) & (df > 0))
+        return {self.terms[i]: float(scores[i]) for i in band}
+
+    def doc_freq_counter(self) -> dict:
+        """{term: df} for terms still present in some document."""
+        df = self.doc_freq()
+        return {self.terms[i]: int(df[i]) for i in np.flatnonzero(df)}
+
+    def stats(self) -> dict:
+        return {
+            "documents": self.num_docs,
+            "terms": len(self.terms),
+            "nonzeros": int(self.counts.nnz),
+        }
+
+
+def main():
+    args = sys.argv[1:]
+    cmd = args[0] if args else "stats"
+    matrix = TFIDFMatrix()
+    if cmd == "stats":
+        s = matrix.stats()
+        print(f"TF-IDF matrix: {matrix.store_dir}")
+        print(f"  Documents: {s['documents']}")
+        print(f"  Vocabulary: {s['terms']} terms")
+        print(f"  Non-zeros: {s['nonzeros']}")
+    elif cmd == "clear":
+        matrix.clear()
+        print("Cleared")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,9 @@ from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent))
+from session_usage import SessionUsageStore
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -222,30 +225,27 @@ def parse_session_file(jsonl_path):
     return data_out
 
 
-def scan_all_sessions():
-    """Scan all Claude Code session files."""
-    claude_dir = Path.home() / ".claude" / "projects"
-    if not claude_dir.exists():
-        return []
-
-    sessions = []
-    for jsonl_file in claude_dir.rglob("*.jsonl"):
-        if "subagents" in str(jsonl_file):
-            continue
+_usage_store = None
+
+
+def get_usage_store():
+    """Shared SessionUsageStore (opened once per process)."""
+    global _usage_store
+    if _usage_store is None:
+        _usage_store = SessionUsageStore()
+    return _usage_store
 
-        usage = parse_session_file(jsonl_file)
-        total = (
-            usage["input_tokens"]
-            + usage["output_tokens"]
-            + usage["cache_creation_tokens"]
-            + usage["cache_read_tokens"]
-        )
-        if total > 0:
-            usage["session_file"] = str(jsonl_file)
-            usage["session_id"] = jsonl_file.stem
-            sessions.append(usage)
 
-    return sorted(sessions, key=lambda x: x["start_time"] or datetime.min, reverse=True)
+def scan_all_sessions():
+    """Scan all Claude Code session files.
+
+    Incremental: only bytes appended since the last run are parsed (see
+    session_usage.py). Session dicts have parse_session_file() shape plus
+    session_file, session_id and file_id.
+    """
+    store = get_usage_store()
+    store.refresh()
+    return store.sessions()
 
 
 # ============================================================================
@@ -265,46 +265,13 @@ def get_model_class(model_id):
     return "sonnet"
 
 
-def _count_tokens_in_window(jsonl_path, window_start):
-    """Count tokens from individual messages after window_start.
-
-    This is more accurate than session-level counting because sessions
-    can span across Anthropic's window reset boundary. By checking each
-    message's timestamp, we only count tokens that actually fall within
-    the current window.
-
-    Returns (tokens, messages, model_msgs_dict).
-    """
-    tokens = 0
-    messages = 0
-    model_msgs = {}
-    try:
-        with open(jsonl_path, "r") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                try:
-                    record = json.loads(line)
-                    ts_str = record.get("timestamp")
-                    if not ts_str:
-                        continue
-                    ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                    if ts < window_start:
-                        continue
-                    msg = record.get("message", {})
-                    usage = msg.get("usage", {})
-                    inp = usage.get("input_tokens", 0)
-                    out = usage.get("output_tokens", 0)
-                    if inp > 0 or out > 0:
-                        tokens += inp + out
-                        messages += 1
-                        cls = get_model_class(msg.get("model"))
-                        model_msgs[cls] = model_msgs.get(cls, 0) + 1
-                except (json.JSONDecodeError, ValueError):
-                    continue
-    except OSError:
-        pass
-    return tokens, messages, model_msgs
+def _file_ids_active_since(sessions, since):
+    """Store file ids of sessions with activity at or after since."""
+    return [
+        s["file_id"]
+        for s in sessions
+        if s.get("file_id") is not None and s.get("end_time") and s["end_time"] >= since
+    ]
 
 
 def calculate_five_hour_window(sessions):
@@ -315,8 +282,8 @@ def calculate_five_hour_window(sessions):
     context caching mechanism. They don't represent conversational usage
     and don't count against subscription rate limits.
 
-    Uses per-message timestamp checking (not session-level) to handle
-    sessions that span across Anthropic's window reset boundary.
+    Uses per-message timestamps (stored usage rows, not session totals) to
+    handle sessions that span across Anthropic's window reset boundary.
     """
     now = datetime.now(timezone.utc)
     window_start = now - timedelta(hours=5)
@@ -325,28 +292,13 @@ def calculate_five_hour_window(sessions):
     window_messages = 0
     window_model_msgs = {}
 
-    for s in sessions:
-        if not s.get("end_time") or s["end_time"] < window_start:
-            continue  # Session ended before window — skip entirely
-
-        if s.get("start_time") and s["start_time"] >= window_start:
-            # Session fully within window — use pre-computed totals (fast)
-            window_tokens += s["input_tokens"] + s["output_tokens"]
-            window_messages += s["messages"]
-            for model_id, model_usage in s["models_used"].items():
-                cls = get_model_class(model_id)
-                window_model_msgs[cls] = (
-                    window_model_msgs.get(cls, 0) + model_usage["msgs"]
-                )
-        else:
-            # Session spans the window boundary — must check per-message
-            session_file = s.get("session_file")
-            if session_file:
-                tok, msg, mmsg = _count_tokens_in_window(session_file, window_start)
-                window_tokens += tok
-                window_messages += msg
-                for cls, count in mmsg.items():
-                    window_model_msgs[cls] = window_model_msgs.get(cls, 0) + count
+    file_ids = _file_ids_active_since(sessions, window_start)
+    usage = get_usage_store().usage_by_model(window_start.timestamp(), file_ids)
+    for model_id, (tokens, msgs) in usage.items():
+        window_tokens += tokens
+        window_messages += msgs
+        cls = get_model_class(model_id)
+        window_model_msgs[cls] = window_model_msgs.get(cls, 0) + msgs
 
     budget = SUBSCRIPTION["five_hour_token_budget"]
     pct = (window_tokens / budget * 100) if budget > 0 else 0
@@ -374,42 +326,17 @@ def calculate_since_last_gap(sessions, gap_threshold_minutes=30):
     now = datetime.now(timezone.utc)
     cutoff = now - timedelta(hours=12)
 
-    all_messages = []
-    for s in sessions:
-        if not s.get("end_time") or s["end_time"] < cutoff:
-            continue
-        session_file = s.get("session_file")
-        if not session_file:
-            continue
-        try:
-            with open(session_file, "r") as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    try:
-                        record = json.loads(line)
-                        ts_str = record.get("timestamp")
-                        if not ts_str:
-                            continue
-                        ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                        if ts < cutoff:
-                            continue
-                        msg = record.get("message", {})
-                        usage = msg.get("usage", {})
-                        inp = usage.get("input_tokens", 0)
-                        out = usage.get("output_tokens", 0)
-                        if inp > 0 or out > 0:
-                            all_messages.append(
-                                {
-                                    "ts": ts,
-                                    "tokens": inp + out,
-                                    "model": msg.get("model"),
-                                }
-                            )
-                    except (json.JSONDecodeError, ValueError):
-                        continue
-        except OSError:
-            continue
+    rows = get_usage_store().conversational_messages(
+        cutoff.timestamp(), _file_ids_active_since(sessions, cutoff)
+    )
+    all_messages = [
+        {
+            "ts": datetime.fromtimestamp(ts, timezone.utc),
+            "tokens": tokens,
+            "model": model,
+        }
+        for ts, tokens, model in rows
+    ]
 
     if not all_messages:
         return {
@@ -420,8 +347,6 @@ def calculate_since_last_gap(sessions, gap_threshold_minutes=30):
             "wh": 0,
         }
 
-    all_messages.sort(key=lambda m: m["ts"])
-
     gap_threshold = timedelta(minutes=gap_threshold_minutes)
     gap_boundary_idx = 0
 
@@ -463,18 +388,19 @@ def calculate_weekly_usage(sessions):
     opus_tokens = 0
     sonnet_tokens = 0
 
-    for s in sessions:
-        if s["start_time"] and s["start_time"] >= week_start:
-            for model_id, model_usage in s["models_used"].items():
-                cls = get_model_class(model_id)
-                # Only count conversational tokens (not cache)
-                total_tok = model_usage["input"] + model_usage["output"]
-                if cls == "opus":
-                    opus_tokens += total_tok
-                    opus_messages += model_usage["msgs"]
-                else:
-                    sonnet_tokens += total_tok
-                    sonnet_messages += model_usage["msgs"]
+    # Only count conversational tokens (not cache), per message timestamp
+    usage = get_usage_store().usage_by_model(
+        week_start.timestamp(), _file_ids_active_since(sessions, week_start)
+    )
+    for model_id, (total_tok, msgs) in usage.items():
+        if not model_id or model_id == "<synthetic>":
+            continue
+        if get_model_class(model_id) == "opus":
+            opus_tokens += total_tok
+            opus_messages += msgs
+        else:
+            sonnet_tokens += total_tok
+            sonnet_messages += msgs
 
     return {
         "opus_tokens": opus_tokens,
@@ -31,6 +31,10 @@ import html2text
 import requests
 from bs4 import BeautifulSoup
 
+from fetch_scheduler import get_scheduler
+from http_cache import CachingSession
+from sitemap_state import get_sitemap_state, scraped_files
+
 # ── Configuration ──────────────────────────────────────────────────────────
 
 KB_BASE = Path.home() / "Development" / "knowledge-bases" / "first-1000"
@@ -151,9 +155,24 @@ def html_to_markdown(html_content: str) -> str:
     return H2T.handle(html_content).strip()
 
 
-def rate_limit(delay: float = DEFAULT_DELAY):
-    """Sleep for rate limiting."""
-    time.sleep(delay)
+# Per-host pacing shared with the other scrapers in this process:
+# a request waits only for its host's next slot, not a fixed sleep
+SCHEDULER = get_scheduler()
+# Conditional GETs (ETag/Last-Modified) against the shared on-disk cache
+SESSION = CachingSession(requests)
+# Per-URL sitemap <lastmod> state: only new or changed pages are fetched
+SITEMAPS = get_sitemap_state()
+
+
+def fetch_sitemap_xml(url: str):
+    """Sitemap XML text, or None if it can't be fetched."""
+    try:
+        resp = SCHEDULER.get(SESSION, url, DEFAULT_DELAY, headers=HEADERS, timeout=30)
+        resp.raise_for_status()
+        return resp.text
+    except Exception as e:
+        print(f"  ERROR fetching sitemap {url}: {e}")
+        return None
 
 
 def get_scraped_urls(output_dir: Path) -> set:
@@ -189,8 +208,13 @@ def scrape_wp_api(source_key: str) -> dict:
 
     # Get total count
     try:
-        resp = requests.get(
-            api_url, params={"per_page": 1}, headers=HEADERS, timeout=30
+        resp = SCHEDULER.get(
+            SESSION,
+            api_url,
+            DEFAULT_DELAY,
+            params={"per_page": 1},
+            headers=HEADERS,
+            timeout=30,
         )
         resp.raise_for_status()
         total = int(resp.headers.get("X-WP-Total", 0))
@@ -213,8 +237,10 @@ def scrape_wp_api(source_key: str) -> dict:
         print(f"  Fetching page {page}/{total_pages}...")
 
         try:
-            resp = requests.get(
+            resp = SCHEDULER.get(
+                SESSION,
                 api_url,
+                DEFAULT_DELAY,
                 params={
                     "per_page": 100,
                     "page": page,
@@ -235,12 +261,12 @@ def scrape_wp_api(source_key: str) -> dict:
                 break
             print(f"    ERROR fetching page {page}: {e}")
             stats["failed"] += 1
-            rate_limit(5.0)
+            SCHEDULER.backoff(api_url, 5.0)
             continue
         except Exception as e:
             print(f"    ERROR fetching page {page}: {e}")
             stats["failed"] += 1
-            rate_limit(5.0)
+            SCHEDULER.backoff(api_url, 5.0)
             continue
 
         if not posts:
@@ -281,9 +307,7 @@ def scrape_wp_api(source_key: str) -> dict:
                 stats["failed"] += 1
 
         if page % 10 == 0:
-            rate_limit(BATCH_PAUSE)
-        else:
-            rate_limit(DEFAULT_DELAY)
+            SCHEDULER.backoff(api_url, BATCH_PAUSE)
 
     return stats
 
@@ -291,23 +315,19 @@ def scrape_wp_api(source_key: str) -> dict:
 # ── Sitemap + HTML Scraper ─────────────────────────────────────────────────
 
 
-def get_sitemap_urls(sitemap_url: str, url_filter: str = None) -> list[str]:
-    """Extract article URLs from a sitemap XML."""
-    resp = requests.get(sitemap_url, headers=HEADERS, timeout=30)
-    resp.raise_for_status()
-    xml_text = resp.text
+def get_sitemap_urls(sitemap_url: str, url_filter: str = None) -> dict[str, str | None]:
+    """Article URL -> <lastmod> from a sitemap (following sitemap indexes)."""
+    lastmods = SITEMAPS.walk(sitemap_url, fetch_sitemap_xml)
 
-    urls = re.findall(r"<loc>([^<]+)</loc>", xml_text)
-
-    article_urls = []
-    for url in urls:
-        # Skip sitemap index refs
+    article_urls = {}
+    for url, lastmod in lastmods.items():
+        # Skip sitemap refs that weren't followed
         if url.endswith(".xml"):
             continue
         # Apply URL filter if provided
         if url_filter and url_filter not in url:
             continue
-        article_urls.append(url)
+        article_urls[url] = lastmod
 
     return article_urls
 
@@ -424,32 +444,41 @@ def scrape_sitemap_html(source_key: str) -> dict:
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    scraped_urls = get_scraped_urls(output_dir)
-    existing_count = len(scraped_urls)
+    existing_count = len(list(output_dir.glob("*.md")))
     if existing_count:
         print(f"  Found {existing_count} existing files.")
 
     stats = {"attempted": 0, "success": 0, "failed": 0, "skipped": 0}
 
     print(f"  Fetching sitemap: {sitemap_url}")
-    urls = get_sitemap_urls(sitemap_url, url_filter)
+    lastmods = get_sitemap_urls(sitemap_url, url_filter)
+    urls = list(lastmods)
     print(f"  Found {len(urls)} article URLs")
 
+    # Articles saved before the sitemap state existed are adopted once from
+    # disk; after that, resume needs no file reads
+    if existing_count and not SITEMAPS.is_seeded(source_key):
+        SITEMAPS.seed(source_key, scraped_files(output_dir), lastmods)
+
     article_index = existing_count
     batch_count = 0
 
-    for i, url in enumerate(urls):
-        if url in scraped_urls:
-            continue
-
+    pending = SITEMAPS.pending(source_key, lastmods, urls)
+    print(f"  {len(pending)} new or changed since last run")
+    fetched = SCHEDULER.fetch_iter(
+        SESSION, pending, DEFAULT_DELAY, headers=HEADERS, timeout=30
+    )
+    for i, (url, resp) in enumerate(fetched):
         stats["attempted"] += 1
         article_index += 1
         batch_count += 1
 
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=30)
+            if isinstance(resp, Exception):
+                raise resp
             if resp.status_code == 404:
                 stats["skipped"] += 1
+                SITEMAPS.record(source_key, url, lastmods.get(url))
                 continue
             resp.raise_for_status()
 
@@ -460,14 +489,17 @@ def scrape_sitemap_html(source_key: str) -> dict:
 
             if len(content.split()) < 30:
                 stats["skipped"] += 1
+                SITEMAPS.record(source_key, url, lastmods.get(url))
                 continue
 
-            save_article(output_dir, article_index, title, content, url, "", author)
+            index = SITEMAPS.previous_index(source_key, url) or article_index
+            path = save_article(output_dir, index, title, content, url, "", author)
+            SITEMAPS.saved(source_key, url, lastmods.get(url), path)
             stats["success"] += 1
 
             if stats["success"] % 25 == 0:
                 print(
-                    f"    Progress: {stats['success']} saved ({i + 1}/{len(urls)} URLs)"
+                    f"    Progress: {stats['success']} saved ({i + 1}/{len(pending)} URLs)"
                 )
 
         except requests.exceptions.Timeout:
@@ -476,7 +508,7 @@ def scrape_sitemap_html(source_key: str) -> dict:
         except requests.exceptions.HTTPError as e:
             if e.response and e.response.status_code == 429:
                 print("    RATE LIMITED. Pausing 30s...")
-                time.sleep(30)
+                SCHEDULER.backoff(url, 30)
                 stats["failed"] += 1
             else:
                 print(
@@ -488,9 +520,7 @@ def scrape_sitemap_html(source_key: str) -> dict:
             stats["failed"] += 1
 
         if batch_count % 10 == 0:
-            rate_limit(BATCH_PAUSE)
-        else:
-            rate_limit(DEFAULT_DELAY)
+            SCHEDULER.backoff(url, BATCH_PAUSE)
 
     return stats
 
@@ -514,7 +544,9 @@ def scrape_rss(source_key: str) -> dict:
 
     print(f"  Fetching RSS: {rss_url}")
     try:
-        resp = requests.get(rss_url, headers=HEADERS, timeout=60)
+        resp = SCHEDULER.get(
+            SESSION, rss_url, DEFAULT_DELAY, headers=HEADERS, timeout=60
+        )
         resp.raise_for_status()
     except Exception as e:
         print(f"  ERROR fetching RSS: {e}")
@@ -660,8 +692,10 @@ def scrape_substack(source_key: str) -> dict:
 
     while True:
         try:
-            resp = requests.get(
+            resp = SCHEDULER.get(
+                SESSION,
                 api_url,
+                1.5,
                 params={"sort": "new", "offset": offset, "limit": limit},
                 headers=HEADERS,
                 timeout=30,
@@ -676,8 +710,6 @@ def scrape_substack(source_key: str) -> dict:
             offset += limit
             print(f"    Fetched {len(all_posts)} posts so far...")
 
-            rate_limit(1.5)
-
         except Exception as e:
             print(f"    ERROR at offset {offset}: {e}")
             stats["failed"] += 1
@@ -713,8 +745,10 @@ def scrape_substack(source_key: str) -> dict:
         elif post_slug:
             # Try fetching individual post
             try:
-                post_resp = requests.get(
+                post_resp = SCHEDULER.get(
+                    SESSION,
                     f"{pub_url}/api/v1/posts/{post_slug}",
+                    1.0,
                     headers=HEADERS,
                     timeout=30,
                 )
@@ -723,7 +757,6 @@ def scrape_substack(source_key: str) -> dict:
                     body_html = post_data.get("body_html", "")
                     if body_html:
                         content = html_to_markdown(body_html)
-                rate_limit(1.0)
             except Exception:
                 pass
 
@@ -30,6 +30,9 @@ import html2text
 import requests
 from bs4 import BeautifulSoup
 
+from fetch_scheduler import get_scheduler
+from http_cache import CachingSession
+
 # ── Configuration ──────────────────────────────────────────────────────────
 
 KB_BASE = Path.home() / "Development" / "knowledge-bases" / "first-1000"
@@ -121,8 +124,11 @@ def html_to_markdown(html_content: str) -> str:
     return H2T.handle(html_content).strip()
 
 
-def rate_limit(delay: float = DEFAULT_DELAY):
-    time.sleep(delay)
+# Per-host pacing shared with the other scrapers in this process:
+# a request waits only for its host's next slot, not a fixed sleep
+SCHEDULER = get_scheduler()
+# Conditional GETs (ETag/Last-Modified) against the shared on-disk cache
+SESSION = CachingSession(requests)
 
 
 def get_scraped_urls(output_dir: Path) -> set:
@@ -155,8 +161,13 @@ def scrape_wp_api(source_key: str) -> dict:
     stats = {"attempted": 0, "success": 0, "failed": 0, "skipped": 0}
 
     try:
-        resp = requests.get(
-            api_url, params={"per_page": 1}, headers=HEADERS, timeout=30
+        resp = SCHEDULER.get(
+            SESSION,
+            api_url,
+            DEFAULT_DELAY,
+            params={"per_page": 1},
+            headers=HEADERS,
+            timeout=30,
         )
         resp.raise_for_status()
         total = int(resp.headers.get("X-WP-Total", 0))
@@ -178,8 +189,10 @@ def scrape_wp_api(source_key: str) -> dict:
         print(f"  Fetching page {page}/{total_pages}...")
 
         try:
-            resp = requests.get(
+            resp = SCHEDULER.get(
+                SESSION,
                 api_url,
+                DEFAULT_DELAY,
                 params={
                     "per_page": 100,
                     "page": page,
@@ -199,12 +212,12 @@ def scrape_wp_api(source_key: str) -> dict:
                 break
             print(f"    ERROR fetching page {page}: {e}")
             stats["failed"] += 1
-            rate_limit(5.0)
+            SCHEDULER.backoff(api_url, 5.0)
             continue
         except Exception as e:
             print(f"    ERROR fetching page {page}: {e}")
             stats["failed"] += 1
-            rate_limit(5.0)
+            SCHEDULER.backoff(api_url, 5.0)
             continue
 
         if not posts:
@@ -244,9 +257,7 @@ def scrape_wp_api(source_key: str) -> dict:
                 stats["failed"] += 1
 
         if page % 10 == 0:
-            rate_limit(BATCH_PAUSE)
-        else:
-            rate_limit(DEFAULT_DELAY)
+            SCHEDULER.backoff(api_url, BATCH_PAUSE)
 
     return stats
 
@@ -272,7 +283,9 @@ def scrape_article_list(source_key: str) -> dict:
     # Step 1: Fetch the articles list page
     print(f"  Fetching article list: {list_url}")
     try:
-        resp = requests.get(list_url, headers=HEADERS, timeout=30)
+        resp = SCHEDULER.get(
+            SESSION, list_url, DEFAULT_DELAY, headers=HEADERS, timeout=30
+        )
         resp.raise_for_status()
     except Exception as e:
         print(f"  ERROR fetching article list: {e}")
@@ -307,16 +320,21 @@ def scrape_article_list(source_key: str) -> dict:
     article_index = existing_count
     batch_count = 0
 
-    for i, (url, list_title) in enumerate(unique_links):
-        if url in scraped_urls:
-            continue
+    pending = [url for url, _title in unique_links if url not in scraped_urls]
+    list_titles = dict(unique_links)
+    fetched = SCHEDULER.fetch_iter(
+        SESSION, pending, DEFAULT_DELAY, headers=HEADERS, timeout=30
+    )
+    for i, (url, resp) in enumerate(fetched):
+        list_title = list_titles[url]
 
         stats["attempted"] += 1
         article_index += 1
         batch_count += 1
 
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=30)
+            if isinstance(resp, Exception):
+                raise resp
             if resp.status_code == 404:
                 stats["skipped"] += 1
                 continue
@@ -376,7 +394,7 @@ def scrape_article_list(source_key: str) -> dict:
 
             if stats["success"] % 25 == 0:
                 print(
-                    f"    Progress: {stats['success']} saved ({i + 1}/{len(unique_links)} URLs)"
+                    f"    Progress: {stats['success']} saved ({i + 1}/{len(pending)} URLs)"
                 )
 
         except requests.exceptions.Timeout:
@@ -385,7 +403,7 @@ def scrape_article_list(source_key: str) -> dict:
         except requests.exceptions.HTTPError as e:
             if e.response and e.response.status_code == 429:
                 print("    RATE LIMITED. Pausing 30s...")
-                time.sleep(30)
+                SCHEDULER.backoff(url, 30)
                 stats["failed"] += 1
             else:
                 print(
@@ -397,9 +415,7 @@ def scrape_article_list(source_key: str) -> dict:
             stats["failed"] += 1
 
         if batch_count % 10 == 0:
-            rate_limit(BATCH_PAUSE)
-        else:
-            rate_limit(DEFAULT_DELAY)
+            SCHEDULER.backoff(url, BATCH_PAUSE)
 
     return stats
 
@@ -38,6 +38,10 @@ import html2text
 import requests
 from bs4 import BeautifulSoup
 
+from fetch_scheduler import get_scheduler
+from http_cache import CachingSession
+from sitemap_state import get_sitemap_state, scraped_files
+
 # ── Configuration ──────────────────────────────────────────────────────────
 
 KB_BASE = Path.home() / "Development" / "knowledge-bases" / "first-1000"
@@ -186,8 +190,24 @@ def html_to_markdown(html_content: str) -> str:
     return H2T.handle(html_content).strip()
 
 
-def rate_limit(delay: float = DEFAULT_DELAY):
-    time.sleep(delay)
+# Per-host pacing shared with the other scrapers in this process:
+# a request waits only for its host's next slot, not a fixed sleep
+SCHEDULER = get_scheduler()
+# Conditional GETs (ETag/Last-Modified) against the shared on-disk cache
+SESSION = CachingSession(requests)
+# Per-URL sitemap <lastmod> state: only new or changed pages are fetched
+SITEMAPS = get_sitemap_state()
+
+
+def fetch_sitemap_xml(url: str):
+    """Sitemap XML text, or None if it can't be fetched."""
+    try:
+        resp = SCHEDULER.get(SESSION, url, DEFAULT_DELAY, headers=HEADERS, timeout=30)
+        resp.raise_for_status()
+        return resp.text
+    except Exception as e:
+        print(f"  ERROR fetching sitemap {url}: {e}")
+        return None
 
 
 def get_scraped_urls(output_dir: Path) -> set:
@@ -220,8 +240,13 @@ def scrape_wp_api(source_key: str) -> dict:
     stats = {"attempted": 0, "success": 0, "failed": 0, "skipped": 0}
 
     try:
-        resp = requests.get(
-            api_url, params={"per_page": 1}, headers=HEADERS, timeout=30
+        resp = SCHEDULER.get(
+            SESSION,
+            api_url,
+            DEFAULT_DELAY,
+            params={"per_page": 1},
+            headers=HEADERS,
+            timeout=30,
         )
         resp.raise_for_status()
         total = int(resp.headers.get("X-WP-Total", 0))
@@ -243,8 +268,10 @@ def scrape_wp_api(source_key: str) -> dict:
         print(f"  Fetching page {page}/{total_pages}...")
 
         try:
-            resp = requests.get(
+            resp = SCHEDULER.get(
+                SESSION,
                 api_url,
+                DEFAULT_DELAY,
                 params={
                     "per_page": 100,
                     "page": page,
@@ -264,12 +291,12 @@ def scrape_wp_api(source_key: str) -> dict:
                 break
             print(f"    ERROR fetching page {page}: {e}")
             stats["failed"] += 1
-            rate_limit(5.0)
+            SCHEDULER.backoff(api_url, 5.0)
             continue
         except Exception as e:
             print(f"    ERROR fetching page {page}: {e}")
             stats["failed"] += 1
-            rate_limit(5.0)
+            SCHEDULER.backoff(api_url, 5.0)
             continue
 
         if not posts:
@@ -309,9 +336,7 @@ def scrape_wp_api(source_key: str) -> dict:
                 stats["failed"] += 1
 
         if page % 10 == 0:
-            rate_limit(BATCH_PAUSE)
-        else:
-            rate_limit(DEFAULT_DELAY)
+            SCHEDULER.backoff(api_url, BATCH_PAUSE)
 
     return stats
 
@@ -326,24 +351,21 @@ def scrape_sitemap_html(source_key: str) -> dict:
     output_dir = source["output_dir"]
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    scraped_urls = get_scraped_urls(output_dir)
-    existing_count = len(scraped_urls)
+    existing_count = len(list(output_dir.glob("*.md")))
     if existing_count:
         print(f"  Found {existing_count} existing files.")
 
     stats = {"attempted": 0, "success": 0, "failed": 0, "skipped": 0}
 
+    # Page URLs with their <lastmod>, following sitemap indexes; unchanged
+    # child sitemaps come from the local state instead of the network
     print(f"  Fetching sitemap: {sitemap_url}")
-    try:
-        resp = requests.get(sitemap_url, headers=HEADERS, timeout=30)
-        resp.raise_for_status()
-    except Exception as e:
-        print(f"  ERROR fetching sitemap: {e}")
+    lastmods = SITEMAPS.walk(sitemap_url, fetch_sitemap_xml)
+    if not lastmods:
         return {"attempted": 0, "success": 0, "failed": 1, "skipped": 0}
 
-    urls = re.findall(r"<loc>([^<]+)</loc>", resp.text)
     article_urls = []
-    for url in urls:
+    for url in lastmods:
         if url.endswith(".xml"):
             continue
         if url_filter and url_filter not in url:
@@ -352,19 +374,28 @@ def scrape_sitemap_html(source_key: str) -> dict:
 
     print(f"  Found {len(article_urls)} article URLs")
 
-    article_index = existing_count
+    # Articles saved before the sitemap state existed are adopted once from
+    # disk; after that, resume needs no file reads
+    if existing_count and not SITEMAPS.is_seeded(source_key):
+        SITEMAPS.seed(source_key, scraped_files(output_dir), lastmods)
 
-    for i, url in enumerate(article_urls):
-        if url in scraped_urls:
-            continue
+    article_index = existing_count
 
+    pending = SITEMAPS.pending(source_key, lastmods, article_urls)
+    print(f"  {len(pending)} new or changed since last run")
+    fetched = SCHEDULER.fetch_iter(
+        SESSION, pending, DEFAULT_DELAY, headers=HEADERS, timeout=30
+    )
+    for i, (url, resp) in enumerate(fetched):
         stats["attempted"] += 1
         article_index += 1
 
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=30)
+            if isinstance(resp, Exception):
+                raise resp
             if resp.status_code == 404:
                 stats["skipped"] += 1
+                SITEMAPS.record(source_key, url, lastmods.get(url))
                 continue
             resp.raise_for_status()
 
@@ -418,9 +449,12 @@ def scrape_sitemap_html(source_key: str) -> dict:
 
             if len(content.split()) < 30:
                 stats["skipped"] += 1
+                SITEMAPS.record(source_key, url, lastmods.get(url))
                 continue
 
-            save_article(output_dir, article_index, title, content, url, "", author)
+            index = SITEMAPS.previous_index(source_key, url) or article_index
+            path = save_article(output_dir, index, title, content, url, "", author)
+            SITEMAPS.saved(source_key, url, lastmods.get(url), path)
             stats["success"] += 1
 
         except requests.exceptions.Timeout:
@@ -429,7 +463,7 @@ def scrape_sitemap_html(source_key: str) -> dict:
         except requests.exceptions.HTTPError as e:
             if e.response and e.response.status_code == 429:
                 print("    RATE LIMITED. Pausing 30s...")
-                time.sleep(30)
+                SCHEDULER.backoff(url, 30)
                 stats["failed"] += 1
             else:
                 print(
@@ -440,8 +474,6 @@ def scrape_sitemap_html(source_key: str) -> dict:
             print(f"    ERROR: {url} — {e}")
             stats["failed"] += 1
 
-        rate_limit(DEFAULT_DELAY)
-
     return stats
 
 
@@ -469,8 +501,10 @@ def scrape_substack(source_key: str) -> dict:
         print(f"  Fetching offset {offset}...")
 
         try:
-            resp = requests.get(
+            resp = SCHEDULER.get(
+                SESSION,
                 f"{substack_url}/api/v1/archive",
+                DEFAULT_DELAY,
                 params={
                     "sort": "new",
                     "search": "",
@@ -508,7 +542,9 @@ def scrape_substack(source_key: str) -> dict:
                         slug = post.get("slug", "")
                         url = f"{substack_url}/p/{slug}"
                     try:
-                        page_resp = requests.get(url, headers=HEADERS, timeout=30)
+                        page_resp = SCHEDULER.get(
+                            SESSION, url, DEFAULT_DELAY, headers=HEADERS, timeout=30
+                        )
                         page_resp.raise_for_status()
                         soup = BeautifulSoup(page_resp.text, "html.parser")
                         body_el = (
@@ -518,7 +554,6 @@ def scrape_substack(source_key: str) -> dict:
                         )
                         if body_el:
                             html_content = str(body_el)
-                        rate_limit(DEFAULT_DELAY)
                     except Exception as fetch_err:
                         print(f"    ERROR fetching post page: {fetch_err}")
                         stats["failed"] += 1
@@ -548,7 +583,6 @@ def scrape_substack(source_key: str) -> dict:
                 stats["failed"] += 1
 
         offset += batch_size
-        rate_limit(DEFAULT_DELAY)
 
     return stats
 
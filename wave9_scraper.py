@@ -32,6 +32,10 @@ import html2text
 import requests
 from bs4 import BeautifulSoup
 
+from fetch_scheduler import get_scheduler
+from http_cache import CachingSession
+from sitemap_state import get_sitemap_state, scraped_files
+
 # ── Configuration ──────────────────────────────────────────────────────────
 
 KB_BASE = Path.home() / "Development" / "knowledge-bases" / "first-1000"
@@ -148,9 +152,24 @@ def html_to_markdown(html_content: str) -> str:
     return H2T.handle(html_content).strip()
 
 
-def rate_limit(delay: float = DEFAULT_DELAY):
-    """Sleep for rate limiting."""
-    time.sleep(delay)
+# Per-host pacing shared with the other scrapers in this process:
+# a request waits only for its host's next slot, not a fixed sleep
+SCHEDULER = get_scheduler()
+# Conditional GETs (ETag/Last-Modified) against the shared on-disk cache
+SESSION = CachingSession(requests)
+# Per-URL sitemap <lastmod> state: only new or changed pages are fetched
+SITEMAPS = get_sitemap_state()
+
+
+def fetch_sitemap_xml(url: str):
+    """Sitemap XML text, or None if it can't be fetched."""
+    try:
+        resp = SCHEDULER.get(SESSION, url, DEFAULT_DELAY, headers=HEADERS, timeout=30)
+        resp.raise_for_status()
+        return resp.text
+    except Exception as e:
+        print(f"  ERROR fetching sitemap {url}: {e}")
+        return None
 
 
 # ── WP REST API Scraper ───────────────────────────────────────────────────
@@ -174,7 +193,14 @@ def scrape_wp_api(source_key: str, resume_from: int = 0) -> dict:
     stats = {"attempted": 0, "success": 0, "failed": 0, "skipped": 0}
 
     # First, get total count
-    resp = requests.get(api_url, params={"per_page": 1}, headers=HEADERS, timeout=30)
+    resp = SCHEDULER.get(
+        SESSION,
+        api_url,
+        DEFAULT_DELAY,
+        params={"per_page": 1},
+        headers=HEADERS,
+        timeout=30,
+    )
     resp.raise_for_status()
     total = int(resp.headers.get("X-WP-Total", 0))
     total_pages = int(resp.headers.get("X-WP-TotalPages", 0))
@@ -187,8 +213,10 @@ def scrape_wp_api(source_key: str, resume_from: int = 0) -> dict:
         print(f"  Fetching page {page}/{total_pages}...")
 
         try:
-            resp = requests.get(
+            resp = SCHEDULER.get(
+                SESSION,
                 api_url,
+                DEFAULT_DELAY,
                 params={
                     "per_page": 100,
                     "page": page,
@@ -203,7 +231,7 @@ def scrape_wp_api(source_key: str, resume_from: int = 0) -> dict:
         except Exception as e:
             print(f"    ERROR fetching page {page}: {e}")
             stats["failed"] += 1
-            rate_limit(5.0)  # Longer pause on error
+            SCHEDULER.backoff(api_url, 5.0)  # Longer pause on error
             continue
 
         for post in posts:
@@ -243,9 +271,7 @@ def scrape_wp_api(source_key: str, resume_from: int = 0) -> dict:
         # Batch pause every 10 pages
         if page % 10 == 0:
             print(f"    Batch pause ({BATCH_PAUSE}s)...")
-            rate_limit(BATCH_PAUSE)
-        else:
-            rate_limit(DEFAULT_DELAY)
+            SCHEDULER.backoff(api_url, BATCH_PAUSE)
 
     return stats
 
@@ -253,16 +279,13 @@ def scrape_wp_api(source_key: str, resume_from: int = 0) -> dict:
 # ── Sitemap + HTML Scraper ─────────────────────────────────────────────────
 
 
-def get_sitemap_urls(sitemap_url: str) -> list[str]:
-    """Extract article URLs from a sitemap XML."""
-    resp = requests.get(sitemap_url, headers=HEADERS, timeout=30)
-    resp.raise_for_status()
-    xml = resp.text
+def get_sitemap_urls(sitemap_url: str) -> dict[str, str | None]:
+    """Article URL -> <lastmod> from a sitemap (following sitemap indexes)."""
+    lastmods = SITEMAPS.walk(sitemap_url, fetch_sitemap_xml)
 
-    urls = re.findall(r"<loc>([^<]+)</loc>", xml)
     # Filter out non-article URLs
-    article_urls = []
-    for url in urls:
+    article_urls = {}
+    for url, lastmod in lastmods.items():
         parsed = urlparse(url)
         path = parsed.path.strip("/")
         # Skip root, tag pages, category pages, sitemap refs
@@ -280,9 +303,9 @@ def get_sitemap_urls(sitemap_url: str) -> list[str]:
                     "founder_link",
                     "sitemap.xml",
                 ):
-                    article_urls.append(url)
+                    article_urls[url] = lastmod
         else:
-            article_urls.append(url)
+            article_urls[url] = lastmod
 
     return article_urls
 
@@ -390,9 +413,10 @@ def scrape_sitemap_html(source_key: str, resume_from: int = 0) -> dict:
 
     stats = {"attempted": 0, "success": 0, "failed": 0, "skipped": 0}
 
-    # Get URLs from sitemap
+    # Get URLs (and their <lastmod>) from the sitemap
     print(f"  Fetching sitemap: {sitemap_url}")
-    urls = get_sitemap_urls(sitemap_url)
+    lastmods = get_sitemap_urls(sitemap_url)
+    urls = list(lastmods)
     print(f"  Found {len(urls)} article URLs")
 
     # Choose extractor based on source
@@ -403,32 +427,30 @@ def scrape_sitemap_html(source_key: str, resume_from: int = 0) -> dict:
     else:
         extractor = extract_first_round_article  # default fallback
 
-    # Build set of already-scraped URLs for resume
-    scraped_urls = set()
-    for f in existing:
-        try:
-            text = f.read_text(encoding="utf-8")
-            match = re.search(r'^url:\s*"([^"]*)"', text, re.MULTILINE)
-            if match:
-                scraped_urls.add(match.group(1))
-        except Exception:
-            pass
+    # Articles saved before the sitemap state existed are adopted once from
+    # disk; after that, resume needs no file reads
+    if existing and not SITEMAPS.is_seeded(source_key):
+        SITEMAPS.seed(source_key, scraped_files(output_dir), lastmods)
 
     article_index = resume_from
     batch_count = 0
 
-    for i, url in enumerate(urls):
-        if url in scraped_urls:
-            continue
-
+    pending = SITEMAPS.pending(source_key, lastmods, urls)
+    print(f"  {len(pending)} new or changed since last run")
+    fetched = SCHEDULER.fetch_iter(
+        SESSION, pending, DEFAULT_DELAY, headers=HEADERS, timeout=30
+    )
+    for i, (url, resp) in enumerate(fetched):
         stats["attempted"] += 1
         article_index += 1
         batch_count += 1
 
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=30)
+            if isinstance(resp, Exception):
+                raise resp
             if resp.status_code == 404:
                 stats["skipped"] += 1
+                SITEMAPS.record(source_key, url, lastmods.get(url))
                 continue
             resp.raise_for_status()
 
@@ -440,14 +462,17 @@ def scrape_sitemap_html(source_key: str, resume_from: int = 0) -> dict:
             # Skip very short articles
             if len(content.split()) < 30:
                 stats["skipped"] += 1
+                SITEMAPS.record(source_key, url, lastmods.get(url))
                 continue
 
-            save_article(output_dir, article_index, title, content, url, "", author)
+            index = SITEMAPS.previous_index(source_key, url) or article_index
+            path = save_article(output_dir, index, title, content, url, "", author)
+            SITEMAPS.saved(source_key, url, lastmods.get(url), path)
             stats["success"] += 1
 
             if stats["success"] % 50 == 0:
                 print(
-                    f"    Progress: {stats['success']} articles saved ({i + 1}/{len(urls)} URLs)"
+                    f"    Progress: {stats['success']} articles saved ({i + 1}/{len(pending)} URLs)"
                 )
 
         except requests.exceptions.Timeout:
@@ -456,7 +481,7 @@ def scrape_sitemap_html(source_key: str, resume_from: int = 0) -> dict:
         except requests.exceptions.HTTPError as e:
             if e.response and e.response.status_code == 429:
                 print("    RATE LIMITED. Pausing 30s...")
-                time.sleep(30)
+                SCHEDULER.backoff(url, 30)
                 stats["failed"] += 1
             else:
                 print(
@@ -467,11 +492,9 @@ def scrape_sitemap_html(source_key: str, resume_from: int = 0) -> dict:
             print(f"    ERROR: {url} — {e}")
             stats["failed"] += 1
 
-        # Rate limiting
+        # Batch pause every 10 articles
         if batch_count % 10 == 0:
-            rate_limit(BATCH_PAUSE)
-        else:
-            rate_limit(DEFAULT_DELAY)
+            SCHEDULER.backoff(url, BATCH_PAUSE)
 
     return stats
 